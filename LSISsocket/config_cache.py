@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""폴링용 설정 스냅샷(config snapshot) 캐시.
+
+service.py는 memory_group_cache / calc_group_cache 등에 지연 QuerySet(MemoryGroup.objects.all())을
+보관해 폴링마다 .filter(id__in=...)로 DB를 다시 조회했고, 설정 변경은 재시작 전까지 반영되지 않았습니다.
+이 모듈은 사용 중인 클라이언트, 디코딩 계획, 계산/설정 그룹을 한 번에 읽어 완전히 풀어 둔
+불변 스냅샷(ConfigSnapshot)을 만들고, 폴링 잡은 get_config_snapshot()으로 하나의 일관된
+스냅샷만 읽습니다 (DB 조회 없음).
+
+- 스냅샷의 버전은 decode_plan.current_version() (Redis 버전 키, 로컬 세대) 입니다.
+  models.py의 시그널이 invalidate_config_snapshot()을 호출하면 버전이 바뀌고,
+  다음 조회에서 새 스냅샷을 만들어 전역 참조를 한 번에 교체합니다.
+- 읽는 쪽은 잠금을 잡지 않습니다. 재빌드 중에 들어온 잡은 이전 스냅샷을 그대로 사용합니다.
+- 스냅샷은 통째로 교체되므로 삭제된 클라이언트/그룹이 캐시에 쌓이지 않습니다.
+"""
+import threading
+import time
+from types import MappingProxyType
+
+from utils.calculation import all_dict as calculation_methods
+from . import logger
+from .decode_plan import build_decode_plans, current_version, invalidate_decode_plans
+
+_snapshot = None
+_build_lock = threading.Lock()
+
+
+class CalcEntry:
+    """계산 변수 하나: 결과 var_id, 계산 함수, 인자 var_id 목록."""
+
+    __slots__ = ('var_id', 'method_name', 'method', 'args')
+
+    def __init__(self, var_id, method_name, method, args):
+        self.var_id = var_id
+        self.method_name = method_name
+        self.method = method
+        self.args = tuple(args)
+
+    def __repr__(self):
+        return f"CalcEntry(var_id={self.var_id}, method={self.method_name}, args={self.args})"
+
+
+class ConfigSnapshot:
+    """한 시점의 폴링 설정. 만든 뒤에는 변경할 수 없습니다.
+
+    - clients: {client_id: SocketClientConfig} (is_used=True)
+    - plans: {client_id: DecodePlan}
+    - calc_groups: {group_id: (CalcEntry, ...)}
+    - setup_groups: {group_id: (변수 dict(읽기 전용), ...)} (is_active=True)
+    - alert_group_ids / control_group_ids: frozenset
+    """
+
+    __slots__ = ('version', 'built_at', 'clients', 'plans', 'calc_groups', 'setup_groups',
+                 'alert_group_ids', 'control_group_ids', '_frozen')
+
+    def __init__(self, version, clients, plans, calc_groups, setup_groups, alert_group_ids=(), control_group_ids=()):
+        self.version = version
+        self.built_at = time.time()
+        self.clients = MappingProxyType(dict(clients))
+        self.plans = MappingProxyType(dict(plans))
+        self.calc_groups = MappingProxyType({gid: tuple(entries) for gid, entries in calc_groups.items()})
+        self.setup_groups = MappingProxyType({
+            gid: tuple(MappingProxyType(dict(mem)) for mem in variables) for gid, variables in setup_groups.items()
+        })
+        self.alert_group_ids = frozenset(alert_group_ids)
+        self.control_group_ids = frozenset(control_group_ids)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError('ConfigSnapshot is immutable')
+        super().__setattr__(name, value)
+
+    def __repr__(self):
+        return (f"ConfigSnapshot(version={self.version}, clients={len(self.clients)}, "
+                f"calc_groups={len(self.calc_groups)}, setup_groups={len(self.setup_groups)})")
+
+    def client(self, client):
+        """잡 인자로 받은 클라이언트의 최신 설정 (스냅샷에 없으면 받은 객체 그대로)."""
+        return self.clients.get(getattr(client, 'id', None), client)
+
+    def plan(self, client_id):
+        return self.plans.get(client_id)
+
+    def calc_entries(self, group_ids):
+        for gid in group_ids:
+            yield from self.calc_groups.get(gid, ())
+
+    def setup_variables(self, group_ids):
+        for gid in group_ids:
+            yield from self.setup_groups.get(gid, ())
+
+
+# ------------------------------
+# 📌 스냅샷 빌드
+# ------------------------------
+def _load_calc_groups():
+    from LSISsocket.models import CalcGroup
+    from LSISsocket.serializers import CalcGroupSerializer
+
+    groups = CalcGroup.objects.prefetch_related('lsissocket_calc_variables_in_group__name')
+    calc_groups = {}
+    for g in CalcGroupSerializer(groups, many=True).data:
+        entries = []
+        for mem in g.get('variables') or []:
+            method_name = (mem.get('name') or {}).get('use_method')
+            method = calculation_methods.get(method_name)
+            if method is None:
+                logger.debug(f'config snapshot: calc var {mem.get("id")}의 계산 함수가 없습니다: {method_name}')
+                continue
+            entries.append(CalcEntry(mem.get('id'), method_name, method, mem.get('args') or []))
+        calc_groups[g['id']] = entries
+    return calc_groups
+
+
+def _load_setup_groups():
+    from LSISsocket.models import SetupGroup
+    from LSISsocket.serializers import SetupGroupSerializer
+
+    groups = SetupGroup.objects.filter(is_active=True).prefetch_related('variables')
+    return {g['id']: g.get('variables_detail') or [] for g in SetupGroupSerializer(groups, many=True).data}
+
+
+def build_config_snapshot(version=None):
+    """DB에서 설정을 읽어 새 ConfigSnapshot을 만듭니다 (전역 스냅샷은 바꾸지 않음)."""
+    from LSISsocket.models import AlertGroup, ControlGroup, SocketClientConfig
+
+    version = current_version() if version is None else version
+    clients = list(SocketClientConfig.objects.filter(is_used=True))
+    snapshot = ConfigSnapshot(
+        version,
+        clients={client.id: client for client in clients},
+        plans=build_decode_plans(clients, version),
+        calc_groups=_load_calc_groups(),
+        setup_groups=_load_setup_groups(),
+        alert_group_ids=AlertGroup.objects.values_list('id', flat=True),
+        control_group_ids=ControlGroup.objects.values_list('id', flat=True),
+    )
+    logger.info(f'config snapshot built: {snapshot}')
+    return snapshot
+
+
+def refresh_config_snapshot():
+    """새 스냅샷을 만들어 전역 스냅샷을 교체하고 반환합니다."""
+    global _snapshot
+    with _build_lock:
+        _snapshot = build_config_snapshot()
+        return _snapshot
+
+
+def get_config_snapshot():
+    """
+    현재 설정 스냅샷을 반환합니다. 버전이 바뀌었으면 다시 만듭니다.
+
+    다른 스레드가 이미 재빌드 중이면 기다리지 않고 이전 스냅샷을 반환하며,
+    재빌드가 실패해도 이전 스냅샷을 계속 사용합니다.
+
+    📌 사용 예시:
+    snapshot = get_config_snapshot()
+    client = snapshot.client(client)
+    plan = snapshot.plan(client.id)
+    """
+    global _snapshot
+    snapshot = _snapshot
+    version = current_version()
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    if not _build_lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        if _snapshot is not None and _snapshot.version == version:
+            return _snapshot
+        try:
+            _snapshot = build_config_snapshot(version)
+        except Exception:
+            if snapshot is None:
+                raise
+            logger.exception('config snapshot 재빌드 실패, 이전 스냅샷을 사용합니다')
+        return _snapshot
+    finally:
+        _build_lock.release()
+
+
+def invalidate_config_snapshot(client_id=None):
+    """설정 버전을 올려 모든 프로세스가 다음 조회에서 스냅샷을 다시 만들도록 합니다."""
+    invalidate_decode_plans(client_id)
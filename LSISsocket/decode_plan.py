@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""클라이언트별 메모리 디코딩 계획(decode plan) 컴파일/캐시 모듈.
+
+reids_to_memory_mapping()은 폴링마다 SocketClientConfigSerializer/MemoryGroupSerializer를
+실행하고 변수마다 LSIS_MappingTool을 새로 만들어 주소 파싱·포맷 조회를 반복했습니다.
+이 모듈은 그 작업을 설정이 바뀔 때 한 번만 수행하여 변수별 오프셋, struct 포맷,
+스케일, min/max, 비트 위치를 미리 계산해 두고, 폴링 시에는 %MB 버퍼를 한 번 순회하며
+값만 꺼냅니다.
+
+- 계획은 프로세스 전역 캐시(_plans)에 client_id 단위로 보관됩니다.
+- Variable / MemoryGroup / SocketClientConfig 등 변경 시(models.py의 시그널) config_cache를 거쳐
+  invalidate_decode_plans()가 호출되어 로컬 캐시를 비우고 Redis의 버전 키를 증가시킵니다.
+- 스케줄러 프로세스와 Django 프로세스가 분리되어 있으므로, 폴러는 Redis 버전 키를 비교해
+  다른 프로세스에서 발생한 변경도 감지하고 다음 폴링에서 계획을 다시 컴파일합니다.
+"""
+import struct
+import threading
+
+from utils.protocol.LSIS.batch_decoder import LSIS_BatchDecoder
+from utils.protocol.LSIS.utilities import LSIS_MappingTool
+from . import logger, redis_instance
+
+# Redis(LSISsocket DB)에 저장되는 설정 버전 키 ('*:*' 패턴과 겹치지 않도록 콜론 미사용)
+DECODE_PLAN_VERSION_KEY = 'decode_plan_version'
+
+# 변수 수가 이 값 이상이면 NumPy 배치 디코더를 사용 (작은 계획은 스칼라 경로가 더 빠름)
+BATCH_DECODE_MIN_ENTRIES = 64
+
+_plans = {}
+_plans_lock = threading.RLock()
+_local_generation = 0
+
+
+class DecodeEntry:
+    """변수 하나에 대한 미리 계산된 디코딩 정보."""
+
+    __slots__ = ('key', 'var_id', 'attributes', 'offset', 'bit', 'unpacker', 'size',
+                 'scale', 'kind', 'clamp', 'deadband')
+
+    def __init__(self, key, var_id, attributes, offset, bit=None, unpacker=None, size=0,
+                 scale=1.0, kind=None, clamp=None, deadband=0.0):
+        self.key = key
+        self.var_id = var_id
+        self.attributes = attributes
+        self.offset = offset
+        self.bit = bit
+        self.unpacker = unpacker
+        self.size = size
+        self.scale = scale
+        self.kind = kind
+        self.clamp = clamp
+        self.deadband = deadband
+
+    def __repr__(self):
+        return f"DecodeEntry(key={self.key}, offset={self.offset}, bit={self.bit}, size={self.size})"
+
+
+def _compile_clamp(tool):
+    """LSIS_MappingTool.minmax()와 동일한 조건에서만 클램프 범위를 반환합니다."""
+    lo, hi = tool.min, tool.max
+    try:
+        if type(lo).__name__ not in ('int', 'float') or type(hi).__name__ not in ('int', 'float'):
+            return None
+        if hi == lo == 0 or hi < lo:
+            return None
+    except Exception:
+        return None
+    if 'int' in tool.type:
+        return (lo, hi)
+    if 'float' in tool.type:
+        return (float(lo), float(hi))
+    return None
+
+
+def compile_entry(client_id, mem):
+    """직렬화된 변수(dict) 하나를 DecodeEntry로 컴파일합니다.
+
+    LSIS_MappingTool을 그대로 사용해 주소/포맷 해석 규칙을 공유하며,
+    폴링마다 실패할 항목(포맷 크기 불일치 등)은 여기서 걸러냅니다.
+    """
+    tool = LSIS_MappingTool(**mem)
+    position = tool.position
+    if not position:
+        raise ValueError(f"유효한 주소가 아닙니다: {mem.get('device_address')}")
+    key = f"{client_id}:{mem.get('id', None)}"
+    attributes = list(mem.get('attributes') or [])
+    try:
+        deadband = abs(float(mem.get('deadband') or 0))
+    except (TypeError, ValueError):
+        deadband = 0.0
+    if len(position) > 1:
+        # bit 변환: repack()은 position[0]부터 2바이트를 비트 리스트로 풀어 position[1]번째를 사용
+        return DecodeEntry(
+            key, mem.get('id'), attributes,
+            offset=position[0] + position[1] // 8,
+            bit=position[1] % 8,
+            deadband=deadband,
+        )
+    unpacker = struct.Struct(tool.format)
+    if unpacker.size != tool.address_size:
+        raise ValueError(
+            f"포맷 크기 불일치: {mem.get('device_address')} format={tool.format} "
+            f"({unpacker.size}B) != address_size({tool.address_size}B)"
+        )
+    if 'int' in tool.type:
+        kind = 'int'
+    elif 'float' in tool.type:
+        kind = 'float'
+    else:
+        kind = None
+    return DecodeEntry(
+        key, mem.get('id'), attributes,
+        offset=position[0],
+        unpacker=unpacker,
+        size=unpacker.size,
+        scale=float(tool.scale),
+        kind=kind,
+        clamp=_compile_clamp(tool),
+        deadband=deadband,
+    )
+
+
+def as_buffer(memory):
+    """Redis에서 읽은 %MB 값(list[int]/bytes)을 bytes 계열 버퍼로 변환합니다."""
+    if memory is None:
+        return b''
+    if isinstance(memory, (bytes, bytearray, memoryview)):
+        return memory
+    try:
+        return bytes(memory)
+    except (ValueError, TypeError):
+        return bytes((int(v) & 0xFF) for v in memory)
+
+
+class DecodePlan:
+    """SocketClientConfig 하나에 대한 컴파일된 디코딩 계획."""
+
+    def __init__(self, client_id, host, port, entries, calc_group_ids=None, setup_group_ids=None, version=None):
+        self.client_id = client_id
+        self.host = host
+        self.port = port
+        self.entries = entries
+        self.calc_group_ids = list(calc_group_ids or [])
+        self.setup_group_ids = list(setup_group_ids or [])
+        self.version = version
+        # 발행 필터용 변수별 데드밴드 (0이 아닌 항목만)
+        self.deadbands = {entry.key: entry.deadband for entry in entries if entry.deadband}
+        self._batch, self._scalar_entries = self._compile_batch(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"DecodePlan(client_id={self.client_id}, entries={len(self.entries)}, version={self.version})"
+
+    @property
+    def redis_key(self):
+        return f'{self.host}:{self.port}'
+
+    def attribute_index(self):
+        """{속성: [client_id:var_id, ...]} 형태의 인덱스를 반환합니다."""
+        index = {}
+        for entry in self.entries:
+            for attr in entry.attributes:
+                index.setdefault(attr, []).append(entry.key)
+        return index
+
+    def _compile_batch(self, entries):
+        """NumPy를 사용할 수 있으면 배치 디코더를 만들고, 배치로 처리할 수 없는 항목만 남깁니다."""
+        if not LSIS_BatchDecoder.available() or len(entries) < BATCH_DECODE_MIN_ENTRIES:
+            return None, entries
+        batch = LSIS_BatchDecoder()
+        leftovers = []
+        for entry in entries:
+            if entry.bit is not None:
+                batch.add_bit(entry.key, entry.offset, entry.bit)
+            elif entry.kind is not None and LSIS_BatchDecoder.supports(entry.unpacker.format):
+                batch.add_value(entry.key, entry.offset, entry.unpacker.format, entry.scale, entry.clamp)
+            else:
+                leftovers.append(entry)
+        return batch.compile(), leftovers
+
+    def decode(self, memory):
+        """%MB 메모리 이미지를 디코딩하여 {client_id:var_id: 값} 딕셔너리를 반환합니다.
+
+        결과는 기존 LSIS_MappingTool.repack() + 소수점 3자리 반올림과 동일합니다.
+        """
+        buf = as_buffer(memory)
+        if self._batch is not None:
+            result = self._batch.decode(buf)
+            result.update(self.decode_scalar(buf, self._scalar_entries))
+            return result
+        return self.decode_scalar(buf, self.entries)
+
+    def decode_scalar(self, memory, entries=None):
+        """항목을 하나씩 struct.unpack_from으로 디코딩합니다 (NumPy 미설치 시 기본 경로)."""
+        buf = as_buffer(memory)
+        length = len(buf)
+        result = {}
+        for entry in (self.entries if entries is None else entries):
+            offset = entry.offset
+            if entry.bit is not None:
+                if offset >= length:
+                    logger.debug(f'decode skipped (bit out of range) {entry.key}: offset={offset}, len={length}')
+                    continue
+                result[entry.key] = bool((buf[offset] >> entry.bit) & 1)
+                continue
+            if offset >= length:
+                result[entry.key] = "유효한 주소가 아닙니다. len(repack_data) == 0 (1)"
+                continue
+            if offset + entry.size > length:
+                logger.error(f'decode failed {entry.key}: offset={offset}, size={entry.size}, len={length}')
+                continue
+            raw = entry.unpacker.unpack_from(buf, offset)[0]
+            if entry.kind == 'int':
+                value = float(raw) * entry.scale
+            elif entry.kind == 'float':
+                value = raw * entry.scale
+            else:
+                value = None
+            if entry.clamp is not None and value is not None:
+                lo, hi = entry.clamp
+                if value > hi:
+                    value = hi
+                elif value < lo:
+                    value = lo
+            if type(value).__name__ == 'float':
+                value = float("{:.3f}".format(round(value, 3)))
+            result[entry.key] = value
+        return result
+
+
+# ------------------------------
+# 📌 계획 컴파일
+# ------------------------------
+def _resolve_group_ids(client):
+    """SocketClientConfigSerializer.to_representation()과 동일한 규칙으로 그룹 ID를 구합니다."""
+    from LSISsocket.models import CalcGroup, SetupGroup
+
+    memory_group_ids = list(client.memory_groups.values_list('id', flat=True))
+    calc_group_ids = list(client.calc_groups.values_list('id', flat=True))
+    if not calc_group_ids:
+        calc_group_ids = list(CalcGroup.objects.values_list('id', flat=True))
+    setup_group_ids = list(client.setup_groups.values_list('id', flat=True))
+    if not setup_group_ids:
+        setup_group_ids = list(SetupGroup.objects.values_list('id', flat=True))
+    return memory_group_ids, calc_group_ids, setup_group_ids
+
+
+def build_decode_plan(client, version=None):
+    """SocketClientConfig 인스턴스로부터 DecodePlan을 컴파일합니다."""
+    from LSISsocket.models import MemoryGroup
+    from LSISsocket.serializers import MemoryGroupSerializer
+
+    memory_group_ids, calc_group_ids, setup_group_ids = _resolve_group_ids(client)
+    groups = (
+        MemoryGroup.objects.filter(id__in=memory_group_ids)
+        .select_related('Adapter', 'Device')
+        .prefetch_related('variables__group')
+    )
+    entries = []
+    for g in MemoryGroupSerializer(groups, many=True).data:
+        for mem in g.get('variables', []):
+            try:
+                entries.append(compile_entry(client.id, mem))
+            except Exception as e:
+                logger.error(f'Error compiling decode entry for memory variable {mem}: {e}')
+    plan = DecodePlan(client.id, client.host, client.port, entries, calc_group_ids, setup_group_ids, version)
+    logger.info(f'decode plan compiled: {plan}')
+    return plan
+
+
+def current_version():
+    """(Redis 버전, 로컬 세대) 튜플. Redis를 사용할 수 없으면 로컬 세대만 반영됩니다."""
+    remote = None
+    try:
+        remote = redis_instance.client.get(DECODE_PLAN_VERSION_KEY)
+    except Exception as e:
+        logger.debug(f'decode plan version 조회 실패: {e}')
+    return (remote, _local_generation)
+
+
+def get_decode_plan(client):
+    """캐시된 계획을 반환하고, 설정 버전이 바뀌었으면 다시 컴파일합니다."""
+    version = current_version()
+    plan = _plans.get(client.id)
+    if plan is not None and plan.version == version:
+        return plan
+    with _plans_lock:
+        plan = _plans.get(client.id)
+        if plan is not None and plan.version == version:
+            return plan
+        plan = build_decode_plan(client, version=version)
+        _plans[client.id] = plan
+        return plan
+
+
+def build_decode_plans(clients, version=None):
+    """여러 클라이언트의 계획을 한 번에 컴파일하여 캐시에 저장하고 {client_id: plan}을 반환합니다."""
+    version = current_version() if version is None else version
+    plans = {}
+    with _plans_lock:
+        for client in clients:
+            try:
+                plans[client.id] = build_decode_plan(client, version=version)
+            except Exception:
+                logger.exception(f'decode plan 컴파일 실패: {getattr(client, "id", None)}')
+        _plans.update(plans)
+    return plans
+
+
+def invalidate_decode_plans(client_id=None):
+    """캐시된 계획을 무효화합니다. client_id가 없으면 전체를 무효화합니다.
+
+    로컬 캐시를 비우고 Redis 버전 키를 증가시켜 다른 프로세스(스케줄러)도 재컴파일하도록 합니다.
+    """
+    global _local_generation
+    with _plans_lock:
+        if client_id is None:
+            _plans.clear()
+        else:
+            _plans.pop(client_id, None)
+        _local_generation += 1
+    try:
+        redis_instance.client.incr(DECODE_PLAN_VERSION_KEY)
+    except Exception as e:
+        logger.debug(f'decode plan version 증가 실패: {e}')
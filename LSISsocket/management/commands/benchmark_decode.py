@@ -0,0 +1,128 @@
+from django.core.management.base import BaseCommand
+import random
+import time
+
+from LSISsocket.decode_plan import DecodePlan, compile_entry
+from utils.protocol.LSIS.batch_decoder import LSIS_BatchDecoder
+from utils.protocol.LSIS.utilities import LSIS_MappingTool
+
+
+class Command(BaseCommand):
+    help = "Benchmark %MB decoding: per-variable LSIS_MappingTool.repack vs compiled decode plan vs NumPy batch decoder."
+
+    # (data_type, unit, 주소 기호) 조합: bit / int16 / uint16 / uint32 / float32
+    COMBOS = [
+        ('bool', 'bit', 'X'),
+        ('int', 'word', 'W'),
+        ('uint', 'word', 'W'),
+        ('udint', 'dword', 'D'),
+        ('float', 'dword', 'D'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='*', type=int, dest='sizes', default=[1000, 10000], help='Number of variables per run')
+        parser.add_argument('--repeat', type=int, dest='repeat', default=20, help='Number of decode passes per method')
+        parser.add_argument('--memory-size', type=int, dest='memory_size', default=100000, help='Size of the synthetic %%MB image in bytes')
+        parser.add_argument('--seed', type=int, dest='seed', default=1, help='Random seed')
+
+    def _variables(self, count, memory_size, rng):
+        variables = []
+        for i in range(count):
+            data_type, unit, symbol = rng.choice(self.COMBOS)
+            if unit == 'bit':
+                address = rng.randrange(0, memory_size * 8 - 16)
+            elif unit == 'word':
+                address = rng.randrange(0, memory_size // 2 - 1)
+            else:
+                address = rng.randrange(0, memory_size // 4 - 1)
+            variables.append({
+                'id': i,
+                'device': 'M',
+                'data_type': data_type,
+                'unit': unit,
+                'scale': rng.choice([1, 0.1, 0.01]),
+                'device_address': f'%M{symbol}{address}',
+                'attributes': ['감시'],
+            })
+        return variables
+
+    @staticmethod
+    def _mismatches(expected, decoded):
+        # 임의 이미지에는 NaN 비트 패턴의 float가 섞이므로 NaN끼리는 같은 값으로 비교
+        def same(a, b):
+            return a == b or (a != a and b != b)
+        return sum(1 for k, v in decoded.items() if not same(expected.get(k), v))
+
+    def _timeit(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        repeat = max(1, options['repeat'])
+        memory_size = options['memory_size']
+        image = bytes(rng.randrange(256) for _ in range(memory_size))
+        memory_list = list(image)
+
+        for size in options['sizes']:
+            variables = self._variables(size, memory_size, rng)
+
+            def repack_each_poll():
+                # 기존 경로: 폴링마다 LSIS_MappingTool 생성 + repack
+                out = {}
+                for mem in variables:
+                    value = LSIS_MappingTool(**mem).repack(memory_list)
+                    if type(value).__name__ == 'float':
+                        value = float("{:.3f}".format(round(value, 3)))
+                    out[f"1:{mem['id']}"] = value
+                return out
+
+            tools = [(f"1:{mem['id']}", LSIS_MappingTool(**mem)) for mem in variables]
+
+            def repack_prebuilt():
+                out = {}
+                for key, tool in tools:
+                    value = tool.repack(memory_list)
+                    if type(value).__name__ == 'float':
+                        value = float("{:.3f}".format(round(value, 3)))
+                    out[key] = value
+                return out
+
+            entries = [compile_entry(1, mem) for mem in variables]
+            plan = DecodePlan(1, 'bench', 0, entries)
+
+            results = [
+                ('repack (per poll tool)', self._timeit(repack_each_poll, repeat)),
+                ('repack (prebuilt tool)', self._timeit(repack_prebuilt, repeat)),
+                ('decode plan (struct)', self._timeit(lambda: plan.decode_scalar(image), repeat)),
+            ]
+            expected = repack_prebuilt()
+            mismatches = self._mismatches(expected, plan.decode_scalar(image))
+
+            if LSIS_BatchDecoder.available():
+                batch = LSIS_BatchDecoder()
+                for entry in entries:
+                    if entry.bit is not None:
+                        batch.add_bit(entry.key, entry.offset, entry.bit)
+                    else:
+                        batch.add_value(entry.key, entry.offset, entry.unpacker.format, entry.scale, entry.clamp)
+                batch.compile()
+                results.append(('numpy batch', self._timeit(lambda: batch.decode(image), repeat)))
+                mismatches += self._mismatches(expected, batch.decode(image))
+            else:
+                self.stdout.write(self.style.WARNING('numpy is not installed; skipping batch decoder'))
+
+            self.stdout.write(f'--- {size} variables (best of {repeat}) ---')
+            baseline = results[0][1]
+            for name, elapsed in results:
+                speedup = (baseline / elapsed) if elapsed else float('inf')
+                self.stdout.write(f'{name:<26} {elapsed * 1000:9.3f} ms  x{speedup:6.1f}')
+            if mismatches:
+                self.stdout.write(self.style.WARNING(f'{mismatches} decoded values differ from repack()'))
+            else:
+                self.stdout.write(self.style.SUCCESS('all decoded values match repack()'))
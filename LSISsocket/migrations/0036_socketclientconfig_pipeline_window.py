@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LSISsocket", "0035_alter_socketclientconfig_alert_groups_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="socketclientconfig",
+            name="pipeline_window",
+            field=models.PositiveSmallIntegerField(
+                default=4,
+                help_text="파이프라인 읽기 시 응답을 기다리지 않고 연속 전송할 최대 요청 수 (1이면 순차 읽기)",
+            ),
+        ),
+    ]
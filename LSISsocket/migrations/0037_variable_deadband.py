@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-16 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LSISsocket", "0036_socketclientconfig_pipeline_window"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="variable",
+            name="deadband",
+            field=models.FloatField(
+                default=0,
+                help_text="마지막 발행 값 대비 변화량이 이 값 이하이면 Redis 발행 생략 (0이면 값이 바뀔 때마다 발행)",
+            ),
+        ),
+    ]
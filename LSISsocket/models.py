@@ -1,5 +1,5 @@
 from django.db import models, transaction
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.apps import apps
 import json
@@ -192,6 +192,7 @@ class Variable(models.Model):
     offset = models.CharField(default='0', max_length=20, help_text="오프셋 값 (정수 또는 소수점 형태의 문자열)")
     attributes = models.JSONField(default=list, blank=True, help_text="['감시','제어','기록','경보'] 중 복수 선택")
     value = models.CharField(max_length=100, null=True, blank=True, help_text='최종 값 (문자열 형태)')
+    deadband = models.FloatField(default=0, help_text='마지막 발행 값 대비 변화량이 이 값 이하이면 Redis 발행 생략 (0이면 값이 바뀔 때마다 발행)')
     remark = models.TextField(null=True, blank=True, help_text='비고')
     def __str__(self):
         return f"{self.name} ({self.device}{self.address})"
@@ -248,6 +249,7 @@ class SocketClientConfig(models.Model):
     is_used = models.BooleanField(default=True, help_text="사용 여부")
     is_deleted = models.BooleanField(default=False, help_text="삭제 여부")
     zone_style = models.JSONField(null=True, blank=True, help_text="존 스타일 정보")
+    pipeline_window = models.PositiveSmallIntegerField(default=4, help_text="파이프라인 읽기 시 응답을 기다리지 않고 연속 전송할 최대 요청 수 (1이면 순차 읽기)")
     control_groups = models.ManyToManyField(ControlGroup, blank=True, related_name='lsissocket_control_groups', help_text='연결된 제어 그룹')
     calc_groups = models.ManyToManyField(CalcGroup, blank=True, related_name='lsissocket_calc_groups', help_text='연결된 계산 그룹')
     memory_groups = models.ManyToManyField(MemoryGroup, blank=True, related_name='lsissocket_memory_groups', help_text='연결된 메모리 그룹')
@@ -402,3 +404,102 @@ class SetupGroup(models.Model):
     def restore(self):
         self.is_deleted = False
         self.save()
+
+
+# ------------------------------
+# 폴링 설정 스냅샷(config_cache) / 디코딩 계획 무효화
+# ------------------------------
+def _invalidate_config_cache(client_id=None):
+    # 커밋 전에 버전을 올리면 다른 프로세스가 커밋 전 행으로 새 버전 스냅샷을 만들어 둘 수 있으므로
+    # 커밋 이후에 올림 (트랜잭션 밖이면 즉시 실행). 같은 시그널의 재조정 알림보다 먼저 등록됨
+    def _invalidate():
+        try:
+            from LSISsocket.config_cache import invalidate_config_snapshot
+            invalidate_config_snapshot(client_id)
+        except Exception:
+            pass
+
+    try:
+        transaction.on_commit(_invalidate)
+    except Exception:
+        pass
+
+
+@receiver([post_save, post_delete], sender=Variable)
+def _invalidate_config_on_variable_change(sender, instance, **kwargs):
+    _invalidate_config_cache()
+
+
+@receiver([post_save, post_delete], sender=MemoryGroup)
+def _invalidate_config_on_memorygroup_change(sender, instance, **kwargs):
+    _invalidate_config_cache()
+
+
+@receiver([post_save, post_delete], sender=SocketClientConfig)
+def _invalidate_config_on_client_change(sender, instance, **kwargs):
+    client_id = getattr(instance, 'id', None)
+    _invalidate_config_cache(client_id)
+    # 스케줄러 프로세스에서 해당 클라이언트의 폴링 잡을 재조정 (커밋 이후 발행)
+    try:
+        from LSISsocket.scheduler_jobs import notify_client_config_changed
+        transaction.on_commit(lambda: notify_client_config_changed(client_id))
+    except Exception:
+        pass
+
+
+# ------------------------------
+# 상태 bulk writer(status_writer) 캐시 정리
+# ------------------------------
+def _forget_client_status(config_id, drop_mirror=False, notify=True):
+    # 이 프로세스의 캐시된 상태 행을 버리고, 스케줄러 프로세스에도 알려 다음 flush에서 행을 다시 읽게 함
+    def _forget():
+        try:
+            from LSISsocket.scheduler_jobs import notify_client_config_changed
+            from LSISsocket.status_writer import drop_client_status, status_writer
+            status_writer.forget(config_id)
+            if drop_mirror:
+                drop_client_status(config_id)
+            if notify:
+                notify_client_config_changed(config_id)
+        except Exception:
+            pass
+
+    try:
+        transaction.on_commit(_forget)
+    except Exception:
+        pass
+
+
+@receiver(post_delete, sender=SocketClientConfig)
+def _forget_status_on_client_delete(sender, instance, **kwargs):
+    # 재조정 알림은 _invalidate_config_on_client_change가 이미 발행
+    _forget_client_status(instance.id, drop_mirror=True, notify=False)
+
+
+@receiver(post_save, sender=SocketClientStatus)
+def _forget_status_on_status_create(sender, instance, created, **kwargs):
+    if created:
+        _forget_client_status(instance.config_id)
+
+
+@receiver(post_delete, sender=SocketClientStatus)
+def _forget_status_on_status_delete(sender, instance, **kwargs):
+    _forget_client_status(instance.config_id)
+
+
+@receiver([post_save, post_delete], sender=CalcGroup)
+@receiver([post_save, post_delete], sender=CalcVariable)
+@receiver([post_save, post_delete], sender=SetupGroup)
+@receiver([post_save, post_delete], sender=AlertGroup)
+@receiver([post_save, post_delete], sender=ControlGroup)
+def _invalidate_config_on_group_change(sender, instance, **kwargs):
+    _invalidate_config_cache()
+
+
+@receiver(m2m_changed, sender=SocketClientConfig.memory_groups.through)
+@receiver(m2m_changed, sender=SocketClientConfig.calc_groups.through)
+@receiver(m2m_changed, sender=SocketClientConfig.setup_groups.through)
+@receiver(m2m_changed, sender=SetupGroup.variables.through)
+def _invalidate_config_on_relation_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate_config_cache()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""변수 값 발행(publish) 필터 모듈.
+
+reids_to_memory_mapping()은 폴링마다 디코딩한 모든 변수 값을 corecode Redis에 기록합니다.
+이 모듈은 클라이언트별로 마지막으로 발행한 값을 기억해 두고, 변화량이 변수별 데드밴드를
+넘는 값만 골라 한 번의 MSET으로 기록합니다.
+
+- 숫자 값: |새 값 - 마지막 발행 값| > deadband 일 때만 발행 (deadband 0이면 값이 바뀔 때마다)
+- 숫자가 아닌 값(bool, 오류 문자열 등): 값이 바뀔 때만 발행
+- LSIS_PUBLISH_REFRESH_SEC마다 전체 값을 강제로 다시 발행하여 Redis 초기화/외부 변경을 복구
+- 발행/생략 건수는 클라이언트별로 집계되어 Redis 해시(PUBLISH_STATS_KEY)에 주기적으로 기록됩니다.
+- 처음 발행하는 키와 강제 재발행한 키는 corecode Redis 키 인덱스(RedisManager.index_keys)에 등록되어
+  조회 측(redis_to_db, RedisKeyViewSet)이 SCAN 없이 키 목록을 얻을 수 있습니다.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+
+from py_backend.settings import LSIS_PUBLISH_REFRESH_SEC
+from corecode import redis_instance as corecode_redis_instance
+from . import logger, redis_instance
+
+# Redis(LSISsocket DB) 해시: field=client_id, value=발행 통계 JSON
+PUBLISH_STATS_KEY = 'publish_stats'
+# 통계 기록 주기(초)
+STATS_FLUSH_SEC = 10
+
+_publishers = {}
+_publishers_lock = threading.Lock()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ValuePublisher:
+    """클라이언트 하나의 마지막 발행 값 캐시와 발행 통계."""
+
+    def __init__(self, client_id, refresh_interval=LSIS_PUBLISH_REFRESH_SEC):
+        self.client_id = client_id
+        self.refresh_interval = refresh_interval
+        self._last = {}
+        self._last_refresh = None
+        self._forced_refresh = False
+        self._stats_flushed_at = 0.0
+        self.polls = 0
+        self.published = 0
+        self.suppressed = 0
+        self.forced = 0
+
+    def _changed(self, key, value, deadband):
+        if key not in self._last:
+            return True
+        last = self._last[key]
+        if deadband and _is_number(value) and _is_number(last):
+            return abs(value - last) > deadband
+        return value != last
+
+    def select(self, values, deadbands=None, now=None):
+        """발행할 값만 골라 반환하고 마지막 발행 값과 통계를 갱신합니다."""
+        now = time.monotonic() if now is None else now
+        self.polls += 1
+        if (self._last_refresh is None or self.refresh_interval <= 0
+                or now - self._last_refresh >= self.refresh_interval):
+            self._last_refresh = now
+            self._forced_refresh = True
+            self.forced += 1
+            changed = dict(values)
+        else:
+            self._forced_refresh = False
+            deadbands = deadbands or {}
+            changed = {key: value for key, value in values.items() if self._changed(key, value, deadbands.get(key, 0))}
+        self._last.update(changed)
+        self.published += len(changed)
+        self.suppressed += len(values) - len(changed)
+        return changed
+
+    def reset(self):
+        """캐시를 비워 다음 폴링에서 전체 값을 다시 발행하도록 합니다."""
+        self._last.clear()
+        self._last_refresh = None
+
+    def publish(self, values, deadbands=None):
+        """변경된 값만 corecode Redis에 기록합니다 (기존 값 조회 없이 MSET 한 번)."""
+        new_keys = [key for key in values if key not in self._last]
+        changed = self.select(values, deadbands)
+        if changed:
+            try:
+                corecode_redis_instance.bulk_set(changed)
+                # 강제 재발행 때는 인덱스도 전체 재등록 (Redis 초기화 복구)
+                indexed = changed if self._forced_refresh else new_keys
+                if indexed:
+                    corecode_redis_instance.index_keys(indexed)
+            except Exception:
+                # 기록 실패 시 캐시를 믿을 수 없으므로 다음 폴링에서 전체 재발행
+                self.reset()
+                raise
+        self.flush_stats()
+        return changed
+
+    def stats(self):
+        total = self.published + self.suppressed
+        return {
+            'client_id': self.client_id,
+            'polls': self.polls,
+            'published': self.published,
+            'suppressed': self.suppressed,
+            'forced_refreshes': self.forced,
+            'suppressed_ratio': round(self.suppressed / total, 3) if total else 0.0,
+            'refresh_interval': self.refresh_interval,
+            'updated_at': datetime.now().isoformat(),
+        }
+
+    def flush_stats(self, force=False):
+        """통계를 Redis 해시에 기록합니다 (STATS_FLUSH_SEC 간격)."""
+        now = time.monotonic()
+        if not force and now - self._stats_flushed_at < STATS_FLUSH_SEC:
+            return
+        self._stats_flushed_at = now
+        try:
+            redis_instance.hset(PUBLISH_STATS_KEY, self.client_id, self.stats())
+        except Exception as e:
+            logger.debug(f'publish stats 기록 실패 (client {self.client_id}): {e}')
+
+
+def get_publisher(client_id):
+    """client_id별 ValuePublisher를 반환합니다 (없으면 생성)."""
+    publisher = _publishers.get(client_id)
+    if publisher is None:
+        with _publishers_lock:
+            publisher = _publishers.setdefault(client_id, ValuePublisher(client_id))
+    return publisher
+
+
+def publish_values(client_id, values, deadbands=None):
+    """변경된 값만 발행하고 발행된 {key: value}를 반환합니다."""
+    return get_publisher(client_id).publish(values, deadbands)
+
+
+def get_publish_stats(client_id=None):
+    """Redis에 기록된 발행 통계를 조회합니다. client_id가 없으면 {client_id: 통계} 전체."""
+    if client_id is not None:
+        return redis_instance.hget(PUBLISH_STATS_KEY, client_id)
+    stats = redis_instance.client.hgetall(PUBLISH_STATS_KEY)
+    return {int(key): json.loads(value) for key, value in stats.items()}
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""PLC 읽기 구간 계획(read planner) 모듈.
+
+SocketClientConfig.blocks는 사람이 작성한 고정 구간이라 실제로 매핑된 변수가 몇 개뿐이어도
+설정된 메모리를 모두 읽습니다. 이 모듈은 memory_groups에 연결된 변수의 %MB 바이트 위치
+(decode plan의 offset/size)로부터 꼭 필요한 읽기 구간만 계산합니다.
+
+- 변수들이 차지하는 바이트 구간을 정렬한 뒤, 사이 간격이 gap_bytes 이하이면 하나로 합칩니다.
+- 하나의 요청이 max_bytes(연속 읽기 최대 크기)를 넘지 않도록 구간을 나눕니다.
+- 어떤 변수도 참조하지 않는 메모리는 읽지 않습니다.
+- 변수가 드문드문 흩어져 합쳐지지 않은 작은 구간(sparse_bytes 이하)이 많으면, 이를 LWORD 단위
+  개별 읽기(요청 하나에 블록 최대 16개)로 묶습니다. 요청 수가 줄어드는 경우에만 바꿉니다.
+- %MB 이외 영역의 블록(%RW, %WW 등)은 설정값 그대로 유지합니다.
+"""
+import math
+
+from utils.protocol.LSIS.constants import LSIS_XGT_constants
+from py_backend.settings import LSIS_READ_GAP_BYTES, LSIS_READ_MAX_BYTES, LSIS_READ_PLAN_MODE, LSIS_READ_SPARSE_BYTES
+from .decode_plan import get_decode_plan
+from . import logger
+
+PLANNED_MEMORY = '%MB'
+READ_FUNC_NAME = 'continuous_read_bytes'
+INDIVIDUAL_FUNC_NAME = 'individual_read_datas'
+INDIVIDUAL_DATA_TYPE = 'lword'
+INDIVIDUAL_UNIT = LSIS_XGT_constants.SingleDataSize[LSIS_XGT_constants.SingleDataType[INDIVIDUAL_DATA_TYPE][1]]
+
+# client_id -> (plan.version, (gap_bytes, max_bytes, sparse_bytes), blocks 원본, 계획된 blocks)
+_planned_blocks = {}
+
+
+class ReadRange:
+    """연속 읽기 요청 하나에 해당하는 구간."""
+
+    __slots__ = ('memory', 'address', 'count', 'variables')
+
+    def __init__(self, memory, address, count, variables=0):
+        self.memory = memory
+        self.address = address
+        self.count = count
+        self.variables = variables
+
+    @property
+    def end(self):
+        return self.address + self.count
+
+    def as_block(self):
+        """SocketClientConfig.blocks 항목과 같은 형태로 반환합니다."""
+        return {'address': str(self.address), 'count': self.count, 'func_name': READ_FUNC_NAME, 'memory': self.memory}
+
+    def __repr__(self):
+        return f"ReadRange({self.memory}{self.address}, count={self.count}, variables={self.variables})"
+
+
+class IndividualRead:
+    """개별 읽기 요청 하나: 같은 크기(unit)로 정렬된 바이트 위치 최대 16개."""
+
+    __slots__ = ('memory', 'data_type', 'unit', 'offsets', 'variables')
+
+    def __init__(self, memory, offsets, variables=0, data_type=INDIVIDUAL_DATA_TYPE):
+        self.memory = memory
+        self.data_type = data_type
+        self.unit = LSIS_XGT_constants.SingleDataSize[LSIS_XGT_constants.SingleDataType[data_type][1]]
+        self.offsets = list(offsets)
+        self.variables = variables
+
+    @property
+    def count(self):
+        return len(self.offsets) * self.unit
+
+    def as_block(self):
+        """SocketClientConfig.blocks 항목 형태 (offsets: 블록별 바이트 위치)."""
+        return {
+            'address': str(self.offsets[0]),
+            'count': self.count,
+            'func_name': INDIVIDUAL_FUNC_NAME,
+            'memory': self.memory,
+            'data_type': self.data_type,
+            'offsets': list(self.offsets),
+        }
+
+    def __repr__(self):
+        return f"IndividualRead({self.memory}, {self.data_type}, offsets={self.offsets}, variables={self.variables})"
+
+
+def _limits(gap_bytes=None, max_bytes=None):
+    gap_bytes = LSIS_READ_GAP_BYTES if gap_bytes is None else int(gap_bytes)
+    max_bytes = LSIS_READ_MAX_BYTES if max_bytes is None else int(max_bytes)
+    max_bytes = min(max(1, max_bytes), LSIS_XGT_constants.ContinuousReadMaxBytes)
+    return max(0, gap_bytes), max_bytes
+
+
+def plan_read_ranges(entries, gap_bytes=None, max_bytes=None):
+    """DecodeEntry 목록으로부터 최소 %MB 읽기 구간 목록을 계산합니다.
+
+    :param entries: DecodePlan.entries
+    :param gap_bytes: 이 값 이하의 빈 구간은 합쳐서 읽음 (기본값: LSIS_READ_GAP_BYTES)
+    :param max_bytes: 요청 하나의 최대 바이트 수 (기본값: LSIS_READ_MAX_BYTES)
+    :returns: 주소 순으로 정렬된 ReadRange 목록
+    """
+    gap_bytes, max_bytes = _limits(gap_bytes, max_bytes)
+    spans = sorted((entry.offset, entry.offset + max(entry.size, 1)) for entry in entries)
+    ranges = []
+    for start, end in spans:
+        current = ranges[-1] if ranges else None
+        if current is not None and start - current.end <= gap_bytes and max(end, current.end) - current.address <= max_bytes:
+            current.count = max(end, current.end) - current.address
+            current.variables += 1
+            continue
+        if current is not None and start < current.end:
+            # 구간 크기 제한으로 새 요청을 시작하는 경우 이미 읽는 바이트는 제외
+            start = current.end
+        while end - start > max_bytes:
+            ranges.append(ReadRange(PLANNED_MEMORY, start, max_bytes, 0))
+            start += max_bytes
+        if end > start:
+            ranges.append(ReadRange(PLANNED_MEMORY, start, end - start, 1))
+        elif current is not None:
+            current.variables += 1
+    return ranges
+
+
+def plan_individual_reads(ranges, sparse_bytes=None):
+    """작은 구간들을 개별 읽기 요청으로 묶을지 결정합니다.
+
+    sparse_bytes 이하인 %MB 구간을 INDIVIDUAL_UNIT 단위로 정렬한 위치들로 바꿔 요청당
+    IndividualReadMaxBlocks개씩 묶고, 그 결과 요청 수가 줄어들 때만 적용합니다.
+
+    :returns: (연속 읽기로 남는 ReadRange 목록, IndividualRead 목록)
+    """
+    sparse_bytes = LSIS_READ_SPARSE_BYTES if sparse_bytes is None else int(sparse_bytes)
+    if sparse_bytes <= 0:
+        return list(ranges), []
+    small = [r for r in ranges if r.memory == PLANNED_MEMORY and r.count <= sparse_bytes]
+    units = {}
+    for r in small:
+        for unit in range(r.address // INDIVIDUAL_UNIT, (r.end - 1) // INDIVIDUAL_UNIT + 1):
+            units.setdefault(unit, 0)
+        units[r.address // INDIVIDUAL_UNIT] += r.variables
+    unit_ids = sorted(units)
+    per_request = LSIS_XGT_constants.IndividualReadMaxBlocks
+    if math.ceil(len(unit_ids) / per_request) >= len(small):
+        return list(ranges), []
+    batches = []
+    for i in range(0, len(unit_ids), per_request):
+        chunk = unit_ids[i:i + per_request]
+        batches.append(IndividualRead(
+            PLANNED_MEMORY, [unit * INDIVIDUAL_UNIT for unit in chunk], sum(units[unit] for unit in chunk),
+        ))
+    small_ids = {id(r) for r in small}
+    return [r for r in ranges if id(r) not in small_ids], batches
+
+
+def _is_planned_block(block):
+    return block.get('memory') == PLANNED_MEMORY and block.get('func_name') == READ_FUNC_NAME
+
+
+def _block_span(block):
+    try:
+        return int(block.get('address', 0)), int(block.get('count', 0))
+    except (TypeError, ValueError):
+        return 0, 0
+
+
+def _request_count(blocks, max_bytes):
+    return sum(
+        1 if block.get('func_name') == INDIVIDUAL_FUNC_NAME else math.ceil(_block_span(block)[1] / max_bytes)
+        for block in blocks if _block_span(block)[1] > 0
+    )
+
+
+def _byte_count(blocks):
+    return sum(max(0, _block_span(block)[1]) for block in blocks)
+
+
+def planned_blocks(client, plan=None, gap_bytes=None, max_bytes=None, sparse_bytes=None):
+    """설정된 blocks 중 %MB 연속 읽기를 계획된 구간(연속 읽기 + 개별 읽기)으로 바꾼 blocks 목록을 반환합니다.
+
+    변수가 하나도 없으면 설정된 blocks를 그대로 반환합니다.
+    """
+    configured = list(client.blocks or [])
+    plan = plan or get_decode_plan(client)
+    gap_bytes, max_bytes = _limits(gap_bytes, max_bytes)
+    sparse_bytes = LSIS_READ_SPARSE_BYTES if sparse_bytes is None else int(sparse_bytes)
+    limits = (gap_bytes, max_bytes, sparse_bytes)
+    cached = _planned_blocks.get(client.id)
+    if cached is not None and cached[:3] == (plan.version, limits, configured):
+        return cached[3]
+    if not plan.entries:
+        logger.debug(f'read plan: client {client.id}에 매핑된 변수가 없어 설정된 blocks를 사용합니다')
+        blocks = configured
+    else:
+        ranges, batches = plan_individual_reads(plan_read_ranges(plan.entries, gap_bytes, max_bytes), sparse_bytes)
+        blocks = [block for block in configured if not _is_planned_block(block)]
+        blocks.extend(r.as_block() for r in ranges)
+        blocks.extend(batch.as_block() for batch in batches)
+    _planned_blocks[client.id] = (plan.version, limits, configured, blocks)
+    return blocks
+
+
+def resolve_read_blocks(client, plan=None):
+    """폴러가 읽을 blocks: LSIS_READ_PLAN_MODE가 'planned'이면 계획된 구간, 아니면 설정값.
+
+    plan을 넘기면(폴링 잡이 잡은 스냅샷의 계획) 버전을 다시 확인하지 않고 그 계획으로 계산합니다.
+    """
+    if LSIS_READ_PLAN_MODE != 'planned':
+        return client.blocks or []
+    try:
+        return planned_blocks(client, plan=plan)
+    except Exception as e:
+        logger.error(f'read plan 계산 실패 (client {client.id}), 설정된 blocks 사용: {e}')
+        return client.blocks or []
+
+
+def describe_read_plan(client, gap_bytes=None, max_bytes=None, sparse_bytes=None):
+    """설정된 blocks와 계획된 읽기 요청을 비교한 요약을 반환합니다 (API 응답용)."""
+    plan = get_decode_plan(client)
+    gap_bytes, max_bytes = _limits(gap_bytes, max_bytes)
+    sparse_bytes = LSIS_READ_SPARSE_BYTES if sparse_bytes is None else int(sparse_bytes)
+    configured = list(client.blocks or [])
+    ranges, batches = plan_individual_reads(plan_read_ranges(plan.entries, gap_bytes, max_bytes), sparse_bytes)
+    kept = [block for block in configured if not _is_planned_block(block)]
+    configured_mb = [block for block in configured if _is_planned_block(block)]
+
+    # 설정된 %MB 블록 밖에 있는 변수 (현재 설정으로는 읽히지 않는 변수)
+    spans = [_block_span(block) for block in configured_mb]
+    uncovered = [
+        entry.key for entry in plan.entries
+        if not any(start <= entry.offset and entry.offset + max(entry.size, 1) <= start + count for start, count in spans)
+    ]
+
+    configured_bytes = _byte_count(configured)
+    planned_bytes = _byte_count(kept) + sum(r.count for r in ranges) + sum(batch.count for batch in batches)
+    configured_requests = _request_count(configured, max_bytes)
+    planned_requests = _request_count(kept, max_bytes) + len(ranges) + len(batches)
+    return {
+        'client_id': client.id,
+        'mode': LSIS_READ_PLAN_MODE,
+        'gap_bytes': gap_bytes,
+        'max_bytes': max_bytes,
+        'sparse_bytes': sparse_bytes,
+        'variables': len(plan.entries),
+        'configured': {
+            'requests': configured_requests,
+            'bytes': configured_bytes,
+            'blocks': configured,
+        },
+        'planned': {
+            'requests': planned_requests,
+            'bytes': planned_bytes,
+            'blocks': kept + [dict(r.as_block(), variables=r.variables) for r in ranges + batches],
+        },
+        'bytes_saved': configured_bytes - planned_bytes,
+        'requests_saved': configured_requests - planned_requests,
+        'uncovered_variables': uncovered,
+    }
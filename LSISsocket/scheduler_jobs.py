@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""PLC 폴링 잡 재조정(reconcile) 및 잡 실행 통계.
+
+main.py의 lifespan은 시작 시 SocketClientConfig마다 폴링 잡을 한 번만 등록했기 때문에
+PLC 추가/사용 중지/주기 변경이 uvicorn 재시작 전까지 반영되지 않았습니다.
+PollJobReconciler는 설정 스냅샷(config_cache)의 클라이언트 목록과 실행 중인 스케줄러의
+잡을 비교해 해당 클라이언트의 잡만 추가/삭제/재스케줄합니다.
+
+- Django 프로세스: SocketClientConfig 저장/삭제 시그널이 커밋 후 notify_client_config_changed()로
+  Redis 채널(CLIENT_CONFIG_CHANNEL)에 client_id를 발행합니다. SocketClientStatus 행 생성/삭제도
+  같은 채널로 알려 스케줄러 프로세스의 status_writer가 캐시된 행을 버리게 합니다(on_client_changed).
+- 스케줄러 프로세스: 리스너 스레드가 채널을 구독해 즉시 재조정하고, pub/sub 메시지를 놓친 경우를
+  대비해 LSIS_JOB_RECONCILE_SEC마다 전체 재조정 잡이 한 번 더 확인합니다
+  (설정 버전이 그대로면 DB 조회 없음).
+- 잡 이벤트 리스너가 잡별 마지막 실행 시각/소요 시간/결과를 기록하며 job_table()로 조회합니다.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_REMOVED,
+    EVENT_JOB_SUBMITTED,
+)
+
+from . import logger, redis_instance
+from .config_cache import get_config_snapshot
+
+# Redis(LSISsocket DB) pub/sub 채널
+CLIENT_CONFIG_CHANNEL = 'socket_client_config_changed'
+POLL_JOB_PREFIX = 'lsis_poll_'
+RECONCILE_JOB_ID = 'lsis_job_reconcile'
+
+
+def poll_job_id(client_id):
+    return f'{POLL_JOB_PREFIX}{client_id}'
+
+
+def client_id_from_job_id(job_id):
+    if not job_id.startswith(POLL_JOB_PREFIX):
+        return None
+    try:
+        return int(job_id[len(POLL_JOB_PREFIX):])
+    except ValueError:
+        return None
+
+
+def client_trigger(client):
+    """SocketClientConfig.cron({'<trigger>': {...}}) → (trigger 이름, trigger 인자). 없으면 None."""
+    cron = client.cron or {}
+    if not isinstance(cron, dict) or not cron:
+        return None
+    trigger, kwargs = next(iter(cron.items()))
+    return trigger, dict(kwargs or {})
+
+
+def notify_client_config_changed(client_id=None):
+    """스케줄러 프로세스에 클라이언트 설정 변경을 알립니다 (client_id가 없으면 전체 재조정)."""
+    try:
+        redis_instance.client.publish(CLIENT_CONFIG_CHANNEL, json.dumps({'client_id': client_id}))
+    except Exception as e:
+        logger.debug(f'client config 변경 알림 실패: {e}')
+
+
+class PollJobReconciler:
+    """
+    실행 중인 스케줄러의 PLC 폴링 잡을 설정과 일치시킵니다.
+
+    📌 사용 예시:
+    reconciler = PollJobReconciler(scheduler, poll_job, executor='asyncio', wrap=log_job_runtime(logger),
+                                   on_endpoint_released=release_connection)
+    reconciler.attach()
+    reconciler.reconcile()          # 전체
+    reconciler.reconcile([3])       # client_id 3만
+    reconciler.start_listener()
+    reconciler.job_table()
+    """
+
+    def __init__(self, scheduler, poll_job, executor='default', wrap=None, job_defaults=None, on_endpoint_released=None,
+                 on_client_changed=None):
+        self.scheduler = scheduler
+        self.executor = executor
+        try:
+            self.poll_job = wrap(poll_job) if wrap else poll_job
+        except Exception:
+            self.poll_job = poll_job
+        self.job_defaults = job_defaults or {'max_instances': 1, 'misfire_grace_time': 15, 'coalesce': False}
+        # job_id -> 등록에 사용한 (trigger, trigger 인자) (변경 감지용)
+        self._triggers = {}
+        # job_id -> 폴링 대상 (host, port). 잡 삭제/주소 변경으로 더 이상 쓰지 않는 대상은
+        # on_endpoint_released((host, port))로 알려 지속 연결을 닫게 함
+        self._endpoints = {}
+        self.on_endpoint_released = on_endpoint_released
+        # 변경 알림을 받을 때마다 on_client_changed(client_id 또는 None) 호출 (상태 행 캐시 정리 등)
+        self.on_client_changed = on_client_changed
+        # job_id -> 실행 통계
+        self.stats = {}
+        self._started = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener = None
+
+    # ------------------------------------------------------------------ #
+    # 재조정
+    # ------------------------------------------------------------------ #
+    def reconcile(self, client_ids=None):
+        """client_ids(없으면 전체)의 잡을 추가/삭제/재스케줄하고 변경 내역을 반환합니다."""
+        snapshot = get_config_snapshot()
+        result = {'added': [], 'removed': [], 'rescheduled': [], 'version': str(snapshot.version)}
+        with self._lock:
+            if client_ids is None:
+                running = {client_id_from_job_id(job.id) for job in self.scheduler.get_jobs()}
+                client_ids = (running - {None}) | set(snapshot.clients)
+            for client_id in sorted(client_ids):
+                try:
+                    change = self._reconcile_client(client_id, snapshot.clients.get(client_id))
+                except Exception:
+                    logger.exception(f'폴링 잡 재조정 실패: client {client_id}')
+                    continue
+                if change:
+                    result[change].append(client_id)
+        if result['added'] or result['removed'] or result['rescheduled']:
+            logger.info(f'폴링 잡 재조정: {result}')
+        return result
+
+    def _reconcile_client(self, client_id, client):
+        job_id = poll_job_id(client_id)
+        job = self.scheduler.get_job(job_id)
+        trigger = client_trigger(client) if client is not None else None
+        if client is not None and trigger is None:
+            logger.warning(f'client {client_id}: cron 설정이 없어 폴링 잡을 등록하지 않습니다')
+
+        if trigger is None:
+            if job is None:
+                return None
+            self.scheduler.remove_job(job_id)
+            self._triggers.pop(job_id, None)
+            self._release(self._endpoints.pop(job_id, None))
+            return 'removed'
+
+        endpoint = (client.host, int(client.port))
+
+        if job is None:
+            self.scheduler.add_job(
+                self.poll_job,
+                trigger[0],
+                **trigger[1],
+                id=job_id,
+                name=f'{client.name} ({client.host}:{client.port})',
+                replace_existing=True,
+                executor=self.executor,
+                args=(client,),
+                **self.job_defaults,
+            )
+            self._triggers[job_id] = trigger
+            self._endpoints[job_id] = endpoint
+            return 'added'
+
+        # 인자는 항상 최신 설정 객체로 교체 (blocks 등은 폴링 시 스냅샷에서도 다시 읽음)
+        job.modify(args=(client,), name=f'{client.name} ({client.host}:{client.port})')
+        previous = self._endpoints.get(job_id)
+        self._endpoints[job_id] = endpoint
+        if previous != endpoint:
+            self._release(previous)
+        if self._triggers.get(job_id) != trigger:
+            self.scheduler.reschedule_job(job_id, trigger=trigger[0], **trigger[1])
+            self._triggers[job_id] = trigger
+            return 'rescheduled'
+        return None
+
+    def _release(self, endpoint):
+        """다른 잡이 같은 (host, port)를 쓰지 않으면 on_endpoint_released를 호출합니다."""
+        if endpoint is None or self.on_endpoint_released is None or endpoint in self._endpoints.values():
+            return
+        try:
+            self.on_endpoint_released(endpoint)
+        except Exception:
+            logger.exception(f'폴링 대상 연결 정리 실패: {endpoint}')
+
+    # ------------------------------------------------------------------ #
+    # 변경 알림 구독
+    # ------------------------------------------------------------------ #
+    def start_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name='lsis-job-reconciler', daemon=True)
+        self._listener.start()
+
+    def stop_listener(self, timeout=2.0):
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout)
+            self._listener = None
+
+    def _listen(self):
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = redis_instance.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CLIENT_CONFIG_CHANNEL)
+                logger.info(f'폴링 잡 재조정: {CLIENT_CONFIG_CHANNEL} 구독 시작')
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        self._on_message(message.get('data'))
+            except Exception as e:
+                logger.error(f'폴링 잡 재조정: 구독 오류, 5초 후 재시도: {e}')
+                self._stop.wait(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _on_message(self, data):
+        try:
+            client_id = json.loads(data).get('client_id')
+        except Exception:
+            client_id = None
+        client_id = None if client_id is None else int(client_id)
+        if self.on_client_changed is not None:
+            try:
+                self.on_client_changed(client_id)
+            except Exception:
+                logger.exception(f'client 변경 후처리 실패: {client_id}')
+        self.reconcile(None if client_id is None else [client_id])
+
+    # ------------------------------------------------------------------ #
+    # 잡 실행 통계
+    # ------------------------------------------------------------------ #
+    def attach(self):
+        """스케줄러 이벤트 리스너를 등록합니다 (모든 잡의 실행 통계 기록)."""
+        self.scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_REMOVED,
+        )
+
+    def _on_job_event(self, event):
+        job_id = event.job_id
+        if event.code == EVENT_JOB_REMOVED:
+            self.stats.pop(job_id, None)
+            self._started.pop(job_id, None)
+            return
+        stats = self.stats.setdefault(job_id, {
+            'runs': 0, 'errors': 0, 'missed': 0, 'skipped': 0,
+            'last_started_at': None, 'last_duration_sec': None, 'last_status': None, 'last_error': None,
+        })
+        if event.code == EVENT_JOB_SUBMITTED:
+            self._started[job_id] = time.monotonic()
+            stats['last_started_at'] = datetime.now().isoformat()
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            started = self._started.pop(job_id, None)
+            if started is not None:
+                stats['last_duration_sec'] = round(time.monotonic() - started, 3)
+            stats['runs'] += 1
+            if event.code == EVENT_JOB_ERROR:
+                stats['errors'] += 1
+                stats['last_status'] = 'error'
+                stats['last_error'] = repr(event.exception)
+            else:
+                stats['last_status'] = 'ok'
+        elif event.code == EVENT_JOB_MISSED:
+            stats['missed'] += 1
+            stats['last_status'] = 'missed'
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            stats['skipped'] += 1
+            stats['last_status'] = 'skipped'
+
+    def job_table(self):
+        """스케줄러의 모든 잡과 다음 실행 시각, 마지막 실행 통계를 반환합니다."""
+        rows = []
+        for job in self.scheduler.get_jobs():
+            next_run = getattr(job, 'next_run_time', None)
+            rows.append({
+                'id': job.id,
+                'name': job.name,
+                'client_id': client_id_from_job_id(job.id),
+                'trigger': str(job.trigger),
+                'executor': job.executor,
+                'next_run_time': next_run.isoformat() if next_run else None,
+                **self.stats.get(job.id, {}),
+            })
+        return sorted(rows, key=lambda row: row['id'])
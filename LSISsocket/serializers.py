@@ -232,7 +232,7 @@ class VariableSerializer(serializers.ModelSerializer):
     class Meta:
         model = Variable
         fields = [
-            'id', 'group', 'name', 'device', 'address', 'use_group_base_address', 'data_type', 'unit', 'scale', 'offset', 'device_address', 'attributes', 'remark', 'value'
+            'id', 'group', 'name', 'device', 'address', 'use_group_base_address', 'data_type', 'unit', 'scale', 'offset', 'device_address', 'attributes', 'remark', 'value', 'deadband'
         ]
         
     def get_device_address(self, obj):
@@ -315,6 +315,7 @@ class MemoryGroupSerializer(serializers.ModelSerializer):
                     scale=var_data.get('scale', 1),
                     offset=var_data.get('offset', '0'),
                     attributes=var_data.get('attributes', []),
+                    deadband=var_data.get('deadband', 0),
                     remark=var_data.get('remark')
                 )
             return group
@@ -342,6 +343,7 @@ class MemoryGroupSerializer(serializers.ModelSerializer):
                     scale=var_data.get('scale', 1),
                     offset=var_data.get('offset', '0'),
                     attributes=var_data.get('attributes', []),
+                    deadband=var_data.get('deadband', 0),
                     remark=var_data.get('remark')
                 )
         return instance
@@ -1,49 +1,120 @@
 # -*- coding: utf-8 -*-
+import asyncio
 from datetime import datetime
 import time
-from LSISsocket.serializers import CalcGroupSerializer, MemoryGroupSerializer, SetupGroupSerializer, SocketClientConfigSerializer
 from main import django
-from utils.calculation import all_dict as calculation_methods
 from utils.logger import log_exceptions, log_execution_time
 import logging
 from utils.protocol.LSIS.client.tcp import LSIS_TcpClient
+from utils.protocol.LSIS.client.async_tcp import LSIS_AsyncTcpClient
 from utils.protocol.LSIS.utilities import LSIS_MappingTool
+from utils.protocol.LSIS.individual_read_byte import byte_variable
+from LSISsocket.config_cache import get_config_snapshot, refresh_config_snapshot
+from LSISsocket.decode_plan import get_decode_plan
+from LSISsocket.read_planner import INDIVIDUAL_DATA_TYPE, INDIVIDUAL_FUNC_NAME, resolve_read_blocks
+from LSISsocket.publisher import publish_values
 
-from LSISsocket.models import AlertGroup, CalcGroup, ControlGroup, MemoryGroup, SetupGroup, SocketClientConfig, SocketClientStatus, Variable
-from django.utils import timezone
+from LSISsocket.status_writer import status_writer
+from py_backend.settings import LSIS_MEMORY_IMAGE_MODE, LSIS_READ_MAX_BYTES, LSIS_READ_PLAN_MODE
 from pathlib import Path
 from . import logger, redis_instance
 from corecode import redis_instance as corecode_redis_instance
 
 sockets = []
-memory_group_cache = {}
-calc_group_cache = {}
-alert_group_cache = {}
-control_group_cache = {}
-setup_group_cache = {}
-client_cache = {}
+# 비동기 폴링용 (host, port) -> LSIS_AsyncTcpClient 지속 연결
+async_clients = {}
+_initialized_images = set()
+# 'host:port' -> {area: bytearray} 프로세스 로컬 메모리 이미지. 응답 청크를 주소 위치에 바로 복사하고
+# 블록 단위로 한 번에 Redis에 기록합니다.
+_local_images = {}
+# 청크 하나의 최대 바이트 수 (청크 사이 간격은 클라이언트의 inter_frame_gap이 조절)
+CHUNK_SIZE = LSIS_READ_MAX_BYTES
+
+
+def _image_buffer(client, area, size):
+    """area의 로컬 메모리 이미지(bytearray)를 최소 size 바이트로 확보해 반환합니다.
+
+    이미지에서 잘라낸 memoryview가 아직 남아 있을 수 있으므로 크기를 늘릴 때는 새로 할당합니다.
+    """
+    images = _local_images.setdefault(f'{client.host}:{client.port}', {})
+    image = images.get(area)
+    if image is None or len(image) < size:
+        grown = bytearray(size)
+        if image:
+            grown[:len(image)] = image
+        images[area] = image = grown
+    return image
+
+
+def _individual_block_variables(block):
+    """개별 읽기 블록 → (데이터 타입, 블록별 바이트 위치, 변수 이름 목록)."""
+    memory = block.get('memory', '')
+    data_type = block.get('data_type') or INDIVIDUAL_DATA_TYPE
+    offsets = [int(offset) for offset in block.get('offsets') or []]
+    return data_type, offsets, [byte_variable(memory, offset, data_type) for offset in offsets]
+
+
+def _copy_individual_blocks(client, area, offsets, values):
+    """개별 읽기 응답 블록을 로컬 이미지의 위치에 복사하고, 이어지는 위치끼리 묶은 [(시작, 끝), ...]을 반환합니다."""
+    pairs = [(offset, data) for offset, data in zip(offsets, values or [])]
+    if not pairs:
+        return None, []
+    image = _image_buffer(client, area, max(offset + len(data) for offset, data in pairs))
+    runs = []
+    for offset, data in pairs:
+        image[offset:offset + len(data)] = data
+        if runs and runs[-1][1] == offset:
+            runs[-1][1] = offset + len(data)
+        else:
+            runs.append([offset, offset + len(data)])
+    return image, runs
+
+
+def _init_memory_images(client, sizes):
+    """클라이언트 해시(메타 정보)와 메모리 영역 이미지를 초기화합니다."""
+    name = f'{client.host}:{client.port}'
+    for area, size in sizes.items():
+        _image_buffer(client, area, size)
+    if LSIS_MEMORY_IMAGE_MODE == 'binary':
+        if not redis_instance.exists(name):
+            redis_instance.hmset(name, mapping={'host': client.host, 'port': client.port, 'created_at': datetime.now().isoformat(), 'updated_at': datetime.now().isoformat()})
+        for area, size in sizes.items():
+            redis_instance.init_memory_image(name, area, size)
+    else:
+        if not redis_instance.exists(name):
+            redis_instance.hmset(name, mapping={'host': client.host, 'port': client.port, 'created_at': datetime.now().isoformat(), 'updated_at': datetime.now().isoformat()})
+        # 해시가 이미 있어도(binary 모드에서 되돌린 경우 등) 빠진 영역 필드는 채움
+        for area, size in sizes.items():
+            redis_instance.hsetnx(name, area, [0] * size)
+
+
+def _write_memory(client, area, start_addr, values):
+    """읽어온 구간만 메모리 이미지에 반영합니다."""
+    name = f'{client.host}:{client.port}'
+    if LSIS_MEMORY_IMAGE_MODE == 'binary':
+        redis_instance.write_memory_image(name, area, start_addr, values)
+        return
+    get_memory = redis_instance.hget(name, area)
+    if (get_memory is not None):
+        get_memory[start_addr:(start_addr + len(values))] = values
+        redis_instance.hset(name, area, get_memory)
+
+
+def _read_memory(name, area):
+    """메모리 이미지 조회 (binary 모드는 bytes, json 모드는 list[int])."""
+    if LSIS_MEMORY_IMAGE_MODE == 'binary':
+        return redis_instance.read_memory_image(name, area)
+    return redis_instance.hget(name=name, key=area)
 
 def initialize_global_caches():
-    global memory_group_cache, calc_group_cache, alert_group_cache, control_group_cache, setup_group_cache, client_cache
-    """동기 함수: 전역 캐시를 초기화합니다."""
-    client_cache = SocketClientConfig.objects.filter(is_used=True).all()
-    memory_group_cache = MemoryGroup.objects.all()
-    calc_group_cache = CalcGroup.objects.all()
-    alert_group_cache = AlertGroup.objects.all()
-    control_group_cache = ControlGroup.objects.all()
-    setup_group_cache = SetupGroup.objects.filter(is_active=True).all()
+    """동기 함수: 설정 스냅샷(config_cache)을 만들고 변수 속성 인덱스를 Redis에 로드합니다."""
+    snapshot = refresh_config_snapshot()
 
+    # 변수 속성 인덱스는 스냅샷의 디코딩 계획에서 만든다
     memory_bulk_attr = {}
-    for client in client_cache:
-        memory_groups = SocketClientConfigSerializer(client).data.get('memory_groups', [])
-        # memory_group_cache는 리스트이므로 list comprehension으로 필터
-        matched = [g for g in memory_group_cache if getattr(g, 'id', None) in memory_groups]
-        memory_group_cacheed = MemoryGroupSerializer(matched, many=True).data
-        for g in memory_group_cacheed:
-            for mem in g.get('variables', []):
-                key = f"{client.id}:{mem.get('id', None)}"
-                for attr in mem.get('attributes', []):
-                    memory_bulk_attr.setdefault(attr, []).append(key)
+    for plan in snapshot.plans.values():
+        for attr, keys in plan.attribute_index().items():
+            memory_bulk_attr.setdefault(attr, []).extend(keys)
 
     try:
         redis_instance.bulk_update(memory_bulk_attr)
@@ -51,11 +122,14 @@ def initialize_global_caches():
     except Exception:
         logger.exception('캐시를 Redis로 로드하는 동안 실패')
 
-    return client_cache, memory_group_cache, calc_group_cache, alert_group_cache, control_group_cache, setup_group_cache
+    return snapshot
 
 @log_exceptions(logger)
 def tcp_client_to_redis(client):
-    global sockets, memory_group_cache, calc_group_cache, alert_group_cache, control_group_cache, setup_group_cache
+    global sockets
+    # 폴링 한 번은 하나의 설정 스냅샷만 사용 (읽기 구간과 디코딩 계획이 같은 버전)
+    snapshot = get_config_snapshot()
+    client = snapshot.client(client)
     connect_sock = None
     try:
         try:
@@ -80,13 +154,11 @@ def tcp_client_to_redis(client):
             is_connected = connect_sock.connect(retry_forever=False)
             if is_connected:
                 sockets.append(connect_sock)
-                if (not redis_instance.exists(f'{client.host}:{client.port}')):
-                    redis_instance.hmset(f'{client.host}:{client.port}', mapping={'host': client.host, 'port': client.port, 'created_at': datetime.now().isoformat(), 'updated_at': datetime.now().isoformat(), '%MB': ([0] * 20000), '%RW': ([0] * 1000), '%WW': ([0] * 1000)})
-        from types import SimpleNamespace
+                _init_memory_images(client, {'%MB': 20000, '%RW': 1000, '%WW': 1000})
         for sock in sockets:
             if ((sock.params.host == client.host) and (sock.params.port == client.port)):
                 try:
-                    for block in client.blocks:
+                    for block in resolve_read_blocks(client, snapshot.plan(client.id)):
                         try:
                             total_count = int(block.get('count', 0))
                         except Exception:
@@ -101,42 +173,70 @@ def tcp_client_to_redis(client):
                         if (func is None):
                             logger.warning(f"LSISsocket: socket has no read function '{func_name}', skipping block")
                             continue
-                        read_count = 0
-                        response_vals = []
-                        while (read_count < total_count):
-                            current_count = min(700, (total_count - read_count))
-                            addr = (start_addr + read_count)
-                            args = [f'{memory}{addr}', current_count]
+                        if (func_name == INDIVIDUAL_FUNC_NAME):
+                            # 개별 읽기: 흩어진 변수 위치를 한 요청으로 읽고 블록별로 이미지에 복사
+                            data_type, offsets, variables = _individual_block_variables(block)
                             try:
-                                partial_response = func(*args)
+                                partial_response = func(data_type, variables)
                             except Exception as e:
-                                had_error = True
-                                error_msg = str(e)
-                                logger.exception(f'Error reading block {args} at offset {addr}, count {current_count}')
-                                break
+                                logger.exception(f'Error reading individual block {variables}')
+                                continue
+                            image, runs = _copy_individual_blocks(client, memory, offsets, getattr(partial_response, 'values', None))
+                            for start, end in runs:
+                                _write_memory(client, memory, start, memoryview(image)[start:end])
+                            continue
+                        read_count = 0
+                        # 응답 payload를 로컬 이미지의 주소 위치에 바로 복사 (int 리스트를 만들지 않음)
+                        image = _image_buffer(client, memory, start_addr + total_count)
+                        filled = start_addr
+                        if (func_name == 'continuous_read_bytes'):
+                            # 파이프라인 읽기: 청크마다 Invoke ID를 달리해 pipeline_window개까지 연속 전송
+                            ranges = []
+                            while (read_count < total_count):
+                                current_count = min(CHUNK_SIZE, (total_count - read_count))
+                                ranges.append((f'{memory}{start_addr + read_count}', current_count))
+                                read_count += current_count
                             try:
-                                vals = getattr(partial_response, 'values', None)
-                                if (vals is None):
-                                    logger.warning(f'partial_response({args} at offset, count {current_count}) has no attribute values or it is None; skipping this chunk ')
-                                else:
-                                    if (not isinstance(vals, (list, tuple))):
-                                        try:
-                                            vals = list(vals)
-                                        except Exception:
-                                            vals = [vals]
-                                    response_vals.extend(vals)
+                                responses = sock.continuous_read_ranges(ranges, window=getattr(client, 'pipeline_window', None))
                             except Exception as e:
-                                logger.exception(f'Error processing partial response values: {e}')
-                                had_error = True
-                                error_msg = str(e)
-                                break
-                            read_count += current_count
-                            time.sleep(0.025)
-                        response = SimpleNamespace(values=response_vals)
-                        get_memory = redis_instance.hget(f'{client.host}:{client.port}', memory)
-                        if (get_memory is not None):
-                            get_memory[start_addr:(start_addr + len(response.values))] = response.values
-                            redis_instance.hset(f'{client.host}:{client.port}', memory, get_memory)
+                                logger.exception(f'Error reading block {memory}{start_addr}, count {total_count}')
+                                responses = []
+                            for args, partial_response in zip(ranges, responses):
+                                payload = getattr(partial_response, 'payload', None)
+                                if (payload is None):
+                                    logger.warning(f'partial_response({args}) has no values ({partial_response}); stopping at this chunk')
+                                    break
+                                image[filled:filled + len(payload)] = payload
+                                filled += len(payload)
+                        else:
+                            while (read_count < total_count):
+                                current_count = min(CHUNK_SIZE, (total_count - read_count))
+                                addr = (start_addr + read_count)
+                                args = [f'{memory}{addr}', current_count]
+                                try:
+                                    partial_response = func(*args)
+                                except Exception as e:
+                                    had_error = True
+                                    error_msg = str(e)
+                                    logger.exception(f'Error reading block {args} at offset {addr}, count {current_count}')
+                                    break
+                                try:
+                                    # 동기 읽기의 values는 프레이머 수신 버퍼의 memoryview이므로 다음 요청 전에 복사
+                                    vals = getattr(partial_response, 'values', None)
+                                    if (vals is None):
+                                        logger.warning(f'partial_response({args} at offset, count {current_count}) has no attribute values or it is None; skipping this chunk ')
+                                    else:
+                                        image[addr:addr + len(vals)] = vals
+                                        filled = addr + len(vals)
+                                except Exception as e:
+                                    logger.exception(f'Error processing partial response values: {e}')
+                                    had_error = True
+                                    error_msg = str(e)
+                                    break
+                                read_count += current_count
+                                sock.inter_frame_gap.sleep()
+                        if (filled > start_addr):
+                            _write_memory(client, memory, start_addr, memoryview(image)[start_addr:filled])
                 except Exception as e:
                     logger.error(f'Error during initial read for context store persistence: {e}')
             else:
@@ -149,139 +249,211 @@ def tcp_client_to_redis(client):
                     logger.exception('Error connecting to socket')
                 logger.debug(getattr(connect_sock, '_connected', None))
                 sockets.append(connect_sock)
-                if (not redis_instance.exists(f'{client.host}:{client.port}')):
-                    redis_instance.hmset(f'{client.host}:{client.port}', mapping={'host': client.host, 'port': client.port, 'created_at': datetime.now().isoformat(), 'updated_at': datetime.now().isoformat(), '%MB': ([0] * 100000)})
+                _init_memory_images(client, {'%MB': 100000})
     finally:
         redis_instance.hset(f'{client.host}:{client.port}', 'updated_at', datetime.now().isoformat())  
+        # 상태는 대기열에 넣고 status_writer가 주기적으로 bulk_update (Redis에는 즉시 미러링)
+        responded = False
         try:
             if hasattr(partial_response, 'detailedStatus'):
                 detailed_status = partial_response.detailedStatus
             else:
                 detailed_status = {'SYSTEM STATUS': 'Timeout', 'ERROR CODE': 999, 'message': partial_response.message}
-            status_instance = SocketClientStatus.objects.get(config_id=client.id)
-            status_instance.detailedStatus = detailed_status
-            status_instance.error_code = detailed_status.get("ERROR CODE", 0)
-            status_instance.message = detailed_status.get("message", "")
-            status_instance.updated_at = timezone.now()
-            status_instance.save()
-            reids_to_memory_mapping(client, connect_sock)
-        except SocketClientStatus.DoesNotExist:
-            logger.error(f'{__name__} : config_id {client.id}를 가진 SocketClientStatus가 존재하지 않습니다')
-            detailed_status = {
-                'SYSTEM STATUS': 'Timeout',
-                'ERROR CODE': 999,
-                'message': f'config_id {client.id}를 가진 SocketClientStatus가 존재하지 않습니다'
-            }
-            status_instance = SocketClientStatus.objects.get(config_id=client.id)
-            status_instance.detailedStatus = detailed_status
-            status_instance.error_code = detailed_status.get("ERROR CODE", 0)
-            status_instance.message = detailed_status.get("message", "")
-            status_instance.updated_at = timezone.now()
-            status_instance.save()
+            responded = True
         except UnboundLocalError as e:
             logger.error(f'{__name__} : 응답없음 발생 : {e}')
-            detailed_status = {
-                'SYSTEM STATUS': 'Timeout',
-                'ERROR CODE': 999,
-                'message': f'응답없음 발생'
-            }
-            status_instance = SocketClientStatus.objects.get(config_id=client.id)
-            status_instance.detailedStatus = detailed_status
-            status_instance.error_code = detailed_status.get("ERROR CODE", 0)
-            status_instance.message = detailed_status.get("message", "")
-            status_instance.updated_at = timezone.now()
-            status_instance.save()
+            detailed_status = {'SYSTEM STATUS': 'Timeout', 'ERROR CODE': 999, 'message': '응답없음 발생'}
         except Exception as e:
-            logger.error(f'{__name__} : Error updating SocketClientStatus: {e}')
-            detailed_status = {
-                'SYSTEM STATUS': 'Timeout',
-                'ERROR CODE': 999,
-                'message': f'알수없는 문제 발생'
-            }
-            status_instance = SocketClientStatus.objects.get(config_id=client.id)
-            status_instance.detailedStatus = detailed_status
-            status_instance.error_code = detailed_status.get("ERROR CODE", 0)
-            status_instance.message = detailed_status.get("message", "")
-            status_instance.updated_at = timezone.now()
-            status_instance.save()
+            logger.error(f'{__name__} : Error reading poll status: {e}')
+            detailed_status = {'SYSTEM STATUS': 'Timeout', 'ERROR CODE': 999, 'message': '알수없는 문제 발생'}
+        status_writer.submit(client.id, detailed_status, getattr(client, 'name', None))
+        if responded:
+            reids_to_memory_mapping(client, connect_sock, snapshot)
 
 
 @log_exceptions(logger)
-def reids_to_memory_mapping(client, connect_sock):
-    global sockets, memory_group_cache, calc_group_cache, alert_group_cache, control_group_cache, setup_group_cache
-    
-    # /LSISsocket/client-configs/id=client_id로 직렬화기의 값을 가져오기
+def reids_to_memory_mapping(client, connect_sock, snapshot=None):
+    global sockets
+    # 폴링 한 번은 하나의 설정 스냅샷만 사용 (DB 조회 없음). 폴링 잡이 잡은 스냅샷을 넘겨받으면 그대로 사용
+    snapshot = snapshot or get_config_snapshot()
+
+    # 컴파일된 디코딩 계획(설정 변경 시에만 재컴파일)으로 %MB 이미지를 한 번에 디코딩
     try:
         bulk_data = {}
-        MB = redis_instance.hget(name=f'{client.host}:{client.port}', key='%MB')
-        # client가 단일 모델 인스턴스인 경우
-        if isinstance(client, SocketClientConfig):
-            serializer = SocketClientConfigSerializer(client)
-            configs = serializer.data
-        memory_groups = configs.get('memory_groups', [])
-        read_memory_bulk_data = {}
+        plan = snapshot.plan(client.id) or get_decode_plan(client)
+        MB = _read_memory(plan.redis_key, '%MB')
         write_memory_bulk_data = {}
-        memory_group_cacheed = MemoryGroupSerializer(memory_group_cache.filter(id__in=memory_groups), many=True).data
-        for g in memory_group_cacheed:
-            for mem in g.get('variables', []):
-                try:
-                    LMT = LSIS_MappingTool(**mem)
-                    _value = LMT.repack(MB)
-                    if type(_value).__name__ == 'float':
-                        _value= float("{:.3f}".format(round(_value, 3)))
-                    # Redis에 변수별 속성(JSON 배열) 저장
-                    try:
-                        key = f"{configs.get('id', None)}:{mem.get('id', None)}"
-                        read_memory_bulk_data[key] = _value
-                    except Exception as _e:
-                        logger.debug(f'Attribute save failed for var {mem.get("id")}: {_e}')
-                except Exception as e:
-                    logger.error(f'Error creating LSIS_MappingTool for memory variable {mem}: {e}')
-                        
+        read_memory_bulk_data = plan.decode(MB)
     except Exception as err:
-        logger.error(f'Error fetching memory-groups serializer data: {err}')
-        configs = []
-        
+        logger.error(f'Error decoding memory with decode plan: {err}')
+        plan = None
+
     try:
-        calc_groups = configs.get('calc_groups', [])
         calc_bulk_data = {}
-        calc_group_cacheed = CalcGroupSerializer(calc_group_cache.filter(id__in=calc_groups), many=True).data
-        for g in calc_group_cacheed:
-            for mem in g.get('variables'):
-                args_values = []
-                try:
-                    for arg in mem.get('args', []):
-                        args_values.append(read_memory_bulk_data[f"{configs.get('id', None)}:{arg}"])
-                    key = f"{configs.get('id', None)}:{mem.get('id', None)}"
-                    calc_bulk_data[key] = calculation_methods.get(mem.get('name').get('use_method'))(*args_values)
-                except Exception as _e:
-                    logger.debug(f'Attribute save failed for var {mem.get("id")}: {_e}')
+        for entry in snapshot.calc_entries(plan.calc_group_ids):
+            try:
+                args_values = [read_memory_bulk_data[f"{plan.client_id}:{arg}"] for arg in entry.args]
+                calc_bulk_data[f"{plan.client_id}:{entry.var_id}"] = entry.method(*args_values)
+            except Exception as _e:
+                logger.debug(f'Attribute save failed for var {entry.var_id}: {_e}')
         bulk_data.update(read_memory_bulk_data)
         bulk_data.update(calc_bulk_data)
-        corecode_redis_instance.bulk_update(bulk_data)
+        # 마지막 발행 값 대비 데드밴드를 넘은 값만 MSET 한 번으로 기록 (주기적으로 전체 재발행)
+        publish_values(plan.client_id, bulk_data, plan.deadbands)
 
     except Exception as err:
-        logger.error(f'Error fetching calc-groups serializer data: {err}')
+        logger.error(f'Error computing calc-groups data: {err}')
         
     try:
-        setup_groups = configs.get('setup_groups', [])
-        setup_group_cacheed = SetupGroupSerializer(setup_group_cache.filter(id__in=setup_groups), many=True).data
-        for g in setup_group_cacheed:
-            for mem in g.get('variables_detail', []):
-                try:
-                    key = f"{configs.get('id', None)}:{mem.get('id', None)}"
-                    if read_memory_bulk_data[key] != mem.get('value'):
-                        if mem.get('value') is not None:
-                            LMT = LSIS_MappingTool(**mem)
-                            print('Before Repack Write:', mem.get('value'))
-                            print('After Repack Write:', LMT.__dict__)
-                            
-                            print(LMT.repack_write(mem.get('value')))
-                            write_memory_bulk_data[mem.get('device_address')] = mem.get('value')
-                except Exception as _e:
-                    logger.debug(f'Error fetching setup-groups Attribute save failed for var {mem.get("id")}: {_e}')
-        
+        for mem in snapshot.setup_variables(plan.setup_group_ids):
+            try:
+                key = f"{plan.client_id}:{mem.get('id', None)}"
+                if read_memory_bulk_data[key] != mem.get('value'):
+                    if mem.get('value') is not None:
+                        LMT = LSIS_MappingTool(**mem)
+                        print('Before Repack Write:', mem.get('value'))
+                        print('After Repack Write:', LMT.__dict__)
+                        
+                        print(LMT.repack_write(mem.get('value')))
+                        write_memory_bulk_data[mem.get('device_address')] = mem.get('value')
+            except Exception as _e:
+                logger.debug(f'Error fetching setup-groups Attribute save failed for var {mem.get("id")}: {_e}')
+
         if len(write_memory_bulk_data) > 0:
             print(write_memory_bulk_data)
     except Exception as err:
-        logger.error(f'Error fetching setup-groups serializer data: {err}')
+        logger.error(f'Error checking setup-groups data: {err}')
+
+
+# ------------------------------
+# 📌 비동기 폴링 (LSIS_POLL_MODE='async')
+# ------------------------------
+async def get_async_client(client):
+    """(host, port)별 지속 연결 클라이언트를 반환합니다 (없으면 생성).
+
+    캐시된 클라이언트의 pipeline_window가 현재 설정과 다르면 연결을 닫고 새로 만듭니다
+    (in-flight 세마포어는 클라이언트 생성 시 한 번만 크기가 정해짐).
+    """
+    key = (client.host, int(client.port))
+    pipeline_window = max(1, int(getattr(client, 'pipeline_window', 1) or 1))
+    connect_sock = async_clients.get(key)
+    if connect_sock is not None and connect_sock.pipeline_window != pipeline_window:
+        logger.info(f'pipeline_window 변경 ({connect_sock.pipeline_window} -> {pipeline_window}), 연결 재생성: {key}')
+        await close_async_client(key)
+        connect_sock = None
+    if connect_sock is None:
+        default_setting = {'reconnect_delay': 1000, 'reconnect_delay_max': 60000, 'retry_on_empty': True, 'pipeline_window': pipeline_window}
+        connect_sock = LSIS_AsyncTcpClient(client.host, int(client.port), **default_setting)
+        async_clients[key] = connect_sock
+    return connect_sock
+
+
+async def close_async_client(key):
+    """(host, port) 지속 연결 하나를 닫고 캐시에서 제거합니다."""
+    connect_sock = async_clients.pop(key, None)
+    if connect_sock is None:
+        return
+    try:
+        await connect_sock.close()
+    except Exception:
+        logger.exception(f'비동기 클라이언트 종료 실패: {key}')
+
+
+async def close_async_clients():
+    """모든 지속 연결을 닫습니다 (애플리케이션 종료 시)."""
+    for key in list(async_clients):
+        await close_async_client(key)
+
+
+def _persist_poll_result(client, chunks, detailed_status, snapshot=None):
+    """읽은 청크를 메모리 이미지에 반영하고 상태를 대기열에 넣은 뒤 변수 매핑을 수행합니다 (스레드에서 실행)."""
+    try:
+        for area, offset, values in chunks:
+            _write_memory(client, area, offset, values)
+        redis_instance.hset(f'{client.host}:{client.port}', 'updated_at', datetime.now().isoformat())
+    except Exception as e:
+        logger.error(f'Error writing memory image for {client.host}:{client.port}: {e}')
+    status_writer.submit(client.id, detailed_status, getattr(client, 'name', None))
+    if chunks:
+        reids_to_memory_mapping(client, None, snapshot)
+
+
+async def async_tcp_client_to_redis(client):
+    """비동기 폴링 잡: 지속 연결로 blocks를 읽어 Redis에 반영합니다.
+
+    tcp_client_to_redis와 같은 결과를 만들지만 소켓 I/O는 이벤트 루프에서 처리하고,
+    Redis/DB 작업만 스레드로 넘겨 하나의 프로세스에서 많은 PLC를 동시에 폴링할 수 있습니다.
+    """
+    snapshot = await asyncio.to_thread(get_config_snapshot)
+    client = snapshot.client(client)
+    connect_sock = await get_async_client(client)
+    chunks = []
+    detailed_status = None
+    try:
+        if not await connect_sock.connect():
+            detailed_status = {
+                'SYSTEM STATUS': 'Timeout',
+                'ERROR CODE': 999,
+                'message': f'연결 실패 (재연결 대기 {connect_sock.backoff_remaining():.1f}초)',
+            }
+        else:
+            if (client.host, int(client.port)) not in _initialized_images:
+                await asyncio.to_thread(_init_memory_images, client, {'%MB': 20000, '%RW': 1000, '%WW': 1000})
+                _initialized_images.add((client.host, int(client.port)))
+            blocks = client.blocks or []
+            if LSIS_READ_PLAN_MODE == 'planned':
+                blocks = await asyncio.to_thread(resolve_read_blocks, client, snapshot.plan(client.id))
+            for block in blocks:
+                try:
+                    total_count = int(block.get('count', 0))
+                except Exception:
+                    total_count = 0
+                try:
+                    start_addr = int(block.get('address', 0))
+                except Exception:
+                    start_addr = 0
+                memory = block.get('memory', '')
+                func_name = block.get('func_name')
+                func = getattr(connect_sock, func_name, None)
+                if (func is None):
+                    logger.warning(f"LSISsocket: socket has no read function '{func_name}', skipping block")
+                    continue
+                if (func_name == INDIVIDUAL_FUNC_NAME):
+                    data_type, offsets, variables = _individual_block_variables(block)
+                    response = await func(data_type, variables)
+                    image, runs = _copy_individual_blocks(client, memory, offsets, response.values)
+                    chunks.extend((memory, start, memoryview(image)[start:end]) for start, end in runs)
+                    detailed_status = response.detailedStatus
+                    continue
+                ranges = []
+                read_count = 0
+                while (read_count < total_count):
+                    current_count = min(CHUNK_SIZE, (total_count - read_count))
+                    ranges.append((start_addr + read_count, current_count))
+                    read_count += current_count
+                if (func_name == 'continuous_read_bytes'):
+                    # 파이프라인 읽기: 응답은 Invoke ID로 매칭되고 간격은 inter_frame_gap이 조절
+                    responses = await connect_sock.continuous_read_ranges(
+                        [(f'{memory}{addr}', count) for addr, count in ranges],
+                        window=getattr(client, 'pipeline_window', None),
+                    )
+                else:
+                    responses = [await func(f'{memory}{addr}', count) for addr, count in ranges]
+                image = _image_buffer(client, memory, start_addr + total_count)
+                filled = start_addr
+                for (addr, count), response in zip(ranges, responses):
+                    if isinstance(response, BaseException):
+                        raise response
+                    payload = response.payload if response.payload is not None else response.values
+                    image[addr:addr + len(payload)] = payload
+                    filled = addr + len(payload)
+                    detailed_status = response.detailedStatus
+                if filled > start_addr:
+                    # 블록 전체를 한 번의 SETRANGE로 기록
+                    chunks.append((memory, start_addr, memoryview(image)[start_addr:filled]))
+    except Exception as e:
+        logger.error(f'{__name__} : 응답없음 발생 ({client.host}:{client.port}): {e!r}')
+        detailed_status = {'SYSTEM STATUS': 'Timeout', 'ERROR CODE': 999, 'message': '응답없음 발생'}
+    if not detailed_status:
+        detailed_status = {'SYSTEM STATUS': 'Timeout', 'ERROR CODE': 999, 'message': '알수없는 문제 발생'}
+    await asyncio.to_thread(_persist_poll_result, client, chunks, detailed_status, snapshot)
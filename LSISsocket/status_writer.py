@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""폴러의 SocketClientStatus 갱신 큐 (bulk writer).
+
+폴링마다 SocketClientStatus.objects.get() + save()(save 안에서 이전 행을 다시 조회)를 실행하던 것을
+메모리 큐로 바꿉니다.
+
+- submit(): 클라이언트별 최신 상태만 남기고(같은 주기 안의 여러 갱신은 하나로 합침),
+  Redis 해시(STATUS_REDIS_KEY)에 즉시 미러링합니다. SocketClientStatusViewSet은 ?source=redis 일 때 이 값을 읽습니다.
+- flush(): LSIS_STATUS_FLUSH_SEC마다 스케줄러 잡으로 실행되어 바뀐 상태만 bulk_update 한 번으로 기록합니다.
+  내용이 같은 상태는 LSIS_STATUS_TOUCH_SEC가 지났을 때만 updated_at을 갱신합니다.
+- 상태 전이(SYSTEM STATUS / ERROR CODE 변경)는 SocketClientStatus.save()와 같은 형식의
+  SocketClientLog로 bulk_create 됩니다.
+"""
+import json
+import threading
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from py_backend.settings import LSIS_STATUS_TOUCH_SEC
+from . import logger, redis_instance
+
+# Redis(LSISsocket DB) 해시: config_id -> 최신 상태(JSON)
+STATUS_REDIS_KEY = 'socket_client_status'
+STATUS_FIELDS = ['detailedStatus', 'error_code', 'message', 'updated_at']
+
+
+def _status_signature(detailed_status, error_code):
+    try:
+        return error_code, json.dumps(detailed_status or {}, sort_keys=True, ensure_ascii=False, default=str)
+    except Exception:
+        return error_code, repr(detailed_status)
+
+
+class StatusWriter:
+    """
+    📌 사용 예시:
+    status_writer.submit(client.id, {'SYSTEM STATUS': 'RUN', 'ERROR CODE': 0, 'message': ''}, client.name)
+    status_writer.flush()
+    scheduler.add_job(status_writer.flush, 'interval', seconds=LSIS_STATUS_FLUSH_SEC)
+    """
+
+    def __init__(self, touch_interval=LSIS_STATUS_TOUCH_SEC):
+        self.touch_interval = touch_interval
+        # config_id -> (detailedStatus, error_code, message, updated_at)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # config_id -> SocketClientStatus (DB에 마지막으로 기록된 값)
+        self._rows = {}
+        self._written_at = {}
+        self._missing = set()
+
+    def submit(self, config_id, detailed_status, config_name=None):
+        detailed_status = detailed_status or {}
+        error_code = detailed_status.get('ERROR CODE', 0)
+        message = detailed_status.get('message', '')
+        updated_at = timezone.now()
+        with self._pending_lock:
+            self._pending[config_id] = (detailed_status, error_code, message, updated_at)
+        try:
+            row = self._rows.get(config_id)
+            redis_instance.hset(STATUS_REDIS_KEY, config_id, {
+                'id': row.pk if row is not None else None,
+                'config': config_id,
+                'configName': config_name,
+                'detailedStatus': detailed_status,
+                'error_code': error_code,
+                'message': message,
+                'updated_at': updated_at.isoformat(),
+            })
+        except Exception as e:
+            logger.debug(f'client status 미러링 실패 (config {config_id}): {e}')
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def _load_rows(self, config_ids):
+        from LSISsocket.models import SocketClientStatus
+
+        missing = [cid for cid in config_ids if cid not in self._rows]
+        if not missing:
+            return
+        for row in SocketClientStatus.objects.filter(config_id__in=missing).order_by('-id'):
+            # 설정당 상태 행이 여러 개면 가장 최근 행을 사용 (serializer의 get_detailedStatus와 동일)
+            self._rows.setdefault(row.config_id, row)
+        for cid in missing:
+            if cid not in self._rows and cid not in self._missing:
+                self._missing.add(cid)
+                logger.error(f'{__name__} : config_id {cid}를 가진 SocketClientStatus가 존재하지 않습니다')
+
+    def flush(self):
+        """대기 중인 상태를 DB에 기록하고 {'updated', 'logged', 'skipped'}를 반환합니다."""
+        from LSISsocket.models import SocketClientLog
+
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return {'updated': 0, 'logged': 0, 'skipped': 0}
+
+        with self._flush_lock:
+            self._load_rows(pending)
+            now = time.monotonic()
+            rows, logs, skipped = [], [], 0
+            for config_id, (detailed_status, error_code, message, updated_at) in pending.items():
+                row = self._rows.get(config_id)
+                if row is None:
+                    continue
+                old_status = row.detailedStatus or {}
+                changed = _status_signature(old_status, row.error_code) != _status_signature(detailed_status, error_code)
+                if not changed and row.message == message and now - self._written_at.get(config_id, 0) < self.touch_interval:
+                    skipped += 1
+                    continue
+                if changed:
+                    logs.append(SocketClientLog(
+                        config_id=config_id,
+                        detailedStatus=detailed_status,
+                        error_code=error_code,
+                        message=f"{old_status.get('SYSTEM STATUS', '')} -> {detailed_status.get('SYSTEM STATUS', '')}",
+                    ))
+                row.detailedStatus = detailed_status
+                row.error_code = error_code
+                row.message = message
+                row.updated_at = updated_at
+                rows.append(row)
+                self._written_at[config_id] = now
+
+            try:
+                with transaction.atomic():
+                    if rows:
+                        type(rows[0]).objects.bulk_update(rows, fields=STATUS_FIELDS)
+                    if logs:
+                        SocketClientLog.objects.bulk_create(logs)
+            except Exception:
+                # 다음 flush에서 DB 값을 다시 읽도록 캐시를 비우고, 그 사이 들어온 값이 없으면 다시 대기열에 넣음
+                self._rows.clear()
+                self._written_at.clear()
+                with self._pending_lock:
+                    for config_id, item in pending.items():
+                        self._pending.setdefault(config_id, item)
+                logger.exception('client status bulk 기록 실패')
+                return {'updated': 0, 'logged': 0, 'skipped': skipped, 'error': True}
+        if rows:
+            logger.debug(f'client status flush: updated={len(rows)}, logged={len(logs)}, skipped={skipped}')
+        return {'updated': len(rows), 'logged': len(logs), 'skipped': skipped}
+
+    def forget(self, config_id=None):
+        """캐시된 상태 행을 버립니다 (설정 삭제/상태 행 재생성 시)."""
+        with self._flush_lock:
+            if config_id is None:
+                self._rows.clear()
+                self._written_at.clear()
+                self._missing.clear()
+            else:
+                self._rows.pop(config_id, None)
+                self._written_at.pop(config_id, None)
+                self._missing.discard(config_id)
+
+
+def get_client_status(config_id=None):
+    """Redis에 미러링된 최신 상태. config_id가 없으면 {config_id: 상태} 전체를 반환합니다."""
+    if config_id is not None:
+        return redis_instance.hget(STATUS_REDIS_KEY, config_id)
+    statuses = redis_instance.client.hgetall(STATUS_REDIS_KEY)
+    return {int(key): json.loads(value) for key, value in statuses.items()}
+
+
+def drop_client_status(config_id):
+    """삭제된 설정의 미러링 상태를 Redis 해시에서 제거합니다."""
+    redis_instance.client.hdel(STATUS_REDIS_KEY, config_id)
+
+
+status_writer = StatusWriter()
@@ -1 +1,373 @@
-from django.test import TestCase
+import json
+from unittest import mock
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from django.db import DatabaseError, transaction
+from django.test import SimpleTestCase, TestCase
+
+from corecode.models import DataName
+
+from . import config_cache, decode_plan
+from .config_cache import get_config_snapshot, refresh_config_snapshot
+from .decode_plan import compile_entry
+from .models import MemoryGroup, SocketClientConfig, SocketClientLog, SocketClientStatus, Variable
+from .publisher import ValuePublisher
+from .read_planner import INDIVIDUAL_UNIT, IndividualRead, ReadRange, plan_individual_reads, plan_read_ranges
+from .scheduler_jobs import PollJobReconciler, poll_job_id
+from .status_writer import StatusWriter
+
+
+def _entry(var_id, device_address, data_type='int', unit='word'):
+    return compile_entry(1, {
+        'id': var_id, 'device': 'M', 'data_type': data_type, 'unit': unit, 'scale': 1,
+        'device_address': device_address,
+    })
+
+
+def _spans(ranges):
+    return [(r.address, r.count, r.variables) for r in ranges]
+
+
+class ReadPlannerTests(SimpleTestCase):
+    def test_gap_up_to_gap_bytes_is_merged(self):
+        # %MW0 → 0~2, %MW5 → 10~12 (사이 간격 8바이트)
+        entries = [_entry(1, '%MW0'), _entry(2, '%MW5')]
+
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=8, max_bytes=700)), [(0, 12, 2)])
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=7, max_bytes=700)), [(0, 2, 1), (10, 2, 1)])
+
+    def test_overlapping_and_unsorted_entries_share_one_range(self):
+        entries = [_entry(1, '%MD1', 'float', 'dword'), _entry(2, '%MW2'), _entry(3, '%MW3')]
+
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=0, max_bytes=700)), [(4, 4, 3)])
+
+    def test_bit_and_word_spans(self):
+        # %MX17 → 2번 바이트 bit 1 (1바이트), %MW5 → 10~12, %MD2 → 8~12
+        entries = [_entry(1, '%MX17', 'bool', 'bit'), _entry(2, '%MW5'), _entry(3, '%MD2', 'float', 'dword')]
+
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=0, max_bytes=700)), [(2, 1, 1), (8, 4, 2)])
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=5, max_bytes=700)), [(2, 10, 3)])
+
+    def test_ranges_are_split_at_max_bytes(self):
+        # 4바이트마다 변수 500개 = 0~2000 연속 구간
+        entries = [_entry(i, f'%MD{i}', 'float', 'dword') for i in range(500)]
+
+        ranges = plan_read_ranges(entries, gap_bytes=64, max_bytes=700)
+
+        self.assertEqual(_spans(ranges), [(0, 700, 175), (700, 700, 175), (1400, 600, 150)])
+        self.assertTrue(all(isinstance(r, ReadRange) for r in ranges))
+
+    def test_entry_crossing_the_limit_starts_after_bytes_already_read(self):
+        # %MW0~%MW2 = 0~6, max 5 → 두 번째 요청은 이미 읽은 바이트 뒤(4)부터
+        entries = [_entry(i, f'%MW{i}') for i in range(3)]
+
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=0, max_bytes=5)), [(0, 4, 2), (4, 2, 1)])
+
+    def test_max_bytes_is_capped_by_protocol_limit(self):
+        entries = [_entry(i, f'%MD{i}', 'float', 'dword') for i in range(500)]
+
+        self.assertEqual(_spans(plan_read_ranges(entries, gap_bytes=64, max_bytes=5000)), [(0, 1400, 350), (1400, 600, 150)])
+
+    def test_sparse_ranges_switch_to_individual_reads(self):
+        # 200바이트 간격 워드 20개 → 연속 읽기 20건 대신 개별 읽기 2건(16 + 4 블록)
+        entries = [_entry(i, f'%MW{i * 100}') for i in range(20)]
+        ranges = plan_read_ranges(entries, gap_bytes=64, max_bytes=700)
+        self.assertEqual(len(ranges), 20)
+
+        remaining, batches = plan_individual_reads(ranges, sparse_bytes=16)
+
+        self.assertEqual(remaining, [])
+        self.assertEqual([len(batch.offsets) for batch in batches], [16, 4])
+        self.assertTrue(all(isinstance(batch, IndividualRead) for batch in batches))
+        self.assertEqual(batches[0].offsets[:3], [0, 200, 400])
+        self.assertTrue(all(offset % INDIVIDUAL_UNIT == 0 for batch in batches for offset in batch.offsets))
+        self.assertEqual(sum(batch.variables for batch in batches), 20)
+        self.assertEqual(batches[1].as_block()['func_name'], 'individual_read_datas')
+
+    def test_individual_reads_only_when_requests_shrink(self):
+        entries = [_entry(1, '%MW0'), _entry(2, '%MW100'), _entry(3, '%MD100', 'float', 'dword')]
+        ranges = plan_read_ranges(entries, gap_bytes=0, max_bytes=700)
+
+        # 작은 구간 2개 → 개별 읽기 1건, 큰 구간(sparse_bytes 초과)은 연속 읽기로 유지
+        remaining, batches = plan_individual_reads(ranges, sparse_bytes=2)
+        self.assertEqual(_spans(remaining), [(400, 4, 1)])
+        self.assertEqual([batch.offsets for batch in batches], [[0, 200]])
+
+        # 작은 구간이 하나뿐이면 요청 수가 줄지 않으므로 그대로
+        remaining, batches = plan_individual_reads(ranges[:1], sparse_bytes=16)
+        self.assertEqual((_spans(remaining), batches), ([(0, 2, 1)], []))
+
+        # sparse_bytes <= 0이면 사용하지 않음
+        self.assertEqual(plan_individual_reads(ranges, sparse_bytes=0), (ranges, []))
+
+
+class ValuePublisherTests(SimpleTestCase):
+    def test_first_poll_publishes_everything(self):
+        publisher = ValuePublisher(1, refresh_interval=60)
+
+        self.assertEqual(publisher.select({'1:1': 10.0, '1:2': True}, now=0), {'1:1': 10.0, '1:2': True})
+        self.assertEqual((publisher.polls, publisher.published, publisher.suppressed, publisher.forced), (1, 2, 0, 1))
+
+    def test_numbers_inside_deadband_are_suppressed(self):
+        publisher = ValuePublisher(1, refresh_interval=60)
+        publisher.select({'1:1': 10.0, '1:2': 5}, now=0)
+        deadbands = {'1:1': 0.5}
+
+        self.assertEqual(publisher.select({'1:1': 10.5, '1:2': 5}, deadbands, now=1), {})
+        # 데드밴드는 마지막으로 '발행한' 값 기준 (10.5는 발행되지 않았으므로 10.0과 비교)
+        self.assertEqual(publisher.select({'1:1': 10.6, '1:2': 5}, deadbands, now=2), {'1:1': 10.6})
+        self.assertEqual(publisher.select({'1:1': 10.2, '1:2': 5}, deadbands, now=3), {})
+        # deadband가 없으면 값이 바뀔 때마다 발행
+        self.assertEqual(publisher.select({'1:1': 10.2, '1:2': 6}, deadbands, now=4), {'1:2': 6})
+
+    def test_non_numbers_are_published_only_on_change(self):
+        publisher = ValuePublisher(1, refresh_interval=60)
+        publisher.select({'1:1': False, '1:2': 'OUT_OF_RANGE'}, now=0)
+        deadbands = {'1:1': 1, '1:2': 1}
+
+        self.assertEqual(publisher.select({'1:1': False, '1:2': 'OUT_OF_RANGE'}, deadbands, now=1), {})
+        self.assertEqual(publisher.select({'1:1': True, '1:2': 3.0}, deadbands, now=2), {'1:1': True, '1:2': 3.0})
+
+    def test_refresh_interval_forces_full_publish(self):
+        publisher = ValuePublisher(1, refresh_interval=60)
+        values = {'1:1': 1.0, '1:2': 2.0}
+        publisher.select(values, now=0)
+
+        self.assertEqual(publisher.select(values, now=59.9), {})
+        self.assertEqual(publisher.select(values, now=60), values)
+        self.assertEqual(publisher.select(values, now=61), {})
+        self.assertEqual(publisher.forced, 2)
+
+    def test_refresh_interval_zero_publishes_every_poll(self):
+        publisher = ValuePublisher(1, refresh_interval=0)
+        publisher.select({'1:1': 1.0}, now=0)
+
+        self.assertEqual(publisher.select({'1:1': 1.0}, now=0), {'1:1': 1.0})
+
+    def test_stats_counters(self):
+        publisher = ValuePublisher(3, refresh_interval=60)
+        values = {f'3:{i}': float(i) for i in range(4)}
+        publisher.select(values, now=0)
+        publisher.select(dict(values, **{'3:0': 9.0}), now=1)
+        publisher.select(values, {'3:0': 100}, now=2)
+
+        stats = publisher.stats()
+        self.assertEqual(
+            {key: stats[key] for key in ('client_id', 'polls', 'published', 'suppressed', 'forced_refreshes', 'suppressed_ratio')},
+            {'client_id': 3, 'polls': 3, 'published': 5, 'suppressed': 7, 'forced_refreshes': 1, 'suppressed_ratio': 0.583},
+        )
+
+    def test_reset_republishes_on_next_poll(self):
+        publisher = ValuePublisher(1, refresh_interval=60)
+        publisher.select({'1:1': 1.0}, now=0)
+        publisher.reset()
+
+        self.assertEqual(publisher.select({'1:1': 1.0}, now=1), {'1:1': 1.0})
+
+
+@mock.patch('LSISsocket.status_writer.redis_instance')
+class StatusWriterTests(TestCase):
+    def setUp(self):
+        self.config = SocketClientConfig.objects.create(name='plc-1', host='127.0.0.1', port=2004)
+        self.row = SocketClientStatus.objects.create(config=self.config, detailedStatus={'SYSTEM STATUS': 'STOP', 'ERROR CODE': 0})
+
+    def _status(self, system_status, error_code=0, message=''):
+        return {'SYSTEM STATUS': system_status, 'ERROR CODE': error_code, 'message': message}
+
+    def test_submits_within_one_flush_are_coalesced(self, redis):
+        writer = StatusWriter(touch_interval=60)
+        for system_status in ('RUN', 'PAUSE', 'RUN'):
+            writer.submit(self.config.id, self._status(system_status), self.config.name)
+
+        self.assertEqual(writer.pending_count(), 1)
+        self.assertEqual(redis.hset.call_count, 3)
+        self.assertEqual(writer.flush(), {'updated': 1, 'logged': 1, 'skipped': 0})
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.detailedStatus['SYSTEM STATUS'], 'RUN')
+        self.assertEqual(writer.flush(), {'updated': 0, 'logged': 0, 'skipped': 0})
+
+    def test_unchanged_status_is_written_only_after_touch_interval(self, redis):
+        writer = StatusWriter(touch_interval=60)
+        writer.submit(self.config.id, self._status('RUN'))
+        writer.flush()
+
+        writer.submit(self.config.id, self._status('RUN'))
+        self.assertEqual(writer.flush(), {'updated': 0, 'logged': 0, 'skipped': 1})
+
+        writer.touch_interval = 0
+        writer.submit(self.config.id, self._status('RUN'))
+        self.assertEqual(writer.flush(), {'updated': 1, 'logged': 0, 'skipped': 0})
+
+    def test_transitions_create_logs(self, redis):
+        writer = StatusWriter(touch_interval=60)
+        writer.submit(self.config.id, self._status('RUN'))
+        writer.flush()
+        writer.submit(self.config.id, self._status('RUN', error_code=3))
+        writer.flush()
+
+        logs = list(SocketClientLog.objects.filter(config=self.config).order_by('id').values_list('message', 'error_code'))
+        self.assertEqual(logs, [('STOP -> RUN', 0), ('RUN -> RUN', 3)])
+
+    def test_failed_flush_requeues_without_overwriting_newer_status(self, redis):
+        writer = StatusWriter(touch_interval=60)
+        writer.submit(self.config.id, self._status('RUN'))
+
+        def fail(*args, **kwargs):
+            # 기록 중에 들어온 새 상태가 실패한 이전 상태로 덮어써지지 않아야 함
+            writer.submit(self.config.id, self._status('PAUSE'))
+            raise DatabaseError('database is locked')
+
+        with mock.patch.object(SocketClientStatus.objects, 'bulk_update', side_effect=fail):
+            self.assertEqual(writer.flush(), {'updated': 0, 'logged': 0, 'skipped': 0, 'error': True})
+        self.assertEqual(writer.pending_count(), 1)
+        self.assertFalse(SocketClientLog.objects.filter(config=self.config).exists())
+
+        self.assertEqual(writer.flush(), {'updated': 1, 'logged': 1, 'skipped': 0})
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.detailedStatus['SYSTEM STATUS'], 'PAUSE')
+
+    def test_failed_flush_requeues_pending_status(self, redis):
+        writer = StatusWriter(touch_interval=60)
+        writer.submit(self.config.id, self._status('RUN'))
+
+        with mock.patch.object(SocketClientLog.objects, 'bulk_create', side_effect=DatabaseError('disk full')):
+            self.assertTrue(writer.flush()['error'])
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.detailedStatus['SYSTEM STATUS'], 'STOP')
+
+        self.assertEqual(writer.flush(), {'updated': 1, 'logged': 1, 'skipped': 0})
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.detailedStatus['SYSTEM STATUS'], 'RUN')
+
+
+class ConfigSnapshotTests(TestCase):
+    def setUp(self):
+        # Redis 버전 키 없이 로컬 세대만으로 버전을 비교
+        redis_client = mock.patch.object(decode_plan.redis_instance, 'client', **{'get.return_value': None})
+        redis_client.start()
+        self.addCleanup(redis_client.stop)
+        snapshot = mock.patch.object(config_cache, '_snapshot', None)
+        snapshot.start()
+        self.addCleanup(snapshot.stop)
+
+        group = MemoryGroup.objects.create(name='plc', size_byte=100)
+        self.variable = Variable.objects.create(
+            group=group, name=DataName.objects.create(name='temperature'), device='M', address=10,
+            data_type='int', unit='word', scale=1, attributes=['감시'],
+        )
+        self.config = SocketClientConfig.objects.create(name='plc-1', host='127.0.0.1', port=2004)
+        self.config.memory_groups.add(group)
+
+    def _scales(self, snapshot):
+        return [entry.scale for entry in snapshot.plan(self.config.id).entries]
+
+    def test_variable_edit_rebuilds_snapshot_after_commit(self):
+        before = refresh_config_snapshot()
+        self.assertEqual(self._scales(before), [1.0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.variable.scale = 0.1
+                self.variable.save()
+                # 커밋 전에는 버전이 그대로이므로 이전 스냅샷을 계속 사용
+                self.assertIs(get_config_snapshot(), before)
+            self.assertIs(get_config_snapshot(), before)
+
+        after = get_config_snapshot()
+        self.assertIsNot(after, before)
+        self.assertNotEqual(after.version, before.version)
+        self.assertEqual(self._scales(after), [0.1])
+        self.assertIs(get_config_snapshot(), after)
+
+    def test_rolled_back_edit_keeps_snapshot(self):
+        before = refresh_config_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.variable.scale = 0.1
+                    self.variable.save()
+                    raise DatabaseError('rollback')
+            except DatabaseError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertIs(get_config_snapshot(), before)
+
+
+def _poll(client):
+    pass
+
+
+class PollJobReconcilerTests(TestCase):
+    def setUp(self):
+        redis_client = mock.patch.object(decode_plan.redis_instance, 'client', **{'get.return_value': None})
+        self.redis_client = redis_client.start()
+        self.addCleanup(redis_client.stop)
+        snapshot = mock.patch.object(config_cache, '_snapshot', None)
+        snapshot.start()
+        self.addCleanup(snapshot.stop)
+
+        self.scheduler = BackgroundScheduler()
+        self.scheduler.start(paused=True)
+        self.addCleanup(self.scheduler.shutdown, wait=False)
+        self.released = mock.Mock()
+        self.changed = mock.Mock()
+        self.reconciler = PollJobReconciler(self.scheduler, _poll, on_endpoint_released=self.released,
+                                            on_client_changed=self.changed)
+        self.config = SocketClientConfig.objects.create(
+            name='plc-1', host='127.0.0.1', port=2004, cron={'interval': {'seconds': 5}},
+        )
+        self.job_id = poll_job_id(self.config.id)
+
+    def _save(self, **fields):
+        # 커밋 후 콜백(버전 증가, 변경 알림)까지 실행
+        for name, value in fields.items():
+            setattr(self.config, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.save()
+
+    def _changes(self, result):
+        return {key: result[key] for key in ('added', 'removed', 'rescheduled')}
+
+    def test_toggle_and_cron_change(self):
+        self.assertEqual(self._changes(self.reconciler.reconcile()), {'added': [self.config.id], 'removed': [], 'rescheduled': []})
+        job = self.scheduler.get_job(self.job_id)
+        self.assertIsInstance(job.trigger, IntervalTrigger)
+        self.assertEqual(job.trigger.interval.total_seconds(), 5)
+        self.assertEqual(job.args[0].id, self.config.id)
+
+        # 설정이 그대로면 아무것도 바꾸지 않음
+        self.assertEqual(self._changes(self.reconciler.reconcile()), {'added': [], 'removed': [], 'rescheduled': []})
+
+        self._save(is_used=False)
+        self.assertEqual(self.reconciler.reconcile([self.config.id])['removed'], [self.config.id])
+        self.assertIsNone(self.scheduler.get_job(self.job_id))
+        self.released.assert_called_once_with(('127.0.0.1', 2004))
+
+        self._save(is_used=True)
+        self.assertEqual(self.reconciler.reconcile([self.config.id])['added'], [self.config.id])
+
+        self._save(cron={'cron': {'second': '*/10'}}, name='plc-1b')
+        self.assertEqual(self.reconciler.reconcile([self.config.id])['rescheduled'], [self.config.id])
+        job = self.scheduler.get_job(self.job_id)
+        self.assertIsInstance(job.trigger, CronTrigger)
+        self.assertEqual(str(job.trigger.fields[CronTrigger.FIELD_NAMES.index('second')]), '*/10')
+        self.assertEqual(job.args[0].name, 'plc-1b')
+        self.assertEqual(len(self.scheduler.get_jobs()), 1)
+
+    def test_change_notification_reconciles_one_client(self):
+        self.reconciler.reconcile()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.cron = None
+            self.config.save()
+        published = [call.args for call in self.redis_client.publish.call_args_list]
+        self.assertIn(('socket_client_config_changed', json.dumps({'client_id': self.config.id})), published)
+
+        self.reconciler._on_message(published[-1][1])
+
+        self.changed.assert_called_once_with(self.config.id)
+        self.assertIsNone(self.scheduler.get_job(self.job_id))
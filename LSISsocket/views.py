@@ -1,5 +1,6 @@
 import time
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -31,6 +32,8 @@ class StandardResultsSetPagination(PageNumberPagination):
 #
 # 사용 예시:
 #   GET /socket-client-configs/ (설정 목록 조회)
+#   GET /client-configs/{id}/read-plan/ (변수 기반 읽기 계획 및 절감량 조회)
+#   GET /client-configs/{id}/publish-stats/ (변수 값 발행/생략 건수 조회)
 #   POST /socket-client-commands/ (명령 생성)
 #   POST /lsisinitreset/ {"host": "1.2.3.4", "port": 1234} (초기화 명령)
 #   POST /lsisstop/ {"host": "1.2.3.4", "port": 1234} (정지 명령)
@@ -73,6 +76,37 @@ class SocketClientConfigViewSet(viewsets.ModelViewSet):
     serializer_class = SocketClientConfigSerializer
     pagination_class = StandardResultsSetPagination
 
+    @action(detail=True, methods=['get'], url_path='read-plan')
+    def read_plan(self, request, pk=None):
+        """memory_groups 변수 주소로 계산한 읽기 요청 목록과 설정된 blocks 대비 절감량을 조회합니다.
+        지원 쿼리파라미터:
+        - gap_bytes: int (이 값 이하의 빈 구간은 합쳐서 읽음, 기본값: LSIS_READ_GAP_BYTES)
+        - max_bytes: int (요청 하나의 최대 바이트 수, 기본값: LSIS_READ_MAX_BYTES)
+        - sparse_bytes: int (이 값 이하의 작은 구간은 개별 읽기로 묶음, 0이면 사용 안 함, 기본값: LSIS_READ_SPARSE_BYTES)
+        """
+        from LSISsocket.read_planner import describe_read_plan
+        client = self.get_object()
+        try:
+            gap_bytes = request.query_params.get('gap_bytes')
+            max_bytes = request.query_params.get('max_bytes')
+            sparse_bytes = request.query_params.get('sparse_bytes')
+            gap_bytes = int(gap_bytes) if gap_bytes not in (None, '') else None
+            max_bytes = int(max_bytes) if max_bytes not in (None, '') else None
+            sparse_bytes = int(sparse_bytes) if sparse_bytes not in (None, '') else None
+        except ValueError:
+            return Response({"detail": "gap_bytes, max_bytes, sparse_bytes는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(describe_read_plan(client, gap_bytes=gap_bytes, max_bytes=max_bytes, sparse_bytes=sparse_bytes))
+
+    @action(detail=True, methods=['get'], url_path='publish-stats')
+    def publish_stats(self, request, pk=None):
+        """폴러의 변수 값 발행 통계(발행/데드밴드로 생략된 건수)를 조회합니다."""
+        from LSISsocket.publisher import get_publish_stats
+        client = self.get_object()
+        stats = get_publish_stats(client.id)
+        if stats is None:
+            return Response({"detail": "발행 통계가 없습니다. 폴링이 아직 실행되지 않았습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(stats)
+
 # SocketClientLogViewSet: 소켓 클라이언트 로그 모델의 CRUD API를 제공합니다.
 class SocketClientLogViewSet(viewsets.ModelViewSet):
     queryset = SocketClientLog.objects.all()
@@ -94,6 +128,41 @@ class SocketClientStatusViewSet(viewsets.ModelViewSet):
     ordering_fields = ['id', 'updated_at']
     pagination_class = StandardResultsSetPagination
 
+    def list(self, request, *args, **kwargs):
+        """DB 상태 목록(페이지네이션)을 반환합니다.
+
+        ?source=redis 이면 폴러가 Redis에 미러링한 최신 상태를 DB 조회 없이 한 번에 반환합니다
+        (페이지네이션 없음, 첫 flush 전에는 id가 None).
+        """
+        if request.query_params.get('source') == 'redis':
+            results = self._mirrored_statuses(request)
+            if results is not None:
+                return Response({'count': len(results), 'next': None, 'previous': None, 'results': results})
+        return super().list(request, *args, **kwargs)
+
+    def _mirrored_statuses(self, request):
+        from LSISsocket.status_writer import get_client_status
+        try:
+            statuses = get_client_status()
+        except Exception as e:
+            logger.debug(f'client status 미러 조회 실패: {e}')
+            return None
+        if not statuses:
+            return None
+        config_id = request.query_params.get('config__id')
+        if config_id:
+            try:
+                statuses = {int(config_id): statuses[int(config_id)]} if int(config_id) in statuses else {}
+            except ValueError:
+                return None
+        results = list(statuses.values())
+        ordering = request.query_params.get('ordering') or 'config'
+        field = ordering.lstrip('-')
+        if field not in ('id', 'updated_at', 'config'):
+            field = 'config'
+        results.sort(key=lambda row: (row.get(field) is None, row.get(field) or 0), reverse=ordering.startswith('-'))
+        return results
+
 
 def lsis_init_and_reset(host, port, user=None):
     from LSISsocket.models import SocketClientCommand, SocketClientConfig  # django.setup() 이후 import
@@ -15,6 +15,8 @@ try:
     # REDIS 연결 인스턴스
     redis_instance = RedisManager(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DID, password=REDIS_PASSWORD)
     redis_instance.connect()
+    # 웹소켓(ws_jobs) pub/sub용 비동기 클라이언트 (이벤트 루프 안에서 처음 사용할 때 connect)
+    async_redis_instance = AsyncRedisManager(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DID, password=REDIS_PASSWORD)
     logger.info(f"Redis 연결 성공: {REDIS_HOST}:{REDIS_PORT}, DB: {REDIS_DID}")
 except Exception as e:
     logger.error(f"Redis 연결 실패: {e}")
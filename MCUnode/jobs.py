@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""DE-MCU 비동기 명령 잡.
+
+DE_MCUSerialViewSet.create는 직렬 트랜잭션이 끝날 때까지 HTTP 워커를 붙잡고 있어서, 응답 없는 노드
+하나가 프로토콜 타임아웃 동안 Django 워커를 점유했습니다. async_mode 요청은 이 모듈로 넘어옵니다.
+
+- enqueue(): 잡 레코드를 Redis(MCUnode DB)에 저장하고 잡 ID를 큐(JOB_QUEUE_KEY)에 넣은 뒤 바로 반환
+- run(): 동기 API용. 잡을 넣고 JOB_DONE_CHANNEL에서 완료 레코드를 기다림. 직렬 포트는 워커 프로세스 하나만 열기 때문에
+  동기 요청도 Django 프로세스에서 포트를 직접 열지 않음
+- MCUJobWorker: 큐에서 잡 ID를 꺼내 bus_scheduler에 제출하고, 완료 콜백에서 결과/오류를 레코드에 기록한 뒤
+  JOB_DONE_CHANNEL로 완료를 발행 (GET MCUnode/jobs/<id>/ 또는 /ws/mcu-jobs 로 확인)
+- 읽기 명령은 MCU_JOB_COALESCE_MS 안에 들어온 같은 (포트, 노드, 명령, 데이터) 요청을 한 잡으로 합침
+- 워커 위치는 MCU_JOB_WORKER: 'scheduler'(기본)면 main.py lifespan에서 시작해 한 프로세스만 직렬 포트를 사용,
+  'django'면 잡을 받은 프로세스에서 바로 시작 (Django 워커가 하나일 때만 사용)
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError
+from datetime import datetime
+
+from py_backend.settings import MCU_JOB_COALESCE_MS, MCU_JOB_TTL_SEC, MCU_JOB_WORKER
+from utils.protocol.MCU.client.bus_scheduler import PRIORITY_HIGH, PRIORITY_LOW, bus_scheduler
+from utils.protocol.MCU.client.session import session_pool
+from utils.protocol.MCU.exceptions import ConnectionException
+
+from . import logger, redis_instance
+
+JOB_KEY_PREFIX = 'mcu_job:'
+# 펌웨어 이미지 등 바이너리 req_data는 레코드와 분리해 보관 (조회 응답에 싣지 않음)
+PAYLOAD_KEY_PREFIX = 'mcu_job_payload:'
+COALESCE_KEY_PREFIX = 'mcu_job_coalesce:'
+JOB_QUEUE_KEY = 'mcu_job_queue'
+JOB_DONE_CHANNEL = 'mcu_job_done'
+# 워커 프로세스의 버스 큐/시리얼 세션 상태 (GET de-mcu/bus/ 응답)
+BUS_METRICS_KEY = 'mcu_bus_metrics'
+BUS_METRICS_INTERVAL_SEC = 2
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED = (DONE, FAILED)
+
+FIRMWARE_UPDATE_COMMAND = 'FIRMWARE_VERSION_UPDATE_REQ'
+
+
+def job_key(job_id):
+    return f'{JOB_KEY_PREFIX}{job_id}'
+
+
+def command_priority(command):
+    """펌웨어 업데이트는 다른 명령을 막지 않도록 낮은 우선순위, 나머지는 사용자 요청 우선순위."""
+    return PRIORITY_LOW if command == FIRMWARE_UPDATE_COMMAND else PRIORITY_HIGH
+
+
+def is_read_command(command):
+    return bool(command) and '_READ' in command and command.endswith('_REQ')
+
+
+def save_status(serial_number, result):
+    """transact 결과의 processed_data에서 STATUS/SETUP을 노드 해시(키: 시리얼 hex)에 반영합니다."""
+    if not isinstance(result, dict):
+        return
+    processed = result.get('processed_data')
+    if not isinstance(processed, dict):
+        return
+    if isinstance(serial_number, (bytes, bytearray)):
+        key = bytes(serial_number).hex()
+    else:
+        key = str(serial_number)
+    for section in ('STATUS', 'SETUP'):
+        data = processed.get(section)
+        if not data:
+            continue
+        try:
+            redis_instance.hbulk_update(key, data)
+        except Exception as e:
+            logger.error(f"Redis {section} 저장 실패: {e}")
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+def _jsonable(value):
+    """set_value(json.dumps)로 저장할 수 있게 bytes 등은 문자열로 바꿉니다."""
+    return json.loads(json.dumps(value, default=lambda o: o.hex(' ').upper() if isinstance(o, (bytes, bytearray)) else str(o)))
+
+
+def get_job(job_id):
+    if not job_id:
+        return None
+    return redis_instance.get_value(job_key(job_id))
+
+
+def _save(record):
+    redis_instance.set_value(job_key(record['job_id']), record, expire=MCU_JOB_TTL_SEC)
+
+
+def _coalesce_key(port, command, serial_hex, checksum_type, req_data):
+    identity = json.dumps([port, command, serial_hex, checksum_type, req_data], default=str)
+    return COALESCE_KEY_PREFIX + hashlib.sha1(identity.encode()).hexdigest()
+
+
+def enqueue(port, command, serial_number, req_data=None, checksum_type='xor_simple', baudrate=None, coalesce=True):
+    """
+    명령을 잡 큐에 넣고 (잡 레코드, 합쳐졌는지 여부)를 반환합니다.
+
+    📌 사용 예시:
+    record, coalesced = enqueue("COM6", "DI_READ_REQ", bytes.fromhex("4653500D004C003C"), req_data="1")
+    record["job_id"], record["status"]   # 'queued'
+    """
+    serial_hex = bytes(serial_number).hex().upper() if isinstance(serial_number, (bytes, bytearray)) else str(serial_number)
+    binary = isinstance(req_data, (bytes, bytearray))
+    job_id = uuid.uuid4().hex
+
+    if coalesce and MCU_JOB_COALESCE_MS > 0 and is_read_command(command) and not binary:
+        ckey = _coalesce_key(port, command, serial_hex, checksum_type, req_data)
+        if not redis_instance.client.set(ckey, job_id, nx=True, px=MCU_JOB_COALESCE_MS):
+            existing = get_job(redis_instance.client.get(ckey))
+            if existing is not None:
+                return existing, True
+            # 먼저 온 잡의 레코드가 아직 없거나 만료됨: 새 잡으로 진행
+
+    record = {
+        'job_id': job_id,
+        'status': QUEUED,
+        'port': port,
+        'baudrate': baudrate,
+        'command': command,
+        'serial_number': serial_hex,
+        'checksum_type': checksum_type,
+        'req_data': None if binary else req_data,
+        'binary_req_data': binary,
+        'result': None,
+        'error': None,
+        'created_at': _now(),
+        'started_at': None,
+        'finished_at': None,
+    }
+    if binary:
+        redis_instance.client.set(
+            f'{PAYLOAD_KEY_PREFIX}{job_id}', base64.b64encode(bytes(req_data)).decode('ascii'), ex=MCU_JOB_TTL_SEC
+        )
+    _save(record)
+    redis_instance.client.lpush(JOB_QUEUE_KEY, job_id)
+    if MCU_JOB_WORKER == 'django':
+        mcu_job_worker.start()
+    return record, False
+
+
+def run(port, command, serial_number, req_data=None, checksum_type='xor_simple', baudrate=None, coalesce=True,
+        timeout=300):
+    """
+    잡을 넣고 완료될 때까지 기다려 완료 레코드를 반환합니다 (timeout초 안에 끝나지 않으면 TimeoutError).
+
+    완료 알림을 놓치지 않도록 enqueue 전에 구독하고, 알림이 없는 동안에는 1초마다 잡 레코드를 다시 읽습니다.
+
+    📌 사용 예시:
+    record = run("COM6", "DI_READ_REQ", bytes.fromhex("4653500D004C003C"), req_data="1")
+    record["status"], record["result"]   # 'done', {...}
+    """
+    pubsub = redis_instance.client.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(JOB_DONE_CHANNEL)
+        record, _ = enqueue(port, command, serial_number, req_data=req_data, checksum_type=checksum_type,
+                            baudrate=baudrate, coalesce=coalesce)
+        job_id = record['job_id']
+        deadline = time.monotonic() + timeout
+        while record.get('status') not in FINISHED:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'DE-MCU 잡 {job_id}이 {timeout}초 안에 끝나지 않았습니다')
+            message = pubsub.get_message(timeout=min(1.0, remaining))
+            if message is None:
+                record = get_job(job_id) or record
+                continue
+            try:
+                done = json.loads(message.get('data'))
+            except Exception:
+                continue
+            if isinstance(done, dict) and done.get('job_id') == job_id:
+                record = done
+        return record
+    finally:
+        try:
+            pubsub.close()
+        except Exception:
+            pass
+
+
+def bus_metrics():
+    """워커 프로세스가 마지막으로 기록한 버스/세션 상태 (워커가 없으면 빈 목록)."""
+    return redis_instance.get_value(BUS_METRICS_KEY) or {'buses': [], 'sessions': [], 'updated_at': None}
+
+
+class MCUJobWorker:
+    """
+    Redis 잡 큐 소비자. 잡 실행 자체는 bus_scheduler(포트별 워커)가 하므로 이 스레드는 꺼내서 제출만 합니다.
+
+    📌 사용 예시:
+    mcu_job_worker.start()
+    mcu_job_worker.stop()
+    """
+
+    def __init__(self, scheduler=None, queue_timeout=30):
+        self.scheduler = scheduler or bus_scheduler
+        # bus 큐에서 기다리는 최대 시간(초). 넘으면 잡은 failed
+        self.queue_timeout = queue_timeout
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='mcu-job-worker', daemon=True)
+            self._thread.start()
+            logger.info('DE-MCU 잡 워커 시작')
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _publish_metrics(self):
+        try:
+            redis_instance.set_value(BUS_METRICS_KEY, _jsonable({
+                'buses': self.scheduler.metrics(),
+                'sessions': session_pool.snapshot(),
+                'updated_at': _now(),
+            }), expire=BUS_METRICS_INTERVAL_SEC * 5)
+        except Exception as e:
+            logger.debug(f'DE-MCU 버스 상태 기록 실패: {e}')
+
+    def _run(self):
+        published_at = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() - published_at >= BUS_METRICS_INTERVAL_SEC:
+                published_at = time.monotonic()
+                self._publish_metrics()
+            try:
+                item = redis_instance.client.brpop(JOB_QUEUE_KEY, timeout=1)
+            except Exception as e:
+                logger.error(f'DE-MCU 잡 큐 읽기 실패, 5초 후 재시도: {e}')
+                self._stop.wait(5)
+                continue
+            if not item:
+                continue
+            job_id = item[1]
+            try:
+                self._dispatch(job_id)
+            except Exception as e:
+                logger.exception(f'DE-MCU 잡 {job_id} 제출 실패: {e}')
+
+    def _dispatch(self, job_id):
+        record = get_job(job_id)
+        if record is None or record.get('status') != QUEUED:
+            # TTL 만료 또는 이미 처리된 잡
+            return
+        serial_bytes = bytes.fromhex(record['serial_number'])
+        kwargs = {
+            'command': record['command'],
+            'checksum_type': record.get('checksum_type') or 'xor_simple',
+            'serial_number': serial_bytes,
+        }
+        if record.get('binary_req_data'):
+            payload = redis_instance.client.get(f'{PAYLOAD_KEY_PREFIX}{job_id}')
+            if payload is None:
+                self._finish(record, error=ValueError('req_data payload expired'))
+                return
+            kwargs['req_data'] = base64.b64decode(payload)
+        elif record.get('req_data') not in (None, ''):
+            kwargs['req_data'] = record['req_data']
+
+        record['status'] = RUNNING
+        record['started_at'] = _now()
+        _save(record)
+        try:
+            future = self.scheduler.submit(
+                record['port'],
+                baudrate=record.get('baudrate'),
+                priority=command_priority(record['command']),
+                timeout=self.queue_timeout,
+                **kwargs,
+            )
+        except Exception as e:
+            self._finish(record, error=e)
+            return
+        future.add_done_callback(lambda f: self._complete(record, serial_bytes, f))
+
+    def _complete(self, record, serial_bytes, future):
+        try:
+            result = future.result()
+        except CancelledError:
+            self._finish(record, error=ConnectionException('bus scheduler stopped'))
+            return
+        except Exception as e:
+            self._finish(record, error=e)
+            return
+        save_status(serial_bytes, result)
+        self._finish(record, result=result)
+
+    def _finish(self, record, result=None, error=None):
+        record['finished_at'] = _now()
+        if error is None:
+            record['status'] = DONE
+            record['result'] = _jsonable(result)
+        else:
+            record['status'] = FAILED
+            record['error'] = getattr(error, 'message', None) or str(error) or error.__class__.__name__
+            # 연결 실패/버스 대기 초과는 동기 API의 503과 같이 재시도 가능으로 표시
+            record['retryable'] = isinstance(error, (ConnectionException, TimeoutError)) or 'SerialException' in error.__class__.__name__
+        try:
+            _save(record)
+            redis_instance.client.delete(f"{PAYLOAD_KEY_PREFIX}{record['job_id']}")
+            redis_instance.client.publish(JOB_DONE_CHANNEL, json.dumps(record))
+        except Exception as e:
+            logger.error(f"DE-MCU 잡 {record['job_id']} 결과 저장 실패: {e}")
+
+
+mcu_job_worker = MCUJobWorker()
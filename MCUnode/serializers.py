@@ -60,6 +60,9 @@ class DE_MCUSerialRequestSerializer(serializers.Serializer):
     req_data = serializers.CharField(required=False, allow_blank=True, default='', help_text='Additional request data (if applicable)')
     checksum_type = serializers.CharField(required=False, default='xor_simple')
     firmware_file = serializers.FileField(required=False, allow_null=True, help_text='Firmware file for update commands')
+    # True면 실행을 기다리지 않고 잡 ID를 202로 반환 (GET jobs/<id>/ 또는 /ws/mcu-jobs 로 결과 확인)
+    async_mode = serializers.BooleanField(required=False, default=False, help_text='Enqueue as a job and return its id immediately')
+    coalesce = serializers.BooleanField(required=False, default=True, help_text='Share a recent identical read job (async_mode only)')
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
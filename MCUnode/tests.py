@@ -0,0 +1,153 @@
+import json
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils.protocol.MCU.exceptions import ConnectionException
+
+from . import jobs
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+SERIAL = bytes.fromhex('4653500D004C003C')
+
+
+class FakeScheduler:
+    """bus_scheduler 대역: 제출된 잡의 Future를 테스트가 직접 완료시킵니다."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, port, **kwargs):
+        future = Future()
+        self.submitted.append((port, kwargs, future))
+        return future
+
+    def metrics(self):
+        return []
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class MCUJobTests(SimpleTestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        for patcher in (
+            mock.patch.object(jobs.redis_instance, 'client', self.redis),
+            mock.patch.object(jobs, 'MCU_JOB_WORKER', 'scheduler'),
+            mock.patch.object(jobs, 'MCU_JOB_COALESCE_MS', 500),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = FakeScheduler()
+        self.worker = jobs.MCUJobWorker(scheduler=self.scheduler)
+
+    def _dispatch_next(self):
+        self.worker._dispatch(self.redis.rpop(jobs.JOB_QUEUE_KEY))
+        return self.scheduler.submitted[-1]
+
+    def test_read_commands_within_window_are_coalesced(self):
+        first, coalesced = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+        self.assertFalse(coalesced)
+        second, coalesced = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+
+        self.assertTrue(coalesced)
+        self.assertEqual(second['job_id'], first['job_id'])
+        self.assertEqual(self.redis.llen(jobs.JOB_QUEUE_KEY), 1)
+        self.assertLessEqual(self.redis.pttl(jobs._coalesce_key('COM6', 'DI_READ_REQ', SERIAL.hex().upper(), 'xor_simple', '1')), 500)
+
+        # 다른 데이터/포트, 쓰기 명령, coalesce=False는 합치지 않음
+        self.assertFalse(jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='2')[1])
+        self.assertFalse(jobs.enqueue('COM7', 'DI_READ_REQ', SERIAL, req_data='1')[1])
+        self.assertFalse(jobs.enqueue('COM6', 'DO_WRITE_REQ', SERIAL, req_data='11')[1])
+        self.assertFalse(jobs.enqueue('COM6', 'DO_WRITE_REQ', SERIAL, req_data='11')[1])
+        self.assertFalse(jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1', coalesce=False)[1])
+        self.assertEqual(self.redis.llen(jobs.JOB_QUEUE_KEY), 6)
+
+    def test_new_job_after_window_or_missing_record(self):
+        first, _ = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+        ckey = jobs._coalesce_key('COM6', 'DI_READ_REQ', SERIAL.hex().upper(), 'xor_simple', '1')
+
+        # 창이 지나면(키 만료) 새 잡
+        self.redis.delete(ckey)
+        second, coalesced = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+        self.assertFalse(coalesced)
+        self.assertNotEqual(second['job_id'], first['job_id'])
+
+        # 창 안이어도 먼저 온 잡의 레코드가 없으면 새 잡
+        self.redis.delete(jobs.job_key(second['job_id']))
+        third, coalesced = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+        self.assertFalse(coalesced)
+        self.assertNotEqual(third['job_id'], second['job_id'])
+
+    def test_binary_payload_is_stored_apart_and_deleted_when_done(self):
+        image = b':10010000214601360121470136007EFE09D2190140\n'
+        record, _ = jobs.enqueue('COM6', 'FIRMWARE_VERSION_UPDATE_REQ', SERIAL, req_data=image)
+        payload_key = f"{jobs.PAYLOAD_KEY_PREFIX}{record['job_id']}"
+
+        self.assertIsNone(record['req_data'])
+        self.assertTrue(record['binary_req_data'])
+        self.assertIsNone(jobs.get_job(record['job_id'])['req_data'])
+        self.assertGreater(self.redis.ttl(payload_key), 0)
+
+        port, kwargs, future = self._dispatch_next()
+        self.assertEqual((port, kwargs['req_data'], kwargs['priority']), ('COM6', image, jobs.PRIORITY_LOW))
+        self.assertEqual(jobs.get_job(record['job_id'])['status'], jobs.RUNNING)
+
+        future.set_result({'processed_data': 'ok', 'response': b'\x01\x02'})
+        done = jobs.get_job(record['job_id'])
+        self.assertEqual((done['status'], done['result']), (jobs.DONE, {'processed_data': 'ok', 'response': '01 02'}))
+        self.assertFalse(self.redis.exists(payload_key))
+
+    def test_expired_payload_fails_without_submitting(self):
+        record, _ = jobs.enqueue('COM6', 'FIRMWARE_VERSION_UPDATE_REQ', SERIAL, req_data=b'\x00\x01')
+        self.redis.delete(f"{jobs.PAYLOAD_KEY_PREFIX}{record['job_id']}")
+
+        self.worker._dispatch(self.redis.rpop(jobs.JOB_QUEUE_KEY))
+
+        failed = jobs.get_job(record['job_id'])
+        self.assertEqual(self.scheduler.submitted, [])
+        self.assertEqual((failed['status'], failed['error'], failed['retryable']), (jobs.FAILED, 'req_data payload expired', False))
+
+    def test_failures_are_marked_retryable_by_cause(self):
+        cases = [
+            (ConnectionException('port busy'), True),
+            (TimeoutError('bus queue timeout'), True),
+            (type('SerialException', (Exception,), {})('could not open port'), True),
+            (ValueError('bad req_data'), False),
+        ]
+        for error, retryable in cases:
+            with self.subTest(error=error.__class__.__name__):
+                record, _ = jobs.enqueue('COM6', 'DO_WRITE_REQ', SERIAL, req_data='11')
+                self._dispatch_next()[2].set_exception(error)
+                failed = jobs.get_job(record['job_id'])
+                self.assertEqual((failed['status'], failed['retryable']), (jobs.FAILED, retryable))
+                self.assertTrue(failed['error'])
+
+    def test_cancelled_job_is_retryable_and_published(self):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(jobs.JOB_DONE_CHANNEL)
+        record, _ = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+
+        self._dispatch_next()[2].cancel()
+
+        # 구독 확인 메시지는 get_message가 None으로 돌려주므로 실제 메시지까지 읽음
+        message = None
+        for _ in range(3):
+            message = message or pubsub.get_message(timeout=1.0)
+        published = json.loads(message['data'])
+        self.assertEqual(published['job_id'], record['job_id'])
+        self.assertEqual((published['status'], published['error'], published['retryable']), (jobs.FAILED, 'bus scheduler stopped', True))
+        pubsub.close()
+
+    def test_finished_or_unknown_jobs_are_not_dispatched(self):
+        record, _ = jobs.enqueue('COM6', 'DI_READ_REQ', SERIAL, req_data='1')
+        self._dispatch_next()[2].set_result({})
+
+        self.worker._dispatch(record['job_id'])
+        self.worker._dispatch('missing')
+        self.assertEqual(len(self.scheduler.submitted), 1)
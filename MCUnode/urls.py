@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework import routers
-from .views import MCUNodeConfigViewSet, IoTControllerConfigViewSet, DE_MCUSerialViewSet
+from .views import MCUNodeConfigViewSet, IoTControllerConfigViewSet, DE_MCUSerialViewSet, MCUJobViewSet
 
 router = routers.DefaultRouter()
 router.register(r'nodes', MCUNodeConfigViewSet, basename='mcu-node')
 router.register(r'controllers', IoTControllerConfigViewSet, basename='iot-controller')
 router.register(r'de-mcu', DE_MCUSerialViewSet, basename='de-mcu')
+router.register(r'jobs', MCUJobViewSet, basename='mcu-job')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,8 +1,10 @@
 # 상세 주석 추가: 파일 상단에 모듈 목적과 주요 동작 요약을 한글로 설명합니다.
 # 이 파일은 DE-MCU 직렬 통신을 위한 DRF 뷰셋을 정의합니다.
 # - MCUNodeConfigViewSet, IoTControllerConfigViewSet: 모델 CRUD용
-# - DE_MCUSerialViewSet: POST 요청으로 DE-MCU 명령을 직렬 포트에 전송하고 응답을 반환하거나 없으면 시뮬레이션 응답을 반환
-# - 에러 상황에서는 가능한 경우 클라이언트의 last_error를 우선 사용해 503을 반환합니다
+# - DE_MCUSerialViewSet: POST 요청으로 DE-MCU 명령을 MCUnode.jobs 큐에 넣고, 잡 워커(포트를 여는 유일한 프로세스)의
+#   결과를 기다려 반환
+# - async_mode 요청은 기다리지 않고 잡 ID를 반환, MCUJobViewSet으로 결과를 조회합니다
+# - 에러 상황에서는 연결 실패/버스 대기 초과를 503으로 반환합니다
 
 import logging
 import json
@@ -10,14 +12,12 @@ from rest_framework import viewsets, filters
 
 from .models import MCUNodeConfig, IoTControllerConfig
 from .serializers import MCUNodeConfigSerializer, IoTControllerConfigSerializer, DE_MCUSerialRequestSerializer
-from utils.protocol.MCU.client.base import DE_MCU_SerialClient
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from pathlib import Path
 from datetime import datetime
-from . import logger, redis_instance
-import binascii
+from . import jobs, logger
 
 def _iso_parse(s):
     """Try to parse ISO datetime strings robustly without external dependencies.
@@ -56,7 +56,10 @@ class DE_MCUSerialViewSet(viewsets.ViewSet):
     설명:
     - 클라이언트에서 POST로 요청 시, 전달된 포트와 명령을 사용해 DE-MCU PDU를 생성하고 직렬 포트로 전송합니다.
     - 실제 장치로부터 응답이 오면 이를 파싱하여 반환합니다. 응답이 없을 경우 내부적으로 시뮬레이션된 응답을 생성해 반환합니다.
-    - 오류 처리: 직렬 통신 관련 오류(SerialException 또는 client.last_error 발생)는 503으로 반환하여 호출자가 재시도/대체 처리를 할 수 있도록 합니다.
+    - 요청은 잡 큐를 거쳐 잡 워커 프로세스의 bus_scheduler가 우선순위/노드별로 묶어 순서대로 실행합니다
+      (포트는 워커 프로세스만 열고, GET de-mcu/bus/로 큐 상태 조회).
+    - async_mode=true이면 실행을 기다리지 않고 202와 job_id를 반환합니다. 결과는 GET jobs/<job_id>/ 또는 웹소켓 /ws/mcu-jobs?job_id=<job_id>로 받습니다.
+    - 오류 처리: 직렬 통신 관련 오류(SerialException, ConnectionException, 큐 대기 초과)는 503으로 반환하여 호출자가 재시도/대체 처리를 할 수 있도록 합니다.
 
     요청 예시 JSON:
     {
@@ -71,6 +74,8 @@ class DE_MCUSerialViewSet(viewsets.ViewSet):
     # SERIAL_WRITE : req_data(RS485) : {'Channel' : 1, 'Timeout': 1000, 'Data': '01 04 08 12 34 56 78 9A BC DE F0 CB FF'}
     """
     serializer_class = DE_MCUSerialRequestSerializer
+    # 동기 요청이 잡 결과를 기다리는 최대 시간(초). 넘으면 503 (잡은 계속 실행되며 job_id로 조회 가능)
+    wait_timeout = 300
 
     def list(self, request):
         # 브라우저에서 DRF의 Browsable API를 통해 POST 폼을 렌더링하기 위해 빈 200 응답을 반환.
@@ -97,59 +102,60 @@ class DE_MCUSerialViewSet(viewsets.ViewSet):
 
         checksum_type = data.get('checksum_type', 'xor_simple')
 
-        # 간단한 직렬 처리
-        client = None
-        try:
-            # create client and perform transact. Keep kwargs structure as requested (serial_number passed through)
-            client = DE_MCU_SerialClient(port=port)
-            kwargs = {'command': command, 'checksum_type': checksum_type, 'serial_number': serial_bytes}
-            if req_data not in (None, ''):
-                kwargs['req_data'] = req_data
-            # perform transact (may return object or dict). We normalize serial key separately below.
-            res = client.transact(**kwargs)
+        if data.get('async_mode'):
+            # 잡으로 넣고 바로 반환 (워커가 실행 후 결과를 Redis 잡 레코드에 기록)
             try:
-                if res.get('processed_data') is not None:
-                # Redis에 STATUS 데이터 저장 (필요시 활성화)
-                    processed = res.get('processed_data')
-                    # processed가 dict인지 확인하고 STATUS 키가 있는 경우에만 처리
-                    if isinstance(processed, dict) and 'STATUS' in processed:
-                        status_data = processed.get('STATUS')
-                        if status_data:
-                            try:
-                                # serial_bytes가 bytes인 경우 16진수 문자열로 변환하여 Redis 키로 사용
-                                if isinstance(serial_bytes, (bytes, bytearray)):
-                                    key = binascii.hexlify(serial_bytes).decode()
-                                else:
-                                    key = str(serial_bytes)
-                                redis_instance.hbulk_update(key, status_data)
-                            except Exception as e:
-                                logger.error(f"Redis STATUS 저장 실패: {e}")
-                    if isinstance(processed, dict) and 'SETUP' in processed:
-                        status_data = processed.get('SETUP')
-                        if status_data:
-                            try:
-                                # serial_bytes가 bytes인 경우 16진수 문자열로 변환하여 Redis 키로 사용
-                                if isinstance(serial_bytes, (bytes, bytearray)):
-                                    key = binascii.hexlify(serial_bytes).decode()
-                                else:
-                                    key = str(serial_bytes)
-                                redis_instance.hbulk_update(key, status_data)
-                            except Exception as e:
-                                logger.error(f"Redis SETUP 저장 실패: {e}")
+                record, coalesced = jobs.enqueue(
+                    port, command, serial_bytes, req_data=req_data, checksum_type=checksum_type,
+                    coalesce=data.get('coalesce', True),
+                )
             except Exception as e:
-                logger.error(f"Redis 저장 실패: {e}")
-            return Response(res, status=status.HTTP_200_OK)
+                logger.error(f"DE-MCU 잡 등록 실패: {e}")
+                return Response({'detail': f'잡 등록 실패: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            return Response({
+                'job_id': record['job_id'],
+                'status': record['status'],
+                'coalesced': coalesced,
+            }, status=status.HTTP_202_ACCEPTED)
+
+        # 잡으로 넣고 워커의 결과를 기다림 (같은 포트의 다른 요청/잡과 순서대로 실행, STATUS/SETUP 저장은 워커가 수행)
+        try:
+            record = jobs.run(
+                port, command, serial_bytes, req_data=req_data if req_data not in (None, '') else None,
+                checksum_type=checksum_type, coalesce=data.get('coalesce', True), timeout=self.wait_timeout,
+            )
+        except TimeoutError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
-            # client.last_error 우선 사용
-            err_msg = None
-            try:
-                if client is not None and getattr(client, 'last_error', None):
-                    err_msg = client.last_error
-            except Exception:
-                err_msg = None
+            logger.error(f"DE-MCU 잡 실행 실패: {e}")
+            return Response({'detail': f'잡 등록 실패: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if record.get('status') == jobs.DONE:
+            return Response(record.get('result'), status=status.HTTP_200_OK)
+        # 연결 실패/버스 대기 초과는 503 (호출자가 재시도/대체 처리)
+        code = status.HTTP_503_SERVICE_UNAVAILABLE if record.get('retryable') else status.HTTP_500_INTERNAL_SERVER_ERROR
+        return Response({'detail': record.get('error'), 'job_id': record.get('job_id')}, status=code)
+
+    @action(detail=False, methods=['get'])
+    def bus(self, request):
+        """잡 워커 프로세스의 포트별 버스 스케줄러 큐/노드 지연 통계와 열린 시리얼 세션 목록."""
+        try:
+            return Response(jobs.bus_metrics(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({'detail': f'버스 상태 조회 실패: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-            exc_name = e.__class__.__name__ if e is not None else ''
-            if err_msg or 'SerialException' in exc_name:
-                return Response({'detail': err_msg or str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-            return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class MCUJobViewSet(viewsets.ViewSet):
+    """DE-MCU 비동기 명령 잡 조회 (GET jobs/<job_id>/).
+
+    status: queued → running → done | failed. done이면 result에 동기 API와 같은 transact 결과,
+    failed면 error와 retryable(연결 실패/버스 대기 초과 여부)이 들어 있습니다.
+    """
+
+    def retrieve(self, request, pk=None):
+        try:
+            record = jobs.get_job(pk)
+        except Exception as e:
+            return Response({'detail': f'잡 조회 실패: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if record is None:
+            return Response({'detail': '잡이 없거나 보관 기간이 지났습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(record, status=status.HTTP_200_OK)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""DE-MCU 잡 완료 알림 웹소켓 (ASGI, /ws/mcu-jobs).
+
+MCUnode.jobs 워커가 JOB_DONE_CHANNEL로 발행하는 완료 레코드를 그대로 전달합니다.
+
+- ?job_id=<id>[,<id>...] : 해당 잡만 전달하고, 모두 끝나면 연결을 닫음
+  (구독 전에 이미 끝난 잡은 접속 직후 Redis 레코드로 바로 전달)
+- job_id가 없으면 모든 잡 완료를 계속 전달
+- settings.DE_MCU_WS_TOKEN이 있으면 ?token= 이 일치해야 함 (/ws/logging-tail과 동일)
+- 구독은 redis.asyncio pub/sub(async_redis_instance)으로 이벤트 루프에서 기다리므로 연결마다 스레드를 쓰지 않음
+
+📌 메시지 예시:
+{"type": "job", "job": {"job_id": "...", "status": "done", "result": {...}, ...}}
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+from . import async_redis_instance, logger
+from .jobs import FINISHED, JOB_DONE_CHANNEL, get_job
+
+
+async def _subscribe():
+    if async_redis_instance is None:
+        raise RuntimeError('Redis 비동기 연결이 없습니다')
+    if async_redis_instance.client is None:
+        await async_redis_instance.connect()
+    if async_redis_instance.client is None:
+        raise RuntimeError('Redis 비동기 연결 실패')
+    pubsub = async_redis_instance.client.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(JOB_DONE_CHANNEL)
+    return pubsub
+
+
+async def _close(pubsub):
+    try:
+        await pubsub.unsubscribe()
+        await (pubsub.aclose() if hasattr(pubsub, 'aclose') else pubsub.close())
+    except Exception:
+        pass
+
+
+async def websocket_app(scope, receive, send):
+    async def _safe_send(msg):
+        try:
+            await send(msg)
+            return True
+        except Exception:
+            return False
+
+    if not await _safe_send({'type': 'websocket.accept'}):
+        return
+    params = parse_qs((scope.get('query_string') or b'').decode('utf-8', 'ignore'))
+    expected = getattr(settings, 'DE_MCU_WS_TOKEN', None)
+    if expected is not None and (params.get('token') or [None])[0] != expected:
+        await _safe_send({'type': 'websocket.send', 'text': json.dumps({'type': 'error', 'msg': 'Unauthorized'})})
+        await _safe_send({'type': 'websocket.close', 'code': 4003})
+        return
+    wanted = {job_id for value in params.get('job_id', []) for job_id in value.split(',') if job_id}
+
+    async def _deliver(record):
+        return await _safe_send({'type': 'websocket.send', 'text': json.dumps({'type': 'job', 'job': record})})
+
+    pubsub = None
+    receiver = None
+    try:
+        pubsub = await _subscribe()
+        # 구독 전에 끝난 잡
+        for job_id in list(wanted):
+            record = await asyncio.to_thread(get_job, job_id)
+            if record is None or record.get('status') in FINISHED:
+                if not await _deliver(record or {'job_id': job_id, 'status': None}):
+                    return
+                wanted.discard(job_id)
+        if params.get('job_id') and not wanted:
+            return
+
+        receiver = asyncio.ensure_future(receive())
+        while True:
+            message = await pubsub.get_message(timeout=1.0)
+            if receiver.done():
+                try:
+                    event = receiver.result()
+                except Exception:
+                    event = {'type': 'websocket.disconnect'}
+                if event.get('type') == 'websocket.disconnect':
+                    return
+                receiver = asyncio.ensure_future(receive())
+            if not message or message.get('type') != 'message':
+                continue
+            try:
+                record = json.loads(message.get('data'))
+            except Exception:
+                continue
+            job_id = record.get('job_id')
+            if wanted and job_id not in wanted:
+                continue
+            if not await _deliver(record):
+                return
+            if wanted:
+                wanted.discard(job_id)
+                if not wanted:
+                    return
+    except Exception as e:
+        logger.error(f'DE-MCU 잡 웹소켓 오류: {e}')
+        await _safe_send({'type': 'websocket.send', 'text': json.dumps({'type': 'error', 'msg': str(e)})})
+    finally:
+        if receiver is not None:
+            receiver.cancel()
+        if pubsub is not None:
+            await _close(pubsub)
+        await _safe_send({'type': 'websocket.close', 'code': 1000})
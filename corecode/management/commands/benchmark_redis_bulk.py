@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+import json
+import time
+
+import redis
+from django.core.management.base import BaseCommand
+
+from py_backend.settings import REDIS_HOST, REDIS_PASSWORD, REDIS_PORT
+from utils.DB.redisDB.main import RedisManager
+
+
+@contextmanager
+def count_round_trips():
+    """redis 연결에서 명령(또는 파이프라인)을 전송한 횟수를 셉니다."""
+    counter = {'round_trips': 0}
+    original = redis.connection.Connection.send_packed_command
+
+    def send_packed_command(self, command, check_health=True):
+        counter['round_trips'] += 1
+        return original(self, command, check_health)
+
+    redis.connection.Connection.send_packed_command = send_packed_command
+    try:
+        yield counter
+    finally:
+        redis.connection.Connection.send_packed_command = original
+
+
+def legacy_bulk_update(client, data, expire=None):
+    """이전 구현: 키마다 GET 후 SET을 파이프라인에 적재 (N+1 왕복)."""
+    pipeline = client.pipeline()
+    for key, new_value in data.items():
+        existing_value = client.get(key)
+        if existing_value:
+            updated_value = json.loads(existing_value)
+            if isinstance(updated_value, dict) and isinstance(new_value, dict):
+                updated_value.update(new_value)
+            else:
+                updated_value = new_value
+        else:
+            updated_value = new_value
+        pipeline.set(key, json.dumps(updated_value), ex=expire)
+    pipeline.execute()
+
+
+def legacy_hbulk_update(client, name, data):
+    """이전 구현: 필드마다 HGET 후 HSET을 파이프라인에 적재 (N+1 왕복)."""
+    pipeline = client.pipeline()
+    for field, new_value in data.items():
+        existing_value = client.hget(name, field)
+        if existing_value:
+            updated_value = json.loads(existing_value)
+            if isinstance(updated_value, dict) and isinstance(new_value, dict):
+                updated_value.update(new_value)
+            else:
+                updated_value = new_value
+        else:
+            updated_value = new_value
+        pipeline.hset(name, field, json.dumps(updated_value))
+    pipeline.execute()
+
+
+class Command(BaseCommand):
+    help = "Benchmark RedisManager merge-style bulk updates (round trips and time per call) against a local redis-server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='*', type=int, dest='sizes', default=[100, 1000, 10000], help='Number of keys/fields per call')
+        parser.add_argument('--chunk-size', type=int, dest='chunk_size', default=None, help='chunk_size passed to bulk_update/hbulk_update')
+        parser.add_argument('--host', dest='host', default=REDIS_HOST, help='Redis host')
+        parser.add_argument('--port', type=int, dest='port', default=REDIS_PORT, help='Redis port')
+        parser.add_argument('--db', type=int, dest='db', default=15, help='Scratch Redis DB (keys under bench:* are overwritten and deleted)')
+
+    def _run(self, name, size, func):
+        with count_round_trips() as counter:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f'{name:<28} {size:>7} keys  {counter["round_trips"]:>7} round trips  {elapsed * 1000:9.2f} ms')
+
+    def handle(self, *args, **options):
+        manager = RedisManager(host=options['host'], port=options['port'], db=options['db'], password=REDIS_PASSWORD)
+        manager.connect()
+        client = manager.client
+        chunk_size = options['chunk_size']
+
+        for size in options['sizes']:
+            keys = [f'bench:key:{i}' for i in range(size)]
+            hash_name = 'bench:hash'
+            data = {key: {'value': i, 'updated_at': time.time()} for i, key in enumerate(keys)}
+            fields = {f'field:{i}': {'value': i} for i in range(size)}
+            client.delete(hash_name, *keys)
+            # 절반은 기존 값이 있는 상태(병합), 절반은 신규 생성
+            manager.bulk_set({key: {'seed': True} for key in keys[::2]})
+            manager.hbulk_set(hash_name, {field: {'seed': True} for field in list(fields)[::2]})
+
+            self.stdout.write(f'--- {size} keys ---')
+            self._run('bulk_update (legacy)', size, lambda: legacy_bulk_update(client, data))
+            self._run('bulk_update', size, lambda: manager.bulk_update(data, chunk_size=chunk_size))
+            self._run('hbulk_update (legacy)', size, lambda: legacy_hbulk_update(client, hash_name, fields))
+            self._run('hbulk_update', size, lambda: manager.hbulk_update(hash_name, fields, chunk_size=chunk_size))
+
+            merged = manager.get_value(keys[0])
+            if merged != {'seed': True, 'value': 0, 'updated_at': data[keys[0]]['updated_at']}:
+                self.stdout.write(self.style.WARNING(f'unexpected merge result for {keys[0]}: {merged}'))
+            client.delete(hash_name, *keys)
+        self.stdout.write(self.style.SUCCESS('done'))
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""시계열 테이블 대량 내보내기 (스트리밍).
+
+DRF 페이지네이션(JSON, 행마다 dict, 최대 9999행) 대신 var_id/timestamp/value/min/max/avg 열만
+서버측 커서(QuerySet.iterator)에서 chunk_size행씩 읽어 바로 기록합니다. 전체 결과를 메모리에
+올리지 않습니다.
+
+- pyarrow가 있으면 Apache Arrow IPC stream('arrow') 또는 Parquet('parquet')
+  (chunk마다 RecordBatch / row group 하나)
+- 없으면 간결한 CSV('csv': 빈 값은 빈 칸, 실수는 최단 표현)
+
+ASGI에서 StreamingHttpResponse는 sync iterator를 sync_to_async(list)로 한꺼번에 읽으므로,
+ASGI 요청에는 aiter_stream()으로 감싼 async generator를 넘겨 chunk마다 하나씩 읽게 합니다.
+"""
+import csv
+import io
+
+from asgiref.sync import sync_to_async
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+from .series import RESOLUTIONS
+
+EXPORT_COLUMNS = ('var_id', 'timestamp', 'value', 'min_value', 'max_value', 'avg_value')
+EXPORT_CHUNK_SIZE = 10000
+FORMATS = ('csv', 'arrow', 'parquet')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+EXTENSIONS = {'csv': 'csv', 'arrow': 'arrows', 'parquet': 'parquet'}
+
+
+def resolve_format(requested=None):
+    """요청 형식을 실제 사용할 형식으로 바꿉니다 (pyarrow가 없으면 항상 'csv')."""
+    requested = (requested or 'auto').lower()
+    if requested not in FORMATS and requested != 'auto':
+        raise ValueError(f'unknown export format: {requested}')
+    if pa is None:
+        return 'csv'
+    return 'parquet' if requested == 'auto' else requested
+
+
+def export_queryset(resolution, start=None, end=None, var_ids=None):
+    """내보낼 (var_id, timestamp, value, min, max, avg) values_list QuerySet."""
+    from . import models
+    model_name = {name: model_name for name, model_name, _ in RESOLUTIONS}.get(resolution)
+    if model_name is None:
+        raise ValueError(f'unknown resolution: {resolution}')
+    qs = getattr(models, model_name).objects.all()
+    if start is not None:
+        qs = qs.filter(timestamp__gte=start)
+    if end is not None:
+        qs = qs.filter(timestamp__lt=end)
+    if var_ids:
+        qs = qs.filter(var_id__in=var_ids)
+    return qs.order_by('timestamp', 'var_id').values_list(*EXPORT_COLUMNS)
+
+
+def iter_chunks(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """서버측 커서에서 chunk_size행씩 목록으로 읽습니다."""
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """pyarrow writer가 쓴 바이트를 모아 두었다가 drain()으로 꺼내는 쓰기 전용 스트림."""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _format_cell(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(sep=' ')
+    return str(value)
+
+
+def iter_csv(chunks):
+    """CSV 바이트를 chunk 단위로 생성합니다."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        writer.writerows([_format_cell(cell) for cell in row] for row in chunk)
+        yield out.getvalue().encode('utf-8')
+        out.seek(0)
+        out.truncate()
+    if out.tell():
+        yield out.getvalue().encode('utf-8')
+
+
+def _arrow_schema():
+    return pa.schema([
+        ('var_id', pa.uint32()),
+        ('timestamp', pa.timestamp('ms')),
+        ('value', pa.float64()),
+        ('min_value', pa.float64()),
+        ('max_value', pa.float64()),
+        ('avg_value', pa.float64()),
+    ])
+
+
+def _record_batch(schema, chunk):
+    columns = list(zip(*chunk))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def iter_arrow(chunks, fmt='arrow'):
+    """Arrow IPC stream 또는 Parquet 바이트를 chunk 단위로 생성합니다."""
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+    try:
+        for chunk in chunks:
+            write(_record_batch(schema, chunk))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+_DONE = object()
+
+
+async def aiter_stream(stream):
+    """
+    sync 바이트 generator를 chunk마다 sync_to_async로 하나씩 읽는 async generator로 바꿉니다.
+    (서버측 커서가 한 스레드에서만 쓰이도록 thread_sensitive=True)
+
+    📌 사용 예시:
+    fmt, stream = iter_export('2min', fmt='csv')
+    StreamingHttpResponse(aiter_stream(stream), content_type=CONTENT_TYPES[fmt])
+    """
+    fetch = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            data = await fetch(stream, _DONE)
+            if data is _DONE:
+                return
+            yield data
+    finally:
+        # 중간에 연결이 끊겨도 커서를 닫음
+        await sync_to_async(stream.close, thread_sensitive=True)()
+
+
+def iter_export(resolution, start=None, end=None, var_ids=None, fmt=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    내보내기 바이트 스트림을 생성합니다.
+    :return: (실제 형식, 바이트 generator)
+
+    📌 사용 예시:
+    fmt, stream = iter_export('2min', start, end, var_ids=[1, 2], fmt='parquet')
+    with open(f'data_2min.{EXTENSIONS[fmt]}', 'wb') as fp:
+        for data in stream:
+            fp.write(data)
+    """
+    fmt = resolve_format(fmt)
+    chunks = iter_chunks(export_queryset(resolution, start, end, var_ids), chunk_size)
+    if fmt == 'csv':
+        return fmt, iter_csv(chunks)
+    return fmt, iter_arrow(chunks, fmt)
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from data_entry import models
+from data_entry.pagination import encode_cursor
+from data_entry.views import TwoMinuteDataViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Seed a large data_2min table inside a rolled-back transaction and record p50/p99 list latency at deep positions for page-number, page-number without COUNT(*) and keyset (cursor) pagination."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, dest='rows', default=1000000, help='Number of data_2min rows to seed')
+        parser.add_argument('--vars', type=int, dest='vars', default=500, help='Number of var_ids (rows per 2-minute bucket)')
+        parser.add_argument('--page-size', type=int, dest='page_size', default=1000, help='page_size query parameter')
+        parser.add_argument('--depths', nargs='*', type=float, dest='depths', default=[0.0, 0.5, 0.9, 0.99], help='Positions to sample, as a fraction of the table')
+        parser.add_argument('--repeat', type=int, dest='repeat', default=20, help='Requests per depth and mode')
+        parser.add_argument('--var-id', type=int, dest='var_id', default=None, help='Also filter by this var_id (exercises the (var_id, timestamp) index)')
+        parser.add_argument('--keep', action='store_true', dest='keep', help='Commit the seeded rows instead of rolling back')
+
+    def _seed(self, rows, var_count):
+        start = datetime(2099, 1, 1)
+        batch = []
+        for i in range(rows):
+            ts = start + timedelta(minutes=2 * (i // var_count))
+            value = float(i % 1000)
+            batch.append(models.TwoMinuteData(timestamp=ts, client_id=1, group_id=0, var_id=i % var_count + 1, value=value,
+                                              value_type='float', min_value=value, max_value=value, avg_value=value, sum_value=value, count=1))
+            if len(batch) >= 10000:
+                models.TwoMinuteData.objects.bulk_create(batch)
+                batch = []
+        models.TwoMinuteData.objects.bulk_create(batch)
+
+    def _measure(self, view, params):
+        factory = APIRequestFactory()
+        request = factory.get('/data_entry/2min/', params)
+        start = time.perf_counter()
+        response = view(request)
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f'{params}: HTTP {response.status_code} {response.data}')
+        return elapsed * 1000
+
+    def _run(self, options):
+        page_size = options['page_size']
+        view = TwoMinuteDataViewSet.as_view({'get': 'list'})
+        base = {'page_size': page_size}
+        qs = models.TwoMinuteData.objects.all()
+        if options['var_id']:
+            base['var_id'] = options['var_id']
+            qs = qs.filter(var_id=options['var_id'])
+        total = qs.count()
+        positions = qs.order_by('-timestamp', '-var_id').values_list('timestamp', 'var_id')
+        self.stdout.write(f'vendor={connection.vendor} rows={total} page_size={page_size}')
+        self.stdout.write(f'{"depth":>6} {"mode":<18} {"p50 ms":>9} {"p99 ms":>9}')
+        for depth in options['depths']:
+            offset = min(int(total * depth) // page_size * page_size, max(0, total - page_size))
+            page = offset // page_size + 1
+            modes = [
+                ('page', dict(base, page=page)),
+                ('page count=false', dict(base, page=page, count='false')),
+            ]
+            if offset:
+                timestamp, var_id = positions[offset - 1]
+                modes.append(('keyset', dict(base, cursor=encode_cursor(timestamp, var_id))))
+            else:
+                modes.append(('keyset', dict(base, pagination='keyset')))
+            for name, params in modes:
+                samples = [self._measure(view, params) for _ in range(options['repeat'])]
+                self.stdout.write(f'{depth:>6.2f} {name:<18} {statistics.median(samples):>9.2f} {_percentile(samples, 99):>9.2f}')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                self._seed(options['rows'], options['vars'])
+                self.stdout.write(f'seeded {options["rows"]} rows in {time.perf_counter() - started:.1f} s')
+                self._run(options)
+                if not options['keep']:
+                    raise _Rollback()
+        except _Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS('done' if options['keep'] else 'done (rolled back)'))
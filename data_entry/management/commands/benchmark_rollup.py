@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from datetime import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from data_entry.rollup import AGGREGATE_FIELDS, CHILD_LEVELS, LEVELS, RollupEngine, _model, merge_partials, sql_rollup, upsert_rows
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def count_queries():
+    """DB로 전송한 SQL 문 수를 셉니다."""
+    counter = {'queries': 0}
+
+    def wrapper(execute, sql, params, many, context):
+        counter['queries'] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def legacy_rollup(level, bucket_start):
+    """이전 구현: 하위 행을 모델 인스턴스로 순회해 Python에서 집계 → 기존 행 SELECT → bulk_create/bulk_update."""
+    child_model = _model(CHILD_LEVELS[level])
+    model = _model(level)
+    bucket_end = bucket_start + LEVELS[level][1]
+    agg = {}
+    for r in child_model.objects.filter(timestamp__gte=bucket_start, timestamp__lt=bucket_end):
+        g = agg.setdefault(r.var_id, {'client_id': r.client_id, 'group_id': r.group_id, 'sum': 0.0, 'count': 0, 'min': None, 'max': None})
+        rc = r.count if r.count is not None else (1 if r.value is not None else 0)
+        if r.sum_value is not None:
+            rs = float(r.sum_value)
+        elif r.avg_value is not None and rc:
+            rs = float(r.avg_value) * int(rc)
+        else:
+            rs = float(r.value) if r.value is not None else 0.0
+        if rc:
+            g['sum'] += rs
+            g['count'] += int(rc)
+        min_c = r.min_value if r.min_value is not None else r.value
+        max_c = r.max_value if r.max_value is not None else r.value
+        if min_c is not None and (g['min'] is None or min_c < g['min']):
+            g['min'] = float(min_c)
+        if max_c is not None and (g['max'] is None or max_c > g['max']):
+            g['max'] = float(max_c)
+    var_ids = list(agg)
+    existing = {}
+    for i in range(0, len(var_ids), 900):  # SQLite 바인딩 변수 수 제한
+        existing.update((r.var_id, r) for r in model.objects.filter(timestamp=bucket_start, var_id__in=var_ids[i:i + 900]))
+    to_create, to_update = [], []
+    for vid, g in agg.items():
+        if g['count'] <= 0:
+            continue
+        avg_value = g['sum'] / g['count']
+        defaults = {'client_id': g['client_id'], 'group_id': g['group_id'], 'value': avg_value, 'value_type': 'float',
+                    'min_value': g['min'], 'max_value': g['max'], 'avg_value': avg_value, 'sum_value': g['sum'], 'count': g['count']}
+        row = existing.get(vid)
+        if row is not None:
+            for k, v in defaults.items():
+                setattr(row, k, v)
+            to_update.append(row)
+        else:
+            to_create.append(model(timestamp=bucket_start, var_id=vid, **defaults))
+    model.objects.bulk_create(to_create, batch_size=1000)
+    model.objects.bulk_update(to_update, AGGREGATE_FIELDS, batch_size=1000)
+
+
+def python_rollup(level, bucket_start, mode):
+    """Python 경로: values()로 하위 행 조회 → Partial 병합 → upsert_rows(mode)."""
+    children = RollupEngine()._load_children(level, bucket_start, var_ids=None)
+    merged = {vid: merge_partials(parts) for vid, parts in children.items()}
+    upsert_rows(level, bucket_start, {vid: p.as_defaults() for vid, p in merged.items() if p.count > 0}, mode=mode)
+
+
+class Command(BaseCommand):
+    help = "Benchmark rolling one parent bucket (default: 1 day of data_1hour into data_daily) with the legacy Python fold, the Python partial path and the set-based SQL path. Runs inside a transaction that is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vars', type=int, dest='vars', default=50000, help='Number of synthetic var_ids')
+        parser.add_argument('--level', dest='level', default='daily', choices=['1hour', 'daily'], help='Parent resolution to build from the level below (data_10min is left out: 2-minute sources are filtered by Variable attributes)')
+        parser.add_argument('--date', dest='date', default='2099-01-01', help='Scratch bucket start (ISO, DB local time)')
+
+    def _run(self, name, func):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f'{name:<32} {counter["queries"]:>7} queries  {elapsed:9.2f} s')
+
+    def _seed(self, level, bucket_start, var_count):
+        child = CHILD_LEVELS[level]
+        child_model = _model(child)
+        width = LEVELS[child][1]
+        slots = int(LEVELS[level][1] / width)
+        batch = []
+        created = 0
+        for slot in range(slots):
+            ts = bucket_start + width * slot
+            for vid in range(1, var_count + 1):
+                value = float((vid * 31 + slot * 7) % 1000) / 10
+                batch.append(child_model(timestamp=ts, client_id=1, group_id=0, var_id=vid, value=value, value_type='float',
+                                         min_value=value - 1, max_value=value + 1, avg_value=value, sum_value=value * 5, count=5))
+                if len(batch) >= 5000:
+                    child_model.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+        child_model.objects.bulk_create(batch)
+        return created + len(batch)
+
+    def handle(self, *args, **options):
+        level = options['level']
+        bucket_start = datetime.fromisoformat(options['date'])
+        model = _model(level)
+        self.stdout.write(f'vendor={connection.vendor} level={level} vars={options["vars"]}')
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                rows = self._seed(level, bucket_start, options['vars'])
+                self.stdout.write(f'seeded {rows} {CHILD_LEVELS[level]} rows in {time.perf_counter() - start:.2f} s')
+                runs = [
+                    ('legacy', lambda: legacy_rollup(level, bucket_start)),
+                    ('python (select + bulk_update)', lambda: python_rollup(level, bucket_start, 'python')),
+                    ('python (update_conflicts)', lambda: python_rollup(level, bucket_start, 'sql')),
+                    ('sql (insert ... select)', lambda: sql_rollup(level, bucket_start)),
+                ]
+                for name, func in runs:
+                    model.objects.filter(timestamp=bucket_start).delete()
+                    self._run(f'{name} [insert]', func)
+                    self._run(f'{name} [update]', func)
+                raise _Rollback()
+        except _Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS('done (rolled back)'))
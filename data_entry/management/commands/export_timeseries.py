@@ -0,0 +1,43 @@
+from datetime import datetime
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_entry.export import EXPORT_CHUNK_SIZE, EXTENSIONS, iter_export
+from data_entry.series import RESOLUTIONS
+
+
+class Command(BaseCommand):
+    help = "Stream a time-series table (var_id, timestamp, value, min, max, avg) to Parquet / Arrow IPC (when pyarrow is installed) or CSV without loading the whole result into memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resolution', dest='resolution', default='2min', choices=[name for name, _, _ in RESOLUTIONS], help='Table to export')
+        parser.add_argument('--start', dest='start', default=None, help='Start (ISO, DB local time, inclusive)')
+        parser.add_argument('--end', dest='end', default=None, help='End (ISO, DB local time, exclusive)')
+        parser.add_argument('--var-id', type=int, nargs='*', dest='var_ids', default=None, help='Only these var_ids')
+        parser.add_argument('--format', dest='format', default='auto', help='auto | parquet | arrow | csv (falls back to csv without pyarrow)')
+        parser.add_argument('--chunk-size', type=int, dest='chunk_size', default=EXPORT_CHUNK_SIZE, help='Rows fetched from the cursor and written per chunk')
+        parser.add_argument('--output', '-o', dest='output', default=None, help="Output file ('-' for stdout; default data_<resolution>.<ext>)")
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.fromisoformat(options['start']) if options['start'] else None
+            end = datetime.fromisoformat(options['end']) if options['end'] else None
+            fmt, stream = iter_export(options['resolution'], start, end, options['var_ids'], options['format'], options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = options['output'] or f"data_{options['resolution']}.{EXTENSIONS[fmt]}"
+        started = time.perf_counter()
+        written = 0
+        fp = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for data in stream:
+                fp.write(data)
+                written += len(data)
+        finally:
+            if fp is not sys.stdout.buffer:
+                fp.close()
+        if output != '-':
+            self.stdout.write(self.style.SUCCESS(f'{fmt}: {written} bytes -> {output} ({time.perf_counter() - started:.2f} s)'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from data_entry import redis_instance
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis key index of 'client_id:var_id' value keys from a SCAN (repair path; the poller keeps the index up to date)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pattern', dest='pattern', default='*:*', help='SCAN MATCH pattern for value keys')
+
+    def handle(self, *args, **options):
+        if redis_instance is None:
+            self.stderr.write(self.style.ERROR('Redis is not connected'))
+            return
+        count = redis_instance.rebuild_key_index(options['pattern'])
+        clients = redis_instance.client.smembers(redis_instance.KEY_INDEX_CLIENTS)
+        self.stdout.write(self.style.SUCCESS(f'indexed {count} keys for {len(clients)} clients'))
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_entry.rollup import LEVELS, rollup_engine
+
+
+class Command(BaseCommand):
+    help = "Re-merge coarser rollup buckets after rows of a finer table were backfilled or edited outside the poller (e.g. --level 2min re-derives data_10min, data_1hour and data_daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--level', dest='level', default='2min', choices=[level for level, (_, _, parent) in LEVELS.items() if parent], help='Resolution whose rows changed')
+        parser.add_argument('--start', dest='start', required=True, help='Start of the changed range (ISO, DB local time)')
+        parser.add_argument('--end', dest='end', required=True, help='End of the changed range, exclusive (ISO, DB local time)')
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.fromisoformat(options['start'])
+            end = datetime.fromisoformat(options['end'])
+        except ValueError as e:
+            raise CommandError(f'invalid --start/--end: {e}')
+        results = rollup_engine.remerge(options['level'], start, end)
+        for ts, result in sorted(results.items()):
+            self.stdout.write(f"{ts.isoformat()}  vars={result['var_count']}  upserted={result['upserted']}")
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} buckets re-merged'))
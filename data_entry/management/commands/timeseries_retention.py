@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_entry.retention import apply_retention_for, convert_to_partitioned
+from data_entry.series import RESOLUTIONS, _model
+
+
+class Command(BaseCommand):
+    help = "Apply the DATA_RETENTION_DAYS policy to the time-series tables (drop expired month partitions on PostgreSQL/MySQL, batched deletes otherwise), or convert a table to monthly RANGE partitions with --convert."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resolution', dest='resolutions', action='append', choices=[name for name, _, _ in RESOLUTIONS], help='Table to process (repeatable, default: all)')
+        parser.add_argument('--dry-run', action='store_true', dest='dry_run', help='Report what would be dropped/deleted (or the conversion SQL) without changing anything')
+        parser.add_argument('--convert', action='store_true', dest='convert', help='Convert the table(s) to monthly partitions (PostgreSQL/MySQL only; rewrites the table)')
+
+    def handle(self, *args, **options):
+        resolutions = options['resolutions'] or [name for name, _, _ in RESOLUTIONS]
+        for resolution in resolutions:
+            if options['convert']:
+                try:
+                    statements = convert_to_partitioned(_model(resolution), dry_run=options['dry_run'])
+                except ValueError as e:
+                    raise CommandError(str(e))
+                for sql in statements:
+                    self.stdout.write(f'{sql};')
+                continue
+            result = apply_retention_for(resolution, dry_run=options['dry_run'])
+            self.stdout.write(f'{resolution}: {json.dumps(result, ensure_ascii=False)}')
+        self.stdout.write(self.style.SUCCESS('done (dry run)' if options['dry_run'] else 'done'))
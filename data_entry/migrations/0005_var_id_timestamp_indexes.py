@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+# PostgreSQL에서만 (var_id, timestamp) 인덱스에 포함할 값 열 (다른 DB는 INCLUDE를 지원하지 않음)
+COVERING_FIELDS = ['value', 'min_value', 'max_value', 'avg_value']
+VAR_TS_INDEXES = {
+    'twominutedata': 'data_2min_var_ts_idx',
+    'tenminutedata': 'data_10min_var_ts_idx',
+    'hourlydata': 'data_1hour_var_ts_idx',
+    'dailydata': 'data_daily_var_ts_idx',
+}
+
+
+def _recreate_var_ts_indexes(apps, schema_editor, include):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    qn = schema_editor.quote_name
+    for model_name, index_name in VAR_TS_INDEXES.items():
+        table = apps.get_model('data_entry', model_name)._meta.db_table
+        suffix = f" INCLUDE ({', '.join(qn(field) for field in include)})" if include else ''
+        schema_editor.execute(f'DROP INDEX IF EXISTS {qn(index_name)}')
+        schema_editor.execute(f'CREATE INDEX {qn(index_name)} ON {qn(table)} ({qn("var_id")}, {qn("timestamp")}){suffix}')
+
+
+def add_covering_columns(apps, schema_editor):
+    _recreate_var_ts_indexes(apps, schema_editor, COVERING_FIELDS)
+
+
+def remove_covering_columns(apps, schema_editor):
+    _recreate_var_ts_indexes(apps, schema_editor, [])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_entry', '0004_dailydata_value_type_hourlydata_value_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='twominutedata',
+            index=models.Index(fields=['var_id', 'timestamp'], name='data_2min_var_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenminutedata',
+            index=models.Index(fields=['var_id', 'timestamp'], name='data_10min_var_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hourlydata',
+            index=models.Index(fields=['var_id', 'timestamp'], name='data_1hour_var_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailydata',
+            index=models.Index(fields=['var_id', 'timestamp'], name='data_daily_var_ts_idx'),
+        ),
+        migrations.RunPython(add_covering_columns, remove_covering_columns),
+    ]
@@ -36,7 +36,11 @@ class TwoMinuteData(BaseTimeSeries):
         verbose_name = '2분 데이터'
         verbose_name_plural = '2분 데이터'
         unique_together = ('timestamp', 'var_id')
-        indexes = [models.Index(fields=['timestamp', 'var_id'])]
+        indexes = [
+            models.Index(fields=['timestamp', 'var_id']),
+            # var_id로 먼저 거르는 조회(차트, 변수별 목록)용. PostgreSQL에서는 마이그레이션 0005가 값 열을 INCLUDE로 추가
+            models.Index(fields=['var_id', 'timestamp'], name='data_2min_var_ts_idx'),
+        ]
 
 
 class TenMinuteData(BaseTimeSeries):
@@ -47,7 +51,10 @@ class TenMinuteData(BaseTimeSeries):
         verbose_name = '10분 데이터'
         verbose_name_plural = '10분 데이터'
         unique_together = ('timestamp', 'var_id')
-        indexes = [models.Index(fields=['timestamp', 'var_id'])]
+        indexes = [
+            models.Index(fields=['timestamp', 'var_id']),
+            models.Index(fields=['var_id', 'timestamp'], name='data_10min_var_ts_idx'),
+        ]
 
 
 class HourlyData(BaseTimeSeries):
@@ -58,7 +65,10 @@ class HourlyData(BaseTimeSeries):
         verbose_name = '1시간 데이터'
         verbose_name_plural = '1시간 데이터'
         unique_together = ('timestamp', 'var_id')
-        indexes = [models.Index(fields=['timestamp', 'var_id'])]
+        indexes = [
+            models.Index(fields=['timestamp', 'var_id']),
+            models.Index(fields=['var_id', 'timestamp'], name='data_1hour_var_ts_idx'),
+        ]
 
 
 class DailyData(BaseTimeSeries):
@@ -69,5 +79,8 @@ class DailyData(BaseTimeSeries):
         verbose_name = '일별 데이터'
         verbose_name_plural = '일별 데이터'
         unique_together = ('timestamp', 'var_id')
-        indexes = [models.Index(fields=['timestamp', 'var_id'])]
+        indexes = [
+            models.Index(fields=['timestamp', 'var_id']),
+            models.Index(fields=['var_id', 'timestamp'], name='data_daily_var_ts_idx'),
+        ]
 
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""시계열(BaseTimeSeries) 목록 API 페이지네이션.
+
+PageNumberPagination은 페이지마다 COUNT(*)와 OFFSET n을 실행하므로 data_2min처럼 큰 테이블에서
+뒤쪽 페이지일수록 느려집니다. TimeSeriesPagination은 다음 두 방식을 추가합니다.
+
+- keyset(cursor) 방식: ?cursor= (첫 페이지는 빈 값 또는 ?pagination=keyset)
+  (timestamp, var_id) 순서의 마지막 위치 다음부터 LIMIT으로 읽습니다. OFFSET/COUNT가 없고
+  (timestamp, var_id)는 테이블마다 unique이므로 동률 처리용 id가 필요 없습니다.
+  ?ordering=timestamp 이면 오름차순, 기본은 내림차순입니다.
+- 기존 page 방식에서 ?count=false 이면 COUNT(*) 없이 page_size+1행으로 다음 페이지 유무만 판단합니다.
+
+keyset 응답은 기본적으로 count를 계산하지 않으며 ?count=true일 때만 포함합니다.
+"""
+import base64
+from collections import OrderedDict
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def encode_cursor(timestamp, var_id):
+    raw = f'{timestamp.isoformat()}|{var_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        timestamp, var_id = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(var_id)
+    except Exception:
+        raise NotFound('Invalid cursor')
+
+
+class TimeSeriesPagination(PageNumberPagination):
+    page_size = 1000
+    page_size_query_param = 'page_size'
+    max_page_size = 9999
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def _flag(self, request, name):
+        value = request.query_params.get(name)
+        if value is None:
+            return None
+        value = value.lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.mode = 'page'
+        if self.cursor_query_param in request.query_params or request.query_params.get('pagination') == 'keyset':
+            self.mode = 'keyset'
+            return self._paginate_keyset(queryset, request)
+        if self._flag(request, self.count_query_param) is False:
+            self.mode = 'page_nocount'
+            return self._paginate_without_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode == 'page':
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.next_link),
+            ('previous', self.previous_link),
+            ('results', data),
+        ]))
+
+    # ------------------------------------------------------------------ #
+    # keyset
+    # ------------------------------------------------------------------ #
+    def _paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        ascending = request.query_params.get('ordering') == 'timestamp'
+        self.count = queryset.count() if self._flag(request, self.count_query_param) else None
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            timestamp, var_id = decode_cursor(cursor)
+            if ascending:
+                queryset = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, var_id__gt=var_id))
+            else:
+                queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, var_id__lt=var_id))
+        order = ('timestamp', 'var_id') if ascending else ('-timestamp', '-var_id')
+        rows = list(queryset.order_by(*order)[:page_size + 1])
+
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        url = request.build_absolute_uri()
+        if has_next:
+            last = rows[-1]
+            self.next_link = replace_query_param(url, self.cursor_query_param, encode_cursor(last.timestamp, last.var_id))
+        else:
+            self.next_link = None
+        # 첫 페이지로 돌아가는 링크만 제공 (역방향 keyset은 지원하지 않음)
+        self.previous_link = remove_query_param(url, self.cursor_query_param) if cursor else None
+        return rows
+
+    # ------------------------------------------------------------------ #
+    # page number without COUNT(*)
+    # ------------------------------------------------------------------ #
+    def _paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            page_number = max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid page.')
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number > 1:
+            raise NotFound('Invalid page.')
+        self.count = None
+        url = request.build_absolute_uri()
+        self.next_link = replace_query_param(url, self.page_query_param, page_number + 1) if len(rows) > page_size else None
+        if page_number <= 1:
+            self.previous_link = None
+        elif page_number == 2:
+            self.previous_link = remove_query_param(url, self.page_query_param)
+        else:
+            self.previous_link = replace_query_param(url, self.page_query_param, page_number - 1)
+        return rows[:page_size]
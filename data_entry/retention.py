@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""시계열 테이블 보존(retention) 및 월 파티션 관리.
+
+해상도별 보존 기간(DATA_RETENTION_DAYS)보다 오래된 데이터를 정리합니다.
+
+- PostgreSQL: 선언적 파티션(PARTITION BY RANGE (timestamp))으로 변환된 테이블은 월 파티션
+  '{table}_pYYYYMM'을 미리 만들고, 보존 기간이 지난 파티션을 DETACH 후 DROP 합니다.
+- MySQL: RANGE 파티션(TO_DAYS(timestamp)) 테이블은 'pmax'를 REORGANIZE 하여 월 파티션 'pYYYYMM'을
+  만들고, 지난 파티션을 DROP PARTITION 합니다.
+- 그 외(SQLite, 파티션 변환 전 테이블): DATA_RETENTION_BATCH_SIZE행씩 나눠서 삭제합니다
+  (한 번에 거대한 DELETE를 실행하지 않음).
+
+기존 테이블을 파티션 테이블로 바꾸는 작업은 partition_conversion_sql()이 만든 SQL을
+management command(timeseries_retention --convert)로 명시적으로 실행합니다.
+"""
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+
+from py_backend.settings import DATA_PARTITION_MONTHS_AHEAD, DATA_RETENTION_BATCH_SIZE, DATA_RETENTION_DAYS
+from utils.logger import log_exceptions, log_execution_time
+from . import logger
+from .series import RESOLUTIONS, _model
+
+PARTITION_VENDORS = ('postgresql', 'mysql')
+
+
+def month_start(dt):
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt, months):
+    month = dt.month - 1 + months
+    return dt.replace(year=dt.year + month // 12, month=month % 12 + 1)
+
+
+def retention_cutoff(resolution, now=None):
+    """보존 기간 경계 시각 (이보다 이전 행은 삭제 대상). 보존 기간이 0이면 None."""
+    days = DATA_RETENTION_DAYS.get(resolution, 0)
+    if not days:
+        return None
+    now = now or datetime.now()
+    return (now - timedelta(days=days)).replace(microsecond=0)
+
+
+def _partition_suffix(month):
+    return month.strftime('p%Y%m')
+
+
+def _parse_partition_month(name):
+    """'..._pYYYYMM' / 'pYYYYMM' → 해당 월 시작 datetime (형식이 다르면 None)."""
+    suffix = name.rsplit('_', 1)[-1]
+    if len(suffix) != 7 or not suffix.startswith('p') or not suffix[1:].isdigit():
+        return None
+    return datetime(int(suffix[1:5]), int(suffix[5:7]), 1)
+
+
+# ---------------------------------------------------------------------- #
+# 파티션 조회/생성/삭제
+# ---------------------------------------------------------------------- #
+def list_partitions(model):
+    """파티션 이름 목록. 파티션 테이블이 아니면 None."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s", [table])
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = %s ORDER BY child.relname",
+                [table],
+            )
+            return [row[0] for row in cursor.fetchall()]
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION",
+                [table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+            return names or None
+    return None
+
+
+def _month_partition_sql(model, month):
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    upper = add_months(month, 1)
+    if connection.vendor == 'postgresql':
+        return (f"CREATE TABLE IF NOT EXISTS {qn(f'{table}_{_partition_suffix(month)}')} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d %H:%M:%S}') TO ('{upper:%Y-%m-%d %H:%M:%S}')")
+    return f"PARTITION {_partition_suffix(month)} VALUES LESS THAN (TO_DAYS('{upper:%Y-%m-%d}'))"
+
+
+def ensure_partitions(model, partitions, now=None, months_ahead=DATA_PARTITION_MONTHS_AHEAD):
+    """이번 달부터 months_ahead개월 뒤까지의 월 파티션을 만듭니다. 만든 파티션 이름 목록을 반환합니다."""
+    existing = {_parse_partition_month(name) for name in partitions}
+    first = month_start(now or datetime.now())
+    missing = [add_months(first, i) for i in range(months_ahead + 1) if add_months(first, i) not in existing]
+    if not missing:
+        return []
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for month in missing:
+                cursor.execute(_month_partition_sql(model, month))
+        else:
+            # MAXVALUE 파티션을 잘라 새 월 파티션을 앞에 끼워 넣음
+            defs = ', '.join(_month_partition_sql(model, month) for month in missing)
+            cursor.execute(f"ALTER TABLE {qn(model._meta.db_table)} REORGANIZE PARTITION pmax INTO ({defs}, PARTITION pmax VALUES LESS THAN MAXVALUE)")
+    return [_partition_suffix(month) for month in missing]
+
+
+def drop_expired_partitions(model, partitions, cutoff, dry_run=False):
+    """월 전체가 cutoff 이전인 파티션을 삭제합니다. 삭제한(dry_run이면 삭제할) 파티션 이름 목록을 반환합니다."""
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    expired = [
+        name for name in partitions
+        if _parse_partition_month(name) is not None and add_months(_parse_partition_month(name), 1) <= cutoff
+    ]
+    if dry_run or not expired:
+        return expired
+    with connection.cursor() as cursor:
+        for name in expired:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                cursor.execute(f"DROP TABLE {qn(name)}")
+            else:
+                cursor.execute(f"ALTER TABLE {qn(table)} DROP PARTITION {name}")
+            logger.info(f"retention: {table} 파티션 {name} 삭제 (cutoff={cutoff.isoformat()})")
+    return expired
+
+
+# ---------------------------------------------------------------------- #
+# 파티션이 없는 테이블: 나눠서 삭제
+# ---------------------------------------------------------------------- #
+def delete_in_batches(model, cutoff, batch_size=DATA_RETENTION_BATCH_SIZE, max_batches=None, dry_run=False):
+    """timestamp < cutoff 행을 batch_size행씩 별도 트랜잭션으로 삭제합니다. 삭제한 행 수를 반환합니다."""
+    qs = model.objects.filter(timestamp__lt=cutoff)
+    if dry_run:
+        return qs.count()
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(qs.order_by('timestamp').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            count, _ = model.objects.filter(id__in=ids).delete()
+        deleted += count
+        batches += 1
+    return deleted
+
+
+def apply_retention_for(resolution, now=None, dry_run=False):
+    """해상도 하나에 보존 정책을 적용합니다."""
+    model = _model(resolution)
+    cutoff = retention_cutoff(resolution, now)
+    result = {'table': model._meta.db_table, 'cutoff': cutoff.isoformat() if cutoff else None}
+    partitions = list_partitions(model) if connection.vendor in PARTITION_VENDORS else None
+    if partitions is not None:
+        result['mode'] = 'partition'
+        result['created_partitions'] = [] if dry_run else ensure_partitions(model, partitions, now)
+        result['dropped_partitions'] = drop_expired_partitions(model, partitions, cutoff, dry_run) if cutoff else []
+        # 월 경계에 걸친 나머지 행(삭제된 파티션 이후 ~ cutoff)은 나눠서 삭제
+        result['deleted_rows'] = delete_in_batches(model, cutoff, dry_run=dry_run) if cutoff else 0
+    else:
+        result['mode'] = 'delete'
+        result['deleted_rows'] = delete_in_batches(model, cutoff, dry_run=dry_run) if cutoff else 0
+    return result
+
+
+@log_exceptions(logger)
+@log_execution_time(logger)
+def apply_retention(now=None, dry_run=False):
+    """
+    모든 해상도 테이블에 보존 정책을 적용합니다.
+
+    사용 예시:
+    - apply_retention()
+    - apply_retention(dry_run=True)
+    - scheduler.add_job(apply_retention, 'cron', hour=3, minute=30)
+    """
+    results = {}
+    for resolution, _, _ in RESOLUTIONS:
+        try:
+            results[resolution] = apply_retention_for(resolution, now, dry_run)
+        except Exception as e:
+            logger.error(f"retention: {resolution} 처리 실패: {e}")
+            results[resolution] = {'error': str(e)}
+    logger.info(f"apply_retention completed: {results}")
+    return results
+
+
+# ---------------------------------------------------------------------- #
+# 기존 테이블 → 월 파티션 테이블 변환
+# ---------------------------------------------------------------------- #
+def _months_between(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_conversion_sql(model, now=None, months_ahead=DATA_PARTITION_MONTHS_AHEAD):
+    """기존 테이블을 월 RANGE 파티션 테이블로 바꾸는 SQL 목록을 반환합니다.
+
+    파티션 키(timestamp)가 모든 unique 키에 포함되어야 하므로 기본키를 (id, timestamp)로 바꿉니다.
+    (timestamp, var_id) unique 제약은 그대로 유지됩니다.
+    """
+    if connection.vendor not in PARTITION_VENDORS:
+        raise ValueError(f'{connection.vendor} does not support table partitioning')
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    now = now or datetime.now()
+    bounds = model.objects.order_by('timestamp').values_list('timestamp', flat=True)
+    first = bounds.first() or now
+    months = list(_months_between(first, add_months(month_start(now), months_ahead)))
+
+    if connection.vendor == 'mysql':
+        defs = ', '.join(_month_partition_sql(model, month) for month in months)
+        return [
+            f"ALTER TABLE {qn(table)} DROP PRIMARY KEY, ADD PRIMARY KEY (id, {qn('timestamp')})",
+            f"ALTER TABLE {qn(table)} PARTITION BY RANGE (TO_DAYS({qn('timestamp')})) ({defs}, PARTITION pmax VALUES LESS THAN MAXVALUE)",
+        ]
+
+    legacy = qn(f'{table}_legacy')
+    statements = [
+        f"ALTER TABLE {qn(table)} RENAME TO {legacy}",
+        f"CREATE TABLE {qn(table)} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING IDENTITY) PARTITION BY RANGE ({qn('timestamp')})",
+        f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {qn('timestamp')})",
+    ]
+    statements += [_month_partition_sql(model, month) for month in months]
+    statements += [
+        f"CREATE TABLE IF NOT EXISTS {qn(f'{table}_pdefault')} PARTITION OF {qn(table)} DEFAULT",
+        f"INSERT INTO {qn(table)} SELECT * FROM {legacy}",
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {qn(table)}))",
+        f"DROP TABLE {legacy}",
+    ]
+    # 기존 테이블과 함께 삭제된 인덱스/unique 제약을 Django 이름 그대로 다시 생성
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+        for field in model._meta.local_fields:
+            if field.db_index and not field.unique and not field.primary_key:
+                editor.execute(editor._create_index_sql(model, fields=[field]))
+        for fields in model._meta.unique_together:
+            editor.execute(editor._create_unique_sql(model, [model._meta.get_field(name) for name in fields]))
+        for index in model._meta.indexes:
+            editor.add_index(model, index)
+    statements += [str(sql).rstrip(';') for sql in editor.collected_sql]
+    return statements
+
+
+def convert_to_partitioned(model, dry_run=False):
+    """partition_conversion_sql()을 한 트랜잭션에서 실행합니다. 실행한(dry_run이면 실행할) SQL 목록을 반환합니다."""
+    if list_partitions(model) is not None:
+        raise ValueError(f'{model._meta.db_table} is already partitioned')
+    statements = partition_conversion_sql(model)
+    if dry_run:
+        return statements
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    logger.info(f"retention: {model._meta.db_table}를 월 파티션 테이블로 변환했습니다 ({len(statements)} statements)")
+    return statements
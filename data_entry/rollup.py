@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""증분(streaming) 롤업 모듈: data_2min → data_10min → data_1hour → data_daily.
+
+기존 집계 작업은 실행할 때마다 Variable 전체를 읽어 '기록' 속성을 Python에서 거르고,
+하위 테이블의 모델 인스턴스를 한 줄씩 순회하며 min/max/avg/sum/count를 처음부터 다시 계산했습니다.
+(일간 작업은 하루치 10분/2분 데이터를 모두 다시 읽음)
+
+이 모듈은 var_id·버킷별 부분 집계(Partial: sum, count, min, max, last)를 메모리에 유지합니다.
+
+- 하위 버킷이 확정되면(ingest) 곧바로 상위 버킷의 부분 집계에 반영됩니다.
+  상위 버킷은 {var_id: {하위 버킷 시각: Partial}} 형태로 보관하므로 같은 하위 버킷이 다시 들어와도
+  중복 합산되지 않고 교체됩니다.
+- 상위 버킷이 확정되면(finalize) 한 번 업서트한 뒤 그 결과를 다시 한 단계 위 버킷에 ingest 합니다.
+  따라서 각 해상도의 비용은 새로 들어온 행 수에 비례합니다.
+- 이미 확정된 버킷에 늦게 들어온/백필된 하위 버킷은 해당 상위 버킷을 즉시 다시 병합·업서트하고
+  그 위 단계까지 전파합니다.
+- 프로세스 재시작 등으로 메모리에 없는 버킷을 처음 건드릴 때는 그 버킷의 하위 행만 DB에서 읽어 채웁니다.
+
+DATA_ROLLUP_MODE='sql'(기본값은 'python', SQL 문은 SQLite에서만 검증됨)이고 DB가 SQLite/PostgreSQL/MySQL이면
+- 메모리에 없는 버킷 확정(재시작, remerge)은 INSERT ... SELECT ... GROUP BY var_id와
+  ON CONFLICT / ON DUPLICATE KEY UPDATE로 DB 안에서 처리하고 (sql_rollup)
+- 업서트는 기존 행 SELECT + bulk_update(CASE 문) 대신 bulk_create(update_conflicts=True)를 사용합니다.
+그 외에는 Python 경로(하위 행 values() 조회 → Partial 병합 → bulk_create/bulk_update)를 사용합니다.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from py_backend.settings import DATA_ROLLUP_MODE
+from . import logger
+
+# 상위 집계에 포함할 변수 속성
+RECORD_ATTRIBUTE = '기록'
+# '기록' 변수 id 캐시 유지 시간(초)
+RECORD_VAR_CACHE_SEC = 60
+
+AGGREGATE_FIELDS = ['client_id', 'group_id', 'value', 'value_type', 'min_value', 'max_value', 'avg_value', 'sum_value', 'count']
+SOURCE_FIELDS = ('timestamp', 'var_id', 'client_id', 'group_id', 'value', 'min_value', 'max_value', 'avg_value', 'sum_value', 'count')
+
+# 해상도 이름 -> (모델 이름, 버킷 폭, 상위 해상도)
+LEVELS = {
+    '2min': ('TwoMinuteData', timedelta(minutes=2), '10min'),
+    '10min': ('TenMinuteData', timedelta(minutes=10), '1hour'),
+    '1hour': ('HourlyData', timedelta(hours=1), 'daily'),
+    'daily': ('DailyData', timedelta(days=1), None),
+}
+# 상위 해상도 -> 하위 해상도
+CHILD_LEVELS = {parent: child for child, (_, _, parent) in LEVELS.items() if parent}
+
+# INSERT ... SELECT 업서트를 지원하는 DB (django connection.vendor)
+SQL_VENDORS = ('sqlite', 'postgresql', 'mysql')
+
+_record_var_cache = {'ids': None, 'loaded_at': 0.0}
+_record_var_lock = threading.Lock()
+
+
+def _model(level):
+    from . import models
+    return getattr(models, LEVELS[level][0])
+
+
+def floor_bucket(level, ts):
+    """ts를 해당 해상도 버킷 시작 시각으로 내림합니다."""
+    width = LEVELS[level][1]
+    if width >= timedelta(days=1):
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if width >= timedelta(hours=1):
+        return ts.replace(minute=0, second=0, microsecond=0)
+    minutes = int(width.total_seconds() // 60)
+    return ts.replace(minute=(ts.minute // minutes) * minutes, second=0, microsecond=0)
+
+
+def record_var_ids(max_age=RECORD_VAR_CACHE_SEC):
+    """'기록' 속성 변수 id 집합 (max_age초 동안 캐시).
+
+    JSONField contains 조회는 SQLite에서 지원되지 않으므로 속성 필터는 Python에서 수행합니다.
+    """
+    now = time.monotonic()
+    ids = _record_var_cache['ids']
+    if ids is not None and now - _record_var_cache['loaded_at'] < max_age:
+        return ids
+    with _record_var_lock:
+        if _record_var_cache['ids'] is not None and now - _record_var_cache['loaded_at'] < max_age:
+            return _record_var_cache['ids']
+        from LSISsocket.models import Variable
+        ids = set()
+        try:
+            for vid, attrs in Variable.objects.values_list('id', 'attributes'):
+                try:
+                    if RECORD_ATTRIBUTE in list(attrs or []):
+                        ids.add(int(vid))
+                except Exception:
+                    continue
+        except Exception as e:
+            logger.error(f"rollup: '기록' 변수 조회 실패: {e}")
+            return _record_var_cache['ids'] or set()
+        _record_var_cache['ids'] = ids
+        _record_var_cache['loaded_at'] = now
+        return ids
+
+
+class Partial:
+    """var_id 하나, 버킷 하나의 부분 집계."""
+
+    __slots__ = ('sum', 'count', 'min', 'max', 'last', 'last_ts', 'client_id', 'group_id')
+
+    def __init__(self, client_id=None, group_id=None):
+        self.sum = 0.0
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.last = None
+        self.last_ts = None
+        self.client_id = client_id
+        self.group_id = group_id
+
+    @classmethod
+    def from_row(cls, row, ts=None):
+        """집계 테이블 한 행(dict)으로부터 Partial을 만듭니다.
+
+        - count가 없으면 value 유무로 1/0
+        - sum_value가 없으면 avg_value*count, 그것도 없으면 value
+        - min/max가 없으면 value
+        """
+        partial = cls(row.get('client_id'), row.get('group_id'))
+        value = row.get('value')
+        count = row.get('count')
+        count = int(count) if count is not None else (1 if value is not None else 0)
+        if row.get('sum_value') is not None:
+            total = float(row['sum_value'])
+        elif row.get('avg_value') is not None and count:
+            total = float(row['avg_value']) * count
+        else:
+            total = float(value) if value is not None else 0.0
+        if count:
+            partial.sum = total
+            partial.count = count
+        min_c = row.get('min_value') if row.get('min_value') is not None else value
+        max_c = row.get('max_value') if row.get('max_value') is not None else value
+        partial.min = float(min_c) if min_c is not None else None
+        partial.max = float(max_c) if max_c is not None else None
+        partial.last = value
+        partial.last_ts = ts if ts is not None else row.get('timestamp')
+        return partial
+
+    def merge(self, other):
+        """다른 Partial을 합칩니다 (결합법칙이 성립하므로 순서와 무관)."""
+        self.sum += other.sum
+        self.count += other.count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        if other.last_ts is not None and (self.last_ts is None or other.last_ts >= self.last_ts):
+            self.last = other.last
+            self.last_ts = other.last_ts
+        if self.client_id is None:
+            self.client_id = other.client_id
+        if self.group_id is None:
+            self.group_id = other.group_id
+        return self
+
+    def as_defaults(self):
+        """상위 집계 테이블에 저장할 필드 (value에는 평균을 저장)."""
+        avg_value = (self.sum / self.count) if self.count > 0 else None
+        return {
+            'client_id': self.client_id or 0,
+            'group_id': self.group_id or 0,
+            'value': avg_value,
+            'value_type': 'float' if avg_value is not None else 'null',
+            'min_value': self.min,
+            'max_value': self.max,
+            'avg_value': avg_value,
+            'sum_value': self.sum,
+            'count': self.count,
+        }
+
+
+def merge_partials(children):
+    """{하위 버킷 시각: Partial} → 합친 Partial (하위 버킷 시각 순으로 병합)."""
+    merged = Partial()
+    for ts in sorted(children):
+        merged.merge(children[ts])
+    return merged
+
+
+def use_sql(mode=None):
+    """SQL 롤업/충돌 업서트 사용 여부 (DATA_ROLLUP_MODE와 DB 종류로 결정)."""
+    from django.db import connection
+    return (mode or DATA_ROLLUP_MODE) == 'sql' and connection.vendor in SQL_VENDORS
+
+
+def upsert_rows(level, timestamp, defaults_by_var, mode=None):
+    """{var_id: 필드 dict}를 해당 해상도 테이블의 timestamp 버킷에 업서트합니다.
+
+    SQL 모드에서는 bulk_create(update_conflicts=True) 한 번으로 처리하고,
+    Python 모드에서는 기존 행을 조회해 bulk_create/bulk_update로 나눕니다.
+
+    :returns: 업서트한 행 수
+    """
+    model = _model(level)
+    if not defaults_by_var:
+        return 0
+    if use_sql(mode):
+        from django.db import connection
+        kwargs = {'update_conflicts': True, 'update_fields': AGGREGATE_FIELDS + ['updated_at']}
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs['unique_fields'] = ['timestamp', 'var_id']
+        objs = [model(timestamp=timestamp, var_id=vid, **defaults) for vid, defaults in defaults_by_var.items()]
+        model.objects.bulk_create(objs, batch_size=1000, **kwargs)
+        return len(objs)
+    var_ids = list(defaults_by_var)
+    existing = {}
+    # SQLite 바인딩 변수 수 제한을 넘지 않도록 나눠서 조회
+    for i in range(0, len(var_ids), 900):
+        existing.update((r.var_id, r) for r in model.objects.filter(timestamp=timestamp, var_id__in=var_ids[i:i + 900]))
+    to_create = []
+    to_update = []
+    for vid, defaults in defaults_by_var.items():
+        row = existing.get(vid)
+        if row is not None:
+            for k, v in defaults.items():
+                setattr(row, k, v)
+            to_update.append(row)
+        else:
+            to_create.append(model(timestamp=timestamp, var_id=vid, **defaults))
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=1000)
+    if to_update:
+        model.objects.bulk_update(to_update, AGGREGATE_FIELDS, batch_size=1000)
+    return len(to_create) + len(to_update)
+
+
+def sql_rollup(level, bucket_start, var_ids=None):
+    """하위 해상도 행을 DB 안에서 집계해 level 버킷 하나를 업서트합니다.
+
+    INSERT INTO <상위> SELECT var_id, MIN, MAX, SUM, COUNT ... FROM <하위> GROUP BY var_id
+    + ON CONFLICT (timestamp, var_id) DO UPDATE (SQLite, PostgreSQL)
+    / ON DUPLICATE KEY UPDATE (MySQL).
+    행별 규칙은 Partial.from_row와 같습니다 (count/sum/min/max가 없으면 value로 대체).
+
+    :param var_ids: 지정하면 해당 변수만 (2분 → 10분은 지정이 없으면 '기록' 변수만)
+    :returns: DB가 보고한 영향 행 수
+    """
+    from django.db import connection
+    from django.utils import timezone
+
+    child = CHILD_LEVELS[level]
+    if var_ids is None and child == '2min':
+        var_ids = record_var_ids()
+    if var_ids is not None:
+        var_ids = sorted(int(vid) for vid in var_ids)
+        if not var_ids:
+            return 0
+
+    qn = connection.ops.quote_name
+    child_table = qn(_model(child)._meta.db_table)
+    parent_table = qn(_model(level)._meta.db_table)
+    value, count = qn('value'), qn('count')
+    c_expr = f"COALESCE({count}, CASE WHEN {value} IS NULL THEN 0 ELSE 1 END)"
+    var_filter = f" AND var_id IN ({', '.join(str(vid) for vid in var_ids)})" if var_ids is not None else ''
+    columns = ['timestamp', 'client_id', 'group_id', 'var_id', 'value', 'value_type', 'min_value',
+               'max_value', 'avg_value', 'sum_value', 'count', 'created_at', 'updated_at']
+    update_columns = AGGREGATE_FIELDS + ['updated_at']
+    if connection.vendor == 'mysql':
+        conflict = 'ON DUPLICATE KEY UPDATE ' + ', '.join(f'{qn(col)} = VALUES({qn(col)})' for col in update_columns)
+    else:
+        conflict = (f"ON CONFLICT ({qn('timestamp')}, {qn('var_id')}) DO UPDATE SET "
+                    + ', '.join(f'{qn(col)} = EXCLUDED.{qn(col)}' for col in update_columns))
+    sql = (
+        f"INSERT INTO {parent_table} ({', '.join(qn(col) for col in columns)}) "
+        f"SELECT %s, MIN(client_id), MIN(group_id), var_id, SUM(s) * 1.0 / SUM(c), 'float', MIN(mn), MAX(mx), "
+        f"SUM(s) * 1.0 / SUM(c), SUM(s), SUM(c), %s, %s "
+        f"FROM (SELECT var_id, client_id, group_id, {c_expr} AS c, "
+        f"CASE WHEN {c_expr} = 0 THEN 0 ELSE COALESCE(sum_value, avg_value * {c_expr}, {value}, 0) END AS s, "
+        f"COALESCE(min_value, {value}) AS mn, COALESCE(max_value, {value}) AS mx "
+        f"FROM {child_table} WHERE {qn('timestamp')} >= %s AND {qn('timestamp')} < %s{var_filter}) src "
+        f"GROUP BY var_id HAVING SUM(c) > 0 "
+        f"{conflict}"
+    )
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [bucket_start, now, now, bucket_start, bucket_start + LEVELS[level][1]])
+        return cursor.rowcount
+
+
+class RollupEngine:
+    """해상도별 열린 버킷의 부분 집계를 유지하고 상위 해상도로 전파합니다.
+
+    📌 사용 예시:
+    rollup_engine.ingest('2min', bucket_ts, {var_id: Partial.from_row(row)})
+    rollup_engine.finalize_due('10min', now)       # 끝난 10분 버킷 확정 → 1시간 버킷에 반영
+    rollup_engine.remerge('2min', start, end)      # 백필된 2분 데이터로 상위 버킷 재병합
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # 상위 해상도 -> {버킷 시작: {var_id: {하위 버킷 시각: Partial}}}
+        self._buckets = {level: {} for level in CHILD_LEVELS}
+        # 상위 해상도 -> 확정이 끝난 가장 늦은 버킷 끝 시각
+        self._finalized_until = {level: None for level in CHILD_LEVELS}
+        self.stats = {level: {'ingested': 0, 'finalized': 0, 'late': 0, 'seeded_rows': 0} for level in CHILD_LEVELS}
+
+    def _load_children(self, level, bucket_start, var_ids=None):
+        """level 버킷 하나에 속하는 하위 해상도 행을 DB에서 읽어 {var_id: {ts: Partial}}로 반환합니다."""
+        child = CHILD_LEVELS[level]
+        width = LEVELS[level][1]
+        qs = _model(child).objects.filter(timestamp__gte=bucket_start, timestamp__lt=bucket_start + width)
+        if var_ids is not None:
+            qs = qs.filter(var_id__in=list(var_ids))
+        elif child == '2min':
+            qs = qs.filter(var_id__in=list(record_var_ids()))
+        children = {}
+        rows = 0
+        for row in qs.values(*SOURCE_FIELDS).iterator():
+            children.setdefault(row['var_id'], {})[row['timestamp']] = Partial.from_row(row)
+            rows += 1
+        self.stats[level]['seeded_rows'] += rows
+        return children
+
+    def _bucket(self, level, bucket_start):
+        bucket = self._buckets[level].get(bucket_start)
+        if bucket is None:
+            bucket = self._load_children(level, bucket_start)
+            self._buckets[level][bucket_start] = bucket
+        return bucket
+
+    def _is_finalized(self, level, bucket_start):
+        until = self._finalized_until[level]
+        return until is not None and bucket_start + LEVELS[level][1] <= until
+
+    def ingest(self, child_level, child_ts, partials):
+        """확정된 하위 버킷(child_ts)의 {var_id: Partial}을 상위 버킷에 반영합니다.
+
+        상위 버킷이 이미 확정된 경우(늦은/백필 데이터) 해당 변수만 DB에서 다시 읽어 병합·업서트하고
+        위로 전파합니다.
+        """
+        level = LEVELS[child_level][2]
+        if level is None or not partials:
+            return
+        bucket_start = floor_bucket(level, child_ts)
+        with self._lock:
+            self.stats[level]['ingested'] += len(partials)
+            if self._is_finalized(level, bucket_start):
+                self.stats[level]['late'] += 1
+                logger.info(f"rollup: 확정된 {level} 버킷 {bucket_start.isoformat()}에 늦은 데이터 {len(partials)}건, 재병합")
+                bucket = self._load_children(level, bucket_start, var_ids=partials.keys())
+                for vid, partial in partials.items():
+                    bucket.setdefault(vid, {})[child_ts] = partial
+                self._finalize_bucket(level, bucket_start, bucket)
+                return
+            bucket = self._bucket(level, bucket_start)
+            for vid, partial in partials.items():
+                bucket.setdefault(vid, {})[child_ts] = partial
+
+    def finalize(self, level, bucket_start):
+        """level 버킷을 확정합니다: 병합 → 업서트 → 상위 해상도에 ingest.
+
+        메모리에 없는 버킷은 SQL 모드이면 sql_rollup으로 DB 안에서 집계합니다.
+
+        :returns: {'upserted', 'var_count', 'sources'} (SQL 경로의 sources는 None)
+        """
+        with self._lock:
+            bucket = self._buckets[level].pop(bucket_start, None)
+            if bucket is None:
+                if use_sql():
+                    return self._finalize_sql(level, bucket_start)
+                bucket = self._load_children(level, bucket_start)
+            return self._finalize_bucket(level, bucket_start, bucket)
+
+    def _mark_finalized(self, level, bucket_start):
+        end = bucket_start + LEVELS[level][1]
+        if self._finalized_until[level] is None or end > self._finalized_until[level]:
+            self._finalized_until[level] = end
+        self.stats[level]['finalized'] += 1
+
+    def _finalize_bucket(self, level, bucket_start, bucket):
+        merged = {vid: merge_partials(children) for vid, children in bucket.items()}
+        merged = {vid: partial for vid, partial in merged.items() if partial.count > 0}
+        upserted = upsert_rows(level, bucket_start, {vid: p.as_defaults() for vid, p in merged.items()})
+        self._mark_finalized(level, bucket_start)
+        self.ingest(level, bucket_start, merged)
+        return {
+            'upserted': upserted,
+            'var_count': len(merged),
+            'sources': sum(len(children) for children in bucket.values()),
+        }
+
+    def _finalize_sql(self, level, bucket_start):
+        affected = sql_rollup(level, bucket_start)
+        self._mark_finalized(level, bucket_start)
+        # 상위 해상도 부분 집계에 넘길 결과만 다시 읽음 (변수당 한 행)
+        merged = {
+            row['var_id']: Partial.from_row(row)
+            for row in _model(level).objects.filter(timestamp=bucket_start).values(*SOURCE_FIELDS).iterator()
+        }
+        self.ingest(level, bucket_start, merged)
+        return {'upserted': affected, 'var_count': len(merged), 'sources': None}
+
+    def finalize_due(self, level, now):
+        """끝 시각이 now 이전인 level 버킷을 모두 확정합니다.
+
+        직전 버킷이 메모리에 없더라도(재시작 등) DB의 하위 행으로 한 번 확정합니다.
+        """
+        width = LEVELS[level][1]
+        previous = floor_bucket(level, now) - width
+        with self._lock:
+            due = sorted(ts for ts in self._buckets[level] if ts + width <= now)
+            if previous not in due and not self._is_finalized(level, previous):
+                due.append(previous)
+            results = {ts: self.finalize(level, ts) for ts in sorted(due)}
+        return results
+
+    def remerge(self, child_level, start, end):
+        """[start, end) 구간의 child_level 행이 외부에서 바뀐 경우 상위 버킷을 모두 다시 병합합니다."""
+        level = LEVELS[child_level][2]
+        if level is None:
+            return {}
+        width = LEVELS[level][1]
+        results = {}
+        ts = floor_bucket(level, start)
+        with self._lock:
+            while ts < end:
+                self._buckets[level].pop(ts, None)
+                results[ts] = self.finalize(level, ts)
+                ts += width
+        return results
+
+    def snapshot(self):
+        """열린 버킷과 통계 요약 (모니터링용)."""
+        with self._lock:
+            return {
+                level: {
+                    'open_buckets': [ts.isoformat() for ts in sorted(buckets)],
+                    'open_vars': sum(len(bucket) for bucket in buckets.values()),
+                    'finalized_until': self._finalized_until[level].isoformat() if self._finalized_until[level] else None,
+                    **self.stats[level],
+                }
+                for level, buckets in self._buckets.items()
+            }
+
+
+rollup_engine = RollupEngine()
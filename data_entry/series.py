@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""차트용 시계열 조회: 해상도 자동 선택 + 서버측 다운샘플링.
+
+- 요청 구간(start~end)과 max_points로부터 변수당 점 수가 max_points 이하가 되는
+  가장 세밀한 테이블(2min → 10min → 1hour → daily)을 고릅니다. daily도 넘으면 daily를 사용합니다.
+- 모델 serializer 대신 values_list로 (var_id, timestamp, 값)만 읽어 열 지향 형태로 반환합니다.
+  {var_id: {'t': [...], 'v': [...]}}
+- downsample='lttb' 또는 'minmax'이면 변수별 점 수가 max_points를 넘을 때 서버에서 줄입니다.
+"""
+from datetime import timedelta
+
+from utils.calculation.downsample import methods as downsample_methods
+
+# (이름, 모델 이름, 버킷 폭) - 세밀한 순서
+RESOLUTIONS = [
+    ('2min', 'TwoMinuteData', timedelta(minutes=2)),
+    ('10min', 'TenMinuteData', timedelta(minutes=10)),
+    ('1hour', 'HourlyData', timedelta(hours=1)),
+    ('daily', 'DailyData', timedelta(days=1)),
+]
+# 조회 가능한 값 필드 (쿼리 파라미터 → 모델 필드)
+FIELDS = {
+    'value': 'value',
+    'avg': 'avg_value',
+    'min': 'min_value',
+    'max': 'max_value',
+    'sum': 'sum_value',
+}
+DEFAULT_MAX_POINTS = 1000
+MAX_POINTS_LIMIT = 20000
+
+
+def choose_resolution(start, end, max_points):
+    """변수당 예상 점 수가 max_points 이하인 가장 세밀한 해상도 이름을 반환합니다."""
+    span = end - start
+    for name, _, width in RESOLUTIONS:
+        if span / width <= max_points:
+            return name
+    return RESOLUTIONS[-1][0]
+
+
+def _model(resolution):
+    from . import models
+    for name, model_name, _ in RESOLUTIONS:
+        if name == resolution:
+            return getattr(models, model_name)
+    raise ValueError(f'unknown resolution: {resolution}')
+
+
+def query_series(var_ids, start, end, max_points=DEFAULT_MAX_POINTS, downsample=None, field='value', resolution=None, time_format='iso'):
+    """
+    변수별 시계열을 열 지향 형태로 조회합니다.
+    :param var_ids: 변수 id 목록
+    :param start: 시작 시각 (포함, DB 로컬 naive)
+    :param end: 끝 시각 (제외)
+    :param max_points: 변수당 최대 점 수 (해상도 선택/다운샘플링 기준)
+    :param downsample: None, 'lttb', 'minmax'
+    :param field: FIELDS의 키 ('value', 'avg', 'min', 'max', 'sum')
+    :param resolution: 지정하면 자동 선택 대신 사용
+    :param time_format: 'iso' 또는 'epoch_ms'
+    :return: {'resolution', 'field', 'downsample', 'points', 'series': {var_id: {'t': [...], 'v': [...]}}}
+    """
+    if field not in FIELDS:
+        raise ValueError(f'unknown field: {field}')
+    if downsample and downsample not in downsample_methods:
+        raise ValueError(f'unknown downsample method: {downsample}')
+    resolution = resolution or choose_resolution(start, end, max_points)
+    column = FIELDS[field]
+
+    rows = (
+        _model(resolution).objects
+        .filter(var_id__in=var_ids, timestamp__gte=start, timestamp__lt=end, **{f'{column}__isnull': False})
+        .order_by('var_id', 'timestamp')
+        .values_list('var_id', 'timestamp', column)
+    )
+    series = {vid: {'t': [], 'v': []} for vid in var_ids}
+    for vid, ts, value in rows.iterator(chunk_size=5000):
+        entry = series[vid]
+        entry['t'].append(ts)
+        entry['v'].append(value)
+
+    points = 0
+    for entry in series.values():
+        if downsample and len(entry['t']) > max_points:
+            entry['t'], entry['v'] = downsample_methods[downsample](entry['t'], entry['v'], max_points)
+        if time_format == 'epoch_ms':
+            entry['t'] = [int(ts.timestamp() * 1000) for ts in entry['t']]
+        else:
+            entry['t'] = [ts.isoformat() for ts in entry['t']]
+        points += len(entry['t'])
+
+    return {
+        'resolution': resolution,
+        'field': field,
+        'downsample': downsample,
+        'points': points,
+        'series': series,
+    }
@@ -11,6 +11,7 @@ import re
 import json
 import os
 from LSISsocket import redis_instance as LSIS_socket_redis_instance
+from .rollup import Partial, floor_bucket, rollup_engine
 try:
     from zoneinfo import ZoneInfo
 except Exception:
@@ -215,7 +216,7 @@ def _parse_scheduled_time(at):
 @log_execution_time(logger)
 def redis_to_db(resolution_minutes: int = 2, at=None):
     """
-    Redis의 'client_id:var_id' 키를 스캔하여 현재 값을 집계하고,
+    Redis 키 인덱스의 'client_id:var_id' 키 현재 값을 MGET으로 일괄 조회해 집계하고,
     지정된 시간 버킷(timestamp)에 TwoMinuteData로 업서트합니다.
 
     - APScheduler에서 실행 시, 예약된 실행 시각을 `at` 인자로 전달하세요.
@@ -250,43 +251,39 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
     except Exception:
         pass
 
-    # scan keys with pattern like 'number:number'
-    pattern = '*:*'
+    # 'client_id:var_id' 값 키는 폴러가 유지하는 키 인덱스에서 가져옵니다 (SCAN은 인덱스 재구성 시에만)
     try:
-        keys = redis_instance.query_scan(pattern)
-        # If LSIS socket Redis has aggregated lists under keys '감시' or '기록', use them
-        try:
-            log_keys = []
-            if LSIS_socket_redis_instance.exists('감시') or LSIS_socket_redis_instance.exists('기록'):
-                if LSIS_socket_redis_instance.exists('감시'):
-                    v = LSIS_socket_redis_instance.get_value('감시') or []
-                    if isinstance(v, (list, tuple)):
-                        log_keys.extend([k for k in v if isinstance(k, str)])
-                if LSIS_socket_redis_instance.exists('기록'):
-                    v = LSIS_socket_redis_instance.get_value('기록') or []
-                    if isinstance(v, (list, tuple)):
-                        log_keys.extend([k for k in v if isinstance(k, str)])
-                # dedupe while preserving order
-                seen = set()
-                deduped = []
-                for k in log_keys:
-                    if k not in seen:
-                        seen.add(k)
-                        deduped.append(k)
-                log_keys = deduped
-            else:
-                log_keys = LSIS_socket_redis_instance.query_scan(pattern)
-        except Exception:
-            # fallback to scanning if any error
-            try:
-                log_keys = LSIS_socket_redis_instance.query_scan(pattern)
-            except Exception:
-                log_keys = []
-    except Exception:
+        keys = redis_instance.get_indexed_keys()
+    except Exception as e:
+        logger.warning(f"redis_to_db: key index 조회 실패, SCAN으로 대체합니다: {e}")
         try:
-            keys = redis_instance.client.keys(pattern) if hasattr(redis_instance, 'client') and redis_instance.client else []
+            keys = redis_instance.query_scan('*:*')
         except Exception:
             keys = []
+    # If LSIS socket Redis has aggregated lists under keys '감시' or '기록', use them
+    try:
+        log_keys = []
+        if LSIS_socket_redis_instance.exists('감시') or LSIS_socket_redis_instance.exists('기록'):
+            if LSIS_socket_redis_instance.exists('감시'):
+                v = LSIS_socket_redis_instance.get_value('감시') or []
+                if isinstance(v, (list, tuple)):
+                    log_keys.extend([k for k in v if isinstance(k, str)])
+            if LSIS_socket_redis_instance.exists('기록'):
+                v = LSIS_socket_redis_instance.get_value('기록') or []
+                if isinstance(v, (list, tuple)):
+                    log_keys.extend([k for k in v if isinstance(k, str)])
+            # dedupe while preserving order
+            seen = set()
+            deduped = []
+            for k in log_keys:
+                if k not in seen:
+                    seen.add(k)
+                    deduped.append(k)
+            log_keys = deduped
+        else:
+            log_keys = keys
+    except Exception:
+        log_keys = keys
 
     # aggregate per var_id (TwoMinuteData.unique_together = (timestamp, var_id))
     aggregates = {}
@@ -318,6 +315,7 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
             var_attrs[int(vid)] = attrs_list
 
     # iterate only over log_keys (LSIS socket entries) and process only variables with '감시' or '기록'
+    targets = []
     for key in log_keys:
         # parse only keys that look like 'int:int'
         if not isinstance(key, str) or ':' not in key:
@@ -335,15 +333,17 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
         attrs = var_attrs.get(var_id, [])
         if not any(a in ('감시', '기록') for a in attrs):
             continue
+        targets.append((key, client_id, var_id))
 
-        # read value (try JSON-decoded get_value first)
-        try:
-            value = redis_instance.get_value(key)
-        except Exception:
-            try:
-                value = redis_instance.client.get(key)
-            except Exception:
-                value = None
+    # read values in batches (MGET, JSON-decoded) instead of one GET per key
+    try:
+        values = redis_instance.mget([key for key, _, _ in targets])
+    except Exception as e:
+        logger.error(f"redis_to_db: 값 조회 실패: {e}")
+        values = {}
+
+    for key, client_id, var_id in targets:
+        value = values.get(key)
 
         # classify and coerce to numeric if applicable
         vtype, vnum = _classify_value(value)
@@ -379,6 +379,7 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
     # upsert aggregated rows into TwoMinuteData
     created = 0
     updated = 0
+    rollup_rows = {}
     # Batch upsert: select existing rows for this timestamp, then bulk_create / bulk_update
     try:
         two_objs_to_create = []
@@ -410,6 +411,7 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
                 'sum_value': sum_value,
                 'count': count if count > 0 else None,
             }
+            rollup_rows[var_id] = defaults
             ex = existing_map.get(var_id)
             if ex:
                 for k, v in defaults.items():
@@ -426,649 +428,103 @@ def redis_to_db(resolution_minutes: int = 2, at=None):
             updated = len(two_objs_to_update)
     except Exception as e:
         logger.error(f'Failed batch upsert TwoMinuteData: {e}')
+        rollup_rows = {}
+
+    # 확정된 2분 버킷을 10분 부분 집계에 바로 반영 ('기록' 변수만)
+    try:
+        partials = {
+            var_id: Partial.from_row(defaults, db_timestamp)
+            for var_id, defaults in rollup_rows.items()
+            if '기록' in var_attrs.get(var_id, [])
+        }
+        rollup_engine.ingest('2min', db_timestamp, partials)
+    except Exception as e:
+        logger.error(f'Failed rollup ingest for 2min bucket {db_timestamp.isoformat()}: {e}')
 
     logger.info(f'redis_to_db completed: buckets={len(aggregates)}, created={created}, updated={updated}, db_bucket={db_timestamp.isoformat()}')
 
     return {'buckets': len(aggregates), 'created': created, 'updated': updated, 'bucket_ts': db_timestamp.isoformat()}
 
 
+def _run_rollup(level, at, name):
+    """at이 있으면 그 시각이 속한 버킷을, 없으면 끝난(직전) 버킷을 확정합니다."""
+    base_time = _parse_scheduled_time(at)
+    if base_time is not None:
+        base_time = _ensure_naive_local(base_time)
+        bucket_start = _to_db_time(floor_bucket(level, base_time))
+        results = {bucket_start: rollup_engine.finalize(level, bucket_start)}
+    else:
+        now = _to_db_time(_ensure_naive_local(timezone.now()))
+        results = rollup_engine.finalize_due(level, now)
+
+    upserted = sum(r['upserted'] for r in results.values())
+    sources = sum(r['sources'] or 0 for r in results.values())
+    var_count = max((r['var_count'] for r in results.values()), default=0)
+    buckets = [ts.isoformat() for ts in sorted(results)]
+    logger.info(f"{name} completed: buckets={buckets}, upserted={upserted}, sources={sources}")
+    return {
+        'bucket_start': buckets[-1] if buckets else None,
+        'buckets': buckets,
+        'upserted': upserted,
+        'sources': sources,
+        'var_count': var_count,
+    }
+
+
 @log_exceptions(logger)
 @log_execution_time(logger)
 def aggregate_2min_to_10min(at=None):
     """
-    data_2min(TwoMinuteData)를 */10 분 단위로 집계해 data_10min(TenMinuteData)을 구성합니다.
+    data_2min(TwoMinuteData)를 10분 단위로 집계해 data_10min(TenMinuteData)을 확정합니다.
+    - 2분 버킷은 redis_to_db()에서 저장되는 즉시 rollup_engine의 10분 부분 집계에 반영되므로
+      이 작업은 끝난 10분 버킷을 업서트하고 1시간 부분 집계로 넘기기만 합니다.
     - 집계 구간: [버킷 시작, 버킷 시작 + 10분)
-    - 각 var_id별로 약 5개의 2분 데이터에서 min/max/avg/sum/count를 산출
     - TenMinuteData.value에는 avg를 저장, value_type은 'float' (집계 불가 시 'null')
-    - LSIS_socket_redis_instance에 key가 기록만 처리합니다.
+    - '기록' 속성 변수만 처리합니다.
 
     매개변수:
-    - at: 예약 실행 시각(문자열 ISO 또는 datetime). 없으면 현재 로컬 시간 기준.
+    - at: 확정할 버킷에 속한 시각(문자열 ISO 또는 datetime). 없으면 끝난 10분 버킷(재시작 등으로
+      메모리에 없는 경우 DB의 2분 데이터로 확정).
 
     사용 예시:
     - aggregate_2min_to_10min()
     - aggregate_2min_to_10min(at='2025-10-28T12:30:00Z')
-    - scheduler.add_job(aggregate_2min_to_10min, 'cron', minute='*/10', kwargs={'at': '2025-10-28T12:30:00Z'})
+    - scheduler.add_job(aggregate_2min_to_10min, 'cron', minute='*/10', second=5)
     """
-    from . import models
-
-    # 기준 시각: 로컬 naive로 확보
-    base_time = _parse_scheduled_time(at) or timezone.now()
-    base_time = _ensure_naive_local(base_time)
-
-    # 10분 버킷으로 내림
-    minute_bucket = (base_time.minute // 10) * 10
-    bucket_start = base_time.replace(minute=minute_bucket, second=0, microsecond=0)
-    bucket_end = bucket_start + timedelta(minutes=10)
-
-    # DB 조회/저장용 타임스탬프 범위 (naive local)
-    db_start = _to_db_time(bucket_start)
-    db_end = _to_db_time(bucket_end)
-
-    try:
-        logger.info(f"aggregate_2min_to_10min start: local={bucket_start.isoformat()}~{bucket_end.isoformat()}, db={db_start.isoformat()}~{db_end.isoformat()}")
-    except Exception:
-        pass
-
-    # 집계 대상 로우 로드 (DB에는 오프셋 적용된 시간으로 저장됨)
-    # For 10-minute aggregation onwards, only include variables with attribute '기록'
-    from LSISsocket.models import Variable
-    # 'contains' lookup on JSONField may not be supported on this DB backend (e.g. SQLite).
-    try:
-        record_var_ids = []
-        qs = Variable.objects.values_list('id', 'attributes')
-        for vid, attrs in qs:
-            try:
-                attrs_list = list(attrs or [])
-            except Exception:
-                attrs_list = []
-            if '기록' in attrs_list:
-                try:
-                    record_var_ids.append(int(vid))
-                except Exception:
-                    pass
-    except Exception:
-        record_var_ids = []
-    rows = models.TwoMinuteData.objects.filter(timestamp__gte=db_start, timestamp__lt=db_end, var_id__in=record_var_ids)
-
-    # var_id별 집계
-    agg = {}
-    for r in rows:
-        vid = r.var_id
-        if vid not in agg:
-            agg[vid] = {
-                'client_ids': set(),
-                'group_ids': set(),
-                'sum': 0.0,
-                'count': 0,
-                'min': None,
-                'max': None,
-            }
-        g = agg[vid]
-        if r.client_id is not None:
-            g['client_ids'].add(r.client_id)
-        if r.group_id is not None:
-            g['group_ids'].add(r.group_id)
-
-        # row-level 집계값 계산
-        row_count = r.count if r.count is not None else (1 if r.value is not None else 0)
-        row_sum = r.sum_value if r.sum_value is not None else (float(r.value) if r.value is not None else 0.0)
-
-        # min/max 후보값: min_value/max_value 우선, 없으면 value 사용
-        min_candidate = r.min_value if r.min_value is not None else r.value
-        max_candidate = r.max_value if r.max_value is not None else r.value
-
-        # 합산/카운트 누적
-        if row_count and row_sum is not None:
-            try:
-                g['sum'] += float(row_sum)
-                g['count'] += int(row_count)
-            except Exception:
-                pass
-
-        # 최소/최대 갱신
-        if min_candidate is not None:
-            try:
-                mv = float(min_candidate)
-                if g['min'] is None or mv < g['min']:
-                    g['min'] = mv
-            except Exception:
-                pass
-        if max_candidate is not None:
-            try:
-                xv = float(max_candidate)
-                if g['max'] is None or xv > g['max']:
-                    g['max'] = xv
-            except Exception:
-                pass
-
-    created = 0
-    updated = 0
-    for vid, g in agg.items():
-        if g['count'] <= 0:
-            # 데이터 없음: 업서트 생략
-            continue
-        sum_value = g['sum']
-        count = g['count']
-        avg_value = (sum_value / count) if count > 0 else None
-        min_value = g['min']
-        max_value = g['max']
-
-        defaults = {
-            'client_id': next(iter(g['client_ids'])) if g['client_ids'] else 0,
-            'group_id': next(iter(g['group_ids'])) if g['group_ids'] else 0,
-            'value': avg_value,
-            'value_type': 'float' if avg_value is not None else 'null',
-            'min_value': min_value,
-            'max_value': max_value,
-            'avg_value': avg_value,
-            'sum_value': sum_value,
-            'count': count,
-        }
-        # we'll handle TenMinuteData upserts in batch after the loop
-        agg[vid]['_ten_defaults'] = defaults
-
-    # Batch upsert TenMinuteData
-    try:
-        ten_to_create = []
-        ten_to_update = []
-        ten_var_ids = list(agg.keys())
-        existing_ten = list(models.TenMinuteData.objects.filter(timestamp=db_start, var_id__in=ten_var_ids)) if ten_var_ids else []
-        existing_map_ten = {r.var_id: r for r in existing_ten}
-        for vid, g in agg.items():
-            if g['count'] <= 0:
-                continue
-            defaults = g.pop('_ten_defaults', None) or {}
-            ex = existing_map_ten.get(vid)
-            if ex:
-                for k, v in defaults.items():
-                    setattr(ex, k, v)
-                ten_to_update.append(ex)
-            else:
-                ten_to_create.append(models.TenMinuteData(timestamp=db_start, var_id=vid, **defaults))
-
-        if ten_to_create:
-            models.TenMinuteData.objects.bulk_create(ten_to_create, batch_size=1000)
-            created += len(ten_to_create)
-        if ten_to_update:
-            models.TenMinuteData.objects.bulk_update(ten_to_update, ['client_id','group_id','value','value_type','min_value','max_value','avg_value','sum_value','count'], batch_size=1000)
-            updated += len(ten_to_update)
-    except Exception as e:
-        logger.error(f"Failed batch upsert TenMinuteData: {e}")
-
-    logger.info(f"aggregate_2min_to_10min completed: db_bucket_start={db_start.isoformat()}, created={created}, updated={updated}, sources={len(rows)}")
-    return {
-        'bucket_start': db_start.isoformat(),
-        'created': created,
-        'updated': updated,
-        'sources': len(rows),
-        'var_count': len(agg),
-    }
+    return _run_rollup('10min', at, 'aggregate_2min_to_10min')
 
 
 @log_exceptions(logger)
 @log_execution_time(logger)
 def aggregate_to_1hour(at=None):
     """
-    1시간 데이터를 구성합니다.
-    - 기준: 로컬 타임존 기준으로 at(없으면 now)를 받아 해당 시각을 시간 단위로 내림한 버킷을 사용
-    - 규칙: var_id별로 10분데이터가 3개 이상이면 TenMinuteData로 집계,
-            3개 미만이면 TwoMinuteData로 집계
-    - 산출: min, max, avg, sum, count 계산 후 HourlyData에 업서트
-    - LSIS_socket_redis_instance에 key가 기록만 처리합니다.
+    1시간 데이터를 확정합니다.
+    - 10분 버킷이 확정될 때마다 rollup_engine의 1시간 부분 집계에 반영되므로,
+      이 작업은 끝난 1시간 버킷을 업서트하고 일간 부분 집계로 넘깁니다.
+    - 산출: min, max, avg, sum, count (HourlyData에 업서트)
+    - '기록' 속성 변수만 처리합니다.
 
     사용 예시:
     - aggregate_to_1hour()
     - aggregate_to_1hour(at='2025-10-28T13:00:00Z')
-    - scheduler.add_job(aggregate_to_1hour, 'cron', minute=0, kwargs={'at': '2025-10-28T13:00:00Z'})
+    - scheduler.add_job(aggregate_to_1hour, 'cron', minute=0, second=10)
     """
-    from . import models
-    from datetime import timedelta
-
-    # 기준 시각: 로컬 naive로 확보
-    base_time = _parse_scheduled_time(at) or timezone.now()
-    base_time = _ensure_naive_local(base_time)
-
-    # 1시간 버킷 시작/끝 (naive local)
-    bucket_start = base_time.replace(minute=0, second=0, microsecond=0)
-    bucket_end = bucket_start + timedelta(hours=1)
-
-    db_start = _to_db_time(bucket_start)
-    db_end = _to_db_time(bucket_end)
-
-    try:
-        logger.info(
-            f"aggregate_to_1hour start: local={bucket_start.isoformat()}~{bucket_end.isoformat()}, db={db_start.isoformat()}~{db_end.isoformat()}"
-        )
-    except Exception:
-        pass
-
-    # 데이터 조회 (DB 상의 오프로 저장된 타임스탬프 기준)
-    # For hourly aggregation, only include variables with attribute '기록'
-    from LSISsocket.models import Variable
-    # 'contains' lookup on JSONField may not be supported on this DB backend (e.g. SQLite).
-    try:
-        record_var_ids = []
-        qs = Variable.objects.values_list('id', 'attributes')
-        for vid, attrs in qs:
-            try:
-                attrs_list = list(attrs or [])
-            except Exception:
-                attrs_list = []
-            if '기록' in attrs_list:
-                try:
-                    record_var_ids.append(int(vid))
-                except Exception:
-                    pass
-    except Exception:
-        record_var_ids = []
-    ten_rows = models.TenMinuteData.objects.filter(timestamp__gte=db_start, timestamp__lt=db_end, var_id__in=record_var_ids)
-    two_rows = models.TwoMinuteData.objects.filter(timestamp__gte=db_start, timestamp__lt=db_end, var_id__in=record_var_ids)
-
-    # 10분 집계 사전
-    ten_agg = {}
-    for r in ten_rows:
-        vid = r.var_id
-        if vid not in ten_agg:
-            ten_agg[vid] = {
-                'client_ids': set(),
-                'group_ids': set(),
-                'sum': 0.0,
-                'count': 0,
-                'min': None,
-                'max': None,
-                'slots': 0,  # 10분 슬롯 수
-            }
-        g = ten_agg[vid]
-        if r.client_id is not None:
-            g['client_ids'].add(r.client_id)
-        if r.group_id is not None:
-            g['group_ids'].add(r.group_id)
-
-        # row-level 수치 추출 (sum/count 우선, 없으면 avg*count, 최후엔 value)
-        rc = r.count if r.count is not None else (1 if r.value is not None else 0)
-        if r.sum_value is not None:
-            rs = float(r.sum_value)
-        elif r.avg_value is not None and rc:
-            rs = float(r.avg_value) * int(rc)
-        else:
-            rs = float(r.value) if r.value is not None else 0.0
-
-        if rc and rs is not None:
-            try:
-                g['sum'] += float(rs)
-                g['count'] += int(rc)
-            except Exception:
-                pass
-
-        # min/max 후보
-        min_c = r.min_value if r.min_value is not None else r.value
-        max_c = r.max_value if r.max_value is not None else r.value
-        if min_c is not None:
-            try:
-                mv = float(min_c)
-                if g['min'] is None or mv < g['min']:
-                    g['min'] = mv
-            except Exception:
-                pass
-        if max_c is not None:
-            try:
-                xv = float(max_c)
-                if g['max'] is None or xv > g['max']:
-                    g['max'] = xv
-            except Exception:
-                pass
-
-        g['slots'] += 1
-
-    # 2분 집계 사전 (fallback)
-    two_agg = {}
-    for r in two_rows:
-        vid = r.var_id
-        if vid not in two_agg:
-            two_agg[vid] = {
-                'client_ids': set(),
-                'group_ids': set(),
-                'sum': 0.0,
-                'count': 0,
-                'min': None,
-                'max': None,
-            }
-        g = two_agg[vid]
-        if r.client_id is not None:
-            g['client_ids'].add(r.client_id)
-        if r.group_id is not None:
-            g['group_ids'].add(r.group_id)
-
-        rc = r.count if r.count is not None else (1 if r.value is not None else 0)
-        rs = r.sum_value if r.sum_value is not None else (float(r.value) if r.value is not None else 0.0)
-        if rc and rs is not None:
-            try:
-                g['sum'] += float(rs)
-                g['count'] += int(rc)
-            except Exception:
-                pass
-
-        min_c = r.min_value if r.min_value is not None else r.value
-        max_c = r.max_value if r.max_value is not None else r.value
-        if min_c is not None:
-            try:
-                mv = float(min_c)
-                if g['min'] is None or mv < g['min']:
-                    g['min'] = mv
-            except Exception:
-                pass
-        if max_c is not None:
-            try:
-                xv = float(max_c)
-                if g['max'] is None or xv > g['max']:
-                    g['max'] = xv
-            except Exception:
-                pass
-
-    # 처리 대상 var_id 집합
-    all_vids = set(ten_agg.keys()) | set(two_agg.keys())
-
-    created = 0
-    updated = 0
-    for vid in all_vids:
-        use_ten = (vid in ten_agg and ten_agg[vid].get('slots', 0) >= 3)
-        src = ten_agg[vid] if use_ten else two_agg.get(vid)
-        if not src or src.get('count', 0) <= 0:
-            continue
-
-        sum_value = src['sum']
-        count = src['count']
-        avg_value = (sum_value / count) if count > 0 else None
-        min_value = src['min']
-        max_value = src['max']
-
-        defaults = {
-            'client_id': next(iter(src['client_ids'])) if src['client_ids'] else 0,
-            'group_id': next(iter(src['group_ids'])) if src['group_ids'] else 0,
-            'value': avg_value,
-            'value_type': 'float' if avg_value is not None else 'null',
-            'min_value': min_value,
-            'max_value': max_value,
-            'avg_value': avg_value,
-            'sum_value': sum_value,
-            'count': count,
-        }
-        # collect defaults for batch upsert
-        all_vid_defaults = globals().get('_hourly_defaults_map', {})
-        if '_hourly_defaults_map' not in globals():
-            globals()['_hourly_defaults_map'] = {}
-            all_vid_defaults = globals()['_hourly_defaults_map']
-        all_vid_defaults[vid] = defaults
-
-    # Batch upsert HourlyData
-    try:
-        hourly_to_create = []
-        hourly_to_update = []
-        hourly_var_ids = list(globals().get('_hourly_defaults_map', {}).keys())
-        existing_hourly = list(models.HourlyData.objects.filter(timestamp=db_start, var_id__in=hourly_var_ids)) if hourly_var_ids else []
-        existing_map_hourly = {r.var_id: r for r in existing_hourly}
-        for vid, defaults in globals().get('_hourly_defaults_map', {}).items():
-            ex = existing_map_hourly.get(vid)
-            if ex:
-                for k, v in defaults.items():
-                    setattr(ex, k, v)
-                hourly_to_update.append(ex)
-            else:
-                hourly_to_create.append(models.HourlyData(timestamp=db_start, var_id=vid, **defaults))
-
-        if hourly_to_create:
-            models.HourlyData.objects.bulk_create(hourly_to_create, batch_size=1000)
-            created += len(hourly_to_create)
-        if hourly_to_update:
-            models.HourlyData.objects.bulk_update(hourly_to_update, ['client_id','group_id','value','value_type','min_value','max_value','avg_value','sum_value','count'], batch_size=1000)
-            updated += len(hourly_to_update)
-        # clean up temporary map
-        globals().pop('_hourly_defaults_map', None)
-    except Exception as e:
-        logger.error(f"Failed batch upsert HourlyData: {e}")
-
-    logger.info(
-        f"aggregate_to_1hour completed: db_bucket_start={db_start.isoformat()}, created={created}, updated={updated}, ten_sources={len(ten_rows)}, two_sources={len(two_rows)}"
-    )
-
-    return {
-        'bucket_start': db_start.isoformat(),
-        'created': created,
-        'updated': updated,
-        'ten_sources': len(ten_rows),
-        'two_sources': len(two_rows),
-        'var_count': len(all_vids),
-    }
+    return _run_rollup('1hour', at, 'aggregate_to_1hour')
 
 
 @log_exceptions(logger)
 @log_execution_time(logger)
 def aggregate_to_daily(at=None):
     """
-    1일(일간) 데이터를 구성합니다.
-    - 기준: 로컬 타임존 기준으로 at(없으면 now)를 받아 해당 날짜의 00:00:00로 내림한 버킷 사용
-    - 규칙: var_id별로 10분데이터가 3개 이상이면 TenMinuteData로 집계,
-            3개 미만이면 TwoMinuteData로 집계
-    - 산출: min, max, avg, sum, count 계산 후 DailyData에 업서트
-    - LSIS_socket_redis_instance에 key가 기록만 처리합니다.
+    1일(일간) 데이터를 확정합니다.
+    - 1시간 버킷의 부분 집계(하루 최대 24개)를 합쳐 DailyData에 업서트합니다.
+      하루치 10분/2분 데이터를 다시 읽지 않습니다.
+    - 산출: min, max, avg, sum, count
+    - '기록' 속성 변수만 처리합니다.
 
     사용 예시:
     - aggregate_to_daily()
     - aggregate_to_daily(at='2025-10-28T00:00:00Z')
-    - scheduler.add_job(aggregate_to_daily, 'cron', hour=0, minute=5, kwargs={'at': '2025-10-28T00:00:00Z'})
+    - scheduler.add_job(aggregate_to_daily, 'cron', hour=0, minute=5)
     """
-    from . import models
-
-    # 기준 시각: 로컬 naive로 확보
-    base_time = _parse_scheduled_time(at) or timezone.now()
-    base_time = _ensure_naive_local(base_time)
-
-    # 일간 버킷 시작/끝 (naive local)
-    bucket_start = base_time.replace(hour=0, minute=0, second=0, microsecond=0)
-    bucket_end = bucket_start + timedelta(days=1)
-
-    db_start = _to_db_time(bucket_start)
-    db_end = _to_db_time(bucket_end)
-
-    try:
-        logger.info(
-            f"aggregate_to_daily start: local={bucket_start.isoformat()}~{bucket_end.isoformat()}, db={db_start.isoformat()}~{db_end.isoformat()}"
-        )
-    except Exception:
-        pass
-
-    # 데이터 조회 (DB 상의 오프로 저장된 타임스탬프 기준)
-    # For daily aggregation, only include variables with attribute '기록'
-    from LSISsocket.models import Variable
-    # 'contains' lookup on JSONField may not be supported on this DB backend (e.g. SQLite).
-    try:
-        record_var_ids = []
-        qs = Variable.objects.values_list('id', 'attributes')
-        for vid, attrs in qs:
-            try:
-                attrs_list = list(attrs or [])
-            except Exception:
-                attrs_list = []
-            if '기록' in attrs_list:
-                try:
-                    record_var_ids.append(int(vid))
-                except Exception:
-                    pass
-    except Exception:
-        record_var_ids = []
-    ten_rows = models.TenMinuteData.objects.filter(timestamp__gte=db_start, timestamp__lt=db_end, var_id__in=record_var_ids)
-    two_rows = models.TwoMinuteData.objects.filter(timestamp__gte=db_start, timestamp__lt=db_end, var_id__in=record_var_ids)
-
-    # 10분 집계 사전
-    ten_agg = {}
-    for r in ten_rows:
-        vid = r.var_id
-        if vid not in ten_agg:
-            ten_agg[vid] = {
-                'client_ids': set(),
-                'group_ids': set(),
-                'sum': 0.0,
-                'count': 0,
-                'min': None,
-                'max': None,
-                'slots': 0,  # 10분 슬롯 수
-            }
-        g = ten_agg[vid]
-        if r.client_id is not None:
-            g['client_ids'].add(r.client_id)
-        if r.group_id is not None:
-            g['group_ids'].add(r.group_id)
-
-        rc = r.count if r.count is not None else (1 if r.value is not None else 0)
-        if r.sum_value is not None:
-            rs = float(r.sum_value)
-        elif r.avg_value is not None and rc:
-            rs = float(r.avg_value) * int(rc)
-        else:
-            rs = float(r.value) if r.value is not None else 0.0
-
-        if rc and rs is not None:
-            try:
-                g['sum'] += float(rs)
-                g['count'] += int(rc)
-            except Exception:
-                pass
-
-        min_c = r.min_value if r.min_value is not None else r.value
-        max_c = r.max_value if r.max_value is not None else r.value
-        if min_c is not None:
-            try:
-                mv = float(min_c)
-                if g['min'] is None or mv < g['min']:
-                    g['min'] = mv
-            except Exception:
-                pass
-        if max_c is not None:
-            try:
-                xv = float(max_c)
-                if g['max'] is None or xv > g['max']:
-                    g['max'] = xv
-            except Exception:
-                pass
-
-        g['slots'] += 1
-
-    # 2분 집계 사전 (fallback)
-    two_agg = {}
-    for r in two_rows:
-        vid = r.var_id
-        if vid not in two_agg:
-            two_agg[vid] = {
-                'client_ids': set(),
-                'group_ids': set(),
-                'sum': 0.0,
-                'count': 0,
-                'min': None,
-                'max': None,
-            }
-        g = two_agg[vid]
-        if r.client_id is not None:
-            g['client_ids'].add(r.client_id)
-        if r.group_id is not None:
-            g['group_ids'].add(r.group_id)
-
-        rc = r.count if r.count is not None else (1 if r.value is not None else 0)
-        rs = r.sum_value if r.sum_value is not None else (float(r.value) if r.value is not None else 0.0)
-        if rc and rs is not None:
-            try:
-                g['sum'] += float(rs)
-                g['count'] += int(rc)
-            except Exception:
-                pass
-
-        min_c = r.min_value if r.min_value is not None else r.value
-        max_c = r.max_value if r.max_value is not None else r.value
-        if min_c is not None:
-            try:
-                mv = float(min_c)
-                if g['min'] is None or mv < g['min']:
-                    g['min'] = mv
-            except Exception:
-                pass
-        if max_c is not None:
-            try:
-                xv = float(max_c)
-                if g['max'] is None or xv > g['max']:
-                    g['max'] = xv
-            except Exception:
-                pass
-
-    # 처리 대상 var_id 집합
-    all_vids = set(ten_agg.keys()) | set(two_agg.keys())
-
-    created = 0
-    updated = 0
-    for vid in all_vids:
-        use_ten = (vid in ten_agg and ten_agg[vid].get('slots', 0) >= 3)
-        src = ten_agg[vid] if use_ten else two_agg.get(vid)
-        if not src or src.get('count', 0) <= 0:
-            continue
-
-        sum_value = src['sum']
-        count = src['count']
-        avg_value = (sum_value / count) if count > 0 else None
-        min_value = src['min']
-        max_value = src['max']
-
-        defaults = {
-            'client_id': next(iter(src['client_ids'])) if src['client_ids'] else 0,
-            'group_id': next(iter(src['group_ids'])) if src['group_ids'] else 0,
-            'value': avg_value,
-            'value_type': 'float' if avg_value is not None else 'null',
-            'min_value': min_value,
-            'max_value': max_value,
-            'avg_value': avg_value,
-            'sum_value': sum_value,
-            'count': count,
-        }
-        # collect defaults for batch upsert daily
-        all_vid_defaults = globals().get('_daily_defaults_map', {})
-        if '_daily_defaults_map' not in globals():
-            globals()['_daily_defaults_map'] = {}
-            all_vid_defaults = globals()['_daily_defaults_map']
-        all_vid_defaults[vid] = defaults
-
-    # Batch upsert DailyData
-    try:
-        daily_to_create = []
-        daily_to_update = []
-        daily_var_ids = list(globals().get('_daily_defaults_map', {}).keys())
-        existing_daily = list(models.DailyData.objects.filter(timestamp=db_start, var_id__in=daily_var_ids)) if daily_var_ids else []
-        existing_map_daily = {r.var_id: r for r in existing_daily}
-        for vid, defaults in globals().get('_daily_defaults_map', {}).items():
-            ex = existing_map_daily.get(vid)
-            if ex:
-                for k, v in defaults.items():
-                    setattr(ex, k, v)
-                daily_to_update.append(ex)
-            else:
-                daily_to_create.append(models.DailyData(timestamp=db_start, var_id=vid, **defaults))
-
-        if daily_to_create:
-            models.DailyData.objects.bulk_create(daily_to_create, batch_size=1000)
-            created += len(daily_to_create)
-        if daily_to_update:
-            models.DailyData.objects.bulk_update(daily_to_update, ['client_id','group_id','value','value_type','min_value','max_value','avg_value','sum_value','count'], batch_size=1000)
-            updated += len(daily_to_update)
-        globals().pop('_daily_defaults_map', None)
-    except Exception as e:
-        logger.error(f"Failed batch upsert DailyData: {e}")
-
-    logger.info(
-        f"aggregate_to_daily completed: db_bucket_start={db_start.isoformat()}, created={created}, updated={updated}, ten_sources={len(ten_rows)}, two_sources={len(two_rows)}"
-    )
-
-    return {
-        'bucket_start': db_start.isoformat(),
-        'created': created,
-        'updated': updated,
-        'ten_sources': len(ten_rows),
-        'two_sources': len(two_rows),
-        'var_count': len(all_vids),
-    }
\ No newline at end of file
+    return _run_rollup('daily', at, 'aggregate_to_daily')
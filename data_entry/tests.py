@@ -1,3 +1,359 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import retention, rollup
+from .models import TenMinuteData, TwoMinuteData
+from .pagination import TimeSeriesPagination, decode_cursor, encode_cursor
+from .rollup import Partial, RollupEngine, floor_bucket, merge_partials
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user('exporter', password='x'))
+        for minute, value in ((0, 1.5), (2, None)):
+            TwoMinuteData.objects.create(
+                timestamp=datetime(2025, 1, 1, 0, minute), client_id=1, group_id=1, var_id=7, value=value,
+            )
+
+    def test_export_format_parameter_reaches_exporter(self):
+        response = self.client.get('/data_entry/export/', {'export_format': 'csv', 'var_id': '7'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Export-Format'], 'csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="data_2min.csv"')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('7,2025-01-01 00:00:00,1.5'))
+
+    def test_unknown_export_format_is_rejected(self):
+        response = self.client.get('/data_entry/export/', {'export_format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 400)
+
+    async def test_asgi_export_is_streamed_chunk_by_chunk(self):
+        from . import views
+        from .export import iter_export
+
+        produced = []
+
+        def counting_export(*args, **kwargs):
+            fmt, stream = iter_export(*args, chunk_size=1, **kwargs)
+
+            def counted():
+                for data in stream:
+                    produced.append(data)
+                    yield data
+            return fmt, counted()
+
+        await self.async_client.aforce_login(await get_user_model().objects.aget(username='exporter'))
+        with mock.patch.object(views, 'iter_export', counting_export):
+            response = await self.async_client.get('/data_entry/export/', {'export_format': 'csv'})
+            self.assertTrue(response.is_async)
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            # 첫 chunk(헤더 + 첫 행)를 보낼 때 나머지 행은 아직 읽지 않음
+            self.assertEqual(len(produced), 1)
+            rest = [data async for data in chunks]
+        self.assertTrue(first.startswith(b'var_id,timestamp'))
+        self.assertEqual(len(produced), 1 + len(rest))
+        self.assertEqual(len(rest), 1)
+
+
+class RollupPartialTests(SimpleTestCase):
+    def test_from_row_fills_missing_aggregates(self):
+        raw = Partial.from_row({'value': 4.0, 'timestamp': datetime(2025, 1, 1)})
+        self.assertEqual((raw.sum, raw.count, raw.min, raw.max, raw.last), (4.0, 1, 4.0, 4.0, 4.0))
+
+        averaged = Partial.from_row({'value': 2.0, 'avg_value': 2.0, 'count': 3, 'min_value': 1.0, 'max_value': 5.0})
+        self.assertEqual((averaged.sum, averaged.count, averaged.min, averaged.max), (6.0, 3, 1.0, 5.0))
+
+        empty = Partial.from_row({'value': None})
+        self.assertEqual((empty.sum, empty.count, empty.min, empty.max), (0.0, 0, None, None))
+
+    def test_merge_is_order_independent_and_keeps_latest_value(self):
+        rows = [
+            (datetime(2025, 1, 1, 0, 0), {'value': 3.0, 'client_id': 1, 'group_id': 2}),
+            (datetime(2025, 1, 1, 0, 2), {'value': None}),
+            (datetime(2025, 1, 1, 0, 4), {'value': -1.0, 'count': 2, 'sum_value': -2.0, 'min_value': -4.0, 'max_value': 2.0}),
+            (datetime(2025, 1, 1, 0, 6), {'value': 9.0}),
+        ]
+        forward = Partial()
+        for ts, row in rows:
+            forward.merge(Partial.from_row(row, ts))
+        backward = Partial()
+        for ts, row in reversed(rows):
+            backward.merge(Partial.from_row(row, ts))
+        for merged in (forward, backward):
+            self.assertEqual((merged.sum, merged.count, merged.min, merged.max), (10.0, 4, -4.0, 9.0))
+            self.assertEqual((merged.last, merged.last_ts), (9.0, datetime(2025, 1, 1, 0, 6)))
+            self.assertEqual((merged.client_id, merged.group_id), (1, 2))
+        self.assertEqual(forward.as_defaults()['avg_value'], 2.5)
+
+    def test_merge_partials_replaces_child_bucket_instead_of_adding(self):
+        ts = datetime(2025, 1, 1, 0, 2)
+        children = {
+            datetime(2025, 1, 1, 0, 0): Partial.from_row({'value': 1.0}, datetime(2025, 1, 1, 0, 0)),
+            ts: Partial.from_row({'value': 2.0}, ts),
+        }
+        children[ts] = Partial.from_row({'value': 5.0}, ts)
+        merged = merge_partials(children)
+        self.assertEqual((merged.sum, merged.count, merged.max, merged.last), (6.0, 2, 5.0, 5.0))
+        self.assertEqual(merge_partials({}).count, 0)
+
+    def test_floor_bucket(self):
+        ts = datetime(2025, 3, 4, 13, 57, 31, 250)
+        self.assertEqual(floor_bucket('2min', ts), datetime(2025, 3, 4, 13, 56))
+        self.assertEqual(floor_bucket('10min', ts), datetime(2025, 3, 4, 13, 50))
+        self.assertEqual(floor_bucket('1hour', ts), datetime(2025, 3, 4, 13, 0))
+        self.assertEqual(floor_bucket('daily', ts), datetime(2025, 3, 4))
+        self.assertEqual(floor_bucket('10min', datetime(2025, 3, 4, 13, 50)), datetime(2025, 3, 4, 13, 50))
+
+
+class RollupEngineTests(TestCase):
+    BUCKET = datetime(2025, 1, 1, 10, 0)
+
+    def setUp(self):
+        patcher = mock.patch.object(rollup, 'record_var_ids', return_value={7})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(rollup, 'DATA_ROLLUP_MODE', 'python')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = RollupEngine()
+
+    def _two_minute(self, minute, value, var_id=7):
+        return TwoMinuteData.objects.create(
+            timestamp=self.BUCKET.replace(minute=minute), client_id=1, group_id=1, var_id=var_id, value=value,
+        )
+
+    def _ingest(self, row):
+        self.engine.ingest('2min', row.timestamp, {row.var_id: Partial.from_row({'value': row.value}, row.timestamp)})
+
+    def _ten_minute(self, var_id=7):
+        return TenMinuteData.objects.get(timestamp=self.BUCKET, var_id=var_id)
+
+    def test_late_child_bucket_is_remerged_by_timestamp(self):
+        for minute, value in ((0, 1.0), (2, 3.0)):
+            self._ingest(self._two_minute(minute, value))
+        self.engine.finalize('10min', self.BUCKET)
+        self.assertEqual((self._ten_minute().count, self._ten_minute().avg_value), (2, 2.0))
+
+        # 이미 반영된 02분 버킷이 다시 들어오면 더하지 않고 교체
+        corrected = TwoMinuteData.objects.get(timestamp=self.BUCKET.replace(minute=2), var_id=7)
+        corrected.value = 5.0
+        corrected.save()
+        self._ingest(corrected)
+        row = self._ten_minute()
+        self.assertEqual((row.count, row.sum_value, row.max_value), (2, 6.0, 5.0))
+
+        self._ingest(self._two_minute(4, 9.0))
+        row = self._ten_minute()
+        self.assertEqual((row.count, row.sum_value, row.max_value, row.avg_value), (3, 15.0, 9.0, 5.0))
+        self.assertEqual(self.engine.stats['10min']['late'], 2)
+
+    def test_finalize_due_after_restart_reads_children_from_db(self):
+        for minute in range(0, 10, 2):
+            self._two_minute(minute, float(minute))
+        self._two_minute(0, 100.0, var_id=8)  # '기록' 변수가 아니면 제외
+
+        results = self.engine.finalize_due('10min', self.BUCKET.replace(minute=11))
+
+        self.assertEqual(list(results), [self.BUCKET])
+        row = self._ten_minute()
+        self.assertEqual((row.count, row.min_value, row.max_value, row.avg_value), (5, 0.0, 8.0, 4.0))
+        self.assertFalse(TenMinuteData.objects.filter(var_id=8).exists())
+        # 확정된 10분 버킷은 1시간 버킷에 반영되고, 같은 시각으로 다시 확정하지 않음
+        self.assertEqual(self.engine.snapshot()['1hour']['open_buckets'], [self.BUCKET.isoformat()])
+        self.assertEqual(self.engine.finalize_due('10min', self.BUCKET.replace(minute=11)), {})
+
+
+class SqlRollupTests(TestCase):
+    BUCKET = datetime(2025, 1, 1, 10, 0)
+    FIELDS = ('client_id', 'group_id', 'value', 'min_value', 'max_value', 'avg_value', 'sum_value', 'count')
+
+    def setUp(self):
+        patcher = mock.patch.object(rollup, 'record_var_ids', return_value={7, 8, 9})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rows = [
+            (7, 0, {'value': 1.5}),
+            (7, 2, {'value': None}),
+            (7, 4, {'value': 2.0, 'count': 3, 'avg_value': 2.0, 'min_value': 0.5, 'max_value': 4.0}),
+            (7, 6, {'value': -1.0, 'count': 2, 'sum_value': -2.0, 'min_value': -3.0, 'max_value': 1.0}),
+            (8, 8, {'value': 10.0}),
+            (9, 2, {'value': None}),  # 값이 하나도 없으면 상위 행을 만들지 않음
+            (7, 10, {'value': 99.0}),  # 다음 버킷
+        ]
+        for var_id, minute, fields in rows:
+            TwoMinuteData.objects.create(
+                timestamp=self.BUCKET.replace(minute=minute), client_id=3, group_id=4, var_id=var_id, **fields,
+            )
+
+    def _rolled_up(self):
+        return {
+            row['var_id']: row
+            for row in TenMinuteData.objects.filter(timestamp=self.BUCKET).values('var_id', *self.FIELDS)
+        }
+
+    def test_sql_rollup_matches_python_path(self):
+        with mock.patch.object(rollup, 'DATA_ROLLUP_MODE', 'python'):
+            RollupEngine().finalize('10min', self.BUCKET)
+        expected = self._rolled_up()
+        TenMinuteData.objects.all().delete()
+
+        with mock.patch.object(rollup, 'DATA_ROLLUP_MODE', 'sql'):
+            self.assertTrue(rollup.use_sql())
+            RollupEngine().finalize('10min', self.BUCKET)
+        actual = self._rolled_up()
+
+        self.assertEqual(sorted(expected), [7, 8])
+        self.assertEqual(sorted(actual), sorted(expected))
+        for var_id, row in expected.items():
+            for field in self.FIELDS:
+                self.assertAlmostEqual(actual[var_id][field], row[field], msg=f'var {var_id} {field}')
+        self.assertEqual(expected[7]['count'], 6)
+        self.assertAlmostEqual(expected[7]['sum_value'], 5.5)
+
+    def test_sql_rollup_updates_existing_bucket(self):
+        with mock.patch.object(rollup, 'DATA_ROLLUP_MODE', 'sql'):
+            rollup.sql_rollup('10min', self.BUCKET)
+            TwoMinuteData.objects.filter(var_id=8).update(value=20.0)
+            rollup.sql_rollup('10min', self.BUCKET)
+        self.assertEqual(TenMinuteData.objects.filter(timestamp=self.BUCKET).count(), 2)
+        self.assertEqual(self._rolled_up()[8]['max_value'], 20.0)
+
+
+class KeysetPaginationTests(TestCase):
+    TIMESTAMPS = [datetime(2025, 1, 1, 0, minute) for minute in (0, 2, 4)]
+    VAR_IDS = [3, 7, 11]
+
+    def setUp(self):
+        for timestamp in self.TIMESTAMPS:
+            for var_id in self.VAR_IDS:
+                TwoMinuteData.objects.create(timestamp=timestamp, client_id=1, group_id=1, var_id=var_id, value=1.0)
+
+    def _walk(self, **params):
+        """keyset 페이지를 끝까지 따라가며 페이지별 (timestamp, var_id) 목록을 반환합니다."""
+        pages = []
+        query = {'pagination': 'keyset', 'page_size': '2', **params}
+        while True:
+            paginator = TimeSeriesPagination()
+            request = Request(APIRequestFactory().get('/data_entry/2min/', query))
+            rows = paginator.paginate_queryset(TwoMinuteData.objects.all(), request)
+            pages.append([(row.timestamp, row.var_id) for row in rows])
+            if paginator.next_link is None:
+                return pages
+            self.assertIsNone(paginator.count)
+            query['cursor'] = paginator.next_link.split('cursor=')[1].split('&')[0]
+
+    def test_cursor_round_trip(self):
+        timestamp = datetime(2025, 1, 1, 0, 2, 30, 123456)
+        cursor = encode_cursor(timestamp, 7)
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), (timestamp, 7))
+        with self.assertRaises(NotFound):
+            decode_cursor('not-a-cursor')
+
+    def test_descending_pages_split_timestamp_ties_by_var_id(self):
+        pages = self._walk()
+        keys = [(ts, var_id) for ts in reversed(self.TIMESTAMPS) for var_id in reversed(self.VAR_IDS)]
+        self.assertEqual([key for page in pages for key in page], keys)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 2, 1])
+        # 같은 timestamp의 변수가 페이지 경계에서 나뉨
+        self.assertEqual(pages[0][-1], (self.TIMESTAMPS[2], 7))
+        self.assertEqual(pages[1][0], (self.TIMESTAMPS[2], 3))
+
+    def test_ascending_pages_split_timestamp_ties_by_var_id(self):
+        pages = self._walk(ordering='timestamp')
+        keys = [(ts, var_id) for ts in self.TIMESTAMPS for var_id in self.VAR_IDS]
+        self.assertEqual([key for page in pages for key in page], keys)
+        self.assertEqual(pages[0][-1], (self.TIMESTAMPS[0], 7))
+        self.assertEqual(pages[1][0], (self.TIMESTAMPS[0], 11))
+
+    def test_keyset_list_endpoint_links(self):
+        client = APIClient()
+        first = client.get('/data_entry/2min/', {'pagination': 'keyset', 'page_size': '4', 'count': 'true'}).json()
+        self.assertEqual(first['count'], 9)
+        self.assertIsNone(first['previous'])
+        second = client.get(first['next']).json()
+        self.assertEqual([row['var_id'] for row in second['results']], [7, 3, 11, 7])
+        self.assertIsNotNone(second['previous'])
+        self.assertNotIn('cursor=', second['previous'])
+
+
+class RetentionTests(TestCase):
+    NOW = datetime(2025, 3, 15, 12, 0, 0, 123456)
+
+    def _rows(self, *timestamps):
+        for i, timestamp in enumerate(timestamps):
+            TwoMinuteData.objects.create(timestamp=timestamp, client_id=1, group_id=1, var_id=i, value=float(i))
+
+    @mock.patch.dict(retention.DATA_RETENTION_DAYS, {'2min': 30, 'daily': 0})
+    def test_retention_cutoff(self):
+        self.assertEqual(retention.retention_cutoff('2min', now=self.NOW), datetime(2025, 2, 13, 12, 0, 0))
+        self.assertIsNone(retention.retention_cutoff('daily', now=self.NOW))
+        self.assertIsNone(retention.retention_cutoff('unknown', now=self.NOW))
+
+    def test_delete_in_batches_stops_at_cutoff(self):
+        cutoff = datetime(2025, 2, 1)
+        self._rows(*(cutoff - timedelta(minutes=2 * i) for i in range(1, 6)), cutoff, cutoff + timedelta(minutes=2))
+
+        self.assertEqual(retention.delete_in_batches(TwoMinuteData, cutoff, batch_size=2), 5)
+        self.assertEqual(sorted(TwoMinuteData.objects.values_list('timestamp', flat=True)), [cutoff, cutoff + timedelta(minutes=2)])
+
+    def test_delete_in_batches_removes_oldest_rows_first(self):
+        cutoff = datetime(2025, 2, 1)
+        self._rows(*(cutoff - timedelta(minutes=2 * i) for i in range(1, 6)))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(retention.delete_in_batches(TwoMinuteData, cutoff, batch_size=2, max_batches=2), 4)
+        self.assertEqual(sum(1 for query in queries if query['sql'].startswith('DELETE')), 2)
+        self.assertEqual(list(TwoMinuteData.objects.values_list('timestamp', flat=True)), [cutoff - timedelta(minutes=2)])
+
+    def test_delete_in_batches_dry_run_counts_only(self):
+        cutoff = datetime(2025, 2, 1)
+        self._rows(cutoff - timedelta(days=1), cutoff - timedelta(days=2), cutoff)
+
+        self.assertEqual(retention.delete_in_batches(TwoMinuteData, cutoff, batch_size=1, dry_run=True), 2)
+        self.assertEqual(TwoMinuteData.objects.count(), 3)
+
+    @mock.patch.dict(retention.DATA_RETENTION_DAYS, {'2min': 30})
+    def test_apply_retention_dry_run_on_unpartitioned_table(self):
+        self._rows(datetime(2025, 1, 1), datetime(2025, 3, 1))
+
+        result = retention.apply_retention_for('2min', now=self.NOW, dry_run=True)
+
+        self.assertEqual(result, {'table': 'data_2min', 'cutoff': '2025-02-13T12:00:00', 'mode': 'delete', 'deleted_rows': 1})
+        self.assertEqual(TwoMinuteData.objects.count(), 2)
+
+    def test_drop_expired_partitions_dry_run(self):
+        partitions = ['data_2min_p202501', 'data_2min_p202502', 'data_2min_p202503', 'data_2min_pdefault']
+
+        # 월 전체가 cutoff 이전인 파티션만 (2월 파티션은 3월 1일 0시부터 삭제 대상)
+        self.assertEqual(retention.drop_expired_partitions(TwoMinuteData, partitions, datetime(2025, 2, 28, 23, 59), dry_run=True),
+                         ['data_2min_p202501'])
+        self.assertEqual(retention.drop_expired_partitions(TwoMinuteData, partitions, datetime(2025, 3, 1), dry_run=True),
+                         ['data_2min_p202501', 'data_2min_p202502'])
+
+    def test_drop_expired_partitions_detaches_on_postgresql(self):
+        pg_connection = mock.MagicMock(vendor='postgresql')
+        pg_connection.ops.quote_name = lambda name: f'"{name}"'
+        cursor = pg_connection.cursor.return_value.__enter__.return_value
+
+        with mock.patch.object(retention, 'connection', pg_connection):
+            dropped = retention.drop_expired_partitions(TwoMinuteData, ['data_2min_p202501', 'data_2min_p202503'], datetime(2025, 3, 1))
+
+        self.assertEqual(dropped, ['data_2min_p202501'])
+        self.assertEqual([call.args[0] for call in cursor.execute.call_args_list], [
+            'ALTER TABLE "data_2min" DETACH PARTITION "data_2min_p202501"',
+            'DROP TABLE "data_2min_p202501"',
+        ])
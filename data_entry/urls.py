@@ -1,6 +1,6 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import TwoMinuteDataViewSet, TenMinuteDataViewSet, HourlyDataViewSet, DailyDataViewSet, RedisKeyViewSet
+from .views import TwoMinuteDataViewSet, TenMinuteDataViewSet, HourlyDataViewSet, DailyDataViewSet, RedisKeyViewSet, SeriesView, ExportView
 
 router = DefaultRouter()
 router.register(r'2min', TwoMinuteDataViewSet, basename='two-minute')
@@ -10,5 +10,7 @@ router.register(r'daily', DailyDataViewSet, basename='daily')
 router.register(r'redis', RedisKeyViewSet, basename='redis')
 
 urlpatterns = [
+    path('series/', SeriesView.as_view(), name='series'),
+    path('export/', ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,17 +1,27 @@
+from fnmatch import fnmatchcase
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 
 from rest_framework import viewsets, permissions, filters
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.views import APIView
 
 # django-filters를 직접 사용
 from django_filters.rest_framework import DjangoFilterBackend  # type: ignore
 FILTER_BACKENDS = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
 
 from . import models, serializers
+from .pagination import TimeSeriesPagination
 
 from . import logger, redis_instance
+from .export import CONTENT_TYPES, EXTENSIONS, aiter_stream, iter_export
+from .series import DEFAULT_MAX_POINTS, MAX_POINTS_LIMIT, RESOLUTIONS, query_series
+from .service import _ensure_naive_local, _parse_scheduled_time
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -23,9 +33,10 @@ class StandardResultsSetPagination(PageNumberPagination):
 class BaseDataViewSet(viewsets.ModelViewSet):
     """공통 설정: 인증은 읽기 가능, 쓰기는 인증 필요
     필터링, 정렬, 검색, 페이지네이션 기본 적용
+    (?cursor= 로 keyset 페이지네이션, ?count=false 로 COUNT(*) 생략 - TimeSeriesPagination 참고)
     """
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = TimeSeriesPagination
     filter_backends = FILTER_BACKENDS
     ordering_fields = ['timestamp', 'client_id', 'group_id', 'var_id', 'value', 'min_value', 'max_value', 'avg_value', 'sum_value', 'count']
     ordering = ['-timestamp']
@@ -64,8 +75,8 @@ class RedisKeyViewSet(viewsets.ViewSet):
 
     def _ensure_connected(self):
         try:
-            # try to connect if not already
-            if hasattr(redis_instance, 'connect'):
+            # try to connect if not already (기존 연결 풀은 재사용)
+            if getattr(redis_instance, 'client', None) is None and hasattr(redis_instance, 'connect'):
                 try:
                     redis_instance.connect()
                 except Exception:
@@ -99,7 +110,7 @@ class RedisKeyViewSet(viewsets.ViewSet):
 
     def list(self, request):
         """Supports query params:
-        - pattern: redis key pattern (default '*:*')
+        - pattern: glob pattern applied to indexed keys (default '*:*')
         - q: free text search (searches client_id, var_id, value, value_type)
         - client_id, var_id: exact numeric filter
         - ordering: e.g. 'client_id' or '-client_id'
@@ -115,17 +126,22 @@ class RedisKeyViewSet(viewsets.ViewSet):
             filter_client = request.query_params.get('client_id')
             filter_var = request.query_params.get('var_id')
 
-            # fetch keys (use scan style)
+            # fetch keys from the key index (SCAN only when the index has to be rebuilt)
             keys = []
             try:
-                keys = redis_instance.query_scan(pattern)
-            except Exception:
+                keys = redis_instance.get_indexed_keys(int(filter_client) if filter_client else None)
+            except ValueError:
+                keys = []
+            except Exception as e:
+                logger.warning(f"RedisKeyViewSet: key index 조회 실패, SCAN으로 대체합니다: {e}")
                 try:
-                    keys = redis_instance.client.keys(pattern) if hasattr(redis_instance, 'client') and redis_instance.client else []
+                    keys = redis_instance.query_scan(pattern)
                 except Exception:
                     keys = []
+            if pattern != '*:*':
+                keys = [key for key in keys if fnmatchcase(key, pattern)]
 
-            entries = []
+            targets = []
             for key in keys:
                 parsed = self._parse_key(key)
                 if not parsed:
@@ -137,16 +153,14 @@ class RedisKeyViewSet(viewsets.ViewSet):
                     continue
                 if filter_var and str(var_id) != str(filter_var):
                     continue
+                targets.append((key, client_id, var_id))
 
-                try:
-                    value = redis_instance.get_value(key)
-                except Exception:
-                    try:
-                        raw = redis_instance.client.get(key)
-                        value = raw
-                    except Exception:
-                        value = None
+            # read values in batches (MGET) instead of one GET per key
+            values = redis_instance.mget([key for key, _, _ in targets])
 
+            entries = []
+            for key, client_id, var_id in targets:
+                value = values.get(key)
                 entry = {
                     'client_id': client_id,
                     'var_id': var_id,
@@ -212,13 +226,20 @@ class RedisKeyViewSet(viewsets.ViewSet):
             return Response({'detail': 'invalid key format'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
+            # 인덱스 확인과 값 조회를 한 번의 왕복으로 처리
+            pipeline = redis_instance.client.pipeline(transaction=False)
+            pipeline.sismember(redis_instance.KEY_INDEX_PREFIX + str(parsed[0]), key)
+            pipeline.get(key)
+            indexed, raw = pipeline.execute()
             try:
-                value = redis_instance.get_value(key)
+                value = json.loads(raw) if raw else None
             except Exception:
-                try:
-                    value = redis_instance.client.get(key)
-                except Exception:
-                    value = None
+                value = raw
+            if not indexed:
+                if raw is None:
+                    return Response({'detail': 'key not found'}, status=status.HTTP_404_NOT_FOUND)
+                # 인덱스에서 빠진 키는 조회 시 다시 등록
+                redis_instance.index_keys([key])
 
             data = {
                 'client_id': parsed[0],
@@ -230,3 +251,104 @@ class RedisKeyViewSet(viewsets.ViewSet):
             return Response(serializer.data)
         except Exception as e:
             return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class SeriesView(APIView):
+    """차트용 시계열 조회: GET /data_entry/series/
+
+    Query params:
+    - var_id (또는 var_id[]): 반복 또는 쉼표 구분 (필수)
+    - start, end: ISO 시각 (필수, end는 제외)
+    - max_points: 변수당 최대 점 수 (기본 1000) → 이 값을 넘지 않는 가장 세밀한 테이블 선택
+    - downsample: lttb | minmax (선택)
+    - field: value | avg | min | max | sum (기본 value)
+    - resolution: 2min | 10min | 1hour | daily (자동 선택 무시)
+    - time_format: iso | epoch_ms (기본 iso)
+
+    응답: {'resolution', 'field', 'downsample', 'points', 'series': {var_id: {'t': [...], 'v': [...]}}}
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def _var_ids(self, request):
+        var_ids = []
+        for raw in request.query_params.getlist('var_id') + request.query_params.getlist('var_id[]'):
+            for part in str(raw).split(','):
+                part = part.strip()
+                if part:
+                    var_ids.append(int(part))
+        return list(dict.fromkeys(var_ids))
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            var_ids = self._var_ids(request)
+        except ValueError:
+            return Response({'detail': 'var_id must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        start = _parse_scheduled_time(params.get('start'))
+        end = _parse_scheduled_time(params.get('end'))
+        if not var_ids or start is None or end is None:
+            return Response({'detail': 'var_id, start and end are required'}, status=status.HTTP_400_BAD_REQUEST)
+        start, end = _ensure_naive_local(start), _ensure_naive_local(end)
+        if end <= start:
+            return Response({'detail': 'end must be after start'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            max_points = min(max(int(params.get('max_points', DEFAULT_MAX_POINTS)), 3), MAX_POINTS_LIMIT)
+        except ValueError:
+            return Response({'detail': 'max_points must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        resolution = params.get('resolution') or None
+        if resolution and resolution not in [name for name, _, _ in RESOLUTIONS]:
+            return Response({'detail': f'unknown resolution: {resolution}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = query_series(
+                var_ids, start, end,
+                max_points=max_points,
+                downsample=params.get('downsample') or None,
+                field=params.get('field', 'value'),
+                resolution=resolution,
+                time_format=params.get('time_format', 'iso'),
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        data.update({'start': start.isoformat(), 'end': end.isoformat(), 'max_points': max_points})
+        return Response(data)
+
+
+class ExportView(SeriesView):
+    """시계열 대량 내보내기(스트리밍): GET /data_entry/export/
+
+    Query params:
+    - resolution: 2min | 10min | 1hour | daily (기본 2min)
+    - start, end: ISO 시각 (선택, end는 제외)
+    - var_id (또는 var_id[]): 반복 또는 쉼표 구분 (선택)
+    - export_format: auto | parquet | arrow | csv (기본 auto: pyarrow가 있으면 parquet, 없으면 csv)
+      ('format'은 DRF의 URL_FORMAT_OVERRIDE라서 렌더러 협상 단계에서 404가 나므로 쓰지 않음)
+
+    응답 본문은 서버측 커서에서 chunk 단위로 생성되며, 실제 형식은 X-Export-Format 헤더로 알려줍니다.
+    ASGI로 서비스할 때는 async generator로 넘겨 chunk마다 읽어 보냅니다 (전체를 메모리에 모으지 않음).
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            var_ids = self._var_ids(request)
+        except ValueError:
+            return Response({'detail': 'var_id must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        start = _parse_scheduled_time(params.get('start'))
+        end = _parse_scheduled_time(params.get('end'))
+        resolution = params.get('resolution', '2min')
+        try:
+            fmt, stream = iter_export(
+                resolution,
+                start=_ensure_naive_local(start) if start else None,
+                end=_ensure_naive_local(end) if end else None,
+                var_ids=var_ids or None,
+                fmt=params.get('export_format'),
+            )
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(request._request, ASGIRequest):
+            stream = aiter_stream(stream)
+        response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="data_{resolution}.{EXTENSIONS[fmt]}"'
+        response['X-Export-Format'] = fmt
+        return response
@@ -16,7 +16,7 @@ if (pythonpath and pythonpath not in sys.path):
     sys.path.insert(0, pythonpath)
 
 import django
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 # Django 설정 초기화
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "py_backend.settings")
@@ -25,17 +25,24 @@ from LSISsocket.models import AlertGroup, CalcGroup, ControlGroup, MemoryGroup,
 from LSISsocket.serializers import MemoryGroupSerializer, SocketClientConfigSerializer
 from LSISsocket import service as LSIS_service
 from data_entry.service import aggregate_2min_to_10min, aggregate_to_1hour, redis_to_db, aggregate_to_daily
-from py_backend.settings import TIME_ZONE
+from data_entry.retention import apply_retention
+from py_backend.settings import TIME_ZONE, LSIS_JOB_RECONCILE_SEC, LSIS_POLL_MODE, LSIS_STATUS_FLUSH_SEC, MCU_JOB_WORKER
 import time
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
+from apscheduler.executors.asyncio import AsyncIOExecutor
 from apscheduler.schedulers.base import SchedulerNotRunningError
 from utils import setup_logger, log_exceptions
 from utils.logger import log_job_runtime
 from pathlib import Path
-from LSISsocket.service import tcp_client_to_redis, reids_to_memory_mapping
+from LSISsocket.service import tcp_client_to_redis, async_tcp_client_to_redis, reids_to_memory_mapping
+from LSISsocket.scheduler_jobs import RECONCILE_JOB_ID, PollJobReconciler
+from LSISsocket.status_writer import status_writer
+from MCUnode.jobs import mcu_job_worker
+from utils.protocol.MCU.client.bus_scheduler import bus_scheduler
+from utils.protocol.MCU.client.session import session_pool
 from contextlib import asynccontextmanager
 from zoneinfo import ZoneInfo
 
@@ -48,6 +55,8 @@ logger = setup_logger(
 
 # 전역 스케줄러 레퍼런스 (없을 수 있으므로 미리 None으로 초기화)
 scheduler = None
+# PLC 폴링 잡 재조정기 (lifespan에서 생성)
+poll_reconciler = None
 from LSISsocket import service as LSIS_service
 
 # 전역 이벤트: 스레드/작업에게 종료 신호를 보냄
@@ -137,7 +146,7 @@ except Exception:
 @log_exceptions(logger)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scheduler
+    global scheduler, poll_reconciler
     logger.info("FastAPI 수명주기 및 스케줄러 시작")
     try:
         # AsyncIO 기반 스케줄러로 교체하여 FastAPI 이벤트 루프와 자연스럽게 동작
@@ -145,31 +154,54 @@ async def lifespan(app: FastAPI):
         # 동일한 executors를 등록 (IO 바운드 작업은 쓰레드풀, 필요시 프로세스풀 사용)
         scheduler.add_executor(ThreadPoolExecutor(max_workers=os.cpu_count()), "default")
         scheduler.add_executor(ProcessPoolExecutor(max_workers=os.cpu_count()), "processpool")
-        client_cache, memory_group_cache, calc_group_cache, alert_group_cache, control_group_cache, setup_group_cache = await asyncio.to_thread(LSIS_service.initialize_global_caches)
-        for client in client_cache:
-            try:
-                # AsyncIOScheduler의 add_job은 이벤트 루프에서 안전하게 호출 가능하므로 직접 호출
-                # tcp_client_servive에 잡 런타임 로깅 데코레이터를 적용하여 START/END/ERROR 로그를 남김
-                try:
-                    wrapped_job = log_job_runtime(logger, level=logging.WARNING, msg_prefix='JOB')(tcp_client_to_redis)
-                except Exception:
-                    wrapped_job = tcp_client_to_redis
-                scheduler.add_job(
-                    wrapped_job,
-                    list(client.cron.keys())[0],
-                    **list(client.cron.values())[0],
-                    replace_existing=True,
-                    max_instances=1,
-                    misfire_grace_time=15,
-                    coalesce=False,
-                    executor='default',
-                    args=(client,),
-                )
-            except Exception:
-                logger.exception(f'클라이언트 작업 등록 실패: {getattr(client, "id", None)}')
-            # 이벤트 루프를 블로킹하지 않도록 소량 대기
-            await asyncio.sleep(0.111)
-            
+        # PLC 폴링 코루틴은 FastAPI 이벤트 루프에서 직접 실행
+        scheduler.add_executor(AsyncIOExecutor(), "asyncio")
+        await asyncio.to_thread(LSIS_service.initialize_global_caches)
+        # 클라이언트별 폴링 잡은 reconciler가 설정 스냅샷과 비교해 등록하고, 이후 설정 변경 시 해당 잡만 추가/삭제/재스케줄
+        # tcp_client_servive에 잡 런타임 로깅 데코레이터를 적용하여 START/END/ERROR 로그를 남김
+        # LSIS_POLL_MODE='async'이면 PLC별 지속 연결을 사용하는 코루틴 잡으로 등록
+        poll_job, poll_executor = (async_tcp_client_to_redis, 'asyncio') if LSIS_POLL_MODE == 'async' else (tcp_client_to_redis, 'default')
+        on_endpoint_released = None
+        if LSIS_POLL_MODE == 'async':
+            loop = asyncio.get_running_loop()
+
+            # 잡이 삭제되거나 host/port가 바뀐 PLC의 지속 연결을 이벤트 루프에서 닫고 캐시에서 제거
+            def on_endpoint_released(key):
+                asyncio.run_coroutine_threadsafe(LSIS_service.close_async_client(key), loop)
+
+        poll_reconciler = PollJobReconciler(
+            scheduler,
+            poll_job,
+            executor=poll_executor,
+            wrap=log_job_runtime(logger, level=logging.WARNING, msg_prefix='JOB'),
+            on_endpoint_released=on_endpoint_released,
+            # 설정/상태 행이 삭제·재생성되면 캐시된 상태 행을 버려 다음 flush에서 다시 읽음
+            on_client_changed=status_writer.forget,
+        )
+        poll_reconciler.attach()
+        await asyncio.to_thread(poll_reconciler.reconcile)
+        # pub/sub 알림을 놓친 경우를 위한 주기적 전체 재조정 (설정 버전이 그대로면 DB 조회 없음)
+        scheduler.add_job(
+            poll_reconciler.reconcile,
+            'interval',
+            seconds=LSIS_JOB_RECONCILE_SEC,
+            id=RECONCILE_JOB_ID,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            executor='default',
+        )
+        # 폴러가 대기열에 넣은 SocketClientStatus를 주기적으로 bulk_update
+        scheduler.add_job(
+            status_writer.flush,
+            'interval',
+            seconds=LSIS_STATUS_FLUSH_SEC,
+            id='lsis_status_flush',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            executor='default',
+        )
 
         # 전역 집계 작업은 한 번만 등록 (클라이언트 루프 밖)
         scheduler.add_job(
@@ -216,14 +248,38 @@ async def lifespan(app: FastAPI):
             coalesce=False,
             executor='default',
         )
+        scheduler.add_job(
+            apply_retention,
+            'cron',
+            hour=3,
+            minute=30,  # 일 집계 이후, 트래픽이 적은 새벽에 보존 기간 정리/파티션 생성
+            replace_existing=True,
+            max_instances=1,
+            misfire_grace_time=3600,
+            coalesce=True,
+            executor='default',
+        )
         # AsyncIOScheduler.start()는 동기 메서드(코루틴이 아님)이므로 await하지 않고 호출
         scheduler.start()
         logger.info("스케줄러 시작됨.")
+        poll_reconciler.start_listener()
+        # DE-MCU 비동기 명령 잡을 이 프로세스에서 실행하도록 설정된 경우
+        if MCU_JOB_WORKER == 'scheduler':
+            mcu_job_worker.start()
         try:
             yield
         finally:
             pass
     finally:
+        if poll_reconciler is not None:
+            poll_reconciler.stop_listener()
+        mcu_job_worker.stop()
+        # 직렬 포트 버스 워커를 멈추고 열린 포트를 닫음 (다음 프로세스가 바로 포트를 열 수 있도록)
+        try:
+            bus_scheduler.shutdown()
+            session_pool.close()
+        except Exception:
+            logger.exception('DE-MCU 버스/시리얼 세션 종료 중 예외 발생')
         # 종료 시점: scheduler가 존재하면 한 번만 완전 종료 시도
         try:
             if scheduler is not None:
@@ -260,6 +316,16 @@ async def lifespan(app: FastAPI):
                 logger.info('종료할 스케줄러 인스턴스 없음')
         except Exception:
             logger.exception('스케줄러 종료 중 예외 발생')
+        # PLC 지속 연결 정리
+        try:
+            await LSIS_service.close_async_clients()
+        except Exception:
+            logger.exception('PLC 비동기 연결 종료 중 예외 발생')
+        # 아직 기록되지 않은 클라이언트 상태 저장
+        try:
+            await asyncio.to_thread(status_writer.flush)
+        except Exception:
+            logger.exception('클라이언트 상태 저장 중 예외 발생')
 
 app = FastAPI(title="FastAPI 스케쥴러", version="1.0", lifespan=lifespan)
 
@@ -274,3 +340,19 @@ except Exception:
     # 대체: 커스텀 ASGI 정적 파일 핸들러 사용
     app.mount('/static/ws_ui', static_file_app)
 
+
+
+# 스케줄러 잡 현황: 잡별 다음 실행 시각과 마지막 실행 소요 시간/결과
+@app.get('/scheduler/jobs')
+async def scheduler_jobs():
+    if poll_reconciler is None:
+        raise HTTPException(status_code=503, detail='스케줄러가 아직 시작되지 않았습니다')
+    return {'jobs': poll_reconciler.job_table()}
+
+
+# PLC 폴링 잡을 즉시 전체 재조정 (변경 알림 없이 설정을 고친 경우 등)
+@app.post('/scheduler/reconcile')
+async def scheduler_reconcile():
+    if poll_reconciler is None:
+        raise HTTPException(status_code=503, detail='스케줄러가 아직 시작되지 않았습니다')
+    return await asyncio.to_thread(poll_reconciler.reconcile)
@@ -29,8 +29,13 @@ except Exception:
     ws_http_app = None
     ws_static_app = None
 
+try:
+    from MCUnode.ws_jobs import websocket_app as mcu_jobs_ws_app  # type: ignore
+except Exception:
+    mcu_jobs_ws_app = None
+
 async def application(scope, receive, send):
-    """Dispatch ASGI connections: websocket (/ws/logging-tail) -> ws_log_app, http -> Django."""
+    """Dispatch ASGI connections: websocket (/ws/logging-tail) -> ws_log_app, (/ws/mcu-jobs) -> mcu_jobs_ws_app, http -> Django."""
     try:
         typ = scope.get('type')
         path = scope.get('path', '')
@@ -77,6 +82,20 @@ async def application(scope, receive, send):
                 pass
         return
 
+    if typ == 'websocket' and path.startswith('/ws/mcu-jobs'):
+        if mcu_jobs_ws_app is None:
+            logger.error('mcu_jobs_ws_app not available to handle request')
+            try:
+                await send({'type': 'websocket.close', 'code': 1011})
+            except Exception:
+                pass
+            return
+        try:
+            await mcu_jobs_ws_app(scope, receive, send)
+        except Exception:
+            logger.exception('Error while handling websocket in mcu_jobs_ws_app')
+        return
+
     # Route certain HTTP paths to the embedded ws_log HTTP ASGI app
     if typ == 'http':
         try:
@@ -41,6 +41,48 @@ REDIS_HOST = os.environ.get('REDIS_HOST', '127.0.0.1')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
 REDIS_DID = int(os.environ.get('REDIS_DID', 0))
 REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD', None)
+# PLC 메모리 이미지 저장 방식: 'binary'(SETRANGE/GETRANGE 바이트 이미지) 또는 'json'(기존 해시 필드 JSON 리스트)
+LSIS_MEMORY_IMAGE_MODE = os.environ.get('LSIS_MEMORY_IMAGE_MODE', 'binary').lower()
+# PLC 폴링 방식: 'sync'(기존 블로킹 소켓 + 스레드풀, 기본값) 또는 'async'(FastAPI 이벤트 루프에서 코루틴, PLC별 지속 연결)
+LSIS_POLL_MODE = os.environ.get('LSIS_POLL_MODE', 'sync').lower()
+# PLC 읽기 구간: 'blocks'(SocketClientConfig.blocks 그대로) 또는 'planned'(memory_groups 변수 주소로 계산한 최소 구간)
+LSIS_READ_PLAN_MODE = os.environ.get('LSIS_READ_PLAN_MODE', 'blocks').lower()
+# 읽기 계획: 이 바이트 수 이하의 빈 구간은 요청을 나누지 않고 함께 읽음
+LSIS_READ_GAP_BYTES = int(os.environ.get('LSIS_READ_GAP_BYTES', 64))
+# 연속 읽기 요청 하나의 최대 바이트 수 (XGT 연속 읽기 최대 1400)
+LSIS_READ_MAX_BYTES = int(os.environ.get('LSIS_READ_MAX_BYTES', 700))
+# 읽기 계획: 다른 변수와 합쳐지지 않은 이 바이트 수 이하의 작은 구간들은 개별 읽기(LWORD 블록 최대 16개/요청)로 묶어 요청 수를 줄임 (0이면 사용 안 함)
+LSIS_READ_SPARSE_BYTES = int(os.environ.get('LSIS_READ_SPARSE_BYTES', 16))
+# 변수 값 발행: 변화 없는 값은 생략하되 이 주기(초)마다 전체 값을 강제로 다시 발행 (0이면 매 폴링 전체 발행)
+LSIS_PUBLISH_REFRESH_SEC = int(os.environ.get('LSIS_PUBLISH_REFRESH_SEC', 60))
+# 폴링 잡 전체 재조정 주기(초): pub/sub 변경 알림을 놓친 경우를 대비한 확인 주기
+LSIS_JOB_RECONCILE_SEC = int(os.environ.get('LSIS_JOB_RECONCILE_SEC', 60))
+# 폴러의 SocketClientStatus 갱신: 대기열을 DB에 일괄 기록하는 주기(초)
+LSIS_STATUS_FLUSH_SEC = int(os.environ.get('LSIS_STATUS_FLUSH_SEC', 5))
+# 내용이 바뀌지 않은 상태도 이 주기(초)마다 updated_at을 DB에 갱신
+LSIS_STATUS_TOUCH_SEC = int(os.environ.get('LSIS_STATUS_TOUCH_SEC', 60))
+# DE-MCU 비동기 명령 잡 레코드(결과 포함) 보관 시간(초)
+MCU_JOB_TTL_SEC = int(os.environ.get('MCU_JOB_TTL_SEC', 3600))
+# 같은 포트/노드/명령/데이터의 읽기 잡은 이 시간(ms) 안에 들어오면 먼저 만든 잡을 공유 (0이면 사용 안 함)
+MCU_JOB_COALESCE_MS = int(os.environ.get('MCU_JOB_COALESCE_MS', 500))
+# 잡 워커 실행 위치: 'scheduler'(기본, main.py FastAPI 프로세스 하나가 큐를 소비) 또는 'django'(잡을 받은 Django 프로세스)
+# 'django'는 워커 프로세스마다 워커/버스 스케줄러가 생겨 같은 RS-485 포트를 여러 프로세스가 쓰게 되므로 단일 워커 배포에서만 사용
+MCU_JOB_WORKER = os.environ.get('MCU_JOB_WORKER', 'scheduler').lower()
+# 집계 롤업: 'python'(기본, 하위 행 조회 후 Python에서 병합) 또는 'sql'(INSERT ... SELECT ... GROUP BY + ON CONFLICT/ON DUPLICATE KEY UPDATE)
+# 'sql'은 SQLite에서만 검증되었으므로 PostgreSQL/MySQL에서는 확인 후 켤 것
+DATA_ROLLUP_MODE = os.environ.get('DATA_ROLLUP_MODE', 'python').lower()
+# 시계열 보존 기간(일): 이 기간보다 오래된 행은 보존 작업에서 삭제 (0이면 무기한 보존)
+# 기본값은 모두 0 (삭제는 환경 변수로 기간을 지정한 경우에만, 예: DATA_RETENTION_2MIN_DAYS=90)
+DATA_RETENTION_DAYS = {
+    '2min': int(os.environ.get('DATA_RETENTION_2MIN_DAYS', 0)),
+    '10min': int(os.environ.get('DATA_RETENTION_10MIN_DAYS', 0)),
+    '1hour': int(os.environ.get('DATA_RETENTION_1HOUR_DAYS', 0)),
+    'daily': int(os.environ.get('DATA_RETENTION_DAILY_DAYS', 0)),
+}
+# 파티션이 없는 테이블(SQLite 등)에서 한 번에 삭제할 행 수
+DATA_RETENTION_BATCH_SIZE = int(os.environ.get('DATA_RETENTION_BATCH_SIZE', 5000))
+# 월 파티션을 미리 만들어 둘 개월 수 (PostgreSQL/MySQL 파티션 테이블)
+DATA_PARTITION_MONTHS_AHEAD = int(os.environ.get('DATA_PARTITION_MONTHS_AHEAD', 2))
 
 
 # ASGI 설정
@@ -14,6 +14,27 @@ except Exception:  # pragma: no cover
 # 시스템의 로컬 타임존 가져오기
 local_tz = get_localzone()
 
+# 병합 갱신(bulk_update, hbulk_update 등)에서 한 번에 조회/기록할 키(필드) 수 기본값
+BULK_CHUNK_SIZE = 1000
+
+
+def _merge_json(existing_value, new_value):
+    """기존 JSON 문자열과 새 값을 병합합니다 (둘 다 dict이면 update, 아니면 새 값으로 대체)."""
+    if existing_value:
+        updated_value = json.loads(existing_value)
+        if isinstance(updated_value, dict) and isinstance(new_value, dict):
+            updated_value.update(new_value)
+            return updated_value
+    return new_value
+
+
+def _chunked(data, chunk_size=None):
+    """{key: value} 딕셔너리를 chunk_size개씩 [(key, value), ...] 목록으로 나눕니다."""
+    items = list(data.items())
+    size = max(1, int(chunk_size or BULK_CHUNK_SIZE))
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 class RedisManager:
     """
     Redis 기본 데이터, 해시 데이터, 시계열 데이터 및 백업을 통합 관리하는 컨텍스트
@@ -61,6 +82,10 @@ class RedisManager:
                 retry_on_timeout=True,  # 타임아웃 시 재시도
             )
             self.client = redis.Redis(connection_pool=pool)
+        # 바이너리 메모리 이미지 전용 클라이언트 (decode_responses=False, 동일 접속 정보)
+        binary_kwargs = dict(self.client.connection_pool.connection_kwargs)
+        binary_kwargs['decode_responses'] = False
+        self.binary_client = redis.Redis(connection_pool=redis.ConnectionPool(max_connections=self.max_connections, **binary_kwargs))
 
     def is_connected(self):
         """연결 상태 확인 (ping 테스트)"""
@@ -99,14 +124,21 @@ class RedisManager:
         """모든 키 목록 조회"""
         return self.client.keys('*')
 
-    def mget(self, keys, as_dict=True):
+    def mget(self, keys, as_dict=True, chunk_size=None):
         """여러 키를 한 번에 조회(MGET)하여 JSON 디코딩해 반환
         :param keys: 조회할 키 리스트 또는 단일 키
         :param as_dict: True면 {key: value} dict, False면 값 리스트 반환
+        :param chunk_size: MGET 한 번에 조회할 키 수 (기본값: BULK_CHUNK_SIZE)
         """
         if isinstance(keys, (str, bytes)):
             keys = [keys]
-        values = self.client.mget(keys)
+        keys = list(keys)
+        if not keys:
+            return {} if as_dict else []
+        size = max(1, int(chunk_size or BULK_CHUNK_SIZE))
+        values = []
+        for i in range(0, len(keys), size):
+            values.extend(self.client.mget(keys[i:i + size]))
         decoded = []
         for v in values:
             try:
@@ -130,37 +162,40 @@ class RedisManager:
             "user:1001": {"name": "Alice", "age": 30},
             "user:1002": {"name": "Bob", "age": 25}
         })
+
+        - 기존 값을 조회하지 않고 덮어씁니다. expire가 없으면 MSET 한 번으로 전송합니다.
         """
+        if not data:
+            return
+        if expire is None:
+            self.client.mset({key: json.dumps(value) for key, value in data.items()})
+            return
         pipeline = self.client.pipeline()
         for key, value in data.items():
             pipeline.set(key, json.dumps(value), ex=expire)
         pipeline.execute()
 
-    def bulk_update(self, data, expire=None):
+    def bulk_update(self, data, expire=None, chunk_size=None):
         """
         여러 개의 키-값 데이터를 한 번에 업데이트 (bulk_update 역할)
         :param data: {key1: value1, key2: value2, ...} 형태의 딕셔너리
         :param expire: 만료 시간 (초) (선택 사항)
+        :param chunk_size: 한 번에 조회/기록할 키 수 (기본값: BULK_CHUNK_SIZE)
 
         📌 사용 예시:
         redis_manager.bulk_update({
             "user:1001": {"age": 31},  # 기존 키 업데이트
             "user:1002": {"city": "Seoul"}  # 새로운 필드 추가
         })
+
+        - chunk마다 MGET 1회 → Python에서 병합 → SET 파이프라인 1회 (chunk당 왕복 2회)
         """
-        pipeline = self.client.pipeline()
-        for key, new_value in data.items():
-            existing_value = self.client.get(key)
-            if existing_value:
-                updated_value = json.loads(existing_value)
-                if isinstance(updated_value, dict) and isinstance(new_value, dict):
-                    updated_value.update(new_value)
-                else:
-                    updated_value = new_value
-            else:
-                updated_value = new_value
-            pipeline.set(key, json.dumps(updated_value), ex=expire)
-        pipeline.execute()
+        for chunk in _chunked(data, chunk_size):
+            existing_values = self.client.mget([key for key, _ in chunk])
+            pipeline = self.client.pipeline(transaction=False)
+            for (key, new_value), existing_value in zip(chunk, existing_values):
+                pipeline.set(key, json.dumps(_merge_json(existing_value, new_value)), ex=expire)
+            pipeline.execute()
 
     # ------------------------------
     # 📌 해시 데이터 Bulk 저장 및 업데이트 (동기)
@@ -183,31 +218,28 @@ class RedisManager:
             pipeline.hset(name, field, json.dumps(value))
         pipeline.execute()
 
-    def hbulk_update(self, name, data):
+    def hbulk_update(self, name, data, chunk_size=None):
         """
         여러 개의 해시 데이터를 한 번에 업데이트 (bulk_update 역할)
         :param name: Redis 해시 키 이름
         :param data: {field1: value1, field2: value2, ...} 형태의 딕셔너리
+        :param chunk_size: 한 번에 조회/기록할 필드 수 (기본값: BULK_CHUNK_SIZE)
         
         📌 사용 예시:
         redis_manager.hbulk_update("user:1001", {
             "phone": "987-654-3210",  # 기존 필드 업데이트
             "address": "New York"  # 새로운 필드 추가
         })
+
+        - chunk마다 HMGET 1회 → Python에서 병합 → HSET(mapping) 1회 (chunk당 왕복 2회)
         """
-        pipeline = self.client.pipeline()
-        for field, new_value in data.items():
-            existing_value = self.client.hget(name, field)
-            if existing_value:
-                updated_value = json.loads(existing_value)
-                if isinstance(updated_value, dict) and isinstance(new_value, dict):
-                    updated_value.update(new_value)
-                else:
-                    updated_value = new_value
-            else:
-                updated_value = new_value
-            pipeline.hset(name, field, json.dumps(updated_value))
-        pipeline.execute()
+        for chunk in _chunked(data, chunk_size):
+            existing_values = self.client.hmget(name, [field for field, _ in chunk])
+            mapping = {
+                field: json.dumps(_merge_json(existing_value, new_value))
+                for (field, new_value), existing_value in zip(chunk, existing_values)
+            }
+            self.client.hset(name, mapping=mapping)
     # ------------------------------
     # 📌 해시 데이터 저장 및 조회
     # ------------------------------
@@ -239,38 +271,194 @@ class RedisManager:
         """키 존재 여부 확인"""
         return self.client.hexists(name, key) > 0
 
-    def hcreate_or_update(self, name, data):
-        """해시 데이터 업데이트 또는 생성"""
-        for key, value in data.items():
-            existing_value = self.client.hget(name, key)
+    def hsetnx(self, name, key, value):
+        """해시 필드가 없을 때만 저장 (저장했으면 True)"""
+        return self.client.hsetnx(name, key, json.dumps(value)) > 0
 
-            if existing_value:
-                updated_value = json.loads(existing_value)
-                if isinstance(updated_value, dict) and isinstance(value, dict):
-                    updated_value.update(value)
-                else:
-                    updated_value = value
-            else:
-                updated_value = value
+    def hcreate_or_update(self, name, data, chunk_size=None):
+        """해시 데이터 업데이트 또는 생성 (hbulk_update와 같은 HMGET/HSET 2단계 처리)"""
+        self.hbulk_update(name, data, chunk_size=chunk_size)
 
-            self.client.hset(name, key, json.dumps(updated_value))
+    # ------------------------------
+    # 📌 바이너리 메모리 이미지 (PLC 메모리 영역: %MB/%RW/%WW)
+    # ------------------------------
+
+    @staticmethod
+    def memory_image_key(name, area):
+        """메모리 이미지 키 이름: '{name}:{area}' (예: '192.168.0.10:2004:%MB')"""
+        return f"{name}:{area}"
+
+    @staticmethod
+    def _to_image_bytes(values):
+        if isinstance(values, (bytes, bytearray, memoryview)):
+            return bytes(values)
+        try:
+            return bytes(values)
+        except (ValueError, TypeError):
+            return bytes((int(v) & 0xFF) for v in values)
+
+    def init_memory_image(self, name, area, size):
+        """
+        메모리 이미지를 0으로 채워 생성합니다. 이미 있으면 size까지 0으로 확장만 합니다.
+        기존 JSON 리스트(해시 필드)가 있으면 먼저 바이너리로 변환합니다.
+
+        📌 사용 예시:
+        redis_manager.init_memory_image("192.168.0.10:2004", "%MB", 20000)
+        """
+        key = self.memory_image_key(name, area)
+        if not self.binary_client.exists(key):
+            self.migrate_memory_image(name, area)
+        if size and self.binary_client.strlen(key) < size:
+            # SETRANGE는 offset 앞쪽을 0x00으로 채움 (마지막 바이트도 신규 영역이므로 0으로 기록)
+            self.binary_client.setrange(key, int(size) - 1, b'\x00')
+        return self.binary_client.strlen(key)
+
+    def write_memory_image(self, name, area, offset, values):
+        """
+        읽어온 구간만 SETRANGE로 갱신합니다 (전체 이미지 JSON 재직렬화 없음).
+        :param values: list[int](0~255) 또는 bytes
+        :return: 갱신 후 이미지 길이
+
+        📌 사용 예시:
+        redis_manager.write_memory_image("192.168.0.10:2004", "%MB", 700, response.values)
+        """
+        data = self._to_image_bytes(values)
+        if not data:
+            return None
+        return self.binary_client.setrange(self.memory_image_key(name, area), int(offset), data)
+
+    def read_memory_image(self, name, area, start=0, end=-1):
+        """
+        메모리 이미지를 bytes로 조회합니다 (GETRANGE, end 포함).
+        바이너리 키가 없으면 기존 JSON 리스트(해시 필드)를 읽어 bytes로 변환합니다 (마이그레이션 호환).
+
+        📌 사용 예시:
+        MB = redis_manager.read_memory_image("192.168.0.10:2004", "%MB")
+        memoryview(MB)[200:202]
+        """
+        key = self.memory_image_key(name, area)
+        data = self.binary_client.getrange(key, int(start), int(end))
+        if data or self.binary_client.exists(key):
+            return data
+        legacy = self.hget(name, area)
+        if not isinstance(legacy, list):
+            return b''
+        legacy = self._to_image_bytes(legacy)
+        stop = None if int(end) == -1 else int(end) + 1
+        return legacy[int(start):stop]
+
+    def migrate_memory_image(self, name, area, drop_legacy=False):
+        """
+        해시 필드에 JSON 리스트로 저장된 메모리 영역을 바이너리 키로 변환합니다.
+        기본값으로는 해시 필드를 남겨 두어 json 모드로 되돌려도 값이 유지됩니다.
+        drop_legacy=True는 모든 프로세스가 binary 모드로 전환된 뒤에만 사용하세요.
+        :return: 변환된 바이트 수 (변환할 데이터가 없으면 0)
+        """
+        legacy = self.hget(name, area) if self.client.type(name) == 'hash' else None
+        if not isinstance(legacy, list):
+            return 0
+        data = self._to_image_bytes(legacy)
+        pipeline = self.binary_client.pipeline()
+        pipeline.set(self.memory_image_key(name, area), data)
+        if drop_legacy:
+            pipeline.hdel(name, area)
+        pipeline.execute()
+        return len(data)
 
     # ------------------------------
     # 📌 일반 키 업데이트 (없으면 생성)
     # ------------------------------
 
     def create_or_update(self, key, value, expire=None):
-        """일반 키 데이터 업데이트 또는 생성"""
-        existing_value = self.client.get(key)
+        """일반 키 데이터 업데이트 또는 생성 (여러 키는 bulk_update 사용)"""
+        self.bulk_update({key: value}, expire=expire)
+
+    # ------------------------------
+    # 📌 키 인덱스 ('client_id:var_id' 값 키)
+    # ------------------------------
+    # 클라이언트별 SET(KEY_INDEX_PREFIX + client_id)에 값 키를 보관하고, 인덱스가 있는
+    # client_id는 KEY_INDEX_CLIENTS SET에 보관합니다. 인덱스 키 이름에 ':'를 쓰지 않아
+    # '*:*' 패턴 SCAN(복구 경로)에 섞이지 않습니다.
+
+    KEY_INDEX_PREFIX = 'key_index.'
+    KEY_INDEX_CLIENTS = 'key_index_clients'
+
+    @staticmethod
+    def _split_value_key(key):
+        """'client_id:var_id' 키를 (client_id, var_id) 문자열로 나눕니다. 형식이 다르면 None."""
+        parts = str(key).split(':')
+        if len(parts) != 2 or not all(part.isdigit() for part in parts):
+            return None
+        return parts[0], parts[1]
+
+    def index_keys(self, keys):
+        """
+        값 키를 클라이언트별 인덱스에 추가 (SADD, 파이프라인 한 번)
+        :param keys: 'client_id:var_id' 형태의 키 목록
+        :return: 인덱스에 추가 시도한 키 수
+
+        📌 사용 예시:
+        redis_manager.index_keys(["1:10", "1:11", "2:5"])
+        """
+        grouped = {}
+        for key in keys:
+            parts = self._split_value_key(key)
+            if parts is not None:
+                grouped.setdefault(parts[0], []).append(key)
+        if not grouped:
+            return 0
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.sadd(self.KEY_INDEX_CLIENTS, *grouped)
+        for client_id, client_keys in grouped.items():
+            pipeline.sadd(self.KEY_INDEX_PREFIX + client_id, *client_keys)
+        pipeline.execute()
+        return sum(len(client_keys) for client_keys in grouped.values())
 
-        if existing_value:
-            updated_value = json.loads(existing_value)
-            updated_value.update(value)
+    def get_indexed_keys(self, client_id=None, rebuild_if_missing=True):
+        """
+        인덱스에 있는 값 키 목록 조회 (SCAN 없이 SMEMBERS)
+        :param client_id: 지정하면 해당 클라이언트의 키만, 없으면 전체
+        :param rebuild_if_missing: 인덱스가 아예 없으면 SCAN으로 한 번 재구성
+        :return: (client_id, var_id) 순으로 정렬된 키 리스트
+
+        📌 사용 예시:
+        keys = redis_manager.get_indexed_keys()      # ['1:10', '1:11', '2:5']
+        keys = redis_manager.get_indexed_keys(1)     # ['1:10', '1:11']
+        """
+        if rebuild_if_missing and not self.client.exists(self.KEY_INDEX_CLIENTS):
+            self.rebuild_key_index()
+        if client_id is not None:
+            keys = self.client.smembers(self.KEY_INDEX_PREFIX + str(client_id))
         else:
-            updated_value = value
+            client_ids = self.client.smembers(self.KEY_INDEX_CLIENTS)
+            pipeline = self.client.pipeline(transaction=False)
+            for cid in client_ids:
+                pipeline.smembers(self.KEY_INDEX_PREFIX + cid)
+            keys = set().union(*pipeline.execute()) if client_ids else set()
+        return sorted(keys, key=lambda k: tuple(int(part) for part in k.split(':')))
 
-        updated_value = json.dumps(updated_value)
-        self.client.set(key, updated_value, ex=expire)
+    def rebuild_key_index(self, pattern='*:*'):
+        """
+        SCAN으로 값 키를 찾아 인덱스를 다시 만듭니다 (복구/재구성 경로).
+        :param pattern: SCAN MATCH 패턴
+        :return: 인덱스에 등록된 키 수
+
+        📌 사용 예시:
+        count = redis_manager.rebuild_key_index()
+        """
+        keys = [key for key in self.query_scan(pattern) if self._split_value_key(key) is not None]
+        old_clients = self.client.smembers(self.KEY_INDEX_CLIENTS)
+        pipeline = self.client.pipeline()
+        pipeline.delete(self.KEY_INDEX_CLIENTS, *(self.KEY_INDEX_PREFIX + cid for cid in old_clients))
+        grouped = {}
+        for key in keys:
+            grouped.setdefault(self._split_value_key(key)[0], []).append(key)
+        if grouped:
+            pipeline.sadd(self.KEY_INDEX_CLIENTS, *grouped)
+            for client_id, client_keys in grouped.items():
+                pipeline.sadd(self.KEY_INDEX_PREFIX + client_id, *client_keys)
+        pipeline.execute()
+        return len(keys)
 
     # ------------------------------
     # 📌 시계열 데이터 관리 기능 (TimeSeries)
@@ -900,31 +1088,29 @@ class AsyncRedisManager:
     # ------------------------------
 
     async def bulk_set(self, data, expire=None):
-        """ 여러 개의 키-값 데이터를 한 번에 저장 """
+        """ 여러 개의 키-값 데이터를 한 번에 저장 (기존 값 조회 없음, expire가 없으면 MSET) """
         if self.client is None:
             await self.connect()
+        if not data:
+            return
+        if expire is None:
+            await self.client.mset({key: json.dumps(value) for key, value in data.items()})
+            return
         async with self.client.pipeline() as pipe:
             for key, value in data.items():
                 await pipe.set(key, json.dumps(value), ex=expire)
             await pipe.execute()
 
-    async def bulk_update(self, data, expire=None):
-        """ 여러 개의 키-값 데이터를 한 번에 업데이트 """
+    async def bulk_update(self, data, expire=None, chunk_size=None):
+        """ 여러 개의 키-값 데이터를 한 번에 업데이트 (chunk마다 MGET 1회 + SET 파이프라인 1회) """
         if self.client is None:
             await self.connect()
-        async with self.client.pipeline() as pipe:
-            for key, new_value in data.items():
-                existing_value = await self.client.get(key)
-                if existing_value:
-                    updated_value = json.loads(existing_value)
-                    if isinstance(updated_value, dict) and isinstance(new_value, dict):
-                        updated_value.update(new_value)
-                    else:
-                        updated_value = new_value
-                else:
-                    updated_value = new_value
-                await pipe.set(key, json.dumps(updated_value), ex=expire)
-            await pipe.execute()
+        for chunk in _chunked(data, chunk_size):
+            existing_values = await self.client.mget([key for key, _ in chunk])
+            async with self.client.pipeline(transaction=False) as pipe:
+                for (key, new_value), existing_value in zip(chunk, existing_values):
+                    await pipe.set(key, json.dumps(_merge_json(existing_value, new_value)), ex=expire)
+                await pipe.execute()
 
     # ------------------------------
     # 📌 해시 데이터 Bulk 저장 및 업데이트 (비동기)
@@ -939,23 +1125,17 @@ class AsyncRedisManager:
                 await pipe.hset(name, field, json.dumps(value))
             await pipe.execute()
 
-    async def hbulk_update(self, name, data):
-        """ 여러 개의 해시 데이터를 한 번에 업데이트 """
+    async def hbulk_update(self, name, data, chunk_size=None):
+        """ 여러 개의 해시 데이터를 한 번에 업데이트 (chunk마다 HMGET 1회 + HSET(mapping) 1회) """
         if self.client is None:
             await self.connect()
-        async with self.client.pipeline() as pipe:
-            for field, new_value in data.items():
-                existing_value = await self.client.hget(name, field)
-                if existing_value:
-                    updated_value = json.loads(existing_value)
-                    if isinstance(updated_value, dict) and isinstance(new_value, dict):
-                        updated_value.update(new_value)
-                    else:
-                        updated_value = new_value
-                else:
-                    updated_value = new_value
-                await pipe.hset(name, field, json.dumps(updated_value))
-            await pipe.execute()
+        for chunk in _chunked(data, chunk_size):
+            existing_values = await self.client.hmget(name, [field for field, _ in chunk])
+            mapping = {
+                field: json.dumps(_merge_json(existing_value, new_value))
+                for (field, new_value), existing_value in zip(chunk, existing_values)
+            }
+            await self.client.hset(name, mapping=mapping)
 
     # ------------------------------
     # 📌 해시 데이터 저장 및 조회 (비동기)
@@ -995,23 +1175,9 @@ class AsyncRedisManager:
             await self.connect()
         return await self.client.hexists(name, key)
 
-    async def hcreate_or_update(self, name, data):
-        """해시 데이터 업데이트 또는 생성"""
-        if self.client is None:
-            await self.connect()
-        async with self.client.pipeline() as pipe:
-            for key, value in data.items():
-                existing_value = await self.client.hget(name, key)
-                if existing_value:
-                    updated_value = json.loads(existing_value)
-                    if isinstance(updated_value, dict) and isinstance(value, dict):
-                        updated_value.update(value)
-                    else:
-                        updated_value = value
-                else:
-                    updated_value = value
-                await pipe.hset(name, key, json.dumps(updated_value))
-            await pipe.execute()
+    async def hcreate_or_update(self, name, data, chunk_size=None):
+        """해시 데이터 업데이트 또는 생성 (hbulk_update와 같은 HMGET/HSET 2단계 처리)"""
+        await self.hbulk_update(name, data, chunk_size=chunk_size)
 
 
     # ------------------------------
@@ -1029,18 +1195,8 @@ class AsyncRedisManager:
         await redis_manager.create_or_update("user:123", {"name": "Alice"}, expire=3600)
         """
         try:
-            # 기존 값 가져오기 (비동기)
-            existing_value = await self.client.get(key)
-
-            if existing_value:
-                updated_value = json.loads(existing_value)  # 기존 JSON 데이터를 dict로 변환
-                updated_value.update(value)  # 기존 데이터 업데이트
-            else:
-                updated_value = value  # 기존 값이 없으면 새로운 값 사용
-
-            # JSON 형식으로 Redis에 저장 (비동기)
-            updated_value = json.dumps(updated_value)
-            await self.client.set(key, updated_value, ex=expire)
+            # 기존 값 조회 → 병합 → 저장 (bulk_update와 같은 2단계 처리)
+            await self.bulk_update({key: value}, expire=expire)
 
         except RedisError as e:
             return {"error": f"Redis error: {str(e)}"}
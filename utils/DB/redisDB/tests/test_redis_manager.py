@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from utils.DB.redisDB import main
+from utils.DB.redisDB.main import RedisManager
+
+
+@pytest.fixture
+def manager():
+    server = fakeredis.FakeServer()
+    redis_manager = RedisManager()
+    redis_manager.client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    redis_manager.binary_client = fakeredis.FakeRedis(server=server)
+    return redis_manager
+
+
+def test_hsetnx_keeps_existing_field(manager):
+    assert manager.hsetnx("10.0.0.1:2004", "%MB", [0, 0])
+    assert not manager.hsetnx("10.0.0.1:2004", "%MB", [9, 9])
+    assert manager.hget("10.0.0.1:2004", "%MB") == [0, 0]
+
+
+def test_migrate_memory_image_keeps_legacy_field_by_default(manager):
+    manager.hset("10.0.0.1:2004", "%MB", [1, 2, 300])
+
+    assert manager.migrate_memory_image("10.0.0.1:2004", "%MB") == 3
+    assert manager.read_memory_image("10.0.0.1:2004", "%MB") == bytes([1, 2, 300 & 0xFF])
+    assert manager.hget("10.0.0.1:2004", "%MB") == [1, 2, 300]
+
+    manager.migrate_memory_image("10.0.0.1:2004", "%MB", drop_legacy=True)
+    assert not manager.hexists("10.0.0.1:2004", "%MB")
+
+
+def test_index_keys_groups_by_client_and_skips_other_keys(manager):
+    assert manager.index_keys(["1:10", "1:2", "2:5", "mcu_job:abc", "1:x", "1:2:3"]) == 3
+    manager.index_keys(["1:10", "10:1"])
+
+    assert manager.get_indexed_keys() == ["1:2", "1:10", "2:5", "10:1"]
+    assert manager.get_indexed_keys(1) == ["1:2", "1:10"]
+    assert manager.get_indexed_keys("2") == ["2:5"]
+    assert manager.get_indexed_keys(3) == []
+    assert manager.index_keys(["not-a-value-key"]) == 0
+
+
+def test_missing_index_is_rebuilt_with_scan(manager):
+    # SCAN이 여러 번 반복되도록 COUNT(100)보다 많은 키
+    manager.bulk_set({f"{client_id}:{var_id}": var_id for client_id in (1, 2) for var_id in range(120)})
+    manager.set_value("mcu_job:abc", {"status": "done"})
+    manager.set_value("7:name", "not a value key")
+
+    keys = manager.get_indexed_keys()
+
+    assert len(keys) == 240
+    assert keys[:3] == ["1:0", "1:1", "1:2"] and keys[-1] == "2:119"
+    assert manager.client.exists(manager.KEY_INDEX_CLIENTS)
+    assert manager.get_indexed_keys(2)[:2] == ["2:0", "2:1"]
+
+
+def test_rebuild_drops_stale_entries(manager):
+    manager.set_value("1:10", 1.5)
+    manager.index_keys(["1:10", "1:11", "3:1"])
+
+    assert manager.rebuild_key_index() == 1
+    assert manager.get_indexed_keys() == ["1:10"]
+    assert not manager.client.exists(manager.KEY_INDEX_PREFIX + "3")
+
+
+def test_get_indexed_keys_without_rebuild(manager):
+    manager.set_value("1:10", 1.5)
+
+    assert manager.get_indexed_keys(rebuild_if_missing=False) == []
+    assert not manager.client.exists(manager.KEY_INDEX_CLIENTS)
+
+
+def test_bulk_update_merges_dicts_and_overwrites_other_values(manager):
+    manager.bulk_set({"a": {"x": 1, "y": 2}, "b": [1, 2], "c": {"x": 1}, "d": 5})
+
+    manager.bulk_update({"a": {"y": 3, "z": 4}, "b": {"x": 1}, "c": [9], "d": {"x": 2}, "e": {"new": True}})
+
+    assert manager.mget(["a", "b", "c", "d", "e"]) == {
+        "a": {"x": 1, "y": 3, "z": 4},
+        "b": {"x": 1},
+        "c": [9],
+        "d": {"x": 2},
+        "e": {"new": True},
+    }
+
+
+def test_bulk_update_sets_expire(manager):
+    manager.bulk_update({"a": 1}, expire=30)
+
+    assert 0 < manager.client.ttl("a") <= 30
+
+
+def test_hbulk_update_merges_fields(manager):
+    manager.hbulk_set("node", {"STATUS": {"Firmware": "1.0", "DI": 0}, "SETUP": [1], "name": "pump"})
+
+    manager.hbulk_update("node", {"STATUS": {"DI": 3}, "SETUP": {"baud": 9600}, "name": {"id": 1}, "new": 0})
+
+    assert manager.hmget("node", ["STATUS", "SETUP", "name", "new"]) == {
+        "STATUS": {"Firmware": "1.0", "DI": 3},
+        "SETUP": {"baud": 9600},
+        "name": {"id": 1},
+        "new": 0,
+    }
+
+
+def test_bulk_updates_are_chunked(manager, monkeypatch):
+    monkeypatch.setattr(main, "BULK_CHUNK_SIZE", 3)
+    data = {f"1:{i}": {"v": i} for i in range(7)}
+
+    with mock.patch.object(manager.client, "mget", wraps=manager.client.mget) as mget:
+        manager.bulk_update(data)
+    assert [len(call.args[0]) for call in mget.call_args_list] == [3, 3, 1]
+
+    with mock.patch.object(manager.client, "hmget", wraps=manager.client.hmget) as hmget:
+        manager.hbulk_update("h", data)
+        manager.hbulk_update("h", {"1:0": {"w": 0}}, chunk_size=5)
+    assert [len(call.args[1]) for call in hmget.call_args_list] == [3, 3, 1, 1]
+
+    assert manager.mget(list(data)) == data
+    assert manager.hget("h", "1:0") == {"v": 0, "w": 0}
+    assert manager.client.hlen("h") == 7
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""시계열 다운샘플링 (차트 표시용).
+
+- lttb: Largest-Triangle-Three-Buckets. 첫/마지막 점을 유지하고, 구간마다 시각적으로 가장
+  중요한 점(인접 구간 평균점과 만드는 삼각형 넓이가 최대인 점) 하나를 고릅니다.
+- minmax: 구간마다 최소/최대 점을 시간 순서대로 유지하여 피크가 사라지지 않도록 합니다.
+
+두 함수 모두 x(시각)가 오름차순이라고 가정하며, 입력이 max_points 이하이면 그대로 반환합니다.
+"""
+
+
+def _as_number(x):
+    """datetime이면 timestamp(초)로, 아니면 float로 변환합니다."""
+    return x.timestamp() if hasattr(x, 'timestamp') else float(x)
+
+
+def lttb(xs, ys, max_points):
+    """
+    LTTB 다운샘플링
+    :param xs: 시각 목록 (datetime 또는 숫자, 오름차순)
+    :param ys: 값 목록
+    :param max_points: 결과 점 수 (3 이상)
+    :return: (xs, ys) 목록 튜플
+    """
+    n = len(xs)
+    if max_points >= n or max_points < 3:
+        return list(xs), list(ys)
+    nx = [_as_number(x) for x in xs]
+    every = (n - 2) / (max_points - 2)
+    selected = [0]
+    a = 0
+    for i in range(max_points - 2):
+        # 다음 구간의 평균점
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        span = next_end - next_start
+        avg_x = sum(nx[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # 현재 구간에서 삼각형 넓이가 최대인 점
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = nx[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - nx[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return [xs[i] for i in selected], [ys[i] for i in selected]
+
+
+def minmax(xs, ys, max_points):
+    """
+    구간별 최소/최대 보존 다운샘플링
+    :param xs: 시각 목록 (오름차순)
+    :param ys: 값 목록
+    :param max_points: 최대 결과 점 수 (구간 수 = max_points // 2)
+    :return: (xs, ys) 목록 튜플
+    """
+    n = len(xs)
+    buckets = max_points // 2
+    if max_points >= n or buckets < 1:
+        return list(xs), list(ys)
+    size = n / buckets
+    out_x, out_y = [], []
+    for b in range(buckets):
+        start = int(b * size)
+        end = min(int((b + 1) * size), n)
+        if start >= end:
+            continue
+        lo = min(range(start, end), key=ys.__getitem__)
+        hi = max(range(start, end), key=ys.__getitem__)
+        for i in sorted({lo, hi}):
+            out_x.append(xs[i])
+            out_y.append(ys[i])
+    return out_x, out_y
+
+
+methods = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
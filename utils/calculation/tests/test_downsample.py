@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import math
+from datetime import datetime, timedelta
+
+from utils.calculation.downsample import lttb, minmax
+
+
+def _series(n):
+    t0 = datetime(2025, 1, 1)
+    xs = [t0 + timedelta(minutes=2 * i) for i in range(n)]
+    ys = [math.sin(i / 20.0) * 10 + (50 if i == n // 3 else 0) for i in range(n)]
+    return xs, ys
+
+
+def test_lttb_keeps_endpoints_and_size():
+    xs, ys = _series(5000)
+    out_x, out_y = lttb(xs, ys, 200)
+    assert len(out_x) == len(out_y) == 200
+    assert out_x[0] == xs[0] and out_x[-1] == xs[-1]
+    assert out_x == sorted(out_x)
+    # 단일 스파이크는 선택되어야 함
+    assert max(out_y) == max(ys)
+
+
+def test_minmax_preserves_extremes():
+    xs, ys = _series(5000)
+    out_x, out_y = minmax(xs, ys, 100)
+    assert len(out_x) <= 100
+    assert out_x == sorted(out_x)
+    assert max(out_y) == max(ys) and min(out_y) == min(ys)
+
+
+def test_small_input_is_unchanged():
+    xs, ys = _series(10)
+    assert lttb(xs, ys, 50) == (xs, ys)
+    assert minmax(xs, ys, 50) == (xs, ys)
@@ -0,0 +1,223 @@
+"""LSIS_ Batch Decoder.
+
+%MB 메모리 이미지 전체(bytes/memoryview)를 받아 같은 포맷의 변수들을
+NumPy 배열 연산 한 번으로 디코딩합니다.
+
+LSIS_MappingTool.repack()은 변수마다 struct.pack('B'*n, *data) → struct.unpack을
+수행하고, bit 변수는 2바이트를 비트 리스트로 풀어 사용합니다. 이 디코더는
+포맷별로 미리 계산된 오프셋 배열을 사용하여 gather → view(dtype) → scale → clamp를
+배열 단위로 처리합니다.
+"""
+# pylint: disable=missing-type-doc
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class LSIS_BatchDecoder:
+    """
+    LSIS Batch Decoder.
+
+    사용 예::
+
+        decoder = LSIS_BatchDecoder()
+        decoder.add_value('1:10', offset=200, format='h', scale=0.1)
+        decoder.add_bit('1:11', offset=12, bit=3)
+        decoder.compile()
+        values = decoder.decode(memory_image)   # {'1:10': 12.3, '1:11': True}
+
+    - 결과는 repack() + 소수점 3자리 반올림 결과와 동일합니다 (DecodePlan.decode_scalar와 같은 변환:
+      float('{:.3f}'.format(round(x, 3))), 클램프된 값은 등록한 경계값 그대로 — int 경계면 int).
+    - 오프셋이 이미지 밖이면 repack()과 같은 오류 문자열을, 일부만 걸치면 결과에서 제외합니다.
+    """
+    # struct 네이티브 포맷 → NumPy dtype (네이티브 바이트 순서, 표준 크기)
+    NUMPY_DTYPE = {
+        'B': '=u1',
+        'b': '=i1',
+        'H': '=u2',
+        'h': '=i2',
+        'I': '=u4',
+        'i': '=i4',
+        'f': '=f4',
+    }
+    OUT_OF_RANGE = "유효한 주소가 아닙니다. len(repack_data) == 0 (1)"
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("LSIS_BatchDecoder requires numpy")
+        self._values = {}
+        self._bits = {'keys': [], 'offsets': [], 'shifts': []}
+        self._groups = []
+        self._bit_group = None
+        self.compiled = False
+
+    @classmethod
+    def available(cls):
+        return np is not None
+
+    @classmethod
+    def supports(cls, format):
+        return format in cls.NUMPY_DTYPE
+
+    def __len__(self):
+        return sum(len(spec['keys']) for spec in self._values.values()) + len(self._bits['keys'])
+
+    def add_value(self, key, offset, format, scale=1.0, clamp=None):
+        """byte 이상 크기 변수를 등록합니다.
+
+        :param key: 결과 딕셔너리 키
+        :param offset: %MB 이미지 내 바이트 오프셋
+        :param format: struct 포맷 문자 (H/h/I/i/f/B/b)
+        :param scale: 읽기 스케일
+        :param clamp: (min, max) 또는 None
+        """
+        if format not in self.NUMPY_DTYPE:
+            raise ValueError(f"지원하지 않는 포맷입니다: {format}")
+        spec = self._values.setdefault(format, {'keys': [], 'offsets': [], 'scales': [], 'lo': [], 'hi': [], 'bounds': []})
+        lo, hi = clamp if clamp is not None else (-np.inf, np.inf)
+        spec['keys'].append(key)
+        spec['bounds'].append(clamp)
+        spec['offsets'].append(int(offset))
+        spec['scales'].append(float(scale))
+        spec['lo'].append(float(lo))
+        spec['hi'].append(float(hi))
+        self.compiled = False
+
+    def add_bit(self, key, offset, bit):
+        """bit 변수를 등록합니다. offset은 바이트 오프셋, bit는 0~7."""
+        self._bits['keys'].append(key)
+        self._bits['offsets'].append(int(offset))
+        self._bits['shifts'].append(int(bit))
+        self.compiled = False
+
+    def compile(self):
+        """등록된 변수들을 포맷별 NumPy 배열로 변환합니다."""
+        self._groups = []
+        for format, spec in self._values.items():
+            dtype = np.dtype(self.NUMPY_DTYPE[format])
+            size = dtype.itemsize
+            if size != struct.calcsize(format):
+                raise ValueError(f"포맷 크기 불일치: {format}")
+            lo = np.asarray(spec['lo'], dtype=np.float64)
+            hi = np.asarray(spec['hi'], dtype=np.float64)
+            self._groups.append({
+                'keys': list(spec['keys']),
+                'offsets': np.asarray(spec['offsets'], dtype=np.int64),
+                'scales': np.asarray(spec['scales'], dtype=np.float64),
+                'lo': lo,
+                'hi': hi,
+                'clamp': bool(np.isfinite(lo).any() or np.isfinite(hi).any()),
+                'bounds': list(spec['bounds']),
+                'dtype': dtype,
+                'size': size,
+                'lanes': np.arange(size, dtype=np.int64),
+            })
+        if self._bits['keys']:
+            self._bit_group = {
+                'keys': list(self._bits['keys']),
+                'offsets': np.asarray(self._bits['offsets'], dtype=np.int64),
+                'shifts': np.asarray(self._bits['shifts'], dtype=np.uint8),
+            }
+        else:
+            self._bit_group = None
+        self.compiled = True
+        return self
+
+    @staticmethod
+    def as_array(memory):
+        """bytes/bytearray/memoryview/list[int]를 uint8 배열로 변환합니다 (bytes 계열은 zero-copy)."""
+        if memory is None:
+            return np.zeros(0, dtype=np.uint8)
+        if isinstance(memory, np.ndarray):
+            return memory.astype(np.uint8, copy=False).reshape(-1)
+        if not isinstance(memory, (bytes, bytearray, memoryview)):
+            try:
+                memory = bytes(memory)
+            except (ValueError, TypeError):
+                memory = bytes((int(v) & 0xFF) for v in memory)
+        return np.frombuffer(memory, dtype=np.uint8)
+
+    @staticmethod
+    def _round(value):
+        return float("{:.3f}".format(round(value, 3)))
+
+    @classmethod
+    def _round_array(cls, values):
+        """float64 배열을 _round와 같은 결과의 float 리스트로 반올림합니다.
+
+        rint(x * 1000) / 1000은 x * 1000의 곱셈 오차 때문에 .5 경계(tie) 근처에서만
+        round(x, 3)과 달라질 수 있으므로, 경계 근처 값과 큰 값·비유한 값만 _round로 다시 계산합니다.
+        """
+        with np.errstate(invalid='ignore', over='ignore'):
+            scaled = values * 1000.0
+            rounded = np.rint(scaled) / 1000.0
+            magnitude = np.abs(scaled)
+            # 곱셈 오차는 최대 0.5ulp(|x * 1000| * 2**-53) → 여유를 두고 경계 근처를 판정
+            near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= magnitude * 2.0 ** -50 + 1e-9
+            fixup = np.nonzero(near_tie | ~np.isfinite(scaled))[0]
+        result = rounded.tolist()
+        for i in fixup.tolist():
+            result[i] = cls._round(float(values[i]))
+        return result
+
+    def decode(self, memory):
+        """메모리 이미지를 디코딩하여 {key: value} 딕셔너리를 반환합니다."""
+        if not self.compiled:
+            self.compile()
+        image = self.as_array(memory)
+        length = image.shape[0]
+        result = {}
+        for group in self._groups:
+            offsets = group['offsets']
+            keys = group['keys']
+            fits = offsets + group['size'] <= length
+            if fits.all():
+                index = None
+                valid_offsets = offsets
+            else:
+                index = np.nonzero(fits)[0]
+                valid_offsets = offsets[index]
+                for i in np.nonzero(offsets >= length)[0].tolist():
+                    result[keys[i]] = self.OUT_OF_RANGE
+            if valid_offsets.shape[0] == 0:
+                continue
+            # (n, size) 바이트 gather → dtype view → float64
+            raw = image[valid_offsets[:, None] + group['lanes']].view(group['dtype']).reshape(-1)
+            scales = group['scales'] if index is None else group['scales'][index]
+            # 임의 이미지의 NaN 비트 패턴(signaling NaN 포함)은 경고 없이 NaN으로 둠
+            with np.errstate(invalid='ignore', over='ignore'):
+                values = raw.astype(np.float64) * scales
+            over = under = None
+            if group['clamp']:
+                lo = group['lo'] if index is None else group['lo'][index]
+                hi = group['hi'] if index is None else group['hi'][index]
+                over = values > hi
+                under = (values < lo) & ~over
+            values = self._round_array(values)
+            if over is not None and (over.any() or under.any()):
+                # 클램프된 값은 decode_scalar처럼 등록한 경계값 자체 (int 경계는 int)
+                bounds = group['bounds']
+                for side, mask in ((1, over), (0, under)):
+                    for i in np.nonzero(mask)[0].tolist():
+                        bound = bounds[i if index is None else int(index[i])][side]
+                        values[i] = self._round(bound) if type(bound).__name__ == 'float' else bound
+            if index is None:
+                result.update(zip(keys, values))
+            else:
+                result.update(zip((keys[i] for i in index.tolist()), values))
+        group = self._bit_group
+        if group is not None:
+            offsets = group['offsets']
+            keys = group['keys']
+            fits = offsets < length
+            if fits.all():
+                bits = (image[offsets] >> group['shifts']) & 1
+                result.update(zip(keys, bits.astype(bool).tolist()))
+            else:
+                index = np.nonzero(fits)[0]
+                bits = (image[offsets[index]] >> group['shifts'][index]) & 1
+                result.update(zip((keys[i] for i in index.tolist()), bits.astype(bool).tolist()))
+        return result
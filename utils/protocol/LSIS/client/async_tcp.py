@@ -0,0 +1,254 @@
+"""LSIS_ client native asyncio TCP communication."""
+import asyncio
+import struct
+import time
+from typing import Any, Tuple, Type
+
+from ..client.base import LSIS_BaseClient
+from ..constants import Defaults
+from ..exceptions import ConnectionException, LSIS_Exception
+from ..framer import LSIS_Framer
+from ..framer.socket_framer import LSIS_SocketFramer
+from ..logger import Log
+from ..pdu import snapshot_response
+from ..transaction import LSIS_AdaptiveGap
+
+
+# LSIS-XGT Application Header (20 bytes): 10s H B B H H B B
+COMPANY_ID = Defaults.companyID[1]
+HEADER_SIZE = 20
+INVOKE_ID_OFFSET = 14
+LENGTH_OFFSET = 16
+# 응답 Instruction의 Error Status 위치 (Command(2) DataType(2) Reserved(2) ErrorStatus(2))
+ERROR_STATUS_OFFSET = HEADER_SIZE + 6
+
+
+class LSIS_AsyncTcpClient(LSIS_BaseClient, asyncio.Protocol):
+    """
+    **LSIS_AsyncTcpClient**
+
+    LSIS_BaseClient의 async_execute / connection_made / data_received 훅을 사용하는
+    asyncio 네이티브 TCP 클라이언트입니다.
+
+    :param host: 호스트 IP 주소 또는 호스트 이름
+    :param port: (선택 사항) 통신에 사용되는 포트
+    :param framer: (선택 사항) 프레이머 클래스
+    :param source_address: (선택 사항) 클라이언트의 소스 주소
+    :param kwargs: (선택 사항) LSIS_BaseClient 매개변수 (timeout, reconnect_delay 등)
+
+    - 하나의 인스턴스가 (host, port) 하나에 대한 지속 연결을 유지합니다.
+    - 연결 실패 시 reconnect_delay부터 reconnect_delay_max까지 지연이 두 배씩 늘어나며,
+      그 동안의 connect() 호출은 즉시 False를 반환합니다(폴링 루프를 막지 않음).
+    - TCP 스트림에서 헤더의 Length 필드로 프레임을 잘라 프레이머에 한 프레임씩 전달합니다.
+    - 요청마다 고유한 Invoke ID를 사용하므로 pipeline_window개까지 응답을 기다리지 않고
+      연속 전송하며, 응답은 Invoke ID로 요청과 매칭됩니다.
+
+    예제::
+
+        client = LSIS_AsyncTcpClient("192.168.0.10", 2004, timeout=3)
+        if await client.connect():
+            rr = await client.continuous_read_bytes("%MB0", 700)
+            print(rr.values)
+            rrs = await client.continuous_read_ranges([("%MB0", 700), ("%MB700", 700)])
+        await client.close()
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = Defaults.TcpPort,
+        framer: Type[LSIS_Framer] = LSIS_SocketFramer,
+        source_address: Tuple[str, int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize LSIS_ asyncio TCP Client."""
+        super().__init__(framer=framer, **kwargs)
+        self.params.host = host
+        self.params.port = port
+        self.params.source_address = source_address
+        self.use_protocol = True
+        self._stream = bytearray()
+        self._inflight = None
+        self._connect_lock = None
+        self._next_connect_at = 0.0
+        self._sent_at = 0.0
+        self.connect_failures = 0
+
+    # ----------------------------------------------------------------------- #
+    # Connection handling
+    # ----------------------------------------------------------------------- #
+    def _locks(self):
+        if self._connect_lock is None:
+            self._inflight = asyncio.Semaphore(self.pipeline_window)
+            self._connect_lock = asyncio.Lock()
+        return self._inflight, self._connect_lock
+
+    @property
+    def connected(self):
+        """Return connection status."""
+        return self._connected and self.transport is not None
+
+    def backoff_remaining(self):
+        """Seconds left before the next reconnect attempt is allowed."""
+        return max(0.0, self._next_connect_at - time.monotonic())
+
+    async def connect(self) -> bool:
+        """Connect (or reuse the existing connection) to the PLC.
+
+        :returns: True if connected, False while backing off or on failure.
+        """
+        if self.connected:
+            return True
+        _, connect_lock = self._locks()
+        async with connect_lock:
+            if self.connected:
+                return True
+            if self.backoff_remaining() > 0:
+                return False
+            loop = asyncio.get_running_loop()
+            try:
+                await asyncio.wait_for(
+                    loop.create_connection(
+                        lambda: self,
+                        self.params.host,
+                        self.params.port,
+                        local_addr=self.params.source_address,
+                    ),
+                    timeout=self.params.timeout,
+                )
+            except (OSError, asyncio.TimeoutError) as exc:
+                self.connect_failures += 1
+                self._next_connect_at = time.monotonic() + self.delay_ms / 1000
+                Log.warning(
+                    f"Connection to {self.params.host}:{self.params.port} failed: {exc} "
+                    f"(retry in {self.delay_ms / 1000} seconds)"
+                )
+                if self.params.reconnect_delay:
+                    self.delay_ms = min(self.delay_ms * 2, self.params.reconnect_delay_max)
+                return False
+            self.connect_failures = 0
+            self._next_connect_at = 0.0
+            self.reset_delay()
+            Log.debug(f"Connection to LSIS server established. {self.params.host, self.params.port}.")
+            return True
+
+    def connection_made(self, transport):
+        """Call when a connection is made."""
+        self._stream = bytearray()
+        super().connection_made(transport)
+
+    def connection_lost(self, reason):
+        """Call when the connection is lost or closed."""
+        self._stream = bytearray()
+        super().connection_lost(reason)
+
+    def is_socket_open(self) -> bool:
+        """Return whether the transport is open."""
+        return self.connected
+
+    async def close(self):
+        """Close the connection (the next connect() reconnects immediately)."""
+        if self.transport:
+            self.transport.close()
+        self.transport = None
+        self._connected = False
+
+    # ----------------------------------------------------------------------- #
+    # Request / response
+    # ----------------------------------------------------------------------- #
+    async def async_execute(self, request=None):
+        """Execute one request on the persistent connection.
+
+        연결당 in-flight 요청 수를 pipeline_window로 제한하고, 요청 전송 전에
+        inter_frame_gap만큼 대기합니다. 응답 결과에 따라 간격이 조절됩니다.
+        """
+        if not self.connected:
+            raise ConnectionException(f"Not connected[{str(self)}]")
+        inflight, _ = self._locks()
+        async with inflight:
+            # 직전 요청 전송 후 inter_frame_gap이 지나지 않았으면 남은 시간만큼 대기
+            wait = self.inter_frame_gap.value - (time.monotonic() - self._sent_at)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if not self.connected:
+                raise ConnectionException(f"Not connected[{str(self)}]")
+            self._sent_at = time.monotonic()
+            try:
+                response = await super().async_execute(request)
+            except (asyncio.TimeoutError, LSIS_Exception):
+                self.inter_frame_gap.on_failure()
+                raise
+            self.inter_frame_gap.on_success()
+            return response
+
+    async def execute_pipelined(self, requests, window=None):
+        """Execute several requests with up to ``window`` of them in flight.
+
+        :returns: 요청 순서와 같은 응답 목록 (실패한 요청은 예외 객체)
+        """
+        if not self.connected:
+            raise ConnectionException(f"Not connected[{str(self)}]")
+        limit = asyncio.Semaphore(max(1, int(window or self.pipeline_window)))
+
+        async def _run(request):
+            async with limit:
+                return await self.async_execute(request)
+
+        return await asyncio.gather(*(_run(request) for request in requests), return_exceptions=True)
+
+    def data_received(self, data):
+        """Split the TCP stream into complete LSIS frames and process them one by one."""
+        Log.debug("recv: {}", data, ":hex")
+        self._stream += data
+        while len(self._stream) >= HEADER_SIZE:
+            if not self._stream.startswith(COMPANY_ID):
+                # 동기 깨짐: 다음 회사 ID까지 버림
+                index = self._stream.find(COMPANY_ID, 1)
+                Log.debug("Frame sync lost, dropping {} bytes", index if index > 0 else len(self._stream))
+                if index < 0:
+                    self._stream = bytearray()
+                    return
+                del self._stream[:index]
+                continue
+            length = struct.unpack_from("<H", self._stream, LENGTH_OFFSET)[0]
+            total = HEADER_SIZE + length
+            if len(self._stream) < total:
+                return
+            # 프레이머 수신 버퍼로 한 번만 복사되도록 memoryview로 넘기고, del 전에 해제
+            frame = memoryview(self._stream)[:total]
+            try:
+                self._process_frame(frame)
+            finally:
+                frame.release()
+            del self._stream[:total]
+
+    def _process_frame(self, frame):
+        tid = struct.unpack_from("<H", frame, INVOKE_ID_OFFSET)[0]
+        if len(frame) >= ERROR_STATUS_OFFSET + 3:
+            error_status, error_code = struct.unpack_from("<HB", frame, ERROR_STATUS_OFFSET)
+            if error_status == 0xFFFF:
+                handler = self.transaction.getTransaction(tid)
+                if handler is not None:
+                    self.raise_future(handler, LSIS_Exception(f"LSIS error response {hex(error_code)}"))
+                return
+        # 이전 프레임 디코딩 실패로 남은 버퍼가 있으면 비우고 한 프레임씩 처리
+        self.framer.resetFrame()
+        self.framer.processIncomingPacket(frame, self._handle_response, unit=0)
+
+    def _handle_response(self, reply, **_kwargs):
+        """Snapshot the shared response object before resolving the future."""
+        if reply is not None:
+            reply = snapshot_response(reply)
+        super()._handle_response(reply, **_kwargs)
+
+    def __str__(self):
+        """Build a string representation of the connection."""
+        return f"LSIS_AsyncTcpClient({self.params.host}:{self.params.port})"
+
+    def __repr__(self):
+        """Return string representation."""
+        return (
+            f"<{self.__class__.__name__} at {hex(id(self))} connected={self.connected}, "
+            f"ipaddr={self.params.host}, port={self.params.port}, timeout={self.params.timeout}>"
+        )
+
@@ -13,7 +13,7 @@ from ..factory import ClientDecoder
 from ..framer import LSIS_Framer
 from ..logger import Log
 from ..pdu import LSIS_XGT_Request, LSIS_XGT_Response
-from ..transaction import DictTransactionManager
+from ..transaction import DictTransactionManager, LSIS_AdaptiveGap
 from ..utilities import LSIS_TransactionState
 
 
@@ -126,6 +126,9 @@ class LSIS_BaseClient(LSIS_ClientMixin):
             self, retries=retries, retry_on_empty=retry_on_empty, **kwargs
         )
         self.delay_ms = self.params.reconnect_delay
+        # 파이프라인 읽기: PLC당 동시에 응답을 기다릴 최대 요청 수와 적응형 프레임 간격
+        self.pipeline_window = max(1, int(kwargs.get("pipeline_window", 1) or 1))
+        self.inter_frame_gap = LSIS_AdaptiveGap()
         self.use_protocol = False
         self._connected = False
         self.use_udp = False
@@ -193,6 +196,19 @@ class LSIS_BaseClient(LSIS_ClientMixin):
             raise ConnectionException(f"Failed to connect[{str(self)}]")
         return self.transaction.execute(request)
 
+    def execute_pipelined(self, requests, window=None):
+        """Execute several requests with up to ``window`` of them in flight (call **sync**).
+
+        :param requests: 요청 목록
+        :param window: in-flight 요청 수 (기본값: pipeline_window)
+        :returns: 요청 순서와 같은 응답 목록 (실패한 요청은 LSIS_IOException)
+        """
+        if not self.connect():
+            raise ConnectionException(f"Failed to connect[{str(self)}]")
+        return self.transaction.execute_pipelined(
+            requests, window=window or self.pipeline_window, gap=self.inter_frame_gap
+        )
+
     def close(self) -> None:
         """Close the underlying socket connection (call **sync/async**)."""
         raise NotImplementedException
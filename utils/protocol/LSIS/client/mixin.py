@@ -5,6 +5,7 @@ from typing import Any, List, Tuple, Union
 
 from .. import continuous_read_byte as pdu_con_read
 from .. import continuous_write_byte as pdu_con_write
+from .. import individual_read_byte as pdu_ind_read
 from .. import single_write_byte as pdu_sin_write
 from ..constants import INTERNAL_ERROR
 from ..exceptions import LSIS_Exception
@@ -19,6 +20,9 @@ class LSIS_ClientMixin:  # pylint: disable=too-many-public-methods
     def execute(self, request: LSIS_XGT_Request) -> LSIS_XGT_Response:
         raise LSIS_Exception(INTERNAL_ERROR)
 
+    def execute_pipelined(self, requests: List[LSIS_XGT_Request], window: int = None) -> List[LSIS_XGT_Response]:
+        raise LSIS_Exception(INTERNAL_ERROR)
+
     def continuous_read_bytes(
         self, address: str, count: int = 1, **kwargs: Any
     ) -> LSIS_XGT_Response:
@@ -27,6 +31,35 @@ class LSIS_ClientMixin:  # pylint: disable=too-many-public-methods
             pdu_con_read.Continuous_Read_Request(address, count, **kwargs)
         )
 
+    def continuous_read_ranges(
+        self, ranges: List[Tuple[str, int]], window: int = None, **kwargs: Any
+    ) -> List[LSIS_XGT_Response]:
+        """여러 구간을 파이프라인으로 연속 읽기합니다.
+
+        :param ranges: [(address, count), ...] 예: [("%MB0", 700), ("%MB700", 700)]
+        :param window: 동시에 응답을 기다릴 최대 요청 수 (기본값: 클라이언트 pipeline_window)
+        :returns: ranges 순서와 같은 응답 목록 (실패한 구간은 예외 객체)
+        """
+        Log.debug("continuous_read_ranges {} ranges, window {}", len(ranges), window)
+        return self.execute_pipelined(
+            [pdu_con_read.Continuous_Read_Request(address, count, **kwargs) for address, count in ranges],
+            window=window,
+        )
+
+    def individual_read_datas(
+        self, data_type: str, variables: List[str], **kwargs: Any
+    ) -> LSIS_XGT_Response:
+        """같은 데이터 타입의 변수를 최대 16개까지 한 번에 읽습니다 (개별 읽기).
+
+        :param data_type: 'bit' | 'byte' | 'word' | 'dword' | 'lword'
+        :param variables: 변수 이름 목록 예: ["%MW10", "%MW200", "%MW4000"]
+        :returns: values가 변수 순서와 같은 블록별 데이터인 응답
+        """
+        Log.debug("individual_read_datas {}, {}", data_type, variables)
+        return self.execute(
+            pdu_ind_read.Individual_Read_Request(data_type, variables, **kwargs)
+        )
+
     def continuous_write_bytes(
         self, address: str, count: int = 1, values: list = [], **kwargs: Any
     ) -> LSIS_XGT_Response:
@@ -193,6 +193,40 @@ class LSIS_TcpClient(LSIS_BaseClient):
 
         return b"".join(data)
 
+    def recv_into(self, view):
+        """Read exactly len(view) bytes into a writable buffer.
+
+        recv()와 같은 타임아웃 규칙을 따르지만 조각마다 bytes를 만들지 않고
+        호출자의 버퍼에 바로 씁니다. 실제로 받은 바이트 수를 반환합니다.
+
+        📌 사용 예시:
+        buffer = bytearray(20)
+        if client.recv_into(memoryview(buffer)) < 20: ...
+        """
+        if not self.socket:
+            raise ConnectionException(str(self))
+        self.socket.setblocking(0)
+        size = len(view)
+        received = 0
+        time_ = time.time()
+        end = time_ + self.params.timeout
+        while received < size:
+            try:
+                ready = select.select([self.socket], [], [], end - time_)
+            except ValueError:
+                ready = None
+            if ready is None or (ready[0] and (count := self.socket.recv_into(view[received:])) == 0):
+                # 원격에서 연결을 닫음: 받은 데이터가 하나도 없으면 ConnectionException
+                data = [bytes(view[:received])] if received else []
+                self._handle_abrupt_socket_close(size, data, time.time() - time_)
+                return received
+            if ready[0]:
+                received += count
+            time_ = time.time()
+            if time_ > end:
+                break
+        return received
+
     def _handle_abrupt_socket_close(
         self, size, data, duration
     ):  # pylint: disable=missing-type-doc
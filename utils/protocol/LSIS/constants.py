@@ -18,6 +18,7 @@ class Defaults:
     SystemCommandRequest = ["H", 0xef]
     ContinuousReadRequest = ["H", 0x54]
     ContinuousReadRecv = ["H", 0x55]
+    ContinuousReadMaxBytes = 1400  # 연속 읽기 요청 하나로 읽을 수 있는 최대 바이트 수
     ContinuousWriteRequest = ["H", 0x58]
     ContinuousWriteRecv = ["H", 0x59]
     ContinuousDataType = ["H", 0x14]
@@ -30,6 +31,10 @@ class Defaults:
         'dword':["H", 0x03],
         'lword':["H", 0x04],
     }
+    # 개별 읽기/쓰기 데이터 타입별 블록 하나의 데이터 크기(바이트)와 변수 이름의 크기 문자 (%MX, %MB, %MW, %MD, %ML)
+    SingleDataSize = {0x00: 1, 0x01: 1, 0x02: 2, 0x03: 4, 0x04: 8}
+    SingleDataPrefix = {'bit': 'X', 'byte': 'B', 'word': 'W', 'dword': 'D', 'lword': 'L'}
+    IndividualReadMaxBlocks = 16  # 개별 읽기 요청 하나에 넣을 수 있는 최대 변수(블록) 수
     TcpPort = 2004
     TlsPort = 802
     UdpPort = 2002
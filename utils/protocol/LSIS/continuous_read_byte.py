@@ -101,17 +101,18 @@ class Continuous_Read_ResponseBase(LSIS_XGT_Response):
             self.instruction[0]
         )  # Length Instruction BYTE SUM
 
+    # Command, DataType, Reserved, Error Status, Block 수, Data 크기
+    _header_format = command[0] + LSIS_XGT_constants.ContinuousDataType[0] + "HHHH"
+    _header_size = struct.calcsize(_header_format)
+
     def decode(self, data):
-        self.instruction = [""]
-        self.instruction[0] += Continuous_Read_ResponseBase.command[0]
-        self.instruction[0] += LSIS_XGT_constants.ContinuousDataType[0]
-        self.instruction[0] += "H"  # Reserved
-        self.instruction[0] += "H"
-        self.instruction[0] += "H"
-        self.instruction[0] += "H"
-        self.instruction[0] += "B" * (len(data) - struct.calcsize(self.instruction[0]))
-        self.instruction.append(data)
-        return struct.unpack(*self.instruction)
+        """고정 헤더만 unpack하고 데이터 영역은 복사하지 않고 memoryview로 보관합니다.
+
+        payload는 프레이머의 수신 버퍼를 그대로 가리키므로 다음 프레임이 들어오기 전까지만
+        유효합니다. 보관이 필요하면 bytes(payload)로 복사하세요 (pdu.snapshot_response).
+        """
+        self.payload = memoryview(data)[Continuous_Read_ResponseBase._header_size:]
+        return struct.unpack_from(Continuous_Read_ResponseBase._header_format, data)
 
     def getRegister(self, index):
         print("Continuous_Read_ResponseBase getRegister")
@@ -18,6 +18,11 @@ from .single_write_byte import (
     Single_Write_Response,
 )
 
+from .individual_read_byte import (
+    Individual_Read_Request,
+    Individual_Read_Response,
+)
+
 # --------------------------------------------------------------------------- #
 # Server Decoder
 # --------------------------------------------------------------------------- #
@@ -35,7 +40,10 @@ class ServerDecoder:
         Single_Write_Request,
         Single_Write_Response,
     ]
-    __sub_function_table = []
+    # Command가 같고 DataType으로 구분되는 PDU (개별 읽기는 연속 읽기와 Command 0x54/0x55 공유)
+    __sub_function_table = [
+        Individual_Read_Request,
+    ]
 
     @classmethod
     def getFCdict(cls):
@@ -48,7 +56,8 @@ class ServerDecoder:
         self.__lookup = self.getFCdict()
         self.__sub_lookup = {f: {} for f in functions}
         for f in self.__sub_function_table:
-            self.__sub_lookup[f.command[1]][f.command[1]] = f
+            for data_type in f.data_types:
+                self.__sub_lookup.setdefault(f.command[1], {})[data_type] = f
 
     def decode(self, message):
         try:
@@ -77,7 +86,8 @@ class ServerDecoder:
         Log.debug("Factory Response[{}]", fc_string)
         try:
             code = struct.unpack("<HB", data[6:9])
-            request = self.__lookup.get(command, lambda values: 0)
+            data_type = struct.unpack_from("<H", data, 2)[0]
+            request = self.__sub_lookup.get(command, {}).get(data_type) or self.__lookup.get(command, lambda values: 0)
         except:
             request = None
         if code[0] == 65535:
@@ -110,7 +120,10 @@ class ClientDecoder:
         Single_Write_Request,
         Single_Write_Response,
     ]
-    __sub_function_table = []
+    # Command가 같고 DataType으로 구분되는 PDU (개별 읽기 응답은 연속 읽기 응답과 Command 0x55 공유)
+    __sub_function_table = [
+        Individual_Read_Response,
+    ]
 
 
     def __init__(self):
@@ -121,7 +134,8 @@ class ClientDecoder:
             self.__lookup = {f.command[1]: f for f in self.function_table}
             self.__sub_lookup = {f: {} for f in functions}
             for f in self.__sub_function_table:
-                self.__sub_lookup[f.command[1]][f.command[1]] = f
+                for data_type in f.data_types:
+                    self.__sub_lookup.setdefault(f.command[1], {})[data_type] = f
         except Exception as err:
             Log.error('factory.py :: ClientDecoder : ', err)
 
@@ -154,7 +168,8 @@ class ClientDecoder:
         Log.debug("Factory Response[{}]", fc_string)
         try:
             code = struct.unpack("<HB", data[6:9])
-            response = self.__lookup.get(command, lambda values: [])
+            data_type = struct.unpack_from("<H", data, 2)[0]
+            response = self.__sub_lookup.get(command, {}).get(data_type) or self.__lookup.get(command, lambda values: [])
         except:
             response = None
         if code[0] == 65535:
@@ -7,6 +7,9 @@ import struct
 from ..constants import LSIS_XGT_constants
 from ..utilities import interpretation
 
+# 수신 버퍼 초기 크기: 헤더(20) + 연속 읽기 최대 응답(데이터 1400바이트 + 명령 헤더)보다 여유 있게
+RECV_BUFFER_SIZE = 2048
+
 
 class LSIS_SocketFramer(LSIS_Framer):
     method = "socket"
@@ -18,7 +21,11 @@ class LSIS_SocketFramer(LSIS_Framer):
                 self.address = client.getsockname()
         except AttributeError as err:
             self.address = address
-        self._buffer = b""
+        # 재사용 수신 버퍼. 프레임마다 새 bytes를 만들지 않고 _length까지만 채워 씁니다.
+        # 디코딩된 응답의 payload(memoryview)가 이 버퍼를 가리킬 수 있으므로 크기를 바꾸지 않고
+        # 모자랄 때만 새 버퍼를 할당합니다 (기존 memoryview는 이전 버퍼를 계속 가리킴).
+        self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self._length = 0
         self._header = {
             "company_id": 0,
             "PLC_Info": 0,
@@ -45,15 +52,26 @@ class LSIS_SocketFramer(LSIS_Framer):
         self.header = []
         self.instruction = []
 
+    @property
+    def _buffer(self):
+        """현재까지 수신한 데이터 (수신 버퍼에 대한 memoryview)."""
+        return memoryview(self._recv_buffer)[: self._length]
+
     def addToFrame(self, message):
         """Add new packet data to the current frame buffer.
 
         :param message: The most recent packet
         """
-        self._buffer += message
+        end = self._length + len(message)
+        if end > len(self._recv_buffer):
+            buffer = bytearray(max(end, 2 * len(self._recv_buffer)))
+            buffer[: self._length] = self._recv_buffer[: self._length]
+            self._recv_buffer = buffer
+        self._recv_buffer[self._length : end] = message
+        self._length = end
 
     def isFrameReady(self):
-        return len(self._buffer) > self._hsize
+        return self._length > self._hsize
 
     def checkFrame(self):
         """Check and decode the next frame.
@@ -85,7 +103,7 @@ class LSIS_SocketFramer(LSIS_Framer):
 
         :returns: The next full frame buffer
         """
-        return self._buffer[20:]
+        return memoryview(self._recv_buffer)[20 : self._length]
 
     # ----------------------------------------------------------------------- #
     # Public Member Functions
@@ -120,7 +138,7 @@ class LSIS_SocketFramer(LSIS_Framer):
                         self.resetFrame()
                     break
                 else:
-                    if len(self._buffer):
+                    if self._length:
                         # print("self._buffer: ", self._buffer)
                         # Possible error ???
                         if self._header["length"] < 2:
@@ -136,7 +154,7 @@ class LSIS_SocketFramer(LSIS_Framer):
         try:
             if result is None:
                 raise LSIS_IOException("Unable to decode request")
-            if result._decode[0] == 89:
+            if len(result._decode) == 5:  # 쓰기 응답(0x59), 개별 읽기
                 (
                     self._instruction["_command"],
                     self._instruction["dataType"],
@@ -157,7 +175,12 @@ class LSIS_SocketFramer(LSIS_Framer):
             # print('socket_framer.py :: LSIS_SocketFramer :: _process worked :', result)
         except Exception as err:
             Log.error('socket_framer.py :: LSIS_SocketFramer :: _process Exception :', err)
-        result.values = result._decode[6:]
+        # 연속 읽기 응답은 데이터 영역을 memoryview(payload)로, 개별 읽기 응답은 블록별 memoryview 튜플로
+        # 전달합니다 (int 튜플을 만들지 않음)
+        payload = getattr(result, "payload", None)
+        if payload is None:
+            payload = getattr(result, "blocks", None)
+        result.values = payload if payload is not None else result._decode[6:]
         self.populateResult(result)
         self.advanceFrame()
         callback(result)  # defer or push to a thread?
@@ -169,7 +192,7 @@ class LSIS_SocketFramer(LSIS_Framer):
         it or determined that it contains an error. It also has to reset the
         current frame header handle
         """
-        self._buffer = b""
+        self._length = 0
         self._header = {
             "company_id": 0,
             "PLC_Info": 0,
@@ -222,7 +245,7 @@ class LSIS_SocketFramer(LSIS_Framer):
         result.detailedStatus = interpretation(self._header, self._instruction)
 
     def resetFrame(self):
-        self._buffer = b""
+        self._length = 0
         self._header = {
             "company_id": 0,
             "PLC_Info": 0,
@@ -0,0 +1,208 @@
+import struct
+from .constants import LSIS_XGT_constants
+from .exceptions import ParameterException
+from .pdu import LSIS_XGT_Request, LSIS_XGT_Response
+
+# 변수 이름의 크기 문자 -> 데이터 크기(바이트). 'X'(비트)는 비트가 들어 있는 1바이트를 읽음
+_UNIT_SIZE = {"X": 1, "B": 1, "W": 2, "D": 4, "L": 8}
+
+
+def data_type_code(data_type):
+    """'bit'/'byte'/'word'/'dword'/'lword' 또는 코드 값 → 데이터 타입 코드."""
+    if isinstance(data_type, str):
+        return LSIS_XGT_constants.SingleDataType[data_type][1]
+    return int(data_type)
+
+
+def variable_byte_span(variable):
+    """XGT 변수 이름을 바이트 메모리 기준 위치로 바꿉니다.
+
+    📌 사용 예시:
+    variable_byte_span("%MW100")  # ("%MB", 200, 2)
+    variable_byte_span("%MX17")   # ("%MB", 2, 1)
+    """
+    variable = variable.decode() if isinstance(variable, (bytes, bytearray)) else variable
+    device, size_char, index = variable[1], variable[2].upper(), int(variable[3:])
+    if size_char == "X":
+        return f"%{device}B", index // 8, 1
+    size = _UNIT_SIZE[size_char]
+    return f"%{device}B", index * size, size
+
+
+def byte_variable(memory, offset, data_type):
+    """바이트 메모리 위치를 data_type 단위의 변수 이름으로 바꿉니다 (offset은 크기의 배수여야 함).
+
+    📌 사용 예시:
+    byte_variable("%MB", 800, "lword")  # "%ML100"
+    """
+    code = data_type_code(data_type)
+    size = LSIS_XGT_constants.SingleDataSize[code]
+    if offset % size:
+        raise ParameterException(f"offset {offset} is not aligned to {size} bytes")
+    name = next(key for key, value in LSIS_XGT_constants.SingleDataType.items() if value[1] == code)
+    return f"{memory[:2]}{LSIS_XGT_constants.SingleDataPrefix[name]}{offset // size}"
+
+
+class Individual_Read_RequestBase(LSIS_XGT_Request):
+    """개별 읽기 요청: 같은 데이터 타입의 변수를 최대 16개(블록)까지 한 프레임으로 읽습니다.
+
+    Command 0x54는 연속 읽기와 같고 DataType(0x00~0x04)으로 구분합니다.
+    """
+
+    instruction = [""]
+    command = LSIS_XGT_constants.ContinuousReadRequest
+    response = LSIS_XGT_constants.ContinuousReadRecv
+    data_types = tuple(value[1] for value in LSIS_XGT_constants.SingleDataType.values())
+    variables = ()
+
+    def __init__(self, data_type, variables, **kwargs):
+        super().__init__(**kwargs)
+        variables = list(variables)
+        if not 1 <= len(variables) <= LSIS_XGT_constants.IndividualReadMaxBlocks:
+            raise ParameterException(
+                f"individual read needs 1~{LSIS_XGT_constants.IndividualReadMaxBlocks} variables ({len(variables)})"
+            )
+        self.dataType = ["H", data_type_code(data_type)]
+        self.block_CNT = ["H", len(variables)]
+        self.blockArray = []
+        for variable in variables:
+            # 연속 읽기 요청과 같이 변수 이름은 짝수 길이로 맞춤
+            length = len(variable) + len(variable) % 2
+            self.blockArray.append([["H", length], [f"{length}s", variable.encode().ljust(length, b"\x00")]])
+        self.variables = tuple(variables)
+        self.instruction = [""]
+
+    def encode(self):
+        self.instruction = ["<"]
+        super(Individual_Read_RequestBase, self).encode()
+        self.instruction[0] += self.command[0]
+        self.instruction.append(self.command[1])
+        self.instruction[0] += self.dataType[0]
+        self.instruction.append(self.dataType[1])
+        self.instruction[0] += "H"  # Reserved
+        self.instruction.append(0x00)  # Reserved
+        self.instruction[0] += self.block_CNT[0]
+        self.instruction.append(self.block_CNT[1])
+        for var_length, var in self.blockArray:
+            self.instruction[0] += var_length[0]
+            self.instruction.append(var_length[1])
+            self.instruction[0] += var[0]
+            self.instruction.append(var[1])
+        self.header[6] = struct.calcsize(
+            self.instruction[0]
+        )  # Length Instruction BYTE SUM
+
+    def decode(self, data):
+        command, data_type, reserved, block_count = struct.unpack_from("<HHHH", data)
+        offset = 8
+        variables = []
+        for _ in range(block_count):
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            variables.append(bytes(data[offset : offset + length]).rstrip(b"\x00").decode())
+            offset += length
+        self.variables = tuple(variables)
+        # 요청에는 Error Status가 없으므로 0 (응답과 같은 필드 배치로 프레이머에 전달)
+        return command, data_type, reserved, 0, block_count
+
+
+class Individual_Read_Request(Individual_Read_RequestBase):
+    name = "IndividualReadRequest"
+
+    def __init__(self, data_type, variables, **kwargs):
+        super().__init__(data_type, variables, **kwargs)
+
+    def execute(self, store):
+        code = self.dataType[1] if isinstance(self.dataType, list) else self.dataType
+        blocks = []
+        for variable in self.variables:
+            memory, address, size = variable_byte_span(variable)
+            values = store.getValues(memory, address, count=size)
+            if variable[2].upper() == "X":
+                values = [(values[0] >> (int(variable[3:]) % 8)) & 0x01]
+            blocks.append(bytes(values))
+        name = next(key for key, value in LSIS_XGT_constants.SingleDataType.items() if value[1] == code)
+        return Individual_Read_Response(values=blocks, data_type=name)
+
+
+class Individual_Read_ResponseBase(LSIS_XGT_Response):
+    command = LSIS_XGT_constants.ContinuousReadRecv
+    data_types = Individual_Read_RequestBase.data_types
+    # Command, DataType, Reserved, Error Status, Block 수
+    _header_format = "<HHHHH"
+    _header_size = struct.calcsize(_header_format)
+
+    def __init__(self, values, **kwargs):
+        super().__init__(values, **kwargs)
+        #: 블록별 데이터 (bytes)
+        self.registers = values or []
+        self.instruction = [""]
+
+    def encode(self):
+        self.instruction = ["<"]
+        super(Individual_Read_ResponseBase, self).encode()
+        self.instruction[0] += self.command[0]
+        self.instruction.append(self.command[1])
+        self.instruction[0] += self.dataType[0]
+        self.instruction.append(self.dataType[1])
+        self.instruction[0] += "H"  # Reserved
+        self.instruction.append(0x00)  # Reserved
+        self.instruction[0] += "H"  # Error Status
+        self.instruction.append(0x00)  # Error Status
+        self.instruction[0] += "H"  # Block 수
+        self.instruction.append(len(self.values))
+        for block in self.values:
+            self.instruction[0] += f"H{len(block)}s"
+            self.instruction.append(len(block))
+            self.instruction.append(bytes(block))
+        self.header[6] = struct.calcsize(
+            self.instruction[0]
+        )  # Length Instruction BYTE SUM
+
+    def decode(self, data):
+        """고정 헤더를 unpack하고 블록별 데이터를 수신 버퍼의 memoryview로 보관합니다.
+
+        blocks는 다음 프레임이 들어오기 전까지만 유효합니다 (pdu.snapshot_response가 bytes로 복사).
+        """
+        fields = struct.unpack_from(Individual_Read_ResponseBase._header_format, data)
+        view = memoryview(data)
+        offset = Individual_Read_ResponseBase._header_size
+        blocks = []
+        for _ in range(fields[4]):
+            (size,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            blocks.append(view[offset : offset + size])
+            offset += size
+        self.payload = None
+        self.blocks = tuple(blocks)
+        return fields
+
+    def __str__(self):
+        """Return a string representation of the instance.
+
+        :returns: A string representation of the instance
+        """
+        return f"{self.__class__.__name__} ({len(self.registers)})"
+
+
+class Individual_Read_Response(Individual_Read_ResponseBase):
+    name = "Individual_Read_Response"
+
+    def __init__(self, values=None, data_type="byte", **kwargs):
+        super().__init__(values, **kwargs)
+        self.dataType = list(LSIS_XGT_constants.SingleDataType[data_type])
+        self.block_CNT = ["H", len(values or [])]
+        self.data_Cnt = ["H", 0]
+        self.values = [bytes(block) for block in values or []]
+
+    def __name__(self):
+        return f"{self.__class__.__name__} : {self.command[1]}"
+
+
+# ---------------------------------------------------------------------------#
+#  Exported symbols
+# ---------------------------------------------------------------------------#
+__all__ = [
+    "Individual_Read_Request",
+    "Individual_Read_Response",
+]
@@ -1,5 +1,6 @@
 from .constants import LSIS_XGT_constants
 import struct
+from types import SimpleNamespace
 from .logger import Log
 
 
@@ -60,7 +61,9 @@ class LSIS_XGT_Request(LSIS_XGT_PDU):
         self.header[0] += self.Sorce_Of_Frame[0]
         self.header.append(self.Sorce_Of_Frame[1])
         self.header[0] += LSIS_XGT_constants.InvokeID[0]
-        self.header.append(LSIS_XGT_constants.InvokeID[1])
+        # 트랜잭션 매니저가 부여한 Invoke ID를 기록해 응답을 요청별로 매칭합니다 (파이프라인 읽기)
+        invoke_id = getattr(self, 'transaction_id', None)
+        self.header.append(LSIS_XGT_constants.InvokeID[1] if invoke_id is None else invoke_id & 0xFFFF)
         self.header[0] += "H"  # Reserved Length Instruction BYTE SUM
         self.header.append(0x00)  # Reserved Length Instruction BYTE SUM
         self.header[0] += LSIS_XGT_constants.FEnet_Position[0]
@@ -111,3 +114,37 @@ class LSIS_XGT_Response(LSIS_XGT_PDU):
 
     def decode(self, data):
         Log.debug(f'LSIS_XGT_Response :: data : ', data)
+
+
+class ResponseSnapshot(SimpleNamespace):
+    """snapshot_response()가 반환하는 응답 사본.
+
+    연속 읽기 응답의 데이터 영역은 payload(bytes)로 한 번만 복사하고,
+    values(int 리스트)는 처음 접근할 때 만듭니다. 개별 읽기 응답의 values는 블록별 bytes 리스트입니다.
+    """
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = list(self.payload) if self.payload is not None else []
+        return self._values
+
+
+def snapshot_response(reply):
+    """Copy a decoded response into an independent object.
+
+    ClientDecoder가 반환하는 응답은 PDU 클래스 자체이고 디코딩 결과가 클래스 속성에
+    기록되므로, 다음 프레임이 도착하면 값이 덮어써집니다. 비동기/파이프라인 환경에서는
+    콜백 시점에 필요한 필드를 복사해 둡니다.
+    """
+    values = getattr(reply, 'values', None)
+    payload = bytes(values) if isinstance(values, memoryview) else None
+    return ResponseSnapshot(
+        function=getattr(reply, 'name', reply.__class__.__name__),
+        transaction_id=getattr(reply, 'transaction_id', None),
+        payload=payload,
+        _values=None if payload is not None else [bytes(v) if isinstance(v, memoryview) else v for v in values or []],
+        dataCount=getattr(reply, 'dataCount', None),
+        detailedStatus=dict(getattr(reply, 'detailedStatus', None) or {}),
+        address=getattr(reply, 'address', None),
+    )
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import random
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.protocol.LSIS.batch_decoder import LSIS_BatchDecoder
+from utils.protocol.LSIS.utilities import LSIS_MappingTool
+
+
+def _repack(tool, data):
+    value = tool.repack(data)
+    if type(value).__name__ == 'float':
+        value = float("{:.3f}".format(round(value, 3)))
+    return value
+
+
+def _nan_safe(values):
+    return {key: 'nan' if value != value else value for key, value in values.items()}
+
+
+def test_batch_decode_matches_repack():
+    rng = random.Random(7)
+    image = bytes(rng.randrange(256) for _ in range(4000))
+    combos = [('bool', 'bit', 'X'), ('int', 'word', 'W'), ('uint', 'word', 'W'), ('udint', 'dword', 'D'), ('float', 'dword', 'D')]
+    decoder = LSIS_BatchDecoder()
+    expected = {}
+    for i in range(500):
+        data_type, unit, symbol = rng.choice(combos)
+        limit = {'bit': 4000 * 8, 'word': 2000, 'dword': 1000}[unit]
+        mem = {'device': 'M', 'data_type': data_type, 'unit': unit, 'scale': rng.choice([1, 0.1]),
+               'device_address': f'%M{symbol}{rng.randrange(limit)}'}
+        tool = LSIS_MappingTool(**mem)
+        key = str(i)
+        expected[key] = _repack(tool, list(image))
+        if len(tool.position) > 1:
+            decoder.add_bit(key, tool.position[0], tool.position[1])
+        else:
+            decoder.add_value(key, tool.position[0], tool.format, tool.scale)
+    # 임의 이미지에는 NaN 비트 패턴의 float가 섞이므로 NaN끼리는 같은 값으로 비교
+    assert _nan_safe(decoder.decode(image)) == _nan_safe(expected)
+
+
+def test_batch_decode_clamp_and_out_of_range():
+    image = struct.pack('=h', 500) + struct.pack('=h', -500)
+    decoder = LSIS_BatchDecoder()
+    decoder.add_value('hi', 0, 'h', 1.0, clamp=(0, 100))
+    decoder.add_value('lo', 2, 'h', 1.0, clamp=(0, 100))
+    decoder.add_value('partial', 3, 'h')
+    decoder.add_value('outside', 10, 'h')
+    decoder.add_bit('bit', 0, 2)
+    result = decoder.decode(memoryview(image))
+    assert result['hi'] == 100.0
+    assert result['lo'] == 0.0
+    assert 'partial' not in result
+    assert result['outside'] == LSIS_BatchDecoder.OUT_OF_RANGE
+    assert result['bit'] is bool((image[0] >> 2) & 1)
+
+
+def test_batch_decode_matches_decode_scalar_rules_for_clamped_ints():
+    # decode_scalar: 클램프된 int 변수는 경계값(int) 그대로, 나머지는 '{:.3f}'.format(round(x, 3))
+    values = [500, -500, 50, 1234, -3, 7]
+    image = struct.pack('=' + 'h' * len(values), *values)
+    clamps = [(0, 100), (0, 100), (0, 100), (0.5, 99.5), (-1, 1), None]
+    scales = [1.0, 1.0, 1.0, 0.1, 1.0, 0.001]
+    decoder = LSIS_BatchDecoder()
+    for i, (clamp, scale) in enumerate(zip(clamps, scales)):
+        decoder.add_value(str(i), i * 2, 'h', scale, clamp=clamp)
+    result = decoder.decode(image)
+
+    assert result == {'0': 100, '1': 0, '2': 50.0, '3': 99.5, '4': -1, '5': 0.007}
+    assert [type(result[str(i)]) for i in range(len(values))] == [int, int, float, float, int, float]
+
+
+def test_batch_decode_rounds_like_format_at_ties():
+    # 0.0005, 0.0025 ... 는 np.round(x, 3)과 round(x, 3) 결과가 다른 값
+    raws = [1, 5, 11, 17, 19]
+    decoder = LSIS_BatchDecoder()
+    for i in range(len(raws)):
+        decoder.add_value(str(i), i * 2, 'h', 0.0005)
+    result = decoder.decode(struct.pack('=' + 'h' * len(raws), *raws))
+    assert result == {str(i): float("{:.3f}".format(round(raw * 0.0005, 3))) for i, raw in enumerate(raws)}
+
+
+def test_batch_decode_nan_pattern_without_warning():
+    # signaling NaN(0x7f800001)도 RuntimeWarning 없이 NaN으로 디코딩
+    image = struct.pack('=I', 0x7f800001) + struct.pack('=f', 2.6755)
+    decoder = LSIS_BatchDecoder()
+    decoder.add_value('nan', 0, 'f')
+    decoder.add_value('value', 4, 'f')
+    with np.errstate(all='raise'):
+        result = decoder.decode(image)
+    assert result['nan'] != result['nan']
+    assert result['value'] == float("{:.3f}".format(round(struct.unpack('=f', struct.pack('=f', 2.6755))[0], 3)))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import struct
+from types import SimpleNamespace
+
+from utils.protocol.LSIS.factory import ClientDecoder
+from utils.protocol.LSIS.framer.socket_framer import LSIS_SocketFramer
+from utils.protocol.LSIS.individual_read_byte import byte_variable, variable_byte_span
+from utils.protocol.LSIS.pdu import LSIS_XGT_Request, snapshot_response
+from utils.protocol.LSIS.transaction import DictTransactionManager, LSIS_AdaptiveGap
+
+
+def test_next_tid_skips_zero():
+    manager = DictTransactionManager(None)
+    manager.tid = 0xFFFE
+    assert [manager.getNextTID() for _ in range(3)] == [0xFFFF, 1, 2]
+
+
+def test_request_header_carries_transaction_id():
+    request = LSIS_XGT_Request()
+    request.transaction_id = 0x1234
+    request.encode()
+    assert request.header[5] == 0x1234
+
+
+def test_adaptive_gap_grows_on_failure_and_decays_on_success():
+    gap = LSIS_AdaptiveGap(initial=0.0, maximum=0.02, step=0.005)
+    gap.on_failure()
+    assert gap.value == 0.005
+    for _ in range(5):
+        gap.on_failure()
+    assert gap.value == 0.02
+    for _ in range(10):
+        gap.on_success()
+    assert gap.value == 0.0
+
+
+def _read_response_frame(data, invoke_id=7):
+    instruction = struct.pack("<HHHHHH", 0x55, 0x14, 0, 0, 1, len(data)) + data
+    header = struct.pack("10sHBBHHBB", b"LSIS-XGT\x00\x00", 0x0101, 0xA4, 0x11, invoke_id, len(instruction), 0, 0)
+    return header + instruction
+
+
+def test_read_response_payload_is_memoryview_and_snapshot_copies_it():
+    data = bytes(range(200)) * 3
+    framer = LSIS_SocketFramer(ClientDecoder(), client=SimpleNamespace(params=SimpleNamespace(host="plc")))
+    replies = []
+    frame = _read_response_frame(data)
+    framer.processIncomingPacket(frame[:25], replies.append)
+    framer.processIncomingPacket(frame[25:], replies.append)
+    reply = replies[-1]
+    assert isinstance(reply.values, memoryview)
+    assert bytes(reply.values) == data
+    assert reply.dataCount == len(data)
+
+    snapshot = snapshot_response(reply)
+    framer.resetFrame()
+    framer.processIncomingPacket(_read_response_frame(bytes(len(data)), invoke_id=8), replies.append)
+    assert snapshot.payload == data
+    assert snapshot.values == list(data)
+
+
+def test_individual_read_response_blocks_are_decoded_per_variable():
+    blocks = [bytes(range(8)), bytes(range(100, 108))]
+    instruction = struct.pack("<HHHHH", 0x55, 0x04, 0, 0, len(blocks))
+    instruction += b"".join(struct.pack("<H", len(block)) + block for block in blocks)
+    header = struct.pack("10sHBBHHBB", b"LSIS-XGT\x00\x00", 0x0101, 0xA4, 0x11, 3, len(instruction), 0, 0)
+    framer = LSIS_SocketFramer(ClientDecoder(), client=SimpleNamespace(params=SimpleNamespace(host="plc")))
+    replies = []
+    framer.processIncomingPacket(header + instruction, replies.append)
+    assert replies[-1].name == "Individual_Read_Response"
+    assert snapshot_response(replies[-1]).values == blocks
+
+
+def test_individual_read_variable_names():
+    assert byte_variable("%MB", 800, "lword") == "%ML100"
+    assert variable_byte_span("%MW100") == ("%MB", 200, 2)
+    assert variable_byte_span("%MX17") == ("%MB", 2, 1)
@@ -7,7 +7,7 @@ from functools import partial
 from threading import RLock
 
 from .exceptions import (
-    InvalidMessageReceivedException, LSIS_IOException, NoSuchSlaveException, NotImplementedException
+    ConnectionException, InvalidMessageReceivedException, LSIS_IOException, NoSuchSlaveException, NotImplementedException
 )
 from .framer.socket_framer import LSIS_SocketFramer
 
@@ -18,6 +18,7 @@ from .framer.socket_framer import LSIS_SocketFramer
 from .logger import Log
 from .utilities import LSIS_TransactionState, hexlify_packets
 from .constants import Defaults, LSIS_XGT_constants
+from .pdu import snapshot_response
 import socket
 import struct
 import time
@@ -211,6 +212,107 @@ class LSIS_TransactionManager:
                     self.client.close()
                 return exc
 
+    def execute_pipelined(self, requests, window=4, gap=None):
+        """Send several requests back to back and match the responses by Invoke ID.
+
+        최대 window개의 요청을 응답을 기다리지 않고 연속 전송하고, 응답 헤더의
+        Invoke ID(transaction_id)로 요청을 찾아 결과를 채웁니다. 응답 하나가 도착할
+        때마다 다음 요청을 보내므로 PLC당 in-flight 요청 수는 window를 넘지 않습니다.
+
+        :param requests: LSIS_XGT_Request 목록 (예: Continuous_Read_Request)
+        :param window: 동시에 응답을 기다릴 최대 요청 수 (1이면 순차 실행)
+        :param gap: 요청 프레임 사이 간격을 조절하는 LSIS_AdaptiveGap (선택)
+        :returns: 요청 순서와 같은 응답 목록 (실패한 요청은 LSIS_IOException)
+        """
+        window = max(1, int(window or 1))
+        results = [None] * len(requests)
+        with self._transaction_lock:
+            pending = {}
+            next_index = 0
+            try:
+                self.client.connect()
+                self.client.framer.resetFrame()
+                while next_index < len(requests) or pending:
+                    while next_index < len(requests) and len(pending) < window:
+                        if gap is not None and (pending or next_index):
+                            gap.sleep()
+                        request = requests[next_index]
+                        request.transaction_id = self.getNextTID()
+                        packet = self.client.framer.buildPacket(request)
+                        self._send(packet)
+                        pending[request.transaction_id] = next_index
+                        next_index += 1
+                    self.client.state = LSIS_TransactionState.WAITING_FOR_REPLY
+                    if not (frame := self._recv_frame()):
+                        raise InvalidMessageReceivedException(
+                            f"No response received for {len(pending)} pipelined request(s)"
+                        )
+                    tid = struct.unpack_from("<H", frame, 14)[0]
+                    if (index := pending.pop(tid, None)) is None:
+                        Log.debug("Unrequested message: invoke id {}", tid)
+                        continue
+                    self.client.framer.resetFrame()
+                    self.client.framer.processIncomingPacket(frame, partial(self.addTransaction, tid=tid))
+                    if (response := self.getTransaction(tid)) is None:
+                        results[index] = LSIS_IOException(
+                            "Unable to decode response", requests[index].command
+                        )
+                        if gap is not None:
+                            gap.on_failure()
+                    else:
+                        results[index] = snapshot_response(response)
+                        if gap is not None:
+                            gap.on_success()
+            except (
+                socket.error,
+                ConnectionException,
+                LSIS_IOException,
+                InvalidMessageReceivedException,
+            ) as exc:
+                Log.debug("Pipelined transaction failed. ({}) ", exc)
+                if gap is not None:
+                    gap.on_failure()
+                for index in list(pending.values()) + list(range(next_index, len(requests))):
+                    results[index] = LSIS_IOException(str(exc), requests[index].command)
+                if self.reset_socket:
+                    self.client.close()
+            self.client.state = LSIS_TransactionState.TRANSACTION_COMPLETE
+        return results
+
+    def _recv_frame(self):
+        """Receive exactly one LSIS-XGT frame (header + Length bytes).
+
+        recv_into를 지원하는 클라이언트는 재사용 버퍼(_frame_buffer)에 직접 받아 memoryview를
+        반환합니다. 반환값은 다음 _recv_frame 호출 전까지만 유효합니다.
+        """
+        recv_into = getattr(self.client, "recv_into", None)
+        if recv_into is None:
+            header = self.client.recv(self.base_adu_size)
+            if len(header) < self.base_adu_size:
+                return b""
+            length = struct.unpack_from("<H", header, 16)[0]
+            body = self.client.recv(length) if length else b""
+            if len(body) < length:
+                return b""
+            return header + body
+
+        buffer = getattr(self, "_frame_buffer", None)
+        if buffer is None:
+            buffer = self._frame_buffer = bytearray(self.base_adu_size + LSIS_XGT_constants.ReadSize + 64)
+        view = memoryview(buffer)
+        if recv_into(view[: self.base_adu_size]) < self.base_adu_size:
+            return b""
+        length = struct.unpack_from("<H", buffer, 16)[0]
+        total = self.base_adu_size + length
+        if total > len(buffer):
+            # 예상보다 큰 프레임: 헤더를 옮겨 담을 더 큰 버퍼를 새로 할당
+            buffer = self._frame_buffer = bytearray(total)
+            buffer[: self.base_adu_size] = view[: self.base_adu_size]
+            view = memoryview(buffer)
+        if length and recv_into(view[self.base_adu_size : total]) < length:
+            return b""
+        return view[:total]
+
     def _retry_transaction(self, retries, reason, packet, response_length, full=False):
         """Retry transaction."""
         Log.debug("Retry on {} response - {}", reason, retries)
@@ -337,7 +439,12 @@ class LSIS_TransactionManager:
             read_min = b""
             total = expected_response_length
         if self.client.framer.instruction[1] == 84:
-            expected_response_length = struct.calcsize(self.client.framer.header[0])+2*6+self.client.framer.instruction[-1]
+            if self.client.framer.instruction[2] == LSIS_XGT_constants.ContinuousDataType[1]:
+                expected_response_length = struct.calcsize(self.client.framer.header[0])+2*6+self.client.framer.instruction[-1]
+            else:
+                # 개별 읽기: Block 수 × (데이터 크기(2) + 데이터)
+                unit = LSIS_XGT_constants.SingleDataSize[self.client.framer.instruction[2]]
+                expected_response_length = struct.calcsize(self.client.framer.header[0])+2*5+self.client.framer.instruction[4]*(2+unit)
         elif self.client.framer.instruction[1] == 88:
             expected_response_length = 30
             total = expected_response_length
@@ -403,7 +510,8 @@ class LSIS_TransactionManager:
 
         :returns: The next unique transaction identifier
         """
-        self.tid = (self.tid + 1) & 0xFFFF
+        # 0은 DictTransactionManager.getTransaction에서 "임의의 트랜잭션"을 뜻하므로 건너뜁니다 (1~0xFFFF 순환)
+        self.tid = (self.tid % 0xFFFF) + 1
         return self.tid
 
     def reset(self):
@@ -414,6 +522,46 @@ class LSIS_TransactionManager:
         )()
 
 
+class LSIS_AdaptiveGap:
+    """Adaptive inter-frame gap for one PLC connection.
+
+    고정 sleep 대신 응답 상태에 따라 요청 프레임 사이 간격을 조절합니다.
+    실패(타임아웃/디코딩 실패)가 나면 간격을 늘리고, 성공이 이어지면 minimum까지 줄입니다.
+
+    :param initial: 시작 간격(초)
+    :param minimum: 최소 간격(초)
+    :param maximum: 최대 간격(초)
+    :param step: 간격이 0일 때 실패하면 적용할 첫 간격(초)
+    :param increase: 실패 시 곱할 배수
+    :param decrease: 성공 시 곱할 배수
+    """
+
+    def __init__(self, initial=0.025, minimum=0.0, maximum=0.2, step=0.005, increase=2.0, decrease=0.5):
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.step = float(step)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.value = min(max(float(initial), self.minimum), self.maximum)
+
+    def on_success(self):
+        """Shrink the gap after a good response."""
+        value = self.value * self.decrease
+        self.value = self.minimum if value < max(self.minimum, 0.001) else value
+
+    def on_failure(self):
+        """Grow the gap after a timeout or bad response."""
+        self.value = min(self.maximum, max(self.step, self.minimum, self.value * self.increase))
+
+    def sleep(self):
+        """Wait for the current gap (sync)."""
+        if self.value > 0:
+            time.sleep(self.value)
+
+    def __repr__(self):
+        return f"<LSIS_AdaptiveGap {self.value * 1000:.1f}ms>"
+
+
 class DictTransactionManager(LSIS_TransactionManager):
     """Implements a transaction for a manager.
 
@@ -531,6 +679,7 @@ class FifoTransactionManager(LSIS_TransactionManager):
 
 
 __all__ = [
+    "LSIS_AdaptiveGap",
     "FifoTransactionManager",
     "DictTransactionManager",
     "LSIS_SocketFramer",
@@ -1,7 +1,13 @@
 from .base import DE_MCU_SerialClient
+from .bus_scheduler import DE_MCU_BusScheduler, bus_scheduler
+from .session import SerialSessionPool, session_pool
 
 __all__ = [
     "DE_MCU_SerialClient",
+    "DE_MCU_BusScheduler",
+    "bus_scheduler",
+    "SerialSessionPool",
+    "session_pool",
 ]
 
 # 사용 예시:
@@ -4,7 +4,10 @@ from dataclasses import dataclass
 from utils.protocol import checksum as checksum_mod
 
 from ..exceptions import ConnectionException
+from .firmware_transfer import DE_MCU_FirmwareTransfer
+from .frame_reader import DE_MCU_FrameReader
 from .mixin import DE_MCU_Mixin
+from .session import session_pool
 
 # 새로운 config 시스템 사용
 from ..config import get_mcu_config, get_serial_config, get_protocol_config, get_start_byte, get_logging_config, CommandCode
@@ -39,6 +42,8 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
         parity: str = None,
         stopbits: int = None,
         serial_module=None,
+        use_session_pool: bool = None,
+        receive_mode: str = None,
         **kwargs,
     ) -> None:
         """
@@ -51,6 +56,10 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
             parity: 패리티 설정 (None이면 config에서 가져옴)
             stopbits: 스톱 비트 수 (None이면 config에서 가져옴)
             serial_module: 사용할 시리얼 모듈 (테스트용)
+            use_session_pool: 열린 포트/선택 노드를 세션 풀에서 재사용할지 여부
+                (None이면 config의 session_pool_enabled, False면 요청마다 포트를 열고 닫음)
+            receive_mode: 'frame'(명령 포맷 기반 프레임 읽기) 또는 'polling'(1바이트씩 읽던 이전 방식).
+                None이면 config의 receive_mode
             **kwargs: 추가 설정
         """
         # 믹스인이 kwargs를 받는 경우를 지원하기 위한 cooperative super 호출
@@ -86,11 +95,17 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
         self.last_error = None
         self.serial = None
         self._serial_module = serial_module
+        self.use_session_pool = (
+            protocol_config.get('session_pool_enabled', True) if use_session_pool is None else bool(use_session_pool)
+        )
+        self.receive_mode = receive_mode or protocol_config.get('receive_mode', 'frame')
+        self._frame_readers = {}
         # RS485 미지원 경고 반복 방지 플래그
         self._rs485_warned = False
         # 시작 바이트 및 체크섬 함수 기본값(트랜잭트별로 덮어쓸 수 있음)
         self.start_byte = protocol_config['start_byte']
         self.checksum_func = None
+        self._checksum_type = None
         
         logger.info(
             f"DE-MCU Client initialized with port: {self.params.port}, "
@@ -122,6 +137,10 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
         self.close()
 
     def close(self):
+        if self.use_session_pool:
+            # 세션 풀의 포트는 다른 요청과 공유하므로 참조만 놓음 (닫기는 session_pool.close())
+            self.serial = None
+            return
         try:
             if getattr(self, "serial", None) and getattr(self.serial, "is_open", False):
                 self.serial.close()
@@ -130,226 +149,81 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
         finally:
             self.serial = None
 
+    def _open_serial(self):
+        """현재 params로 serial.Serial을 엽니다 (세션 풀/단발 경로 공용)."""
+        serial_mod = self._get_serial_module()
+
+        bytesize_map = {
+            8: serial_mod.EIGHTBITS,
+            7: serial_mod.SEVENBITS,
+            6: serial_mod.SIXBITS,
+            5: serial_mod.FIVEBITS,
+        }
+        parity_map = {
+            "N": serial_mod.PARITY_NONE,
+            "E": serial_mod.PARITY_EVEN,
+            "O": serial_mod.PARITY_ODD,
+        }
+        stopbits_map = {
+            1: serial_mod.STOPBITS_ONE,
+            1.5: serial_mod.STOPBITS_ONE_POINT_FIVE,
+            2: serial_mod.STOPBITS_TWO,
+        }
+
+        bs = bytesize_map.get(self.params.bytesize, serial_mod.EIGHTBITS)
+        pr = parity_map.get(str(self.params.parity).upper(), serial_mod.PARITY_NONE)
+        sb = stopbits_map.get(self.params.stopbits, serial_mod.STOPBITS_ONE)
+
+        # 새로운 config 시스템에서 타임아웃 설정 가져오기
+        open_timeout = float(self._serial_config.get('timeout', 5.0))
+
+        return serial_mod.Serial(
+            port=self.params.port,
+            baudrate=self.params.baudrate,
+            bytesize=bs,
+            parity=pr,
+            stopbits=sb,
+            timeout=open_timeout,
+            write_timeout=self._serial_config.get('write_timeout', 5.0),
+        )
+
+    def _exchange(self, ser, req_bytes, timeout):
+        """입출력 버퍼를 비우고 요청 프레임을 보낸 뒤 응답 프레임 하나를 받습니다."""
+        ser.reset_input_buffer()
+        ser.reset_output_buffer()
+        ser.write(req_bytes)
+        ser.flush()  # 버퍼 비우기 (즉시 전송)
+        return self.receive_bytes(ser, timeout=timeout)
+
     def transact(self, retry_forever: bool = False, **kwargs):
         """
         MCU 장치와 트랜잭션을 수행합니다.
         
         새로운 config 시스템을 사용하여 환경별 타임아웃과 재시도 정책을 적용합니다.
+        use_session_pool이면 (port, baudrate) 세션의 열린 포트를 재사용하고,
+        이미 선택된 노드에 대해서는 NODE_SELECT 핸드셰이크를 생략합니다.
         """
-        serial_number = kwargs.get("serial_number", None)
-        checksum_type = kwargs.get("checksum_type", self._protocol_config['checksum_method'])
         command = kwargs.get("command", "NODE_SELECT_REQ")
         attempt = 0
-        req_bytes = None
-        res_bytes = None
-        result = dict
         try:
-            serial_mod = self._get_serial_module()
-
-            bytesize_map = {
-                8: serial_mod.EIGHTBITS,
-                7: serial_mod.SEVENBITS,
-                6: serial_mod.SIXBITS,
-                5: serial_mod.FIVEBITS,
-            }
-            parity_map = {
-                "N": serial_mod.PARITY_NONE,
-                "E": serial_mod.PARITY_EVEN,
-                "O": serial_mod.PARITY_ODD,
-            }
-            stopbits_map = {
-                1: serial_mod.STOPBITS_ONE,
-                1.5: serial_mod.STOPBITS_ONE_POINT_FIVE,
-                2: serial_mod.STOPBITS_TWO,
-            }
-
-            bs = bytesize_map.get(self.params.bytesize, serial_mod.EIGHTBITS)
-            pr = parity_map.get(str(self.params.parity).upper(), serial_mod.PARITY_NONE)
-            sb = stopbits_map.get(self.params.stopbits, serial_mod.STOPBITS_ONE)
-
-            # 새로운 config 시스템에서 타임아웃 설정 가져오기
-            open_timeout = float(self._serial_config.get('timeout', 5.0))
-
             # 이 트랜잭션에서 사용할 시작 바이트와 체크섬 함수를 설정
+            checksum_type = kwargs.get("checksum_type", self._protocol_config['checksum_method'])
             self.start_byte = self._protocol_config['start_byte']
             self.checksum_func = self._make_checksum_callable(checksum_type)
+            self._checksum_type = checksum_type
 
-            # Open a temporary serial port for handshake only
-            self.serial = serial_mod.Serial(
-                port=self.params.port,
-                baudrate=self.params.baudrate,
-                bytesize=bs,
-                parity=pr,
-                stopbits=sb,
-                timeout=open_timeout,
-                write_timeout=self._serial_config.get('write_timeout', 5.0),
-            )
-            req_pdu = self.NODE_SELECT_REQ(
-                serial_number=serial_number, checksum_type=checksum_type
-            )
-            if command == "FIRMWARE_VERSION_UPDATE_REQ":
-                firm_bytes_list = kwargs.get("req_data").decode("utf-8").split(":")
-                for idx, firm_bytes in enumerate(firm_bytes_list, start=1):
-                    logger.info(
-                        "Processing firmware index %d/%d", idx, len(firm_bytes_list)
-                    )
-                    isSelected = False
-                    req_pdu = None
-                    if len(firm_bytes) != 0:
-                        try:
-                            req_pdu = self.NODE_SELECT_REQ(
-                                serial_number=serial_number, checksum_type=checksum_type
-                            )
-                            req_bytes = req_pdu.serialize()
-                            self.serial.reset_input_buffer()
-                            self.serial.reset_output_buffer()
-                            self.serial.write(req_bytes)
-                            self.serial.flush()  # 버퍼 비우기 (즉시 전송)
-                            res_bytes = self.receive_bytes(
-                                self.serial,
-                                timeout=(
-                                    self._protocol_config['firmware_response_timeout_ms'] / 1000.0
-                                ),
-                            )
-                            isSelected = self.NODE_SELECT_RES(
-                                bytes=res_bytes, checksum_type=checksum_type
-                            )
-                            if isSelected:
-                                req = getattr(self, command)(**kwargs)
-                                req_bytes = req.serialize(
-                                    data=firm_bytes
-                                )  # Validate command existence
-                                logger.debug(
-                                    f"{command} : TX -> {bytes(req_bytes).hex(' ').upper() if req_bytes else 'No Request'}"
-                                )
-                                self.serial.reset_input_buffer()
-                                self.serial.reset_output_buffer()
-                                self.serial.write(req_bytes)
-                                self.serial.flush()  # 버퍼 비우기 (즉시 전송)
-                                res_bytes = self.receive_bytes(
-                                    self.serial,
-                                    timeout=(
-                                        self._protocol_config['firmware_response_timeout_ms'] / 1000.0
-                                    ),
-                                )
-                                logger.debug(
-                                    f"{command.replace('REQ', 'RES')} : RX <- {bytes(res_bytes).hex(' ').upper() if res_bytes else 'No Response'}"
-                                )
-                                if getattr(self, command.replace("REQ", "RES"))(
-                                    **kwargs
-                                ):
-                                    logger.error(
-                                        f"Firmware update failed at index {idx}: {len(firm_bytes_list)}"
-                                    )
-                                    break
-                        except Exception as e:
-                            raise ConnectionException(
-                                f"NODE_SELECT_REQ 빌드 실패: {e}",
-                                exc=e,
-                                endpoint=self.params.port,
-                                retryable=False,
-                            )
-            else:
-                try:
-                    req_bytes = req_pdu.serialize()
-                    # serialize should return bytes; log hex representation
-                    if not isinstance(req_bytes, (bytes, bytearray)):
-                        raise TypeError("요청 PDU 직렬화 결과가 바이트가 아닙니다")
-                    try:
-                        logger.debug(
-                            "NODE_SELECT_REQ : TX -> %s",
-                            bytes(req_bytes).hex(" ").upper(),
-                        )
-                    except Exception:
-                        logger.error("NODE_SELECT_REQ : TX -> (unable to format)")
-                except Exception as e:
-                    raise ConnectionException(
-                        f"NODE_SELECT_REQ 빌드 실패: {e}",
-                        exc=e,
-                        endpoint=self.params.port,
-                        retryable=False,
-                    )
+            if self.use_session_pool:
+                return self._transact_pooled(command, checksum_type, kwargs)
 
+            # Open a temporary serial port for this transaction only
+            self.serial = self._open_serial()
+            try:
+                return self._transact_on(self.serial, None, command, checksum_type, kwargs)
+            finally:
                 try:
-                    self.serial.reset_input_buffer()
-                    self.serial.reset_output_buffer()
-                    self.serial.write(req_bytes)
-                    self.serial.flush()  # 버퍼 비우기 (즉시 전송)
-                    res_bytes = self.receive_bytes(
-                        self.serial,
-                        timeout=(self._protocol_config['response_timeout_ms'] / 1000.0) + 1.0,
-                    )
-                    logger.debug(
-                        f"NODE_SELECT_RES : RX <- {bytes(res_bytes).hex(' ').upper() if res_bytes else 'No Response'}"
-                    )
-                    isSelected = self.NODE_SELECT_RES(
-                        bytes=res_bytes, checksum_type=checksum_type
-                    )
-                    self.last_response = res_bytes
-                    result = {
-                        "request": (
-                            req_bytes.hex(" ").upper() if req_bytes else "No Resquest"
-                        ),
-                        "response": (
-                            res_bytes.hex(" ").upper()
-                            if self.last_response
-                            else "No Response"
-                        ),
-                    }
-                    if not res_bytes:
-                        logger.error(
-                            f"No response received on {self.params.port} for NODE_SELECT_REQ"
-                        )
-                        return result
-                    if not isSelected:
-                        logger.error(
-                            f"Invalid NODE_SELECT_RES response on {self.params.port}: {res_bytes.hex(' ').upper() if res_bytes else 'empty'}"
-                        )
-                        return result
-                    result["selected_node"] = isSelected
-                    if command != "NODE_SELECT_REQ":
-                        req_bytes = getattr(self, command)(
-                            **kwargs
-                        ).serialize()  # Validate command existence
-                        logger.debug(
-                            f"{command} : TX -> {bytes(req_bytes).hex(' ').upper() if req_bytes else 'No Request'}"
-                        )
-                        self.serial.reset_input_buffer()
-                        self.serial.reset_output_buffer()
-                        self.serial.write(req_bytes)
-                        result["request"] = (
-                            req_bytes.hex(" ").upper() if req_bytes else "No Resquest"
-                        )
-                        self.serial.flush()  # 버퍼 비우기 (즉시 전송)
-                        res_bytes = self.receive_bytes(
-                            self.serial,
-                            timeout=(self._protocol_config['response_timeout_ms'] / 1000.0) + 1.0,
-                        )
-                        logger.debug(
-                            f"{command.replace('REQ', 'RES')} : RX <- {bytes(res_bytes).hex(' ').upper() if res_bytes else 'No Response'}"
-                        )
-                        kwargs["res_bytes"] = res_bytes
-                        processed_data = getattr(self, command.replace("REQ", "RES"))(
-                            **kwargs
-                        )
-                        self.serial.reset_input_buffer()
-                        self.serial.reset_output_buffer()
-                        self.serial.flush()  # 버퍼 비우기 (즉시 전송)
-                        result["processed_data"] = processed_data
-                        result["response"] = (
-                            res_bytes.hex(" ").upper()
-                            if self.last_response
-                            else "No Response"
-                        )
-                    else:
-                        result["processed_data"] = "존재하지 않는 명령입니다."
-                    # (제거됨) 이전에 사용하던 예외 캐치-로깅의 주석 처리된 중복 코드 삭제
-                    return result
-                finally:
-                    try:
-                        self.serial.close()
-                    except Exception:
-                        pass
+                    self.serial.close()
+                except Exception:
+                    pass
 
         except ConnectionException as e:
             attempt += 1
@@ -373,6 +247,159 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
                 str(e), exc=e, endpoint=self.params.port, retryable=False
             )
 
+    def _transact_pooled(self, command, checksum_type, kwargs):
+        """세션 풀의 버스 락을 잡고 트랜잭션을 수행합니다.
+
+        포트 입출력 오류(OSError, pyserial SerialException 포함)가 나면 세션을 닫고
+        포트를 다시 열어 한 번 더 시도합니다 (USB 분리 후 재연결 등).
+        """
+        session_pool.close_idle(self._protocol_config.get('session_idle_timeout_s', 0))
+        lock_timeout = self._protocol_config.get('bus_lock_timeout_ms', 10000) / 1000.0
+        with session_pool.acquire(self.params.port, self.params.baudrate, timeout=lock_timeout) as session:
+            for retry in range(2):
+                try:
+                    self.serial = session.ensure_open(self._open_serial)
+                    return self._transact_on(self.serial, session, command, checksum_type, kwargs)
+                except OSError as e:
+                    session.invalidate(e)
+                    self.serial = None
+                    if retry:
+                        raise ConnectionException(
+                            f"serial I/O failed on {self.params.port}: {e}",
+                            exc=e,
+                            endpoint=self.params.port,
+                            retryable=True,
+                        )
+                except Exception:
+                    # 버스 상태를 알 수 없으므로 다음 요청은 NODE_SELECT부터 다시 수행
+                    session.clear_selection()
+                    raise
+
+    def _select_node(self, ser, session, req_pdu, checksum_type, result):
+        """NODE_SELECT 핸드셰이크를 수행하고 선택 여부를 반환합니다 (result에 요청/응답 기록)."""
+        req_bytes = req_pdu.serialize()
+        # serialize should return bytes; log hex representation
+        if not isinstance(req_bytes, (bytes, bytearray)):
+            raise ConnectionException(
+                "NODE_SELECT_REQ 빌드 실패: 요청 PDU 직렬화 결과가 바이트가 아닙니다",
+                endpoint=self.params.port,
+                retryable=False,
+            )
+        logger.debug("NODE_SELECT_REQ : TX -> %s", bytes(req_bytes).hex(" ").upper())
+        res_bytes = self._exchange(
+            ser,
+            req_bytes,
+            timeout=(self._protocol_config['response_timeout_ms'] / 1000.0) + 1.0,
+        )
+        logger.debug(
+            f"NODE_SELECT_RES : RX <- {bytes(res_bytes).hex(' ').upper() if res_bytes else 'No Response'}"
+        )
+        self.last_response = res_bytes
+        result["request"] = req_bytes.hex(" ").upper() if req_bytes else "No Resquest"
+        result["response"] = res_bytes.hex(" ").upper() if res_bytes else "No Response"
+        if not res_bytes:
+            logger.error(
+                f"No response received on {self.params.port} for NODE_SELECT_REQ"
+            )
+            return False
+        isSelected = self.NODE_SELECT_RES(bytes=res_bytes, checksum_type=checksum_type)
+        if not isSelected:
+            logger.error(
+                f"Invalid NODE_SELECT_RES response on {self.params.port}: {res_bytes.hex(' ').upper()}"
+            )
+            return False
+        if session is not None:
+            session.mark_selected(req_pdu.serial_number)
+        return isSelected
+
+    @staticmethod
+    def _is_read_command(command):
+        """다시 보내도 장치 상태가 바뀌지 않는 조회 명령인지 (예: DI_READ_REQ, ANALOG_READ_ALL_REQ)."""
+        return "_READ" in command
+
+    def _transact_on(self, ser, session, command, checksum_type, kwargs):
+        """열린 포트 ser에서 NODE_SELECT(필요 시)와 command를 수행합니다. session이 None이면 항상 선택."""
+        serial_number = kwargs.get("serial_number", None)
+        req_pdu = self.NODE_SELECT_REQ(
+            serial_number=serial_number, checksum_type=checksum_type
+        )
+        if command == "FIRMWARE_VERSION_UPDATE_REQ":
+            # 전송 엔진이 노드를 직접 선택하고, 끝나면 선택 상태를 버림 (장치 재부팅)
+            if session is not None:
+                session.clear_selection()
+            try:
+                return self._firmware_update_on(ser, command, checksum_type, serial_number, kwargs)
+            finally:
+                if session is not None:
+                    session.clear_selection()
+
+        result = {}
+        for _ in range(2):
+            skipped = (
+                session is not None
+                and command != "NODE_SELECT_REQ"
+                and session.is_selected(req_pdu.serial_number)
+            )
+            if skipped:
+                session.stats['node_select_skipped'] += 1
+                isSelected = True
+            else:
+                isSelected = self._select_node(ser, session, req_pdu, checksum_type, result)
+                if not isSelected:
+                    return result
+            result["selected_node"] = isSelected
+            if command == "NODE_SELECT_REQ":
+                result["processed_data"] = "존재하지 않는 명령입니다."
+                return result
+
+            req_bytes = getattr(self, command)(**kwargs).serialize()  # Validate command existence
+            logger.debug(
+                f"{command} : TX -> {bytes(req_bytes).hex(' ').upper() if req_bytes else 'No Request'}"
+            )
+            result["request"] = req_bytes.hex(" ").upper() if req_bytes else "No Resquest"
+            res_bytes = self._exchange(
+                ser,
+                req_bytes,
+                timeout=(self._protocol_config['response_timeout_ms'] / 1000.0) + 1.0,
+            )
+            logger.debug(
+                f"{command.replace('REQ', 'RES')} : RX <- {bytes(res_bytes).hex(' ').upper() if res_bytes else 'No Response'}"
+            )
+            if res_bytes or not skipped:
+                break
+            # 선택을 생략했는데 응답이 없으면 노드가 리셋되었을 수 있으므로 한 번 다시 선택
+            session.clear_selection()
+            if not self._is_read_command(command):
+                # 쓰기 명령은 장치가 이미 실행했을 수 있으므로 다시 보내지 않고 No Response로 보고
+                logger.warning(f"{command}: no response with cached node selection on {self.params.port}, re-selecting without resend")
+                self._select_node(ser, session, req_pdu, checksum_type, {})
+                break
+            logger.info(f"{command}: no response with cached node selection on {self.params.port}, re-selecting")
+
+        if res_bytes:
+            self.last_response = res_bytes
+        kwargs["res_bytes"] = res_bytes
+        processed_data = getattr(self, command.replace("REQ", "RES"))(**kwargs)
+        ser.reset_input_buffer()
+        ser.reset_output_buffer()
+        ser.flush()  # 버퍼 비우기 (즉시 전송)
+        result["processed_data"] = processed_data
+        result["response"] = (
+            res_bytes.hex(" ").upper() if res_bytes else "No Response"
+        )
+        return result
+
+    def _firmware_update_on(self, ser, command, checksum_type, serial_number, kwargs):
+        """열린 포트에서 Intel HEX 이미지(req_data)를 DE_MCU_FirmwareTransfer로 전송합니다.
+
+        window: ACK 없이 연달아 보낼 레코드 수 (None이면 config의 firmware_window_size)
+        resume: 같은 노드/이미지의 이전 전송이 중단되었으면 마지막으로 확인된 레코드부터 이어서 보냄
+        """
+        transfer = DE_MCU_FirmwareTransfer(
+            self, ser, serial_number, checksum_type=checksum_type, window=kwargs.get("window")
+        )
+        return transfer.run(kwargs.get("req_data"), resume=kwargs.get("resume", True))
+
     def build_request_pdu(self, **kwargs):
         # Mixin의 execute()가 제거되어 각 명령별 편의 메서드를 직접 호출합니다.
         cmd = kwargs.get("command")
@@ -395,7 +422,21 @@ class DE_MCU_SerialClient(DE_MCU_Mixin):
         return self
 
     def receive_bytes(self, ser, timeout):
-        """시작바이트와 데이터 길이 및 체크섬(선택)을 사용하여 프레임을 빠르게 읽음."""
+        """응답 프레임 하나를 읽습니다 (receive_mode에 따라 프레임 리더 또는 이전 폴링 방식)."""
+        if self.receive_mode == "polling":
+            return self._receive_bytes_polling(ser, timeout)
+        checksum_type = self._checksum_type
+        reader = self._frame_readers.get(checksum_type)
+        if reader is None:
+            reader = self._frame_readers[checksum_type] = DE_MCU_FrameReader(
+                checksum_type=checksum_type,
+                checksum_func=self.checksum_func,
+                config=self._mcu_config,
+            )
+        return reader.read_frame(ser, timeout)
+
+    def _receive_bytes_polling(self, ser, timeout):
+        """시작바이트와 데이터 길이 및 체크섬(선택)을 사용하여 프레임을 읽음 (1바이트씩 폴링하는 이전 방식)."""
         if self.start_byte is None:
             self.start_byte = get_start_byte()
         if self.checksum_func is None:
@@ -0,0 +1,265 @@
+"""DE-MCU 버스(포트) 스케줄러.
+
+HTTP 요청, 스케줄 잡, 펌웨어 업데이트가 같은 RS-485 포트를 각자 열고 노드를 번갈아 선택하던 것을
+포트마다 하나의 워커 스레드와 우선순위 큐로 바꿉니다.
+
+- submit()은 명령을 큐에 넣고 concurrent.futures.Future를 돌려줍니다 (결과는 transact()와 같은 dict).
+- 워커는 가장 급한 명령을 고른 뒤, 같은 노드에 쌓인 명령 중 다른 노드의 가장 급한 명령보다
+  늦지 않은 것들을 최대 max_batch개까지 이어서 실행합니다. 세션 풀이 선택된 노드를 기억하므로
+  묶음의 두 번째 명령부터는 NODE_SELECT가 생략됩니다.
+- 묶음을 실행하는 동안 세션 락을 잡고 있어 스케줄러 밖의 transact()가 끼어들지 않습니다.
+- 큐 대기 timeout이 지난 명령은 실행하지 않고 TimeoutError로 끝냅니다.
+- metrics(): 포트별 큐 길이, 노드 전환 횟수, 노드별 지연(ms)/타임아웃/오류 횟수.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+from ..config import get_mcu_config
+from ..utils import to_bytes
+from .base import DE_MCU_SerialClient
+from .session import session_pool
+
+logger = get_mcu_config().get_logger()
+
+# 숫자가 작을수록 먼저 실행
+PRIORITY_HIGH = 0  # HTTP 요청 등 사용자가 기다리는 명령
+PRIORITY_NORMAL = 5  # 주기 수집 잡
+PRIORITY_LOW = 9  # 펌웨어 업데이트 등 오래 걸리는 작업
+
+
+def node_key(serial_number):
+    """NODE_SELECT_REQ와 같은 방식(little-endian)으로 정규화한 노드 키. 잘못된 값이면 None."""
+    try:
+        return to_bytes(serial_number, endian="<") or None
+    except Exception:
+        return None
+
+
+class _BusCommand:
+    __slots__ = ("priority", "seq", "node", "kwargs", "future", "enqueued_at", "deadline")
+
+    def __init__(self, priority, seq, node, kwargs, timeout):
+        self.priority = priority
+        self.seq = seq
+        self.node = node
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = self.enqueued_at + timeout if timeout else None
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _NodeStats:
+    __slots__ = ("count", "errors", "timeouts", "total_ms", "max_ms", "last_ms", "wait_ms")
+
+    def __init__(self):
+        self.count = self.errors = self.timeouts = 0
+        self.total_ms = self.max_ms = self.last_ms = self.wait_ms = 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+            "avg_wait_ms": round(self.wait_ms / self.count, 3) if self.count else None,
+        }
+
+
+class _Bus:
+    """포트 하나의 큐와 워커."""
+
+    def __init__(self, scheduler, port, baudrate, client_kwargs):
+        self.scheduler = scheduler
+        self.port = port
+        self.baudrate = baudrate
+        self.client = DE_MCU_SerialClient(port=port, baudrate=baudrate, **client_kwargs)
+        self.queue = []
+        self.condition = threading.Condition()
+        self.running = 0
+        self.last_node = None
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "queue_timeouts": 0, "node_switches": 0, "batches": 0}
+        self.nodes = {}
+        self.thread = threading.Thread(target=self._run, name=f"mcu-bus-{port}", daemon=True)
+        self.thread.start()
+
+    def put(self, command):
+        with self.condition:
+            heapq.heappush(self.queue, command)
+            self.counters["submitted"] += 1
+            self.condition.notify()
+
+    def _next_batch(self):
+        """가장 급한 명령과, 같은 노드에서 다른 노드보다 늦지 않은 명령들을 꺼냅니다."""
+        head = heapq.heappop(self.queue)
+        others = [c.priority for c in self.queue if c.node != head.node]
+        limit = min(others) if others else None
+        same = sorted(
+            c for c in self.queue if c.node == head.node and (limit is None or c.priority <= limit)
+        )[: self.scheduler.max_batch - 1]
+        if same:
+            taken = set(map(id, same))
+            self.queue = [c for c in self.queue if id(c) not in taken]
+            heapq.heapify(self.queue)
+        return [head] + same
+
+    def _run(self):
+        stop = self.scheduler._stop
+        while not stop.is_set():
+            with self.condition:
+                while not self.queue and not stop.is_set():
+                    self.condition.wait(1.0)
+                if stop.is_set():
+                    break
+                batch = self._next_batch()
+                self.running = len(batch)
+            try:
+                self._execute(batch)
+            except Exception as e:
+                # 세션 락을 못 잡은 경우 등: 아직 끝나지 않은 명령은 같은 예외로 종료
+                logger.warning(f"bus scheduler batch failed on {self.port}: {e}")
+                for command in batch:
+                    if not command.future.done():
+                        self.counters["failed"] += 1
+                        command.future.set_exception(e)
+            finally:
+                self.running = 0
+        with self.condition:
+            pending, self.queue = self.queue, []
+        for command in pending:
+            command.future.cancel()
+
+    def _execute(self, batch):
+        self.counters["batches"] += 1
+        if batch[0].node != self.last_node:
+            self.counters["node_switches"] += 1
+            self.last_node = batch[0].node
+        lock_timeout = self.client._protocol_config.get("bus_lock_timeout_ms", 10000) / 1000.0
+        with session_pool.acquire(self.port, self.baudrate, timeout=lock_timeout):
+            for command in batch:
+                self._execute_one(command)
+
+    def _execute_one(self, command):
+        future = command.future
+        started = time.monotonic()
+        stats = self.nodes.setdefault(command.node.hex().upper() if command.node else None, _NodeStats())
+        if command.deadline is not None and started > command.deadline:
+            self.counters["queue_timeouts"] += 1
+            stats.timeouts += 1
+            if future.set_running_or_notify_cancel():
+                future.set_exception(TimeoutError(f"queued command expired before running on {self.port}"))
+            return
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.client.transact(**dict(command.kwargs))
+        except Exception as e:
+            stats.errors += 1
+            self.counters["failed"] += 1
+            future.set_exception(e)
+            return
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.last_ms = elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.wait_ms += (started - command.enqueued_at) * 1000
+        if isinstance(result, dict) and result.get("response") == "No Response":
+            stats.timeouts += 1
+        self.counters["completed"] += 1
+        future.set_result(result)
+
+    def describe(self):
+        with self.condition:
+            depth = len(self.queue)
+            by_priority = {}
+            for command in self.queue:
+                by_priority[command.priority] = by_priority.get(command.priority, 0) + 1
+        return {
+            "port": self.port,
+            "baudrate": self.baudrate,
+            "queue_depth": depth,
+            "queue_by_priority": by_priority,
+            "running": self.running,
+            **self.counters,
+            "nodes": {node: stats.as_dict() for node, stats in self.nodes.items()},
+        }
+
+
+class DE_MCU_BusScheduler:
+    """
+    📌 사용 예시:
+    future = bus_scheduler.submit("/dev/ttyUSB0", command="DI_READ_REQ", serial_number="4653500D004C003C",
+                                  req_data=1, priority=PRIORITY_HIGH, timeout=10)
+    result = future.result(timeout=15)
+    bus_scheduler.metrics()
+    """
+
+    def __init__(self, max_batch=16, client_kwargs=None):
+        self.max_batch = max_batch
+        self.client_kwargs = client_kwargs or {}
+        self._buses = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+
+    def _bus(self, port, baudrate):
+        baudrate = int(baudrate or get_mcu_config().serial.baudrate)
+        key = (port, baudrate)
+        with self._lock:
+            bus = self._buses.get(key)
+            if bus is None:
+                self._stop.clear()
+                bus = self._buses[key] = _Bus(self, port, baudrate, self.client_kwargs)
+            return bus
+
+    def submit(self, port, baudrate=None, priority=PRIORITY_NORMAL, timeout=None, **kwargs):
+        """명령을 포트 큐에 넣고 Future를 반환합니다. kwargs는 transact()에 그대로 전달됩니다.
+
+        timeout(초)은 큐에서 기다리는 최대 시간입니다 (실행 시간은 프로토콜 타임아웃을 따름).
+        """
+        command = _BusCommand(
+            priority, next(self._seq), node_key(kwargs.get("serial_number")), kwargs, timeout
+        )
+        self._bus(port, baudrate).put(command)
+        return command.future
+
+    def transact(self, port, baudrate=None, priority=PRIORITY_NORMAL, timeout=None, wait=None, **kwargs):
+        """submit() 후 결과를 기다립니다. wait(초) 안에 끝나지 않으면 concurrent.futures.TimeoutError."""
+        future = self.submit(port, baudrate=baudrate, priority=priority, timeout=timeout, **kwargs)
+        return future.result(timeout=wait)
+
+    def metrics(self):
+        with self._lock:
+            buses = list(self._buses.values())
+        return [bus.describe() for bus in buses]
+
+    def shutdown(self, timeout=2.0):
+        """워커를 멈추고 남은 명령을 취소합니다."""
+        self._stop.set()
+        with self._lock:
+            buses, self._buses = list(self._buses.values()), {}
+        for bus in buses:
+            with bus.condition:
+                bus.condition.notify_all()
+            bus.thread.join(timeout)
+
+
+bus_scheduler = DE_MCU_BusScheduler()
+
+
+__all__ = [
+    "DE_MCU_BusScheduler",
+    "PRIORITY_HIGH",
+    "PRIORITY_LOW",
+    "PRIORITY_NORMAL",
+    "bus_scheduler",
+]
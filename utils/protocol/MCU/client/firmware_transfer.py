@@ -0,0 +1,296 @@
+"""DE-MCU 펌웨어 전송 엔진.
+
+이전 _firmware_update_on은 Intel HEX 레코드마다 NODE_SELECT → FIRMWARE_VERSION_UPDATE_REQ → ACK 대기를
+반복했고, 실패하면 처음부터 다시 보내야 했습니다. DE_MCU_FirmwareTransfer는 열린 포트와 선택된 노드를
+전송이 끝날 때까지 유지합니다.
+
+- 윈도우: ACK를 기다리지 않고 최대 window개 레코드를 연달아 보낸 뒤 ACK를 순서대로 셉니다.
+  FIRMWARE_VERSION_UPDATE_RES에는 순번이 없으므로 ACK가 모자라면 어느 레코드가 빠졌는지 알 수 없습니다.
+  그 윈도우만 늦은 ACK를 비운 뒤 레코드 하나씩(stop-and-wait) 다시 보내 각각 확인합니다.
+- 확장 주소 레코드(02/04): 재전송/재개 시 첫 데이터 레코드 앞에 해당 주소 레코드를 다시 보내
+  부트로더의 상위 주소가 어긋나지 않게 합니다. EOF 레코드(01)는 앞의 레코드가 모두 확인된 뒤 단독으로 보냅니다.
+- 진행 상태: 확인된 레코드 수(앞에서부터 연속)를 노드 시리얼 + 이미지 해시 키로 JSON 파일에 기록합니다.
+  같은 이미지를 다시 보내면 마지막으로 확인된 위치부터 이어서 보내고, 완료되면 파일을 지웁니다.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from ..config import CommandCode, get_mcu_config, get_protocol_config
+from ..exceptions import ConnectionException
+from ..utils import to_bytes
+
+logger = get_mcu_config().get_logger()
+
+# Intel HEX 레코드 타입
+RECORD_EOF = 0x01
+RECORD_BASE_ADDRESS = (0x02, 0x04)  # 확장 세그먼트/선형 주소
+
+
+def parse_records(image):
+    """Intel HEX 이미지(bytes/str)를 ':' 기준으로 나눈 레코드 hex 문자열 목록."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = bytes(image).decode("utf-8")
+    if not isinstance(image, str):
+        raise ValueError(f"펌웨어 이미지 형식이 올바르지 않습니다: {type(image).__name__}")
+    return [record.strip() for record in image.split(":") if record.strip()]
+
+
+def record_type(record):
+    try:
+        raw = bytes.fromhex(record)
+    except ValueError:
+        return None
+    return raw[3] if len(raw) >= 4 else None
+
+
+def progress_key(serial_number, image):
+    serial_hex = to_bytes(serial_number).hex().upper() if serial_number is not None else "UNKNOWN"
+    if isinstance(image, str):
+        image = image.encode("utf-8")
+    return f"{serial_hex}_{hashlib.sha256(bytes(image)).hexdigest()[:16]}"
+
+
+class FirmwareProgressStore:
+    """
+    전송 진행 상태 파일 저장소 (키마다 <directory>/<key>.json).
+
+    📌 사용 예시:
+    store = FirmwareProgressStore("log/firmware")
+    store.load("4653500D004C003C_1a2b3c4d5e6f7a8b")   # {'records': 1200, 'confirmed': 640, ...} 또는 None
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or get_protocol_config().get("firmware_progress_dir", "log/firmware"))
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def load(self, key):
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key, state):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def clear(self, key):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class DE_MCU_FirmwareTransfer:
+    """
+    📌 사용 예시 (보통 transact(command="FIRMWARE_VERSION_UPDATE_REQ")가 세션 락을 잡은 포트에서 호출):
+    transfer = DE_MCU_FirmwareTransfer(client, ser, "4653500D004C003C", window=8)
+    summary = transfer.run(open("app.hex", "rb").read())
+    """
+
+    command = "FIRMWARE_VERSION_UPDATE_REQ"
+
+    def __init__(self, client, ser, serial_number, checksum_type="xor_simple", window=None, max_retries=None,
+                 ack_timeout=None, store=None, checkpoint_interval=0.5):
+        config = client._protocol_config
+        self.client = client
+        self.ser = ser
+        self.serial_number = serial_number
+        self.checksum_type = checksum_type
+        self.window = max(1, int(window or config.get("firmware_window_size", 1)))
+        self.max_retries = config.get("firmware_max_retries", 3) if max_retries is None else int(max_retries)
+        self.ack_timeout = config["firmware_response_timeout_ms"] / 1000.0 if ack_timeout is None else ack_timeout
+        # 레코드 송신 + ACK 수신에 걸리는 선로 시간 (10비트/바이트)
+        self.byte_time = 10.0 / float(client.params.baudrate or 9600)
+        self.store = store or FirmwareProgressStore(config.get("firmware_progress_dir"))
+        self.checkpoint_interval = checkpoint_interval
+        self.stats = {"frames_sent": 0, "retransmits": 0, "window_failures": 0, "node_selects": 0}
+        self.frames = []
+        self.types = []
+        self.bases = []
+        # 이번 전송에서 한 번 이상 보낸 레코드 인덱스 (재전송 횟수 집계용)
+        self._sent = set()
+        self.confirmed = 0
+        self.last_ack = b""
+        self._base_synced = False
+        self._saved_at = 0.0
+
+    # ------------------------------------------------------------------ #
+    # 준비
+    # ------------------------------------------------------------------ #
+    def _prepare(self, records):
+        self.frames = [
+            self.client.FIRMWARE_VERSION_UPDATE_REQ(command=self.command, checksum_type=self.checksum_type).serialize(
+                data=record
+            )
+            for record in records
+        ]
+        self.types = [record_type(record) for record in records]
+        # 각 레코드에 적용되는 확장 주소 레코드 인덱스 (주소 레코드 자신은 자기 인덱스)
+        base = None
+        self.bases = []
+        for index, kind in enumerate(self.types):
+            if kind in RECORD_BASE_ADDRESS:
+                base = index
+            self.bases.append(base)
+
+    def _window_end(self, start):
+        end = min(start + self.window, len(self.frames))
+        for index in range(start, end):
+            if self.types[index] == RECORD_EOF:
+                return index if index > start else index + 1
+        return end
+
+    # ------------------------------------------------------------------ #
+    # 송수신
+    # ------------------------------------------------------------------ #
+    def _select(self):
+        self.stats["node_selects"] += 1
+        req_pdu = self.client.NODE_SELECT_REQ(serial_number=self.serial_number, checksum_type=self.checksum_type)
+        if not self.client._select_node(self.ser, None, req_pdu, self.checksum_type, {}):
+            raise ConnectionException(
+                f"firmware update: node did not answer NODE_SELECT on {self.client.params.port}",
+                endpoint=self.client.params.port,
+                retryable=True,
+            )
+
+    def _read_ack(self, frame):
+        timeout = self.ack_timeout + (len(frame) + 3) * self.byte_time
+        res_bytes = self.client.receive_bytes(self.ser, timeout=timeout)
+        if not res_bytes or len(res_bytes) < 2 or res_bytes[1] != CommandCode.FIRMWARE_VERSION_UPDATE_RES:
+            return False
+        self.last_ack = res_bytes
+        return bool(self.client.FIRMWARE_VERSION_UPDATE_RES(res_bytes=res_bytes, checksum_type=self.checksum_type))
+
+    def _send(self, start, end):
+        """레코드 start..end-1을 한 번에 쓰고 ACK가 모두 오면 True."""
+        indexes = range(start, end)
+        # 이미 보낸 레코드를 다시 보낸 경우만 재전송으로 셈 (재개 시 처음 보내는 주소 레코드는 제외)
+        self.stats["retransmits"] += sum(1 for index in indexes if index in self._sent)
+        self._sent.update(indexes)
+        self.ser.reset_input_buffer()
+        self.ser.write(b"".join(self.frames[start:end]))
+        self.ser.flush()
+        self.stats["frames_sent"] += end - start
+        return all(self._read_ack(self.frames[index]) for index in range(start, end))
+
+    def _drain(self):
+        """실패한 윈도우의 늦은 ACK가 다음 레코드의 ACK로 잘못 세어지지 않도록 비움."""
+        time.sleep(self.ack_timeout)
+        self.ser.reset_input_buffer()
+
+    def _sync_base(self, index):
+        if self._base_synced:
+            return
+        self._base_synced = True
+        base = self.bases[index]
+        if base is not None and base != index:
+            self._deliver(base)
+
+    def _deliver(self, index):
+        """레코드 하나를 ACK가 올 때까지 재전송 (max_retries 초과 시 ConnectionException)."""
+        for _ in range(self.max_retries):
+            self._sync_base(index)
+            if self._send(index, index + 1):
+                return
+            self._drain()
+            self._base_synced = False
+            # 장치가 재시작되었을 수 있으므로 노드를 다시 선택
+            self._select()
+        raise ConnectionException(
+            f"firmware record {index + 1}/{len(self.frames)} not acknowledged after {self.max_retries} retries",
+            endpoint=self.client.params.port,
+            retryable=True,
+        )
+
+    # ------------------------------------------------------------------ #
+    # 진행 상태
+    # ------------------------------------------------------------------ #
+    def _checkpoint(self, key, force=False):
+        now = time.monotonic()
+        if not force and now - self._saved_at < self.checkpoint_interval:
+            return
+        self._saved_at = now
+        try:
+            self.store.save(key, {
+                "serial_number": to_bytes(self.serial_number).hex().upper() if self.serial_number is not None else None,
+                "records": len(self.frames),
+                "confirmed": self.confirmed,
+                "updated_at": datetime.now().isoformat(),
+            })
+        except OSError as e:
+            logger.warning(f"firmware progress save failed ({key}): {e}")
+
+    def run(self, image, resume=True):
+        records = parse_records(image)
+        if not records:
+            raise ValueError("펌웨어 이미지에 레코드가 없습니다")
+        self._prepare(records)
+        total = len(self.frames)
+        key = progress_key(self.serial_number, image)
+
+        start = 0
+        if resume:
+            state = self.store.load(key)
+            if state and state.get("records") == total:
+                start = min(int(state.get("confirmed", 0)), total)
+        if start:
+            logger.info(f"firmware update resuming at record {start + 1}/{total} ({key})")
+        self.confirmed = start
+        self._base_synced = False
+        started = time.monotonic()
+
+        self._select()
+        try:
+            index = start
+            while index < total:
+                end = self._window_end(index)
+                self._sync_base(index)
+                if not self._send(index, end):
+                    self.stats["window_failures"] += 1
+                    self._drain()
+                    self._base_synced = False
+                    for retry_index in range(index, end):
+                        self._deliver(retry_index)
+                self.confirmed = end
+                self._checkpoint(key)
+                index = end
+        except BaseException:
+            self._checkpoint(key, force=True)
+            logger.error(f"firmware update stopped at record {self.confirmed + 1}/{total}, progress saved ({key})")
+            raise
+        self.store.clear(key)
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        logger.info(f"firmware update finished: {total} records in {elapsed_ms:.0f} ms, stats={self.stats}")
+        return {
+            "selected_node": True,
+            "request": f"{self.command} x {total}",
+            "response": self.last_ack.hex(" ").upper() if self.last_ack else "No Response",
+            "processed_data": {
+                "FIRMWARE_UPDATE": {
+                    "records": total,
+                    "resumed_from": start,
+                    "window": self.window,
+                    "bytes": sum(len(frame) for frame in self.frames[start:]),
+                    "elapsed_ms": round(elapsed_ms, 1),
+                    **self.stats,
+                },
+            },
+        }
+
+
+__all__ = [
+    "DE_MCU_FirmwareTransfer",
+    "FirmwareProgressStore",
+    "parse_records",
+    "progress_key",
+]
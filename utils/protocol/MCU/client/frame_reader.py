@@ -0,0 +1,187 @@
+"""DE-MCU 응답 프레임 리더.
+
+이전 receive_bytes는 1바이트씩 읽고 데이터가 없으면 time.sleep(0.01)을 반복했습니다.
+DE_MCU_FrameReader는 MCUProtocolConfig의 명령 포맷으로 프레임 길이를 구해 필요한 만큼만 읽습니다.
+
+1) 시작 바이트(START)를 찾음
+2) 명령 바이트(CMD)를 읽고 config.get_frame_layout(CMD)으로 길이 필드 유무를 확인
+   (NODE_SELECT_RES 등 길이 필드가 없는 응답은 고정 크기, 모르는 명령은 길이 필드가 있다고 가정)
+3) 남은 DATA + CHK를 read(n) 한 번으로 읽음
+4) 읽은 조각마다 체크섬을 누적 계산(XOR/SUM/LRC)하고, 그 밖의 방식은 프레임 전체로 검증
+
+모든 읽기는 전체 마감 시각(deadline) 안에서만 기다립니다.
+"""
+import time
+
+from ..config import get_mcu_config
+
+logger = get_mcu_config().get_logger()
+
+# 체크섬 방식 -> 프레임 끝 체크섬 크기(바이트)
+CHECKSUM_SIZES = {
+    "xor_simple": 1,
+    "xor": 1,
+    "sum": 1,
+    "checksum_sum": 1,
+    "lrc": 1,
+    "checksum_lrc": 1,
+    "crc16": 2,
+    "crc16modbus": 2,
+    "crc16_modbus": 2,
+    "crc16ccitt": 2,
+    "crc16_ccitt": 2,
+    "crc32": 4,
+    "adler32": 4,
+}
+
+# 조각 단위로 누적 계산할 수 있는 1바이트 체크섬
+_RUNNING = {
+    "xor_simple": "xor",
+    "xor": "xor",
+    "sum": "sum",
+    "checksum_sum": "sum",
+    "lrc": "lrc",
+    "checksum_lrc": "lrc",
+}
+
+
+class _RunningChecksum:
+    def __init__(self, kind):
+        self.kind = kind
+        self.value = 0
+
+    def update(self, chunk):
+        if self.kind == "xor":
+            value = self.value
+            for byte in chunk:
+                value ^= byte
+            self.value = value
+        else:
+            self.value += sum(chunk)
+
+    def matches(self, checksum_byte):
+        expected = (-self.value) & 0xFF if self.kind == "lrc" else self.value & 0xFF
+        return expected == checksum_byte
+
+
+class DE_MCU_FrameReader:
+    """
+    📌 사용 예시:
+    reader = DE_MCU_FrameReader(checksum_type="xor_simple")
+    frame = reader.read_frame(ser, timeout=1.0)   # 타임아웃이면 b"", 불완전하면 받은 부분
+    """
+
+    def __init__(self, checksum_type=None, checksum_func=None, config=None):
+        self.config = config or get_mcu_config()
+        self.start_byte = self.config.protocol.start_byte
+        self.max_packet_size = self.config.protocol.max_packet_size
+        checksum_type = str(checksum_type).lower() if checksum_type else None
+        self.checksum_type = checksum_type
+        self.checksum_size = CHECKSUM_SIZES.get(checksum_type, 1)
+        self._running_kind = _RUNNING.get(checksum_type)
+        # frame: bytes -> bool|int|bytes (DE_MCU_SerialClient._make_checksum_callable과 같은 규약)
+        self.checksum_func = checksum_func
+        self._layouts = {}
+
+    def layout(self, command):
+        try:
+            return self._layouts[command]
+        except KeyError:
+            layout = self._layouts[command] = self.config.get_frame_layout(command) or (True, 0)
+            return layout
+
+    @staticmethod
+    def _read(ser, size, deadline):
+        """deadline까지 size 바이트를 읽습니다. 시리얼 timeout은 남은 시간보다 길지 않게 맞춤."""
+        data = b""
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if ser.timeout is None or ser.timeout > remaining + 0.01:
+                ser.timeout = remaining
+            chunk = ser.read(size - len(data))
+            if chunk:
+                data = data + chunk if data else chunk
+        return data
+
+    def _valid(self, frame, running):
+        if running is not None:
+            return running.matches(frame[-1])
+        if not self.checksum_func:
+            return True
+        try:
+            result = self.checksum_func(frame)
+        except Exception as e:
+            logger.warning("Checksum function raised exception: %s", e)
+            return False
+        if isinstance(result, bool):
+            return result
+        if isinstance(result, int):
+            return (result & 0xFF) == frame[-1]
+        if isinstance(result, (bytes, bytearray)):
+            return frame[-len(result):] == bytes(result)
+        return False
+
+    def read_frame(self, ser, timeout):
+        deadline = time.monotonic() + timeout
+        original_timeout = ser.timeout
+        try:
+            while True:
+                # 1) 시작 바이트 검색
+                head = self._read(ser, 1, deadline)
+                if not head:
+                    logger.debug("read_frame RX <- (timeout)")
+                    return bytes()
+                if head[0] != self.start_byte:
+                    continue
+                running = _RunningChecksum(self._running_kind) if self._running_kind else None
+
+                # 2) 명령 (+ 길이)
+                command = self._read(ser, 1, deadline)
+                if not command:
+                    return bytes(head)
+                has_length, data_size = self.layout(command[0])
+                header = head + command
+                if has_length:
+                    length = self._read(ser, 1, deadline)
+                    if not length:
+                        return header
+                    header += length
+                    data_size = length[0]
+                    if data_size > self.max_packet_size:
+                        logger.warning(
+                            "read_frame RX <- data_len %d exceeds max_packet_size %d, skipping frame",
+                            data_size,
+                            self.max_packet_size,
+                        )
+                        continue
+                if running is not None:
+                    running.update(header)
+
+                # 3) 데이터 + 체크섬
+                body_size = data_size + self.checksum_size
+                body = self._read(ser, body_size, deadline)
+                frame = header + body
+                if len(body) < body_size:
+                    logger.debug("read_frame RX <- incomplete frame %s", frame.hex(" ").upper())
+                    return frame
+                if running is not None:
+                    running.update(memoryview(body)[:-self.checksum_size])
+
+                # 4) 체크섬 검증
+                if not self._valid(frame, running):
+                    logger.warning(
+                        "Received frame failed checksum, skipping. Frame: %s",
+                        frame.hex(" ").upper(),
+                    )
+                    continue
+                return frame
+        finally:
+            if ser.timeout != original_timeout:
+                ser.timeout = original_timeout
+
+
+__all__ = [
+    "DE_MCU_FrameReader",
+]
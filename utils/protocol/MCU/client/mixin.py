@@ -215,7 +215,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Input_Read_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -259,7 +259,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Output_Read_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -303,7 +303,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Output_Write_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -347,7 +347,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Analog_Input_Read_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -475,7 +475,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Serial_Setup_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -516,7 +516,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Serial_Write_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -559,7 +559,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Input_Threshold_Write_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -601,7 +601,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Input_Output_All_Read_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -644,7 +644,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Digital_Output_Write_All_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -685,7 +685,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Analog_Input_Read_All_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -725,7 +725,7 @@ class DE_MCU_Mixin:
         """
         try:
             response = Serial_Setup_Read_Response(**kwargs)
-            if bytes is None or bytes == b"":
+            if res_bytes is None or res_bytes == b"":
                 return response
             return response.deserialize(data=res_bytes)
         except Exception as e:
@@ -0,0 +1,194 @@
+"""DE-MCU 시리얼 포트 세션 풀.
+
+DE_MCU_SerialClient.transact는 요청마다 serial.Serial을 새로 열고 NODE_SELECT 핸드셰이크를
+먼저 보냈기 때문에 레지스터 하나를 읽는 데 포트 open/close + 왕복 2회 + tty 설정 시간이 들었습니다.
+
+- (port, baudrate)마다 SerialSession 하나를 유지하고 포트를 열어 둡니다.
+- 세션은 현재 선택된 노드(serial_number)를 기억하므로 같은 노드에 대한 연속 요청은
+  NODE_SELECT를 건너뜁니다.
+- 같은 버스(포트)는 세션 락으로 한 번에 한 요청만 사용합니다.
+- 쓰기/읽기 중 SerialException/OSError(USB 분리 등)가 나면 세션을 무효화(포트 닫기 +
+  선택 노드 초기화)하고 다음 요청에서 다시 엽니다.
+
+풀은 프로세스 단위입니다. 여러 프로세스가 같은 포트를 쓰면 각자 세션을 가집니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from ..config import get_mcu_config
+from ..exceptions import ConnectionException
+
+logger = get_mcu_config().get_logger()
+
+
+class SerialSession:
+    """열린 시리얼 포트 하나와 그 버스에서 선택된 노드 상태.
+
+    📌 사용 예시:
+    with session_pool.acquire("/dev/ttyUSB0", 19200) as session:
+        ser = session.ensure_open(client._open_serial)
+        if session.selected_node != serial_number:
+            ...  # NODE_SELECT 후 session.mark_selected(serial_number)
+    """
+
+    def __init__(self, port, baudrate):
+        self.port = port
+        self.baudrate = baudrate
+        self.serial = None
+        self.selected_node = None
+        self.lock = threading.RLock()
+        self.opened_at = None
+        self.last_used = time.monotonic()
+        self.stats = {
+            'opens': 0,
+            'reuses': 0,
+            'node_selects': 0,
+            'node_select_skipped': 0,
+            'failures': 0,
+        }
+
+    @property
+    def key(self):
+        return self.port, self.baudrate
+
+    @property
+    def is_open(self):
+        return bool(self.serial is not None and getattr(self.serial, 'is_open', True))
+
+    def ensure_open(self, opener):
+        """포트가 닫혀 있으면 opener()로 새로 열고, 열린 시리얼 객체를 반환합니다."""
+        self.last_used = time.monotonic()
+        if self.is_open:
+            self.stats['reuses'] += 1
+            return self.serial
+        self.serial = opener()
+        self.selected_node = None
+        self.opened_at = time.monotonic()
+        self.stats['opens'] += 1
+        logger.info(f"serial session opened: {self.port} @ {self.baudrate}")
+        return self.serial
+
+    def mark_selected(self, serial_number):
+        self.selected_node = bytes(serial_number) if serial_number is not None else None
+        self.stats['node_selects'] += 1
+
+    def is_selected(self, serial_number):
+        return serial_number is not None and self.selected_node == bytes(serial_number)
+
+    def clear_selection(self):
+        self.selected_node = None
+
+    def invalidate(self, reason=None):
+        """포트를 닫고 선택 상태를 버립니다. 다음 ensure_open()에서 다시 엽니다."""
+        self.stats['failures'] += 1
+        if reason is not None:
+            logger.warning(f"serial session invalidated: {self.port} @ {self.baudrate}: {reason}")
+        self.close()
+
+    def close(self):
+        serial, self.serial = self.serial, None
+        self.selected_node = None
+        self.opened_at = None
+        if serial is None:
+            return
+        try:
+            serial.close()
+        except Exception as e:
+            logger.debug(f"serial session close 실패 ({self.port}): {e}")
+
+    def describe(self):
+        return {
+            'port': self.port,
+            'baudrate': self.baudrate,
+            'open': self.is_open,
+            'selected_node': self.selected_node.hex().upper() if self.selected_node else None,
+            'idle_sec': round(time.monotonic() - self.last_used, 3),
+            **self.stats,
+        }
+
+
+class SerialSessionPool:
+    """(port, baudrate) → SerialSession.
+
+    📌 사용 예시:
+    with session_pool.acquire(port, baudrate, timeout=10) as session:
+        ...
+    session_pool.close_idle(300)
+    session_pool.close()       # 모든 포트 닫기
+    session_pool.snapshot()
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, port, baudrate):
+        key = (port, int(baudrate))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = SerialSession(*key)
+            return session
+
+    @contextmanager
+    def acquire(self, port, baudrate, timeout=None):
+        """버스 락을 잡은 세션을 돌려줍니다. timeout(초) 안에 락을 못 잡으면 ConnectionException."""
+        session = self.session(port, baudrate)
+        if not session.lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise ConnectionException(
+                f"serial bus busy: {port} @ {baudrate}",
+                endpoint=port,
+                retryable=True,
+                level="warning",
+            )
+        try:
+            yield session
+        finally:
+            session.last_used = time.monotonic()
+            session.lock.release()
+
+    def close_idle(self, max_idle_sec):
+        """max_idle_sec 이상 쓰이지 않은(락이 비어 있는) 세션의 포트를 닫고 닫은 수를 반환합니다."""
+        if not max_idle_sec:
+            return 0
+        now = time.monotonic()
+        closed = 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if not session.is_open or now - session.last_used < max_idle_sec:
+                continue
+            if session.lock.acquire(blocking=False):
+                try:
+                    session.close()
+                    closed += 1
+                finally:
+                    session.lock.release()
+        return closed
+
+    def close(self, port=None, baudrate=None):
+        """port(와 baudrate)에 해당하는 세션을 닫습니다. 인자가 없으면 전체."""
+        with self._lock:
+            sessions = [
+                s for s in self._sessions.values()
+                if (port is None or s.port == port) and (baudrate is None or s.baudrate == int(baudrate))
+            ]
+        for session in sessions:
+            with session.lock:
+                session.close()
+
+    def snapshot(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [session.describe() for session in sessions]
+
+
+session_pool = SerialSessionPool()
+
+
+__all__ = [
+    "SerialSession",
+    "SerialSessionPool",
+    "session_pool",
+]
@@ -191,6 +191,13 @@ class ProtocolConfig:
         response_timeout_ms: 응답 대기 시간 (밀리초)
         firmware_response_timeout_ms: 펌웨어 응답 대기 시간 (밀리초)
         max_packet_size: 최대 패킷 크기 (바이트)
+        session_pool_enabled: 포트를 열어 둔 채 재사용(세션 풀)할지 여부
+        session_idle_timeout_s: 이 시간(초) 동안 쓰이지 않은 세션 포트는 닫음 (0이면 계속 유지)
+        bus_lock_timeout_ms: 같은 버스를 다른 요청이 쓰고 있을 때 기다리는 최대 시간 (밀리초)
+        receive_mode: 응답 수신 방식 ('frame': 명령 포맷으로 길이를 구해 한 번에 읽음, 'polling': 이전 방식)
+        firmware_window_size: 펌웨어 전송 시 ACK를 기다리지 않고 연달아 보내는 레코드 수 (1이면 레코드마다 ACK 대기)
+        firmware_max_retries: 펌웨어 레코드 하나의 최대 재전송 횟수
+        firmware_progress_dir: 펌웨어 전송 진행 상태(확인된 레코드 위치) 파일을 두는 디렉터리
     """
     start_byte: int = 0x7E
     checksum_method: ChecksumMethod = ChecksumMethod.XOR_SIMPLE
@@ -199,6 +206,13 @@ class ProtocolConfig:
     response_timeout_ms: int = 3000
     firmware_response_timeout_ms: int = 100
     max_packet_size: int = 1024
+    session_pool_enabled: bool = True
+    session_idle_timeout_s: int = 300
+    bus_lock_timeout_ms: int = 10000
+    receive_mode: str = "frame"
+    firmware_window_size: int = 1
+    firmware_max_retries: int = 3
+    firmware_progress_dir: str = "log/firmware"
     
     def __post_init__(self):
         """설정값 유효성 검증"""
@@ -208,6 +222,10 @@ class ProtocolConfig:
             raise ValueError(f"재시도 횟수는 0 이상이어야 합니다: {self.max_retry_count}")
         if self.retry_delay_ms < 0:
             raise ValueError(f"재시도 간격은 0 이상이어야 합니다: {self.retry_delay_ms}")
+        if self.receive_mode not in ("frame", "polling"):
+            raise ValueError(f"지원하지 않는 수신 방식: {self.receive_mode}")
+        if self.firmware_window_size < 1:
+            raise ValueError(f"펌웨어 전송 윈도우는 1 이상이어야 합니다: {self.firmware_window_size}")
 
 
 @dataclass
@@ -388,6 +406,16 @@ class MCUProtocolConfig:
             self.protocol.max_retry_count = int(retry_count)
         if response_timeout := os.getenv('MCU_RESPONSE_TIMEOUT'):
             self.protocol.response_timeout_ms = int(response_timeout)
+        if session_pool := os.getenv('MCU_SESSION_POOL'):
+            self.protocol.session_pool_enabled = session_pool.lower() in ('1', 'true', 'yes', 'on')
+        if idle_timeout := os.getenv('MCU_SESSION_IDLE_TIMEOUT'):
+            self.protocol.session_idle_timeout_s = int(idle_timeout)
+        if receive_mode := os.getenv('MCU_RECEIVE_MODE'):
+            self.protocol.receive_mode = receive_mode.lower()
+        if firmware_window := os.getenv('MCU_FIRMWARE_WINDOW'):
+            self.protocol.firmware_window_size = max(1, int(firmware_window))
+        if firmware_progress_dir := os.getenv('MCU_FIRMWARE_PROGRESS_DIR'):
+            self.protocol.firmware_progress_dir = firmware_progress_dir
         
         # 로깅 설정
         if log_level := os.getenv('MCU_LOG_LEVEL'):
@@ -635,6 +663,23 @@ class MCUProtocolConfig:
             명령어 포맷 리스트
         """
         return self.command_formats.get(command_code, [])
+
+    def get_frame_layout(self, command_code: int) -> Optional[Tuple[bool, int]]:
+        """
+        응답 프레임을 읽는 데 필요한 배치를 반환합니다.
+        
+        Args:
+            command_code: 수신한 명령 바이트
+        
+        Returns:
+            (Data Length 필드 유무, 길이 필드가 없을 때의 고정 데이터 크기). 모르는 명령이면 None
+        """
+        formats = self.command_formats.get(command_code)
+        if not formats:
+            return None
+        has_length = any(cf.name == "Data Length" for cf in formats)
+        data_size = sum(cf.size for cf in formats if cf.name == "Data" and isinstance(cf.size, int))
+        return has_length, data_size
     
     def get_serial_config(self, **overrides) -> Dict[str, Any]:
         """
@@ -674,6 +719,13 @@ class MCUProtocolConfig:
             'response_timeout_ms': self.protocol.response_timeout_ms,
             'firmware_response_timeout_ms': self.protocol.firmware_response_timeout_ms,
             'max_packet_size': self.protocol.max_packet_size,
+            'session_pool_enabled': self.protocol.session_pool_enabled,
+            'session_idle_timeout_s': self.protocol.session_idle_timeout_s,
+            'bus_lock_timeout_ms': self.protocol.bus_lock_timeout_ms,
+            'receive_mode': self.protocol.receive_mode,
+            'firmware_window_size': self.protocol.firmware_window_size,
+            'firmware_max_retries': self.protocol.firmware_max_retries,
+            'firmware_progress_dir': self.protocol.firmware_progress_dir,
         }
     
     def get_logging_config(self) -> Dict[str, Any]:
@@ -855,6 +907,11 @@ def get_command_format(command_code: CommandCode) -> List[CommandFormat]:
     return mcu_config.get_command_format(command_code)
 
 
+def get_frame_layout(command_code: int) -> Optional[Tuple[bool, int]]:
+    """응답 프레임 배치(길이 필드 유무, 고정 데이터 크기)를 반환합니다."""
+    return mcu_config.get_frame_layout(command_code)
+
+
 def get_start_byte() -> int:
     """프레임 시작 바이트를 반환합니다."""
     return mcu_config.protocol.start_byte
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""pty 위에서 동작하는 DE-MCU 부트로더 대역 (펌웨어 전송 테스트/벤치마크용).
+
+FakeMCU에 FIRMWARE_VERSION_UPDATE_REQ 처리를 더합니다.
+
+- 요청 데이터(Intel HEX 레코드 1개)의 체크섬을 확인하고 확장 주소(02/04)를 반영해 memory에 기록
+- 정상 처리한 레코드마다 FIRMWARE_VERSION_UPDATE_RES(ACK) 전송, EOF(01)를 받으면 finished=True 후 선택 해제(재부팅)
+- drop: 받은 순번(1부터)이 여기에 있으면 ACK 없이 버림 (선로 오류 흉내)
+- stall_after: 레코드를 이만큼 받은 뒤로는 ACK하지 않음 (전원 차단/중단 흉내, None으로 되돌리면 재개)
+- flash_time: 레코드마다 플래시 기록 시간(초)
+
+📌 사용 예시 (pyserial 필요):
+    python -m utils.protocol.MCU.tests.fake_bootloader --size 4096 --window 1 4 16 --baudrate 115200
+"""
+import time
+
+from utils.protocol.MCU.config import CommandCode
+from utils.protocol.MCU.tests.fake_mcu import DEFAULT_SERIAL, FakeMCU
+
+
+def make_hex_image(data, address=0x0800FC00, record_size=16):
+    """data를 address부터 싣는 Intel HEX 텍스트 (64KB 경계마다 04 레코드, 마지막에 EOF)."""
+
+    def record(kind, offset, payload):
+        raw = bytes([len(payload), (offset >> 8) & 0xFF, offset & 0xFF, kind]) + bytes(payload)
+        return ":" + (raw + bytes([(-sum(raw)) & 0xFF])).hex().upper() + "\r\n"
+
+    lines = []
+    upper = None
+    position = 0
+    while position < len(data):
+        current = address + position
+        if current >> 16 != upper:
+            upper = current >> 16
+            lines.append(record(0x04, 0, upper.to_bytes(2, "big")))
+        size = min(record_size, len(data) - position, 0x10000 - (current & 0xFFFF))
+        lines.append(record(0x00, current & 0xFFFF, data[position:position + size]))
+        position += size
+    lines.append(record(0x01, 0, b""))
+    return "".join(lines)
+
+
+class FakeBootloader(FakeMCU):
+    def __init__(self, flash_time=0.0, drop=(), stall_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self.flash_time = flash_time
+        self.drop = set(drop)
+        self.stall_after = stall_after
+        self.memory = {}
+        self.base = 0
+        self.received = 0
+        self.finished = False
+        self.handlers[CommandCode.FIRMWARE_VERSION_UPDATE_REQ] = self._update
+
+    def image(self, address, size):
+        return bytes(self.memory.get(address + offset, 0xFF) for offset in range(size))
+
+    def _update(self, data):
+        self.received += 1
+        if self.received in self.drop:
+            return None
+        if self.stall_after is not None and self.received > self.stall_after:
+            return None
+        record = bytes(data)
+        if len(record) < 5 or sum(record) & 0xFF or len(record) != record[0] + 5:
+            self.counts["bad_record"] += 1
+            return None
+        length, offset, kind = record[0], (record[1] << 8) | record[2], record[3]
+        payload = record[4:4 + length]
+        if kind == 0x00:
+            for index, byte in enumerate(payload):
+                self.memory[self.base + offset + index] = byte
+        elif kind == 0x04:
+            self.base = int.from_bytes(payload, "big") << 16
+        elif kind == 0x02:
+            self.base = int.from_bytes(payload, "big") << 4
+        elif kind == 0x01:
+            self.finished = True
+            self.selected = None
+        if self.flash_time:
+            time.sleep(self.flash_time)
+        return CommandCode.FIRMWARE_VERSION_UPDATE_RES, b""
+
+
+def _legacy_transfer(client, ser, image):
+    """레코드마다 NODE_SELECT 후 레코드를 보내고 ACK를 기다리던 이전 방식 (비교용)."""
+    timeout = client._protocol_config["firmware_response_timeout_ms"] / 1000.0
+    for record in image.split(":"):
+        record = record.strip()
+        if not record:
+            continue
+        req_pdu = client.NODE_SELECT_REQ(serial_number=DEFAULT_SERIAL, checksum_type="xor_simple")
+        client._exchange(ser, req_pdu.serialize(), timeout=timeout)
+        frame = client.FIRMWARE_VERSION_UPDATE_REQ(command="FIRMWARE_VERSION_UPDATE_REQ").serialize(data=record)
+        client._exchange(ser, frame, timeout=timeout)
+
+
+def _benchmark(size, windows, baudrates, flash_ms, progress_dir):
+    import os
+
+    from utils.protocol.MCU.client.base import DE_MCU_SerialClient
+    from utils.protocol.MCU.client.session import session_pool
+
+    data = os.urandom(size)
+    image = make_hex_image(data)
+    for baudrate in baudrates:
+        for window in [None] + list(windows):
+            with FakeBootloader(baudrate=baudrate, flash_time=flash_ms / 1000.0) as loader:
+                client = DE_MCU_SerialClient(port=loader.port, baudrate=baudrate)
+                client._protocol_config["firmware_progress_dir"] = progress_dir
+                client._serial_config["timeout"] = 0.2
+                started = time.perf_counter()
+                if window is None:
+                    client.start_byte = client._protocol_config["start_byte"]
+                    client._checksum_type = "xor_simple"
+                    client.checksum_func = client._make_checksum_callable("xor_simple")
+                    with session_pool.acquire(loader.port, baudrate) as session:
+                        _legacy_transfer(client, session.ensure_open(client._open_serial), image)
+                    label = "legacy"
+                else:
+                    client.transact(
+                        command="FIRMWARE_VERSION_UPDATE_REQ", serial_number=DEFAULT_SERIAL,
+                        req_data=image.encode(), window=window,
+                    )
+                    label = f"window={window}"
+                elapsed = time.perf_counter() - started
+                ok = loader.image(0x0800FC00, size) == data
+                print(
+                    f"baud={baudrate:<6} {label:10} bytes={size} records={loader.received} ok={ok} "
+                    f"elapsed={elapsed:7.3f} s rate={size / elapsed / 1024:7.2f} KiB/s "
+                    f"node_selects={loader.counts['NODE_SELECT_REQ']}"
+                )
+                session_pool.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4096, help="image payload bytes")
+    parser.add_argument("--window", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--baudrate", type=int, nargs="+", default=[115200])
+    parser.add_argument("--flash-ms", type=float, default=1.0, help="per-record flash time")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as progress_dir:
+        _benchmark(args.size, args.window, args.baudrate, args.flash_ms, progress_dir)
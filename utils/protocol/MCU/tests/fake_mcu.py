@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""pty(pseudo-tty) 위에서 동작하는 DE-MCU 대역(stand-in) 장치.
+
+하드웨어 없이 DE_MCU_SerialClient의 처리량과 복구 동작을 측정하기 위한 도구입니다.
+pty.openpty()의 slave 쪽 경로를 가리키는 심볼릭 링크(self.port)를 클라이언트에 넘기고,
+master 쪽에서 요청 프레임(START, CMD, LEN, DATA, CHK)을 읽어 응답합니다.
+
+- NODE_SELECT_REQ: 버스의 노드(serial_number, extra_nodes) 중 하나와 일치하면 그 노드를 선택하고 NODE_SELECT_RES를 보냄
+- 선택된 상태에서만 handlers에 등록된 명령에 응답 (기본: FIRMWARE_VERSION_READ_REQ)
+- 응답 프레임은 config의 명령 포맷을 따름 (포맷에 Data Length가 없으면 길이 바이트도 없음)
+- reset(): 장치 재부팅(선택 해제), unplug()/replug(): USB 분리/재연결 (링크는 새 pty로 바뀜)
+- baudrate를 주면 응답을 바이트마다 선로 전송 시간(10비트/바이트) 간격으로 나눠 보냄
+
+📌 사용 예시 (pyserial 필요):
+    python -m utils.protocol.MCU.tests.fake_mcu --count 20 --baudrate 9600 115200
+"""
+import os
+import pty
+import select
+import shutil
+import tempfile
+import threading
+import time
+import tty
+from collections import Counter
+
+from utils.protocol import all_dict as checksum_methods
+from utils.protocol.MCU.config import CommandCode, get_command_format, get_start_byte
+from utils.protocol.MCU.utils import to_bytes
+
+# 클라이언트에 넘기는 serial_number (선로에는 NODE_SELECT_REQ와 같이 little-endian으로 실림)
+DEFAULT_SERIAL = "4653500D004C003C"
+
+
+class FakeMCU:
+    def __init__(self, serial_number=DEFAULT_SERIAL, firmware=(1, 2, 3), checksum_type="xor_simple",
+                 baudrate=None, response_delay=0.0, extra_nodes=()):
+        self.serial_number = to_bytes(serial_number, endian="<")
+        self.nodes = {self.serial_number} | {to_bytes(node, endian="<") for node in extra_nodes}
+        self.firmware = tuple(firmware)
+        self.checksum = checksum_methods[checksum_type]
+        self.baudrate = baudrate
+        self.response_delay = response_delay
+        self.start_byte = get_start_byte()
+        self.selected = None
+        self.counts = Counter()
+        self.handlers = {
+            CommandCode.FIRMWARE_VERSION_READ_REQ: lambda data: (
+                CommandCode.FIRMWARE_VERSION_READ_RES, bytes(self.firmware)
+            ),
+        }
+        self._dir = tempfile.mkdtemp(prefix="fake_mcu_")
+        self.port = os.path.join(self._dir, "ttyMCU")
+        self._master = self._slave = None
+        self._plugged = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------ #
+    # 장치 수명 주기
+    # ------------------------------------------------------------------ #
+    def start(self):
+        self.replug()
+        self._thread = threading.Thread(target=self._run, name="fake-mcu", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+        self.unplug()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        """장치 재부팅: 포트는 그대로, 노드 선택만 풀림."""
+        self.selected = None
+
+    def unplug(self):
+        self._plugged.clear()
+        self.selected = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def replug(self):
+        self.unplug()
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        if os.path.lexists(self.port):
+            os.unlink(self.port)
+        os.symlink(os.ttyname(self._slave), self.port)
+        self._plugged.set()
+
+    # ------------------------------------------------------------------ #
+    # 프레임 처리
+    # ------------------------------------------------------------------ #
+    def frame(self, command, data=b""):
+        """config의 응답 포맷대로 프레임을 만듭니다."""
+        has_length = any(cf.name == "Data Length" for cf in get_command_format(command))
+        body = bytes([self.start_byte, int(command)]) + (bytes([len(data)]) if has_length else b"") + bytes(data)
+        return body + bytes([int(self.checksum(body)) & 0xFF])
+
+    def handle(self, command, data):
+        """요청 하나에 대한 응답 프레임(없으면 None)."""
+        try:
+            self.counts[CommandCode(command).name] += 1
+        except ValueError:
+            self.counts[command] += 1
+        if command == CommandCode.NODE_SELECT_REQ:
+            self.selected = bytes(data) if data in self.nodes else None
+            return self.frame(CommandCode.NODE_SELECT_RES) if self.selected else None
+        handler = self.handlers.get(command)
+        if not self.selected or handler is None:
+            return None
+        # handler는 (응답 명령, 데이터) 또는 응답하지 않을 때 None을 반환
+        response = handler(data)
+        return self.frame(*response) if response else None
+
+    def _run(self):
+        buffer = bytearray()
+        while not self._stop.is_set():
+            if not self._plugged.wait(0.05):
+                buffer.clear()
+                continue
+            master = self._master
+            try:
+                ready, _, _ = select.select([master], [], [], 0.05)
+                if not ready:
+                    continue
+                buffer += os.read(master, 4096)
+            except (OSError, ValueError, TypeError):
+                buffer.clear()
+                continue
+            while True:
+                start = buffer.find(bytes([self.start_byte]))
+                if start < 0:
+                    buffer.clear()
+                    break
+                del buffer[:start]
+                if len(buffer) < 3 or len(buffer) < 4 + buffer[2]:
+                    break
+                size = 4 + buffer[2]
+                frame, buffer[:size] = bytes(buffer[:size]), b""
+                if (int(self.checksum(frame[:-1])) & 0xFF) != frame[-1]:
+                    self.counts["bad_checksum"] += 1
+                    continue
+                response = self.handle(frame[1], frame[3:-1])
+                if response is None:
+                    continue
+                try:
+                    self._send(master, response)
+                except OSError:
+                    break
+
+    def _send(self, master, response):
+        if self.response_delay:
+            time.sleep(self.response_delay)
+        if not self.baudrate:
+            os.write(master, response)
+            return
+        byte_time = 10 / self.baudrate
+        started = time.perf_counter()
+        for index in range(len(response)):
+            wait = started + (index + 1) * byte_time - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            os.write(master, response[index:index + 1])
+
+
+def _benchmark(count, baudrates, timeout_ms):
+    """수신 방식(polling/frame)과 세션 풀 사용 여부별 트랜잭션 지연을 비교합니다."""
+    from utils.protocol.MCU.client.base import DE_MCU_SerialClient
+    from utils.protocol.MCU.client.session import session_pool
+
+    kwargs = {"command": "FIRMWARE_VERSION_READ_REQ", "serial_number": DEFAULT_SERIAL}
+    for baudrate in baudrates:
+        with FakeMCU(baudrate=baudrate) as mcu:
+            for receive_mode in ("polling", "frame"):
+                for use_pool in (False, True):
+                    client = DE_MCU_SerialClient(
+                        port=mcu.port, baudrate=baudrate, use_session_pool=use_pool, receive_mode=receive_mode
+                    )
+                    client._protocol_config["response_timeout_ms"] = timeout_ms
+                    client._serial_config["timeout"] = timeout_ms / 1000.0
+                    mcu.counts.clear()
+                    started = time.perf_counter()
+                    ok = sum(1 for _ in range(count) if (client.transact(**kwargs) or {}).get("processed_data"))
+                    elapsed = time.perf_counter() - started
+                    print(
+                        f"baud={baudrate:<6} receive={receive_mode:7} session_pool={use_pool!s:5} "
+                        f"requests={count} ok={ok} mean={elapsed / count * 1000:8.2f} ms "
+                        f"rate={count / elapsed:7.1f} req/s node_selects={mcu.counts['NODE_SELECT_REQ']}"
+                    )
+                    session_pool.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--baudrate", type=int, nargs="+", default=[9600, 115200])
+    parser.add_argument("--timeout-ms", type=int, default=200, help="response_timeout_ms")
+    args = parser.parse_args()
+    _benchmark(args.count, args.baudrate, args.timeout_ms)
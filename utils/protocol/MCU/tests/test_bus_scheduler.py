@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+pytest.importorskip("termios")
+
+from utils.protocol.MCU.client.bus_scheduler import PRIORITY_HIGH, PRIORITY_LOW, DE_MCU_BusScheduler
+from utils.protocol.MCU.client.session import session_pool
+from utils.protocol.MCU.tests.fake_mcu import DEFAULT_SERIAL, FakeMCU
+
+OTHER_SERIAL = "4653500D004C0099"
+
+
+@pytest.fixture
+def mcu_bus():
+    with FakeMCU(extra_nodes=[OTHER_SERIAL]) as mcu:
+        scheduler = DE_MCU_BusScheduler()
+        yield mcu, scheduler
+        scheduler.shutdown()
+    session_pool.close()
+
+
+def _submit(scheduler, port, serial_number, done, label=None, **kwargs):
+    future = scheduler.submit(port, command="FIRMWARE_VERSION_READ_REQ", serial_number=serial_number, **kwargs)
+    future.add_done_callback(lambda f: done.append(label or serial_number))
+    return future
+
+
+def _configure(scheduler, port):
+    bus = scheduler._bus(port, None)
+    bus.client._protocol_config["response_timeout_ms"] = 100
+    bus.client._serial_config["timeout"] = 0.1
+    return bus
+
+
+def _wait_running(bus):
+    deadline = time.monotonic() + 2
+    while not bus.running and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_scheduler_groups_commands_by_node(mcu_bus):
+    mcu, scheduler = mcu_bus
+    bus = _configure(scheduler, mcu.port)
+    done = []
+    # 워커가 첫 명령을 꺼낸 채 버스 락을 기다리는 동안 두 노드의 명령을 번갈아 넣음
+    with session_pool.acquire(mcu.port, 19200):
+        futures = [_submit(scheduler, mcu.port, DEFAULT_SERIAL, done)]
+        _wait_running(bus)
+        for serial_number in (OTHER_SERIAL, DEFAULT_SERIAL, OTHER_SERIAL, DEFAULT_SERIAL):
+            futures.append(_submit(scheduler, mcu.port, serial_number, done))
+    for future in futures:
+        assert future.result(timeout=5)["processed_data"]["STATUS"]["Firmware"]["Version"] == "1.2.3"
+
+    assert done == [DEFAULT_SERIAL, OTHER_SERIAL, OTHER_SERIAL, DEFAULT_SERIAL, DEFAULT_SERIAL]
+    assert mcu.counts["NODE_SELECT_REQ"] == 3
+    metrics = scheduler.metrics()[0]
+    assert metrics["queue_depth"] == 0
+    assert metrics["node_switches"] == 3
+    assert sum(node["count"] for node in metrics["nodes"].values()) == 5
+
+
+def test_scheduler_runs_urgent_commands_first_and_expires_stale_ones(mcu_bus):
+    mcu, scheduler = mcu_bus
+    bus = _configure(scheduler, mcu.port)
+    done = []
+    with session_pool.acquire(mcu.port, 19200):
+        first = _submit(scheduler, mcu.port, DEFAULT_SERIAL, done, "first")
+        _wait_running(bus)
+        futures = {
+            "low": _submit(scheduler, mcu.port, OTHER_SERIAL, done, "low", priority=PRIORITY_LOW),
+            "high": _submit(scheduler, mcu.port, OTHER_SERIAL, done, "high", priority=PRIORITY_HIGH),
+            "stale": _submit(scheduler, mcu.port, DEFAULT_SERIAL, done, "stale", timeout=0.01),
+        }
+        time.sleep(0.05)
+    first.result(timeout=5)
+    futures["low"].result(timeout=5)
+    with pytest.raises(TimeoutError):
+        futures["stale"].result(timeout=5)
+
+    assert done == ["first", "high", "stale", "low"]
+    assert futures["high"].result()["selected_node"] is True
+    metrics = scheduler.metrics()[0]
+    assert metrics["queue_timeouts"] == 1
+    assert metrics["completed"] == 3
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+pytest.importorskip("serial")
+pytest.importorskip("termios")
+
+from utils.protocol.MCU.client.base import DE_MCU_SerialClient
+from utils.protocol.MCU.client.session import session_pool
+from utils.protocol.MCU.exceptions import ConnectionException
+from utils.protocol.MCU.tests.fake_bootloader import FakeBootloader, make_hex_image
+from utils.protocol.MCU.tests.fake_mcu import DEFAULT_SERIAL
+
+ADDRESS = 0x0800FC00
+DATA = os.urandom(2048)  # 64KB 경계를 넘어 04 레코드가 두 개
+IMAGE = make_hex_image(DATA, address=ADDRESS).encode()
+RECORDS = IMAGE.count(b":")
+
+
+@pytest.fixture
+def loader():
+    with FakeBootloader() as device:
+        yield device
+    session_pool.close()
+
+
+def _client(port, progress_dir):
+    client = DE_MCU_SerialClient(port=port)
+    client._protocol_config["response_timeout_ms"] = 100
+    client._protocol_config["firmware_response_timeout_ms"] = 50
+    client._protocol_config["firmware_progress_dir"] = str(progress_dir)
+    client._serial_config["timeout"] = 0.1
+    return client
+
+
+def _update(client, **kwargs):
+    return client.transact(
+        command="FIRMWARE_VERSION_UPDATE_REQ", serial_number=DEFAULT_SERIAL, req_data=IMAGE, **kwargs
+    )["processed_data"]["FIRMWARE_UPDATE"]
+
+
+def test_windowed_transfer_retransmits_only_failed_window(loader, tmp_path):
+    loader.drop = {10}
+    summary = _update(_client(loader.port, tmp_path), window=8)
+
+    assert loader.finished
+    assert loader.image(ADDRESS, len(DATA)) == DATA
+    assert loader.counts["NODE_SELECT_REQ"] == 1
+    assert summary["records"] == RECORDS
+    assert summary["window_failures"] == 1
+    # 실패한 윈도우(8개)와 그 앞의 확장 주소 레코드만 다시 보냄
+    assert summary["retransmits"] == 9
+    assert loader.received == RECORDS + 9
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_interrupted_transfer_resumes_at_confirmed_record(loader, tmp_path):
+    client = _client(loader.port, tmp_path)
+    loader.stall_after = 60
+    with pytest.raises(ConnectionException):
+        _update(client, window=4)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    loader.stall_after = None
+    loader.received = 0
+    summary = _update(client, window=4)
+
+    assert summary["resumed_from"] == 60
+    # 재개 위치 앞의 확장 주소 레코드는 이번 전송에서 처음 보내는 것이므로 재전송이 아님
+    assert summary["retransmits"] == 0
+    assert loader.finished
+    assert loader.image(ADDRESS, len(DATA)) == DATA
+    # 재개 위치의 확장 주소 레코드 1개 + 나머지 레코드
+    assert loader.received == RECORDS - 60 + 1
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from utils.protocol.MCU.client.frame_reader import DE_MCU_FrameReader
+
+
+class _BufferSerial:
+    """read(n)/timeout만 흉내 내는 메모리 시리얼 (데이터가 모자라면 있는 만큼 반환)."""
+
+    def __init__(self, data, timeout=1.0):
+        self.data = bytearray(data)
+        self.timeout = timeout
+        self.reads = []
+
+    def read(self, size=1):
+        chunk, self.data[:size] = bytes(self.data[:size]), b""
+        self.reads.append(size)
+        return chunk
+
+
+def _frame(*body):
+    checksum = 0
+    for byte in body:
+        checksum ^= byte
+    return bytes(body) + bytes([checksum])
+
+
+def test_reads_fixed_and_length_prefixed_frames():
+    node_select = _frame(0x7E, 0x21)
+    firmware = _frame(0x7E, 0xA1, 0x03, 1, 2, 3)
+    ser = _BufferSerial(node_select + firmware)
+    reader = DE_MCU_FrameReader(checksum_type="xor_simple")
+
+    assert reader.read_frame(ser, timeout=0.2) == node_select
+    assert reader.read_frame(ser, timeout=0.2) == firmware
+    # START, CMD, (LEN), DATA+CHK 를 각각 한 번씩만 읽음
+    assert ser.reads == [1, 1, 1, 1, 1, 1, 4]
+    assert ser.timeout == 1.0
+
+
+def test_skips_noise_and_bad_checksum():
+    good = _frame(0x7E, 0xA1, 0x03, 4, 5, 6)
+    bad = bytearray(good)
+    bad[-1] ^= 0xFF
+    ser = _BufferSerial(b"\x00\x13" + bytes(bad) + good)
+
+    assert DE_MCU_FrameReader(checksum_type="xor_simple").read_frame(ser, timeout=0.2) == good
+
+
+def test_returns_partial_frame_on_deadline():
+    partial = _frame(0x7E, 0xA1, 0x03, 1, 2, 3)[:-2]
+    ser = _BufferSerial(partial, timeout=0.01)
+
+    assert DE_MCU_FrameReader(checksum_type="xor_simple").read_frame(ser, timeout=0.05) == partial
+    assert DE_MCU_FrameReader().read_frame(_BufferSerial(b"", timeout=0.01), timeout=0.03) == b""
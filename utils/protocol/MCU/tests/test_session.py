@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+pytest.importorskip("serial")
+pytest.importorskip("termios")
+
+from utils.protocol.MCU.client.base import DE_MCU_SerialClient
+from utils.protocol.MCU.client.session import session_pool
+from utils.protocol.MCU.tests.fake_mcu import DEFAULT_SERIAL, FakeMCU
+
+READ_FIRMWARE = {"command": "FIRMWARE_VERSION_READ_REQ", "serial_number": DEFAULT_SERIAL}
+
+
+@pytest.fixture
+def mcu():
+    with FakeMCU() as device:
+        yield device
+    session_pool.close()
+
+
+def _client(port, **kwargs):
+    client = DE_MCU_SerialClient(port=port, **kwargs)
+    client._protocol_config["response_timeout_ms"] = 100
+    client._serial_config["timeout"] = 0.1
+    return client
+
+
+def _version(result):
+    return result["processed_data"]["STATUS"]["Firmware"]["Version"]
+
+
+def test_session_pool_skips_repeated_node_select(mcu):
+    client = _client(mcu.port)
+    for _ in range(3):
+        assert _version(client.transact(**READ_FIRMWARE)) == "1.2.3"
+    assert mcu.counts["NODE_SELECT_REQ"] == 1
+    assert mcu.counts["FIRMWARE_VERSION_READ_REQ"] == 3
+
+
+def test_legacy_path_selects_every_request(mcu):
+    client = _client(mcu.port, use_session_pool=False)
+    for _ in range(2):
+        assert _version(client.transact(**READ_FIRMWARE)) == "1.2.3"
+    assert mcu.counts["NODE_SELECT_REQ"] == 2
+
+
+def test_session_reselects_after_reset_and_unplug(mcu):
+    client = _client(mcu.port)
+    client.transact(**READ_FIRMWARE)
+
+    mcu.reset()
+    assert _version(client.transact(**READ_FIRMWARE)) == "1.2.3"
+    assert mcu.counts["NODE_SELECT_REQ"] == 2
+
+    mcu.unplug()
+    mcu.replug()
+    assert _version(client.transact(**READ_FIRMWARE)) == "1.2.3"
+    session = session_pool.session(mcu.port, client.params.baudrate)
+    assert session.stats["opens"] == 2
+    assert mcu.counts["NODE_SELECT_REQ"] == 3
+
+
+def test_write_is_not_resent_after_cached_select_miss(mcu):
+    from utils.protocol.MCU.config import CommandCode
+
+    mcu.handlers[CommandCode.DO_WRITE_REQ] = lambda data: (CommandCode.DO_WRITE_RES, b"")
+    client = _client(mcu.port)
+    write = {"command": "DO_WRITE_REQ", "serial_number": DEFAULT_SERIAL, "req_data": "11"}
+    assert client.transact(**write)["response"] != "No Response"
+
+    mcu.reset()
+    # 쓰기는 다시 보내지 않고 노드만 다시 선택한 뒤 No Response로 보고
+    assert client.transact(**write)["response"] == "No Response"
+    assert mcu.counts["DO_WRITE_REQ"] == 2
+    assert mcu.counts["NODE_SELECT_REQ"] == 2
+
+    # 다시 선택된 상태이므로 다음 요청은 NODE_SELECT 없이 바로 처리
+    assert _version(client.transact(**READ_FIRMWARE)) == "1.2.3"
+    assert mcu.counts["NODE_SELECT_REQ"] == 2